@@ -2,12 +2,16 @@
 
 """Code genarates an OpenSCAD model for HR2 (HBRC ROS Robot)."""
 
-from scad_models.scad import (Color, Circle, CornerCube, Cylinder, If2D, Difference2D, KicadPcb,
-                              LinearExtrude, Module2D, Module3D, P2D, P3D, Polygon, Rotate3D,
-                              Scad2D, Scad3D, SimplePolygon, ScadProgram, Square,
-                              Translate3D, UseModule3D, Union3D, Variable2D)
-from typing import Any, Dict, IO, List, Optional, Set, Tuple
+from scad_models.scad import (BillOfMaterials, Color, Circle, CornerCube, Cylinder, If2D,
+                              Difference2D, KicadBoard, LinearExtrude, MarkedDocument, Module2D,
+                              Module3D, NameRegistry, P2D, P3D, Polygon, Rotate3D, Scad, Scad2D,
+                              Scad3D, SimplePolygon, ScadProgram, Square, Translate3D,
+                              UseModule3D, Union3D, Variable2D)
+from typing import Any, Callable, Dict, IO, List, Optional, Set, Tuple
 from math import acos, asin, atan2, cos, degrees, nan, pi, sin, sqrt
+import argparse
+import os
+import sys
 
 
 # DXF:
@@ -434,6 +438,7 @@ class EncoderBoard:
         module: Module3D = Module3D("EncoderBoard Module", [
             translated_encoder_pcb,
         ])
+        module.bom_part_append("Romi Encoder Board", {"type": "PCB"})
         scad_program.append(module)
         scad_program.if3d.name_match_append("encoder_board", module, ["Encoder Board"])
         # encoder_board: EncoderBoard = self
@@ -491,6 +496,7 @@ class HCSR04:
 
         # Create *module*, append to *scad_program*, and save into *hcsr04* (i.e. *self*):
         module: Module3D = Module3D("HR SR04 Sonar Module", [east_facing_hcsr04])
+        module.bom_part_append("HC-SR04 Sonar", {"type": "Sensor"})
         scad_program.append(module)
         scad_program.if3d.name_match_append("sonar", module, ["HC-SR04 Sonar"])
         # hcsr04: HCSR04 = self
@@ -503,13 +509,12 @@ class HR2BaseAssembly:
 
     # HR2BaseAssembly.__init__():
     def __init__(self, scad_program: ScadProgram, base_dxf: BaseDXF,
-                 pi_z: float, master_board_z: float, arm_z: float) -> None:
+                 pi_z: float, master_board_z: float, arm_z: float, romi_base: "RomiBase") -> None:
         """Initialize a HR2BaseAssembly."""
         # Grab some Z values via *base_dxf*:
         base_battery_top_z: float = base_dxf.z_locate(-2.701374)
         base_top_z: float = base_dxf.z_locate(-3.095083)
 
-        romi_base: RomiBase = RomiBase(scad_program, base_dxf)
         romi_motor_holder: RomiMotorHolder = RomiMotorHolder(scad_program, base_dxf)
         west_romi_motor_holder: UseModule3D = romi_motor_holder.module.use_module_get()
         degrees180: float = pi
@@ -637,14 +642,8 @@ class HR2MasterAssembly:
 
     # HR2MasterAssembly.__init__():
     def __init__(self, scad_program: ScadProgram, hr2_pi_assembly: "HR2PiAssembly",
-                 base_dxf: BaseDXF, master_board_z: float, arm_z, pi_offset: P3D,
-                 nucleo144: "Nucleo144", romi_base_keys: List[Tuple[Any, ...]],
-                 romi_expansion_plate_keys: List[Tuple[Any, ...]]) -> None:
+                 master_board: "MasterBoard") -> None:
         """Initialize the HR2MasterAssembly."""
-        master_board: MasterBoard = MasterBoard(scad_program, base_dxf, nucleo144,
-                                                pi_offset, master_board_z, arm_z,
-                                                romi_base_keys, romi_expansion_plate_keys)
-
         # Create *module*, append to *scad_program* and save into *hr2_master_assembly*
         # (i.e. *self*):
         module: Module3D = Module3D("HR2 Master Assembly", [
@@ -653,6 +652,7 @@ class HR2MasterAssembly:
         scad_program.append(module)
         # hr2_master_assembly: HR2MasterAssembly = self
         self.module = module
+        self.master_board: MasterBoard = master_board
         scad_program.if3d.name_match_append("hr2_master_assembly", module, ["HR2 Base Assembly"])
 
 
@@ -683,21 +683,20 @@ class HR2PiAssembly:
 
     # HR2PiAssembly.__init__():
     def __init__(self, scad_program: ScadProgram, hr2_base_assembly: HR2BaseAssembly,
-                 pi_offset: P3D, master_board_z: float) -> None:
+                 pi_offset: P3D, master_board_z: float,
+                 other_pi: "OtherPi", raspberry_pi3: "RaspberryPi3") -> None:
         """Initialize the HR2BaseAssembly."""
         # Define some constants
         z_axis: P3D = P3D(0.0, 0.0, 1.0)
         degrees90: float = pi / 2.0
 
-        # Create the *other_pi* and rotate and translate to the correct location:
-        other_pi: OtherPi = OtherPi(scad_program)
+        # Rotate and translate the *other_pi* to the correct location:
         other_pi_use_module: UseModule3D = other_pi.module.use_module_get()
         rotated_other_pi: Rotate3D = Rotate3D("Rotated Other Pi",
                                               other_pi_use_module, degrees90, z_axis)
         translated_other_pi: Translate3D = Translate3D("Translated Other Pi",
                                                        rotated_other_pi, pi_offset)
-        # Create the *raspberry_pi3*:
-        raspberry_pi3: RaspberryPi3 = RaspberryPi3(scad_program)
+        # Rotate and translate the *raspberry_pi3* to the correct location:
         raspberry_pi3_use_module: UseModule3D = raspberry_pi3.module.use_module_get()
         rotated_raspberry_pi3: Rotate3D = Rotate3D("Rotated Raspberry Pi3",
                                                    raspberry_pi3_use_module, degrees90, z_axis)
@@ -718,10 +717,150 @@ class HR2PiAssembly:
 
 # HR2Robot:
 class HR2Robot:
-    """Represents the entire HR2 robot."""
+    """Represents the entire HR2 robot.
+
+    Every part is constructed on demand by one of the memoized `*_get()`
+    methods, so an HR2Robot can build either the entire robot or just
+    the parts needed by a few registered names (see
+    *HR2Robot*.*names_build*().)
+    """
+
+    # *NAME_PARTS* maps each name registered via `name_match_append()` to the `*_get()` method
+    # that constructs it.  Containing assemblies are listed before the parts they contain,
+    # since building an assembly also registers the names of the parts it constructs:
+    NAME_PARTS: Dict[str, str] = {
+        "hr2_arm_assembly": "hr2_arm_assembly_get",
+        "hr2_nucleo_assembly": "hr2_nucleo_assembly_get",
+        "hr2_wheel_assembly": "hr2_wheel_assembly_get",
+        "hr2_master_assembly": "hr2_master_assembly_get",
+        "hr2_pi_assembly": "hr2_pi_assembly_get",
+        "hr2_base_assembly": "hr2_base_assembly_get",
+        "master_board": "master_board_get",
+        "master_pcb": "master_board_get",
+        "stlink": "master_board_get",
+        "stlink_pcb": "master_board_get",
+        "sonar": "hcsr04_get",
+        "wheel_assembly": "romi_wheel_assembly_get",
+        "encoder_board": "encoder_board_get",
+        "encoder_pcb": "encoder_board_get",
+        "nucleo144": "nucleo144_get",
+        "nucleo144_pcb": "nucleo144_get",
+        "other_pi": "other_pi_get",
+        "other_pi_pcb": "other_pi_get",
+        "raspi3": "raspberry_pi3_get",
+        "raspi3_pcb": "raspberry_pi3_get",
+        "romi_base": "romi_base_get",
+        "expansion_plate": "romi_expansion_plate_get",
+        "expansion_flat": "romi_expansion_plate_get",
+    }
+
+    # *CLEARANCE_GROUPS* tags groups of *Module3D* name patterns (see *Scad3D*.*clearances_get*())
+    # and *CLEARANCE_PAIRS* lists the pairs of groups whose clearances are reported by
+    # *HR2Robot*.*clearances_report*().  The connectors are soldered to (or plugged into) the
+    # boards, so *CLEARANCE_IGNORES* lists the (connector, board) *Module3D* name patterns that
+    # are expected to touch.  What remains of the ("connectors", "boards") pair catches a
+    # connector that runs into some other board:
+    CLEARANCE_GROUPS: Dict[str, List[str]] = {
+        "arm": ["Romi Expansion Plate"],
+        "boards": ["EncoderBoard Module", "Master Board Module", "Nucleo144 Module",
+                   "Other Pi Module", "RasPi3B_Module"],
+        "connectors": ["*Connector*", "*Header*", "*Receptacle*"],
+        "spacers": ["*Spacer Module"],
+        "stlink": ["STLink"],
+    }
+    CLEARANCE_PAIRS: List[Tuple[str, str]] = [
+        ("boards", "arm"),
+        ("connectors", "arm"),
+        ("connectors", "boards"),
+        ("connectors", "spacers"),
+        ("spacers", "stlink"),
+        ("stlink", "arm"),
+    ]
+    CLEARANCE_IGNORES: List[Tuple[str, str]] = [
+        ("CN* Zio Connector *", "Nucleo144 Module"),
+        ("CN1[12] * Morpho Connector *", "Nucleo144 Module"),
+        ("* Ground Connector *", "Nucleo144 Module"),
+        ("MB *", "Master Board Module"),
+        ("* Morpho Connector 2x36 Module", "Master Board Module"),
+        ("* Encoder Receptacle *", "Master Board Module"),
+        ("* Encoder Receptacle *", "EncoderBoard Module"),
+        ("* Encoder Header *", "EncoderBoard Module"),
+    ]
+
+    # *DENSITIES* gives rough densities in grams per cubic centimeter for
+    # *HR2Robot*.*mass_properties_report*().  The parts are mostly modeled as solid blocks, so the
+    # densities are by color, which mostly tracks the material.  Hollow metal shells (e.g. the
+    # "Silver" USB/Ethernet jacks and sonar transducers) and the motors get an effective density:
+    DENSITIES: Dict[str, float] = {
+        "Black": 1.3,  # Connector plastic
+        "Blue": 1.05,  # Romi chassis ABS
+        "DarkBlue": 1.3,
+        "DarkRed": 1.3,
+        "Gold": 8.5,  # Brass pins
+        "GoldenRod": 8.5,  # Brass spacers
+        "Gray": 1.3,
+        "Green": 1.85,  # FR4 printed circuit boards
+        "Lime": 1.3,
+        "Maroon": 1.3,
+        "Olive": 1.3,
+        "Orange": 1.85,
+        "PaleGreen": 1.85,
+        "RoyalBlue": 1.05,
+        "SaddleBrown": 7.5,  # Magnets
+        "Silver": 1.0,
+        "SkyBlue": 1.3,
+        "SlateBlue": 1.3,
+        "SpringGreen": 1.85,
+        "Teal": 1.3,
+        "Wheat": 2.5,  # Motors
+        "White": 1.85,
+    }
+
+    # *PARAMETER_DEFAULTS* lists the stack up dimensions that can be overridden (e.g. by a
+    # parameter sweep.)  The defaults were arrived at by trial and error:
+    # * *pi_dz*: The height of the Raspberry Pi above the top of the Romi base.
+    # * *master_board_dz*: The height of the master board above the Raspberry Pi.
+    # * *arm_dz*: The height of the arm above the master board.
+    # * *nucleo144_dx*, *nucleo144_dy*, *nucleo144_dz*: The Nucleo144 offset from the
+    #   Raspberry Pi origin, where *nucleo144_dz* is measured up from the master board.
+    PARAMETER_DEFAULTS: Dict[str, float] = {
+        "pi_dz": 11.00,
+        "master_board_dz": 8.000,
+        "arm_dz": 26.00,
+        "nucleo144_dx": 6.5,
+        "nucleo144_dy": -1.0,
+        "nucleo144_dz": 13.00,
+    }
+
+    # HR2Robot.__init__():
+    def __init__(self, scad_program: ScadProgram, names: Optional[List[str]] = None,
+                 parameters: Optional[Dict[str, float]] = None) -> None:
+        """Initialize an HR2Robot.
+
+        Args:
+            *scad_program* (*ScadProgram*): The *ScadProgram* to append to.
+            *names* (*Optional*[*List*[*str*]]):
+                (Optional: Defaults to *None*.)  When *None*, the entire
+                robot is constructed; otherwise, only the parts needed for
+                *names* are constructed.
+            *parameters* (*Optional*[*Dict*[*str*, *float*]]):
+                (Optional: Defaults to *None*.)  Overrides for some of the
+                *PARAMETER_DEFAULTS*.
+
+        Raises:
+            *ValueError* if a parameter is not in *PARAMETER_DEFAULTS*.
+
+        """
+        # Merge *parameters* into the defaults:
+        merged_parameters: Dict[str, float] = dict(HR2Robot.PARAMETER_DEFAULTS)
+        if parameters is not None:
+            parameter_name: str
+            for parameter_name in parameters.keys():
+                if parameter_name not in merged_parameters:
+                    raise ValueError(f"'{parameter_name}' is not one of "
+                                     f"{sorted(merged_parameters.keys())}")
+            merged_parameters.update(parameters)
 
-    def __init__(self, scad_program: ScadProgram) -> None:
-        """Initialize an HR2Robot."""
         base_dxf: BaseDXF = BaseDXF()
         base_top_z: float = base_dxf.z_locate(-2.701374)
 
@@ -743,43 +882,258 @@ class HR2Robot:
         # *pi_dz* is selected to make all the master pcb pins fit:
         pi_x: float = 0.0
         pi_y: float = 0.0
-        pi_z: float = base_top_z + 11.00
-        pi_offset: P3D = P3D(pi_x, pi_y, pi_z)
-        master_board_z: float = pi_z + 8.000
-        arm_z: float = master_board_z + 26.00
-
-        # Create the *nucleo144* before *master_board* so it can be passed in:
-        nucleo144_offset: P3D = P3D(pi_x + 6.5, pi_y - 1.0, master_board_z + 13.00)
-        degrees90 = pi / 2.0
-        nucleo144: Nucleo144 = Nucleo144(scad_program, -degrees90, nucleo144_offset)
-
-        # Create the *romi_expansion_plate* before *master_board* so it can be passed in:
-        romi_expansion_plate: RomiExpansionPlate = RomiExpansionPlate(scad_program)
-        romi_expansion_plate_keys: List[Tuple[Any, ...]] = romi_expansion_plate.keys_get()
-
-        # Create the *hr2_base_assembly* object that can accept the various PCB's and assemblies
-        # that go on top of it:
-        hr2_base_assembly: HR2BaseAssembly = HR2BaseAssembly(scad_program, base_dxf,
-                                                             pi_z, master_board_z, arm_z)
-        hr2_pi_assembly: HR2PiAssembly = HR2PiAssembly(scad_program, hr2_base_assembly,
-                                                       pi_offset, master_board_z)
-        romi_base_keys: List[Tuple[Any, ...]] = hr2_base_assembly.romi_base_keys_get()
-        hr2_master_assembly: HR2MasterAssembly = HR2MasterAssembly(scad_program, hr2_pi_assembly,
-                                                                   base_dxf, master_board_z,
-                                                                   arm_z,
-                                                                   pi_offset, nucleo144,
-                                                                   romi_base_keys,
-                                                                   romi_expansion_plate_keys)
-        hr2_wheel_assembly: HR2WheelAssembly = HR2WheelAssembly(scad_program,
-                                                                hr2_master_assembly, base_dxf)
-
-        hr2_nucleo_assembly: HR2NucleoAssembly = HR2NucleoAssembly(scad_program,
-                                                                   hr2_wheel_assembly,
-                                                                   nucleo144,
-                                                                   master_board_z)
-        hr2_arm_assembly: HR2ArmAssembly = HR2ArmAssembly(scad_program, hr2_nucleo_assembly,
-                                                          romi_expansion_plate, arm_z)
-        hr2_arm_assembly = hr2_arm_assembly
+        pi_z: float = base_top_z + merged_parameters["pi_dz"]
+        master_board_z: float = pi_z + merged_parameters["master_board_dz"]
+
+        # Load values into *hr2_robot* (i.e. *self*):
+        hr2_robot: HR2Robot = self
+        self.arm_z: float = master_board_z + merged_parameters["arm_dz"]
+        self.base_dxf: BaseDXF = base_dxf
+        self.master_board_z: float = master_board_z
+        # *name_registry* is only present when the build runs inside of a `with NameRegistry()`
+        # block (e.g. for `--duplicates`), since registering slows the build down:
+        self.name_registry: Optional[NameRegistry] = Scad.name_registry
+        self.nucleo144_offset: P3D = P3D(pi_x + merged_parameters["nucleo144_dx"],
+                                         pi_y + merged_parameters["nucleo144_dy"],
+                                         master_board_z + merged_parameters["nucleo144_dz"])
+        self.parameters: Dict[str, float] = merged_parameters
+        self.parts_table: Dict[str, Any] = {}
+        self.pi_offset: P3D = P3D(pi_x, pi_y, pi_z)
+        self.pi_z: float = pi_z
+        self.scad_program: ScadProgram = scad_program
+
+        if names is None:
+            # Construct everything in the traditional order.  The *nucleo144* and the
+            # *romi_expansion_plate* are created before *master_board* so they can be passed in:
+            hr2_robot.nucleo144_get()
+            hr2_robot.romi_expansion_plate_get()
+            hr2_robot.hr2_base_assembly_get()
+            hr2_robot.hr2_pi_assembly_get()
+            hr2_robot.hr2_master_assembly_get()
+            hr2_robot.hr2_wheel_assembly_get()
+            hr2_robot.hr2_nucleo_assembly_get()
+            hr2_robot.hr2_arm_assembly_get()
+        else:
+            hr2_robot.names_build(names)
+
+        # Save the *hr2_master_assembly* so the *master_board* can be found later:
+        self.hr2_master_assembly: Optional[HR2MasterAssembly] = (
+            hr2_robot.parts_table.get("hr2_master_assembly_get"))
+
+    # HR2Robot.bom_files_write():
+    def bom_files_write(self, directory: str) -> List[str]:
+        """Write a CSV and a JSON bill of materials for each assembly.
+
+        Args:
+            *directory* (*str*): The directory to write the files into.
+
+        Returns:
+            (*List*[*str*]) Returns the `NAME_bom.csv` and `NAME_bom.json`
+                file names written for each `*_assembly` name in
+                *NAME_PARTS*.
+
+        """
+        # All of the assemblies share one *bill_of_materials*, so each module is counted once:
+        hr2_robot: HR2Robot = self
+        bill_of_materials: BillOfMaterials = BillOfMaterials()
+        file_names: List[str] = []
+        name: str
+        method_name: str
+        for name, method_name in HR2Robot.NAME_PARTS.items():
+            if name.endswith("_assembly"):
+                module3d: Module3D = getattr(hr2_robot, method_name)().module
+                csv_file_name: str = os.path.join(directory, f"{name}_bom.csv")
+                json_file_name: str = os.path.join(directory, f"{name}_bom.json")
+                bom_file: IO[Any]
+                with open(csv_file_name, "w") as bom_file:
+                    bom_file.write(bill_of_materials.csv_get(module3d))
+                with open(json_file_name, "w") as bom_file:
+                    bom_file.write(bill_of_materials.json_get(module3d))
+                file_names.extend([csv_file_name, json_file_name])
+        return file_names
+
+    # HR2Robot.clearances_report():
+    def clearances_report(self, warning: float = 1.0) -> str:
+        """Return the clearance report for the HR2 arm assembly.
+
+        Args:
+            *warning* (*float*):
+                (Optional: Defaults to 1.0.)  Clearances less than
+                *warning* millimeters are flagged with `WARNING`.
+
+        Returns:
+            (*str*) Returns the *CLEARANCE_PAIRS* clearances sorted from
+                the closest to the furthest, skipping the
+                *CLEARANCE_IGNORES* connectors and their boards.
+
+        """
+        hr2_robot: HR2Robot = self
+        return hr2_robot.hr2_arm_assembly_get().module.clearances_report(
+            HR2Robot.CLEARANCE_GROUPS, warning, HR2Robot.CLEARANCE_PAIRS,
+            HR2Robot.CLEARANCE_IGNORES)
+
+    # HR2Robot.encoder_board_get():
+    def encoder_board_get(self) -> "EncoderBoard":
+        """Return a stand-alone EncoderBoard."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("encoder_board_get", lambda: EncoderBoard(
+            hr2_robot.scad_program, hr2_robot.base_dxf))
+
+    # HR2Robot.hcsr04_get():
+    def hcsr04_get(self) -> HCSR04:
+        """Return a stand-alone HCSR04 sonar."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hcsr04_get", lambda: HCSR04(hr2_robot.scad_program))
+
+    # HR2Robot.hr2_arm_assembly_get():
+    def hr2_arm_assembly_get(self) -> HR2ArmAssembly:
+        """Return the HR2ArmAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hr2_arm_assembly_get", lambda: HR2ArmAssembly(
+            hr2_robot.scad_program, hr2_robot.hr2_nucleo_assembly_get(),
+            hr2_robot.romi_expansion_plate_get(), hr2_robot.arm_z))
+
+    # HR2Robot.hr2_base_assembly_get():
+    def hr2_base_assembly_get(self) -> HR2BaseAssembly:
+        """Return the HR2BaseAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hr2_base_assembly_get", lambda: HR2BaseAssembly(
+            hr2_robot.scad_program, hr2_robot.base_dxf, hr2_robot.pi_z,
+            hr2_robot.master_board_z, hr2_robot.arm_z, hr2_robot.romi_base_get()))
+
+    # HR2Robot.hr2_master_assembly_get():
+    def hr2_master_assembly_get(self) -> "HR2MasterAssembly":
+        """Return the HR2MasterAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hr2_master_assembly_get", lambda: HR2MasterAssembly(
+            hr2_robot.scad_program, hr2_robot.hr2_pi_assembly_get(), hr2_robot.master_board_get()))
+
+    # HR2Robot.hr2_nucleo_assembly_get():
+    def hr2_nucleo_assembly_get(self) -> "HR2NucleoAssembly":
+        """Return the HR2NucleoAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hr2_nucleo_assembly_get", lambda: HR2NucleoAssembly(
+            hr2_robot.scad_program, hr2_robot.hr2_wheel_assembly_get(),
+            hr2_robot.nucleo144_get(), hr2_robot.master_board_z))
+
+    # HR2Robot.hr2_pi_assembly_get():
+    def hr2_pi_assembly_get(self) -> "HR2PiAssembly":
+        """Return the HR2PiAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hr2_pi_assembly_get", lambda: HR2PiAssembly(
+            hr2_robot.scad_program, hr2_robot.hr2_base_assembly_get(), hr2_robot.pi_offset,
+            hr2_robot.master_board_z, hr2_robot.other_pi_get(), hr2_robot.raspberry_pi3_get()))
+
+    # HR2Robot.hr2_wheel_assembly_get():
+    def hr2_wheel_assembly_get(self) -> "HR2WheelAssembly":
+        """Return the HR2WheelAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("hr2_wheel_assembly_get", lambda: HR2WheelAssembly(
+            hr2_robot.scad_program, hr2_robot.hr2_master_assembly_get(), hr2_robot.base_dxf,
+            hr2_robot.romi_wheel_assembly_get()))
+
+    # HR2Robot.mass_properties_report():
+    def mass_properties_report(self) -> str:
+        """Return the mass, center of gravity and inertia report for the HR2 Nucleo assembly.
+
+        Returns:
+            (*str*) Returns the *Scad3D*.*mass_properties_report*() of the
+                Nucleo assembly using the *DENSITIES* table.
+
+        """
+        hr2_robot: HR2Robot = self
+        return hr2_robot.hr2_nucleo_assembly_get().module.mass_properties_report(
+            HR2Robot.DENSITIES)
+
+    # HR2Robot.master_board_get():
+    def master_board_get(self) -> "MasterBoard":
+        """Return the MasterBoard."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("master_board_get", lambda: MasterBoard(
+            hr2_robot.scad_program, hr2_robot.base_dxf, hr2_robot.nucleo144_get(),
+            hr2_robot.pi_offset, hr2_robot.master_board_z, hr2_robot.arm_z,
+            hr2_robot.romi_base_get().keys_get(), hr2_robot.romi_expansion_plate_get().keys_get()))
+
+    # HR2Robot.names_build():
+    def names_build(self, names: List[str]) -> None:
+        """Construct only the parts needed for some registered names.
+
+        Args:
+            *names* (*List*[*str*]): The names (e.g. "romi_base") to build.
+
+        Raises:
+            *ValueError* if a name is not in *HR2Robot*.*NAME_PARTS*.
+
+        """
+        hr2_robot: HR2Robot = self
+        name_parts: Dict[str, str] = HR2Robot.NAME_PARTS
+        name: str
+        for name in names:
+            if name not in name_parts:
+                raise ValueError(f"'{name}' is not one of {sorted(name_parts.keys())}")
+
+        # Visit the *names* in *NAME_PARTS* order, skipping any name that was registered as
+        # a side effect of building an earlier one:
+        scad_program: ScadProgram = hr2_robot.scad_program
+        for name in name_parts.keys():
+            if name in names:
+                named_mark_down: Tuple[str, ...]
+                registered_names: Set[str] = set(
+                    [named_mark_down[0] for named_mark_down
+                     in scad_program.if2d.named_mark_downs + scad_program.if3d.named_mark_downs])
+                if name not in registered_names:
+                    getattr(hr2_robot, name_parts[name])()
+
+    # HR2Robot.nucleo144_get():
+    def nucleo144_get(self) -> "Nucleo144":
+        """Return the Nucleo144."""
+        hr2_robot: HR2Robot = self
+        degrees90: float = pi / 2.0
+        return hr2_robot.part_get("nucleo144_get", lambda: Nucleo144(
+            hr2_robot.scad_program, -degrees90, hr2_robot.nucleo144_offset))
+
+    # HR2Robot.other_pi_get():
+    def other_pi_get(self) -> "OtherPi":
+        """Return the OtherPi."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("other_pi_get", lambda: OtherPi(hr2_robot.scad_program))
+
+    # HR2Robot.part_get():
+    def part_get(self, part_name: str, thunk: Callable[[], Any]) -> Any:
+        """Return a memoized part, calling *thunk* to construct it the first time."""
+        hr2_robot: HR2Robot = self
+        parts_table: Dict[str, Any] = hr2_robot.parts_table
+        if part_name not in parts_table:
+            parts_table[part_name] = thunk()
+        return parts_table[part_name]
+
+    # HR2Robot.raspberry_pi3_get():
+    def raspberry_pi3_get(self) -> "RaspberryPi3":
+        """Return the RaspberryPi3."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("raspberry_pi3_get",
+                                  lambda: RaspberryPi3(hr2_robot.scad_program))
+
+    # HR2Robot.romi_base_get():
+    def romi_base_get(self) -> "RomiBase":
+        """Return the RomiBase."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("romi_base_get", lambda: RomiBase(
+            hr2_robot.scad_program, hr2_robot.base_dxf))
+
+    # HR2Robot.romi_expansion_plate_get():
+    def romi_expansion_plate_get(self) -> "RomiExpansionPlate":
+        """Return the RomiExpansionPlate."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("romi_expansion_plate_get",
+                                  lambda: RomiExpansionPlate(hr2_robot.scad_program))
+
+    # HR2Robot.romi_wheel_assembly_get():
+    def romi_wheel_assembly_get(self) -> "RomiWheelAssembly":
+        """Return the (west) RomiWheelAssembly."""
+        hr2_robot: HR2Robot = self
+        return hr2_robot.part_get("romi_wheel_assembly_get", lambda: RomiWheelAssembly(
+            hr2_robot.scad_program, hr2_robot.base_dxf))
 
 
 # HR2WheelAssembly:
@@ -788,10 +1142,10 @@ class HR2WheelAssembly:
 
     # HR2WheelAssemlby.__init__():
     def __init__(self, scad_program: ScadProgram,
-                 hr2_master_assembly: HR2MasterAssembly, base_dxf: BaseDXF) -> None:
+                 hr2_master_assembly: HR2MasterAssembly, base_dxf: BaseDXF,
+                 west_romi_wheel_assembly: "RomiWheelAssembly") -> None:
         """Initialzie HR2WheelAssembly."""
-        # Create the *west_romi_wheel_assembly* and associated *UseModule3D*:
-        west_romi_wheel_assembly: RomiWheelAssembly = RomiWheelAssembly(scad_program, base_dxf)
+        # Grab the *UseModule3D* for *west_romi_wheel_assembly*:
         west_romi_wheel_assembly_use_module: UseModule3D
         west_romi_wheel_assembly_use_module = west_romi_wheel_assembly.module.use_module_get()
 
@@ -1075,6 +1429,7 @@ class Nucleo144:
 
         # Now create *module*, append it to *scad_program*":
         module: Module3D = Module3D("Nucleo144 Module", [translated_nucleo144])
+        module.bom_part_append("Nucleo-144 Board", {"type": "PCB"})
         scad_program.append(module)
         self.module: Module3D = module
         self.mount_hole_keys: List[Tuple[str, float, float, float]] = mount_hole_keys
@@ -1346,6 +1701,14 @@ class MasterBoard:
                                                insulation_color="Maroon",
                                                vertical_rotate=degrees90, is_top=False)
 
+        # *connector_placements* maps a connector name to its (pin 1 location, rotation in
+        # degrees, "F"/"B" side) placement.  The `rev_a` schematic and `.kicad_pcb` do not have
+        # any connector footprints yet, so these are keyed by name rather than by KiCad
+        # reference.  Once a connector has a footprint, its placement can be copied into
+        # *kicad_placements* (see below) under the real reference:
+        connector_placements: Dict[str, Tuple[P2D, float, str]] = {}
+        connector_placements[receptacle_2x20.name] = receptacle_2x20.kicad_placement_get()
+
         # Create the 4 EncoderBoard 1x4 Female connectors and append the mounting holes
         # to *pcb_polygon*:
         encoder_receptacles_use_modules: List[Scad3D] = []
@@ -1373,6 +1736,8 @@ class MasterBoard:
                                                           insulation_color="Olive",
                                                           vertical_rotate=degrees90)
             encoder_receptacles_use_modules.append(encoder_receptacle_1x3.module.use_module_get())
+            connector_placements[encoder_receptacle_1x3.name] = (
+                encoder_receptacle_1x3.kicad_placement_get())
 
         # *nucleo144_offset* is the offset from the robot origin to the bottom center of
         # the Nucleo144 board.  We use these offsets to place the various holes Nucleo144
@@ -1466,6 +1831,10 @@ class MasterBoard:
                                                       cut_out=True,
                                                       pcb_polygon=pcb_polygon,
                                                       insulation_color="Teal")
+        connector_placements[north_morpho_connector.name] = (
+            north_morpho_connector.kicad_placement_get())
+        connector_placements[south_morpho_connector.name] = (
+            south_morpho_connector.kicad_placement_get())
 
         # Create some HC-SR04 sonars:
         hcsr04: HCSR04 = HCSR04(scad_program)
@@ -1498,7 +1867,8 @@ class MasterBoard:
         beam_angle: float
         on_bottom: bool
         is_srf02: bool
-        for rim_angle, beam_angle, on_bottom in sonar_poses:
+        sonar_index: int
+        for sonar_index, (rim_angle, beam_angle, on_bottom) in enumerate(sonar_poses):
             if beam_angle < 0.0:
                 beam_angle = rim_angle
             angle_text: str = f"{rim_angle * 180.0 / pi}deg:{on_bottom}"
@@ -1531,11 +1901,17 @@ class MasterBoard:
                                           1.27, 8, P2D(pin_x, pin_y))
                 pcb_polygon.append(pin_hole)
 
+                # The first pin is the KiCad placement of the sonar connector:
+                if pin_index == 0:
+                    connector_placements[f"Sonar {degrees(rim_angle):.2f}deg"] = (
+                        P2D(pin_x, pin_y), degrees(pin_angle), "B" if on_bottom else "F")
+
         # This is where we build the *STLink* board and associated connectors.
         # All the work is done inside the *STLink* initializer.
         st_link_offset: P3D = P3D(0.0, -45.0, pcb_bottom_z)
         st_link_connectors: List[Scad3D] = []
-        st_link: STLink = STLink(scad_program, st_link_offset, pcb_polygon, st_link_connectors)
+        st_link: STLink = STLink(scad_program, st_link_offset, pcb_polygon, st_link_connectors,
+                                 connector_placements)
         st_link_use_module: UseModule3D = st_link.module.use_module_get()
         translated_st_link: Scad3D = Translate3D("Translated ST Link",
                                                  st_link_use_module,
@@ -1583,13 +1959,19 @@ class MasterBoard:
         scad_program.append(pcb_polygon_module)
         scad_program.if2d.name_match_append("master_pcb", pcb_polygon_module, ["Master PCB"])
 
-        # Write the *external_polygon* and *kicad_holes* out to *kicad_file_name*:
-        kicad_file_name: str = "../electrical/master_board/rev_a/master_board.kicad_pcb"
-        kicad_pcb: KicadPcb = KicadPcb(kicad_file_name, P2D(100.0, 100.0))
-        kicad_pcb.edge_cuts_remove()
-        kicad_pcb.mounting_holes_update(kicad_mounting_holes)
-        external_polygon.kicad_edge_cuts_append(kicad_pcb)
-        kicad_pcb.save()
+        # *kicad_placements* maps a real KiCad footprint reference to its placement.  For now,
+        # only the mounting holes (H1-H17) have footprints and they all sit unrotated on the front:
+        kicad_placements: Dict[str, Tuple[P2D, float, str]] = {}
+        kicad_mounting_hole: Tuple[P2D, float]
+        for kicad_hole_name, kicad_mounting_hole in kicad_mounting_holes.items():
+            kicad_placements[kicad_hole_name] = (kicad_mounting_hole[0], 0.0, "F")
+
+        # Register the *external_polygon*, *kicad_mounting_holes*, and *kicad_placements* with
+        # *scad_program* so that `master_board.kicad_pcb` can be synchronized later on
+        # (see *KICAD_PCB_FILES*):
+        kicad_board: KicadBoard = KicadBoard("master_board", [external_polygon],
+                                             kicad_mounting_holes, kicad_placements)
+        scad_program.kicad_board_append(kicad_board)
 
         # Create *colored_pcb* from *pcb_polygon* by extrusion and translation:
         extruded_pcb: LinearExtrude = LinearExtrude("Extruded PCB", pcb_polygon, pcb_dz)
@@ -1609,9 +1991,14 @@ class MasterBoard:
                                       receptacle_2x20.module.use_module_get(),
                                       north_morpho_connector.module.use_module_get(),
                                       south_morpho_connector.module.use_module_get()]))
+        module.bom_part_append("HR2 Master Board", {"type": "PCB"})
         scad_program.append(module)
         scad_program.if3d.name_match_append("master_board", module, ["Master Board"])
         self.module: Module3D = module
+        self.kicad_board: KicadBoard = kicad_board
+        self.kicad_mounting_holes: Dict[str, Tuple[P2D, float]] = kicad_mounting_holes
+        self.connector_placements: Dict[str, Tuple[P2D, float, str]] = connector_placements
+        self.kicad_placements: Dict[str, Tuple[P2D, float, str]] = kicad_placements
 
 
 # PiBoard:
@@ -1738,6 +2125,7 @@ class OtherPi(PiBoard):
 
         # Create *module*, append it to *scad_program*, and save it into *other_pi* (i.e. *self*):
         module: Module3D = Module3D("Other Pi Module", [translate_other_pi])
+        module.bom_part_append("Other Pi Board", {"type": "PCB"})
         scad_program.append(module)
         scad_program.if3d.name_match_append("other_pi", module, ["OtherPI SBC"])
         super().__init__(module)
@@ -1871,6 +2259,7 @@ class RaspberryPi3(PiBoard):
                                                           -(3.5 + 49.0/2.0), 1.000))
         # Create *module*, append it to *scad_program* and save it into *raspi3b* (i.e. *self*):
         module: Module3D = Module3D("RasPi3B_Module", [translated_raspi3b])
+        module.bom_part_append("Raspberry Pi 3B+", {"type": "PCB"})
         scad_program.if3d.name_match_append("raspi3", module, ["Raspberry Pi 3B+"])
         scad_program.append(module)
 
@@ -1917,7 +2306,7 @@ class RectangularConnector:
     # RectangularConnector.__init__():
     def __init__(self, scad_program: ScadProgram, name: str, rows: int, columns: int,
                  insulation_height: float, pcb_pin_height: float, male_pin_height: float = 0.0,
-                 center: P3D = P3D(0.0, 0.0, 0.0),
+                 center: Optional[P3D] = None,
                  rows_pitch: float = 2.54, columns_pitch: float = 2.54,
                  is_top: bool = True,
                  vertical_rotate: float = 0.0,
@@ -1953,7 +2342,7 @@ class RectangularConnector:
                 (Optional: Defaults to 0.0)
                 The pin distance above the insulation for male headers.
                 Set to 0.0 to get a female receptacle.
-            *center* (*P3D*):
+            *center* (*Optional*[*P3D*]):
                 (Optional: Defaults to *P3D(0.0, 0.0, 0.0))  The final location to tranlsate the
                 connector to.
             *rows_pitch* (*float*):
@@ -2003,6 +2392,10 @@ class RectangularConnector:
                 Sets the color of the pin.
 
         """
+        # Fill in the default *center*:
+        if center is None:
+            center = P3D(0.0, 0.0, 0.0)
+
         # Stuff all of the values into *pin_header* (i.e. *self*):
         # pin_header: RectangularConnector = self
         self.name: str = name
@@ -2221,9 +2614,55 @@ class RectangularConnector:
 
         # Construct *module*, append to *scad_program*:
         module: Module3D = Module3D(f"{full_name} Module", [recentered_connector])
+        # Every physically distinguishing dimension goes into the part name, so that different
+        # headers are never counted together:
+        part: str = (f"{rows}x{columns} {rows_pitch:.2f}x{columns_pitch:.2f}mm "
+                     f"{'Male Header' if male_pin_height > 0.0 else 'Female Receptacle'} "
+                     f"{insulation_height:.2f}mm")
+        part += f" Pin {male_pin_height:.2f}mm" if male_pin_height > 0.0 else ""
+        part += f" PCB Pin {pcb_pin_height:.2f}mm"
+        part += f" Right Angle {right_angle_length:.2f}mm" if right_angle_length != 0.0 else ""
+        part += (f" Extra {rows_extra_insulation:.2f}x{columns_extra_insulation:.2f}mm"
+                 if rows_extra_insulation != 0.0 or columns_extra_insulation != 0.0 else "")
+        module.bom_part_append(part, {
+            "type": "Connector",
+            "rows": rows,
+            "columns": columns,
+            "rows_pitch": round(rows_pitch, 3),
+            "columns_pitch": round(columns_pitch, 3),
+            "insulation_height": round(insulation_height, 3),
+            "male_pin_height": round(male_pin_height, 3),
+            "pcb_pin_height": round(pcb_pin_height, 3),
+            "right_angle_length": round(right_angle_length, 3),
+            "rows_extra_insulation": round(rows_extra_insulation, 3),
+            "columns_extra_insulation": round(columns_extra_insulation, 3)})
         scad_program.append(module)
         self.module: Module3D = module
 
+        # Remember where pin 1 (the first column of the first row) lands on the PCB, since
+        # that is the origin of the standard KiCad pin header and socket footprints:
+        cos_vertical_rotate: float = cos(vertical_rotate)
+        sin_vertical_rotate: float = sin(vertical_rotate)
+        self.pin1_center: P2D = P2D(
+            center_x + column_start_x * cos_vertical_rotate - row_start_y * sin_vertical_rotate,
+            center_y + column_start_x * sin_vertical_rotate + row_start_y * cos_vertical_rotate)
+
+    # RectangularConnector.kicad_placement_get():
+    def kicad_placement_get(self) -> Tuple[P2D, float, str]:
+        """Return the KiCad footprint placement of a RectangularConnector.
+
+        Returns:
+            (*Tuple*[*P2D*, *float*, *str*]) Returns the pin 1 location,
+                the rotation in degrees, and the side ("F" or "B").
+
+        """
+        # Grab some values from *rectangular_connector* (i.e. *self*):
+        rectangular_connector: RectangularConnector = self
+        pin1_center: P2D = rectangular_connector.pin1_center
+        rotation: float = degrees(rectangular_connector.vertical_rotate)
+        side: str = "F" if rectangular_connector.is_top else "B"
+        return (pin1_center, rotation, side)
+
 
 # RomiBase:
 class RomiBase:
@@ -2275,6 +2714,7 @@ class RomiBase:
 
         # Create *module*, append to *scad_program* and save into *romi_base* (i.e. *self*):
         module: Module3D = Module3D("Romi Base Module", [blue_romi_base])
+        module.bom_part_append("Romi Chassis Base", {"type": "Mechanical"})
         scad_program.append(module)
         # romi_base: RomiBase = self
         self.module: Module3D = module
@@ -3413,6 +3853,7 @@ class RomiExpansionPlate:
                                                                 romi_expansion_polygon, plate_dz)
         # Stuff *module* into *scad_program* and *romi_expansion_plate* (i.e. *self*):
         module: Module3D = Module3D("Romi Expansion Plate", [extruded_expansion_plate])
+        module.bom_part_append("Romi Chassis Expansion Plate", {"type": "Mechanical"})
         scad_program.append(module)
         # romi_expansion_plate: RomiExpansionPlate = self
         self.polygon: Polygon = romi_expansion_polygon
@@ -3860,6 +4301,7 @@ class RomiMagnet:
 
         # Create *module*, append it to *scad_program*  and save into *RomiMagnet* (i.e. *self*):
         module: Module3D = Module3D("Magnet Module", [colored_magnet])
+        module.bom_part_append("Romi Encoder Magnet", {"type": "Mechanical"})
         scad_program.append(module)
         self.module: Module3D = module
 
@@ -4004,6 +4446,7 @@ class RomiMotor:
 
         # Create *module*, append to *scad_program,  and save into *romi_motor* (i.e. *self*):
         module: Module3D = Module3D("Romi Motor Module", [union])
+        module.bom_part_append("Romi Mini Plastic Gearmotor", {"type": "Motor"})
         scad_program.append(module)
         # romi_motor: RomiMotor = self
         self.module: Module3D = module
@@ -4144,6 +4587,7 @@ class RomiMotorHolder:
         # *romi_motor_holder* (i.e. *self*):
         module: Module3D = Module3D("Romi Motor Holder Module",
                                     [Color("Blue Color", holder_union, "RoyalBlue")])
+        module.bom_part_append("Romi Motor Holder", {"type": "Mechanical"})
         scad_program.append(module)
         # romi_motor_holder: RomiMotorHolder = self
         self.module: Module3D = module
@@ -4189,10 +4633,10 @@ class Spacer:
     # Spacer.__init__():
     def __init__(self, scad_program: ScadProgram, name: str, height: float, screw_class: str,
                  diameter: float = 0.0, is_hex: bool = False,
-                 bottom_center: P3D = P3D(0.0, 0.0, 0.0),
+                 bottom_center: Optional[P3D] = None,
                  bottom_height: float = 0.0, top_height: float = 0.0, color: str = "GoldenRod",
-                 bottom_washers: List[Tuple[float, float, str]] = [],
-                 top_washers: List[Tuple[float, float, str]] = []) -> None:
+                 bottom_washers: Optional[List[Tuple[float, float, str]]] = None,
+                 top_washers: Optional[List[Tuple[float, float, str]]] = None) -> None:
         """Generate a spacer with optional washers.
 
         All length measurements are in millimeters:
@@ -4218,7 +4662,7 @@ class Spacer:
                 (Optional: Defaults to *False*.):
                 If *True*, the *Diameter* is the width of a hex spacer;
                 otherwise the spacer is round.
-            *bottom_center*: (*P3D*):
+            *bottom_center*: (*Optional*[*P3D*]):
                 (Optional: Defualts to *P3D*(0.0, 0.0, 0.0))
             *bottom_height* (*float*):
                 (Optional: Defaults to 0.0 which means no male thread.)
@@ -4228,7 +4672,8 @@ class Spacer:
                 The top male thread extrusion.
             *color*: (*str*):
                 (Optional: Defaults to "GoldenRod" (i.e. Brass.))
-            *bottom_washers* (*List*[*Tuple*[*float*, *float*, *str*]]):
+            *bottom_washers* (*Optional*[*List*[*Tuple*[*float*, *float*, *str*]]]):
+                (Optional: Defaults to an empty list.)
                 The list of bottom washers to put below the spacer.
                 Each washer is specifed as a Tuple of the form:
                         (height, width, "color")
@@ -4236,10 +4681,19 @@ class Spacer:
                 "width" is the width in millimeters, and the "color" is
                 a valid color.  If no *color* is "", "Silver" is used
                 as a default color.
-            *top_washers* (*List*[*Tuple*[*float*, *float*, *str*]]):
+            *top_washers* (*Optional*[*List*[*Tuple*[*float*, *float*, *str*]]]):
+                (Optional: Defaults to an empty list.)
                 Same as *bottom_washers*, but puts the washers on top.
 
         """
+        # Fill in the defaults for the optional arguments:
+        if bottom_center is None:
+            bottom_center = P3D(0.0, 0.0, 0.0)
+        if bottom_washers is None:
+            bottom_washers = []
+        if top_washers is None:
+            top_washers = []
+
         # Verify argument sanity:
         screw_classes: Tuple[str, ...] = ("M2", "M2.5", "M3")
         assert name != "", "name is empty"
@@ -4345,6 +4799,22 @@ class Spacer:
         scad_program.append(module)
         self.module: Module3D = module
 
+        # Record the spacer and its washers in the bill of materials:
+        threads: str = (("M" if bottom_height > 0.0 else "F") + "-" +
+                        ("M" if top_height > 0.0 else "F"))
+        module.bom_part_append(f"{screw_class} {threads} {'Hex' if is_hex else 'Round'} "
+                               f"Spacer {height:.2f}mm", {
+                                   "type": "Spacer",
+                                   "screw_class": screw_class,
+                                   "height": round(height, 3),
+                                   "is_hex": is_hex})
+        for washer in bottom_washers + top_washers:
+            module.bom_part_append(f"{screw_class} Washer {washer[1]:.2f}x{washer[0]:.2f}mm", {
+                "type": "Washer",
+                "screw_class": screw_class,
+                "height": round(washer[0], 3),
+                "diameter": round(washer[1], 3)})
+
     def washer_append(self, name: str, washer: Tuple[float, float, str], inside_diameter: float,
                       start_z: float, spacer_stack: List[Scad3D]) -> float:
         """Construct one washer."""
@@ -4374,8 +4844,19 @@ class STLink:
     """Represents the STLink portion of a Nucleo144."""
 
     def __init__(self, scad_program: ScadProgram, center: P3D,
-                 master_board_polygon: Polygon, master_board_connectors: List[Scad3D]) -> None:
-        """Initialize the STLink object."""
+                 master_board_polygon: Polygon, master_board_connectors: List[Scad3D],
+                 connector_placements: Optional[Dict[str, Tuple[P2D, float, str]]] = None
+                 ) -> None:
+        """Initialize the STLink object.
+
+        Args:
+            *connector_placements*
+                (*Optional*[*Dict*[*str*, *Tuple*[*P2D*, *float*, *str*]]]):
+                (Optional: Defaults to *None*.)  When present, the
+                placements of the master board connectors are stored into
+                it keyed by connector name.
+
+        """
         # The mechanical drawing in the Nucleo144 User Manual does not give very much dimensional
         # information.  So much of the numbers below are measured with calipers:
         # stlink: STLink = self
@@ -4556,6 +5037,14 @@ class STLink:
                                                 vertical_rotate=-degrees90)  # Pin 1 on top
         master_board_connectors.append(mb_cn3_connector.module.use_module_get())
 
+        # Record the placements of the master board connectors:
+        if connector_placements is not None:
+            mb_connector: RectangularConnector
+            for mb_connector in (mb_cn2_connector, mb_cn3_connector, mb_cn4_connector,
+                                 mb_cn5_connector, mb_cn6_connector, mb_jp1_connector,
+                                 mb_jp2_connector):
+                connector_placements[mb_connector.name] = mb_connector.kicad_placement_get()
+
         st_connectors: List[Scad3D] = [
             st_cn2_connector.module.use_module_get(),
             st_cn6_connector.module.use_module_get(),
@@ -4622,14 +5111,100 @@ class SRF02:
 
         # Create *module*, append to *scad_program*, and save into *srf02* (i.e. *self*):
         module: Module3D = Module3D("SRF02 Sonar Module", [east_facing_srf02])
+        module.bom_part_append("SRF02 Sonar", {"type": "Sensor"})
         scad_program.append(module)
         scad_program.if3d.name_match_append("sonar", module, ["SRF02 Sonar"])
         # srf02: SRF02 = self
         self.module: Module3D = module
 
 
-def main() -> int:  # pragma: no cover
-    """Generate the openscand file."""
+# *KICAD_PCB_FILES* maps a *KicadBoard* name to its `.kicad_pcb` file (relative to the
+# `mechanical` directory.)  The encoder, ST-Link and OtherPi boards do not have KiCad
+# projects yet, so they are not listed:
+KICAD_PCB_FILES: Dict[str, str] = {
+    "master_board": "../electrical/master_board/rev_a/master_board.kicad_pcb",
+}
+
+# *KICAD_SCH_FILES* maps a *KicadBoard* name to its root `.sch` file.  The schematic is
+# cross checked against the model before the `.kicad_pcb` file is synchronized:
+KICAD_SCH_FILES: Dict[str, str] = {
+    "master_board": "../electrical/master_board/rev_a/master_board.sch",
+}
+
+
+# hr2_robot_build():
+def hr2_robot_build(names: Optional[List[str]] = None, default_name: str = "hr_robot",
+                    parameters: Optional[Dict[str, float]] = None) -> HR2Robot:
+    """Build and return the HR2Robot along with its top level ScadProgram.
+
+    Args:
+        *names* (*Optional*[*List*[*str*]]):
+            (Optional: Defaults to *None*.)  When *None*, the entire robot
+            is built; otherwise, only the parts needed for *names* are built.
+        *default_name* (*str*):
+            (Optional: Defaults to "hr_robot".)  The default value of the
+            OpenSCAD *name* variable.
+        *parameters* (*Optional*[*Dict*[*str*, *float*]]):
+            (Optional: Defaults to *None*.)  Overrides for some of the
+            *HR2Robot*.*PARAMETER_DEFAULTS*.
+
+    """
+    # Create the top level *scad_program* program that we will stuff everything into:
+    scad_program: ScadProgram = ScadProgram("Scad models")
+
+    # Define the default value for the *name* OpenSCAD variable.  The *name* variable
+    # can be set from the command line as shown below:
+    #
+    #     openscad -D 'name="VALID_NAME"' hr2_models.scad
+    #
+    # The list of *VALID_NAME*'s can be found near the bottom of `README.md`.
+    scad_program.append(Variable2D("Name", "name", f'"{default_name}"'))
+
+    hr2_robot: HR2Robot = HR2Robot(scad_program, names, parameters)
+    return hr2_robot
+
+
+# hr2_scad_program_build():
+def hr2_scad_program_build(names: Optional[List[str]] = None,
+                           default_name: str = "hr_robot") -> ScadProgram:
+    """Build and return the top level ScadProgram for the HR2 robot.
+
+    Args:
+        *names* (*Optional*[*List*[*str*]]):
+            (Optional: Defaults to *None*.)  When *None*, the entire robot
+            is built; otherwise, only the parts needed for *names* are built.
+        *default_name* (*str*):
+            (Optional: Defaults to "hr_robot".)  The default value of the
+            OpenSCAD *name* variable.
+
+    """
+    return hr2_robot_build(names, default_name).scad_program
+
+
+def main(arguments: Optional[List[str]] = None) -> int:  # pragma: no cover
+    """Generate the openscand file.
+
+    Args:
+        *arguments* (*Optional*[*List*[*str*]]):
+            (Optional: Defaults to *sys.argv*[1:].)  The command line
+            arguments.  Any schematic mismatch fails the KiCad sync of its
+            board before its PCB is written, unless `--no-strict` is given
+            to only report the mismatches.  `hr2_models.scad` and the
+            `hr2_models.cache` file go into the `--output-directory`.
+
+    Returns:
+        (*int*) Returns 0 for success and 1 if any KiCad board failed to sync.
+
+    """
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Generate `hr2_models.scad` and synchronize the KiCad boards.")
+    argument_parser.add_argument("--no-strict", action="store_false", dest="strict",
+                                 help="only report schematic mismatches instead of failing "
+                                 "the board (its PCB is then written anyway)")
+    argument_parser.add_argument("-o", "--output-directory", default=".",
+                                 help="The directory to write `hr2_models.scad` and "
+                                 "`hr2_models.cache` into (default: .)")
+    parsed_arguments: argparse.Namespace = argument_parser.parse_args(arguments)
     print("hr2_models.main() called")
     # scad_file: IO[Any]
     # with open("romi_base_dxf.scad", "w") as scad_file:
@@ -4641,16 +5216,24 @@ def main() -> int:  # pragma: no cover
     # with open("romi_base.scad", "w") as scad_file:
     #     union.scad_file_write(scad_file)
 
-    # Create the top level *scad_program* program that we will stuff everything into:
-    scad_program: ScadProgram = ScadProgram("Scad models")
-
-    # Define the default value for the *name* OpenSCAD variable.  The *name* variable
-    # can be set from the command line as shown below:
-    #
-    #     openscad -D 'name="VALID_NAME"' hr2_models.scad
-    #
-    # The list of *VALID_NAME*'s can be found near the bottom of `README.md`.
-    scad_program.append(Variable2D("Name", "name", '"hr_robot"'))
+    # Reuse the previously built *scad_program* from `hr2_models.cache` when neither the
+    # `scad_models` sources nor the KiCad files that *main*() reads have changed since it was
+    # written.  The cached program carries its *KicadBoard*'s, so the KiCad sync below works
+    # either way.  The cache lives next to `hr2_models.scad` in *output_directory*:
+    output_directory: str = parsed_arguments.output_directory
+    os.makedirs(output_directory, exist_ok=True)
+    cache_file_name: str = os.path.join(output_directory, "hr2_models.cache")
+    input_file_names: List[str] = (sorted(KICAD_PCB_FILES.values()) +
+                                   sorted(KICAD_SCH_FILES.values()))
+    sources_hash: str = ScadProgram.sources_hash_get(input_file_names=input_file_names)
+    cached_scad_program: Optional[ScadProgram] = ScadProgram.cache_load(cache_file_name,
+                                                                        sources_hash)
+    scad_program: ScadProgram
+    if cached_scad_program is not None:
+        scad_program = cached_scad_program
+    else:
+        scad_program = hr2_scad_program_build()
+        scad_program.cache_save(cache_file_name, sources_hash)
 
     # romi_base: RomiBase = RomiBase(scad_program, base_dxf)
     # romi_base.holes_slots_rectangles_write()
@@ -4675,30 +5258,34 @@ def main() -> int:  # pragma: no cover
     #                master_board, other_pi, pi_offset)
     # hr2 = hr2
 
-    hr2_robot: HR2Robot = HR2Robot(scad_program)
-    hr2_robot = hr2_robot
-
     # Generate `hr2_models.scad`:
     scad_lines: List[str] = []
     scad_program.scad_lines_append(scad_lines, "")
     scad_lines.append("")
     scad_text: str = '\n'.join(scad_lines)
     scad_file: IO[Any]
-    with open("hr2_models.scad", "w") as scad_file:
+    with open(os.path.join(output_directory, "hr2_models.scad"), "w") as scad_file:
         scad_file.write(scad_text)
 
-    # Update the `README.md` file:
-    read_me_text: str = ""
-    read_me_file: IO[Any]
-    with open("README.md") as read_me_file:
-        read_me_text = read_me_file.read()
-    updated_read_me_text: str = scad_program.read_me_update(read_me_text)
-    if read_me_text != updated_read_me_text:
-        with open("README.md", "w") as read_me_file:
-            read_me_file.write(updated_read_me_text)
-
-    return 0
+    # Update the generated regions of the `README.md` file (it is only rewritten if a region
+    # changed):
+    read_me: MarkedDocument = MarkedDocument.file_read("README.md")
+    read_me.regions_update({"NAME list": scad_program.name_list_lines_get()})
+    read_me.save()
+
+    # Synchronize all of the registered `.kicad_pcb` files concurrently.  Each board is verified
+    # against its schematic first and a board that does not match is not written (and the exit
+    # code is 1) unless `--no-strict` is given:
+    exit_code: int
+    kicad_report: List[str]
+    exit_code, kicad_report = KicadBoard.boards_sync(scad_program.kicad_boards, KICAD_PCB_FILES,
+                                                     kicad_sch_files=KICAD_SCH_FILES,
+                                                     strict=parsed_arguments.strict)
+    kicad_report_line: str
+    for kicad_report_line in kicad_report:
+        print(kicad_report_line)
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
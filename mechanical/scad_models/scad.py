@@ -6,9 +6,21 @@ This module provides a Python interface to OpenSCAD.
 
 The basic class tree is:
 
+* Affine3D: A 3-dimensional rotation and translation transform.
+* BillOfMaterials: The memoized part counts of Module3D's.
+* BoundingBox3D: The world space bounding box of a Scad3D primitive.
+* BoundingVolumeHierarchy: A tree of BoundingBox3D's for finding interferences and clearances.
+* MassProperties: The mass, center of gravity and inertia of some Scad3D primitives.
+* NameRegistry: An interned index of the names of Scad objects.
+* KicadBoard: The outline, holes, and placements that a model computes for a PCB.
+* KicadPcb: A KiCad `.kicad_pcb` file that can be edited in place.
+* KicadSchematic: A legacy KiCad `.sch` hierarchy indexed by reference designator.
+* MarkedDocument: A text document with generated regions between marker comments.
 * P: Generic point
   * P2D: 2-dimensional Point
   * P3D: 3-dimensional Point
+* SExpression: A lossless S-expression tree (used by KicadPcb.)
+* ScadSnapshot: A normalized and hashed per module snapshot of a ScadProgram.
 * Scad: Basic Scad Command
   * Scad: A generic OpenScad command
     * ScadProgram: A top level OpenSCAD program.
@@ -52,8 +64,29 @@ The basic class tree is:
 # <----------------------------------------100 Characters----------------------------------------> #
 
 # Import stuff from other libraries:
-from math import acos, ceil, cos, degrees, pi, sin, sqrt
-from typing import Any, Callable, Dict, IO, List, Optional, Set, Tuple
+from array import array
+import base64
+import collections
+from concurrent.futures import Future, ProcessPoolExecutor
+import csv
+from decimal import Decimal
+import difflib
+import fnmatch
+import hashlib
+import heapq
+import html
+import io
+import json
+from math import acos, atan2, ceil, cos, degrees, pi, sin, sqrt, tan
+import os
+import pickle
+import re
+import struct
+import sys
+import time
+from typing import (Any, Callable, Deque, Dict, FrozenSet, IO, List, Match, Optional, Pattern,
+                    Set, Tuple, Union)
+import zlib
 
 
 # P3D:
@@ -261,138 +294,2486 @@ class P2D:
         return P2D(-p2d.x, p2d.y)
 
 
-# KicadPCB:
+# Affine3D:
+class Affine3D:
+    """Represents a 3 dimensional affine transform (rotation followed by translation)."""
+
+    # Affine3D.__init__():
+    def __init__(self, values: Tuple[float, ...] = (1.0, 0.0, 0.0, 0.0,
+                                                    0.0, 1.0, 0.0, 0.0,
+                                                    0.0, 0.0, 1.0, 0.0)) -> None:
+        """Initialize an Affine3D.
+
+        Args:
+            *values* (*Tuple*[*float*, ...]):
+                (Optional: Defaults to the identity transform.)
+                The 12 values of the top 3 rows of a 4x4 affine matrix
+                in row major order.  The bottom row is always
+                [0, 0, 0, 1] and is not stored.
+
+        """
+        assert len(values) == 12, f"Affine3D needs 12 values, not {len(values)}"
+        # Load *values* into *affine3d* (i.e. *self*):
+        # affine3d: Affine3D = self
+        self.values: Tuple[float, ...] = values
+
+    # Affine3D.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of an Affine3D."""
+        # Grab some values from *affine3d* (i.e. *self*):
+        affine3d: Affine3D = self
+        values: Tuple[float, ...] = affine3d.values
+        value: float
+        values_text: str = ",".join(["{0:.3f}".format(value) for value in values])
+        return f"Affine3D({values_text})"
+
+    # Affine3D.compose():
+    def compose(self, inner: "Affine3D") -> "Affine3D":
+        """Return the transform that applies *inner* first and then *self*."""
+        # Grab the matrix values from *outer* (i.e. *self*) and *inner*:
+        outer: Affine3D = self
+        a: Tuple[float, ...] = outer.values
+        b: Tuple[float, ...] = inner.values
+
+        # Perform the 4x4 matrix multiply, skipping the implied bottom row of [0, 0, 0, 1]:
+        values: List[float] = []
+        row: int
+        for row in range(3):
+            a0: float = a[row * 4]
+            a1: float = a[row * 4 + 1]
+            a2: float = a[row * 4 + 2]
+            a3: float = a[row * 4 + 3]
+            values.append(a0 * b[0] + a1 * b[4] + a2 * b[8])
+            values.append(a0 * b[1] + a1 * b[5] + a2 * b[9])
+            values.append(a0 * b[2] + a1 * b[6] + a2 * b[10])
+            values.append(a0 * b[3] + a1 * b[7] + a2 * b[11] + a3)
+        return Affine3D(tuple(values))
+
+    # Affine3D.point_transform():
+    def point_transform(self, point: P3D) -> P3D:
+        """Return *point* transformed by an Affine3D."""
+        # Grab the matrix values from *affine3d* (i.e. *self*):
+        affine3d: Affine3D = self
+        m: Tuple[float, ...] = affine3d.values
+        x: float = point.x
+        y: float = point.y
+        z: float = point.z
+        return P3D(m[0] * x + m[1] * y + m[2] * z + m[3],
+                   m[4] * x + m[5] * y + m[6] * z + m[7],
+                   m[8] * x + m[9] * y + m[10] * z + m[11])
+
+    # Affine3D.rotate_get():
+    @staticmethod
+    def rotate_get(angle: float, axis: P3D) -> "Affine3D":
+        """Return an Affine3D that rotates by *angle* radians around *axis*."""
+        # Normalize *axis* into the unit vector (*kx*, *ky*, *kz*):
+        length: float = axis.length()
+        assert length > 0.0, "Rotate axis has no direction."
+        kx: float = axis.x / length
+        ky: float = axis.y / length
+        kz: float = axis.z / length
+
+        # Use the Rodrigues rotation formula
+        # (https://en.wikipedia.org/wiki/Rodrigues%27_rotation_formula):
+        #
+        #     R = cos(angle) * I + sin(angle) * [k]x + (1 - cos(angle)) * (k * k^T)
+        c: float = cos(angle)
+        s: float = sin(angle)
+        t: float = 1.0 - c
+        return Affine3D((c + t * kx * kx, t * kx * ky - s * kz, t * kx * kz + s * ky, 0.0,
+                         t * kx * ky + s * kz, c + t * ky * ky, t * ky * kz - s * kx, 0.0,
+                         t * kx * kz - s * ky, t * ky * kz + s * kx, c + t * kz * kz, 0.0))
+
+    # Affine3D.translate_get():
+    @staticmethod
+    def translate_get(offset: P3D) -> "Affine3D":
+        """Return an Affine3D that translates by *offset*."""
+        return Affine3D((1.0, 0.0, 0.0, offset.x,
+                         0.0, 1.0, 0.0, offset.y,
+                         0.0, 0.0, 1.0, offset.z))
+
+
+# BillOfMaterials:
+class BillOfMaterials:
+    """Represents a bill of materials for some Module3D's.
+
+    Each part is registered with the *Module3D* that models it via
+    *Module3D*.*bom_part_append*().  The part counts of each *Module3D*
+    are computed once and memoized by module name, so a module that is
+    used in many places (e.g. via several *UseModule3D*'s) is traversed
+    only once and its counts are added in once per use.  A single
+    BillOfMaterials can be shared by several assemblies, so that the
+    modules they have in common are only counted once.
+    """
+
+    # BillOfMaterials.__init__():
+    def __init__(self) -> None:
+        """Initialize an empty BillOfMaterials."""
+        # Load values into *bill_of_materials* (i.e. *self*):
+        # bill_of_materials: BillOfMaterials = self
+        self.module_counts: Dict[str, Dict[str, int]] = {}
+        self.part_attributes: Dict[str, Dict[str, Any]] = {}
+
+    # BillOfMaterials.counts_get():
+    def counts_get(self, module3d: "Module3D") -> Dict[str, int]:
+        """Return the part counts for one instance of a Module3D.
+
+        Args:
+            *module3d* (*Module3D*): The *Module3D* to count the parts of.
+
+        Returns:
+            (*Dict*[*str*, *int*]) Returns a table of part name to count.
+                The table is memoized and must not be modified.
+
+        """
+        bill_of_materials: BillOfMaterials = self
+        module_counts: Dict[str, Dict[str, int]] = bill_of_materials.module_counts
+        name: str = module3d.name
+        if name not in module_counts:
+            counts: Dict[str, int] = {}
+            part: str
+            attributes: Dict[str, Any]
+            quantity: int
+            part_attributes: Dict[str, Dict[str, Any]] = bill_of_materials.part_attributes
+            for part, attributes, quantity in module3d.bom_parts:
+                counts[part] = counts.get(part, 0) + quantity
+                # A part name must always describe the same physical part:
+                assert part_attributes.setdefault(part, attributes) == attributes, (
+                    f"Part '{part}' attributes {attributes} do not match "
+                    f"{part_attributes[part]}")
+            scad3d: Scad3D
+            for scad3d in module3d.scad3ds:
+                scad3d.bom_counts_append(bill_of_materials, counts)
+            module_counts[name] = counts
+        return module_counts[name]
+
+    # BillOfMaterials.csv_get():
+    def csv_get(self, module3d: "Module3D") -> str:
+        """Return the bill of materials for a Module3D as CSV text.
+
+        The columns are the part name, the quantity and then each of the
+        part attribute names in alphabetical order.
+        """
+        bill_of_materials: BillOfMaterials = self
+        rows: List[Dict[str, Any]] = bill_of_materials.rows_get(module3d)
+        row: Dict[str, Any]
+        attribute_names: Set[str] = set()
+        for row in rows:
+            attribute_names |= set(row.keys())
+        attribute_names -= {"part", "quantity"}
+        csv_file: io.StringIO = io.StringIO()
+        csv_writer: Any = csv.DictWriter(csv_file, ["part", "quantity"] + sorted(attribute_names),
+                                         lineterminator="\n")
+        csv_writer.writeheader()
+        csv_writer.writerows(rows)
+        return csv_file.getvalue()
+
+    # BillOfMaterials.json_get():
+    def json_get(self, module3d: "Module3D") -> str:
+        """Return the bill of materials for a Module3D as JSON text."""
+        bill_of_materials: BillOfMaterials = self
+        return json.dumps({"assembly": module3d.name,
+                           "parts": bill_of_materials.rows_get(module3d)}, indent=2) + "\n"
+
+    # BillOfMaterials.rows_get():
+    def rows_get(self, module3d: "Module3D") -> List[Dict[str, Any]]:
+        """Return the bill of materials rows for a Module3D sorted by part name.
+
+        Each row is a table with the "part" name, the "quantity" and the
+        part attributes.
+        """
+        bill_of_materials: BillOfMaterials = self
+        counts: Dict[str, int] = bill_of_materials.counts_get(module3d)
+        part_attributes: Dict[str, Dict[str, Any]] = bill_of_materials.part_attributes
+        part: str
+        rows: List[Dict[str, Any]] = []
+        for part in sorted(counts.keys()):
+            row: Dict[str, Any] = {"part": part, "quantity": counts[part]}
+            row.update(part_attributes[part])
+            rows.append(row)
+        return rows
+
+
+# BoundingBox3D:
+class BoundingBox3D:
+    """Represents the world space axis aligned bounding box of a Scad3D primitive.
+
+    Each box remembers the *name* of its primitive and the *module_name*
+    of the innermost *Module3D* that contains it.  A primitive that is the
+    root of a *Difference3D* also remembers the boxes of the subtracted
+    *holes*, so that a part passing through a cut-out is not reported as
+    an interference.
+    """
+
+    # BoundingBox3D.__init__():
+    def __init__(self, name: str, lower: P3D, upper: P3D, module_name: str = "",
+                 holes: "Optional[List[BoundingBox3D]]" = None) -> None:
+        """Initialize a BoundingBox3D.
+
+        Args:
+            *name* (*str*): The name of the primitive that is bounded.
+            *lower* (*P3D*): The corner with the smallest X, Y and Z.
+            *upper* (*P3D*): The corner with the largest X, Y and Z.
+            *module_name* (*str*):
+                (Optional: Defaults to "".)  The name of the innermost
+                *Module3D* that contains the primitive.
+            *holes* (*Optional*[*List*[*BoundingBox3D*]]):
+                (Optional: Defaults to an empty list.)  The boxes of the
+                *Difference3D* subtractions that cut into the primitive.
+
+        """
+        # Load values into *bounding_box3d* (i.e. *self*):
+        # bounding_box3d: BoundingBox3D = self
+        self.holes: List[BoundingBox3D] = [] if holes is None else holes
+        self.lower: P3D = lower
+        self.module_name: str = module_name
+        self.name: str = name
+        self.upper: P3D = upper
+
+    # BoundingBox3D.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of a BoundingBox3D."""
+        bounding_box3d: BoundingBox3D = self
+        name: str = bounding_box3d.name
+        lower: P3D = bounding_box3d.lower
+        upper: P3D = bounding_box3d.upper
+        return f"BoundingBox3D('{name}',{lower},{upper})"
+
+    # BoundingBox3D.clearance_get():
+    def clearance_get(self, other: "BoundingBox3D") -> float:
+        """Return the clearance between two BoundingBox3D's.
+
+        Args:
+            *other* (*BoundingBox3D*): The other box.
+
+        Returns:
+            (*float*) Returns the straight line distance between the two
+                boxes.  When the boxes overlap entirely inside of a hole
+                (e.g. a pin passing through a mounting hole), the smallest
+                margin between the overlap and the hole walls is returned
+                instead.  Axes that the hole passes all the way through
+                are ignored.  Otherwise overlapping boxes return 0.0.
+
+        """
+        bounding_box3d: BoundingBox3D = self
+        distance: float = bounding_box3d.distance_get(other)
+        if distance <= 0.0 and bounding_box3d.hole_clears(other):
+            # Find the overlap between the two boxes:
+            overlap_lower: P3D = P3D(max(bounding_box3d.lower.x, other.lower.x),
+                                     max(bounding_box3d.lower.y, other.lower.y),
+                                     max(bounding_box3d.lower.z, other.lower.z))
+            overlap_upper: P3D = P3D(min(bounding_box3d.upper.x, other.upper.x),
+                                     min(bounding_box3d.upper.y, other.upper.y),
+                                     min(bounding_box3d.upper.z, other.upper.z))
+
+            # Find the best margin of the holes that contain the overlap:
+            epsilon: float = BoundingVolumeHierarchy.EPSILON
+            best_margin: float = 0.0
+            host: BoundingBox3D
+            hole: BoundingBox3D
+            for host in (bounding_box3d, other):
+                for hole in host.holes:
+                    margins: List[float] = []
+                    axis: int
+                    for axis in range(3):
+                        host_lower: float = host.lower.x if axis == 0 else (
+                            host.lower.y if axis == 1 else host.lower.z)
+                        host_upper: float = host.upper.x if axis == 0 else (
+                            host.upper.y if axis == 1 else host.upper.z)
+                        hole_lower: float = hole.lower.x if axis == 0 else (
+                            hole.lower.y if axis == 1 else hole.lower.z)
+                        hole_upper: float = hole.upper.x if axis == 0 else (
+                            hole.upper.y if axis == 1 else hole.upper.z)
+                        lower: float = overlap_lower.x if axis == 0 else (
+                            overlap_lower.y if axis == 1 else overlap_lower.z)
+                        upper: float = overlap_upper.x if axis == 0 else (
+                            overlap_upper.y if axis == 1 else overlap_upper.z)
+                        if not (hole_lower <= host_lower + epsilon and
+                                hole_upper >= host_upper - epsilon):
+                            margins.append(min(lower - hole_lower, hole_upper - upper))
+                    if margins and min(margins) >= 0.0:
+                        best_margin = max(best_margin, min(margins))
+            distance = best_margin
+        return max(distance, 0.0)
+
+    # BoundingBox3D.distance_get():
+    def distance_get(self, other: "BoundingBox3D") -> float:
+        """Return the straight line distance between two BoundingBox3D's (0.0 if they touch)."""
+        bounding_box3d: BoundingBox3D = self
+        lower1: P3D = bounding_box3d.lower
+        upper1: P3D = bounding_box3d.upper
+        lower2: P3D = other.lower
+        upper2: P3D = other.upper
+        dx: float = max(lower1.x - upper2.x, lower2.x - upper1.x, 0.0)
+        dy: float = max(lower1.y - upper2.y, lower2.y - upper1.y, 0.0)
+        dz: float = max(lower1.z - upper2.z, lower2.z - upper1.z, 0.0)
+        return sqrt(dx * dx + dy * dy + dz * dz)
+
+    # BoundingBox3D.enclosing_get():
+    @staticmethod
+    def enclosing_get(bounding_boxes: "List[BoundingBox3D]", name: str = "") -> "BoundingBox3D":
+        """Return the smallest BoundingBox3D that encloses some non-empty list of boxes."""
+        assert bounding_boxes, "No bounding boxes to enclose"
+        bounding_box: BoundingBox3D
+        return BoundingBox3D(
+            name, P3D(min([bounding_box.lower.x for bounding_box in bounding_boxes]),
+                      min([bounding_box.lower.y for bounding_box in bounding_boxes]),
+                      min([bounding_box.lower.z for bounding_box in bounding_boxes])),
+            P3D(max([bounding_box.upper.x for bounding_box in bounding_boxes]),
+                max([bounding_box.upper.y for bounding_box in bounding_boxes]),
+                max([bounding_box.upper.z for bounding_box in bounding_boxes])))
+
+    # BoundingBox3D.gap_get():
+    def gap_get(self, other: "BoundingBox3D") -> float:
+        """Return the largest per axis gap between two BoundingBox3D's.
+
+        The result is zero when the boxes just touch and negative when
+        they overlap.
+        """
+        box1: BoundingBox3D = self
+        lower1: P3D = box1.lower
+        upper1: P3D = box1.upper
+        lower2: P3D = other.lower
+        upper2: P3D = other.upper
+        return max(lower1.x - upper2.x, lower2.x - upper1.x,
+                   lower1.y - upper2.y, lower2.y - upper1.y,
+                   lower1.z - upper2.z, lower2.z - upper1.z)
+
+    # BoundingBox3D.hole_clears():
+    def hole_clears(self, other: "BoundingBox3D") -> bool:
+        """Return whether a hole in either box contains the whole overlap of both boxes."""
+        box1: BoundingBox3D = self
+        overlap_lower: P3D = P3D(max(box1.lower.x, other.lower.x),
+                                 max(box1.lower.y, other.lower.y),
+                                 max(box1.lower.z, other.lower.z))
+        overlap_upper: P3D = P3D(min(box1.upper.x, other.upper.x),
+                                 min(box1.upper.y, other.upper.y),
+                                 min(box1.upper.z, other.upper.z))
+        hole: BoundingBox3D
+        for hole in box1.holes + other.holes:
+            if (hole.lower.x <= overlap_lower.x and overlap_upper.x <= hole.upper.x and
+                    hole.lower.y <= overlap_lower.y and overlap_upper.y <= hole.upper.y and
+                    hole.lower.z <= overlap_lower.z and overlap_upper.z <= hole.upper.z):
+                return True
+        return False
+
+    # BoundingBox3D.transformed_get():
+    @staticmethod
+    def transformed_get(name: str, affine3d: Affine3D, lower: P3D, upper: P3D,
+                        module_name: str) -> "BoundingBox3D":
+        """Return the world space BoundingBox3D of a transformed local box.
+
+        Args:
+            *name* (*str*): The name of the primitive that is bounded.
+            *affine3d* (*Affine3D*): The transform from local to world coordinates.
+            *lower* (*P3D*): The local corner with the smallest X, Y and Z.
+            *upper* (*P3D*): The local corner with the largest X, Y and Z.
+            *module_name* (*str*): The name of the innermost containing *Module3D*.
+
+        Returns:
+            (*BoundingBox3D*) Returns the box that encloses all 8 transformed
+                corners of the local box.
+
+        """
+        corners: List[P3D] = [affine3d.point_transform(P3D(x, y, z))
+                              for x in (lower.x, upper.x)
+                              for y in (lower.y, upper.y)
+                              for z in (lower.z, upper.z)]
+        corner: P3D
+        return BoundingBox3D(name,
+                             P3D(min([corner.x for corner in corners]),
+                                 min([corner.y for corner in corners]),
+                                 min([corner.z for corner in corners])),
+                             P3D(max([corner.x for corner in corners]),
+                                 max([corner.y for corner in corners]),
+                                 max([corner.z for corner in corners])), module_name)
+
+
+# BoundingVolumeHierarchy:
+class BoundingVolumeHierarchy:
+    """Represents a bounding volume hierarchy over a list of BoundingBox3D's.
+
+    The hierarchy is a binary tree that is built top down by splitting
+    the boxes at the median box center along the longest axis until each
+    leaf has at most *LEAF_SIZE* boxes.  Finding every pair of boxes that
+    are closer than some distance walks pairs of tree nodes and prunes
+    any node pair whose boxes are already too far apart, so the cost is
+    close to *n* log *n* for *n* boxes rather than *n* squared.  Finding
+    the closest pair of boxes between two hierarchies is a best first
+    search over pairs of nodes that stops as soon as the nearest remaining
+    node pair is further apart than the best box pair found so far.  The
+    tree is stored in flat lists that are indexed by node number.
+    """
+
+    # Boxes must overlap by more than *EPSILON* to count as an interference, so parts that
+    # merely sit on one another are not reported:
+    EPSILON: float = 1.0e-6
+
+    # The maximum number of boxes in a leaf node:
+    LEAF_SIZE: int = 4
+
+    # BoundingVolumeHierarchy.__init__():
+    def __init__(self, bounding_boxes: List[BoundingBox3D]) -> None:
+        """Build a BoundingVolumeHierarchy.
+
+        Args:
+            *bounding_boxes* (*List*[*BoundingBox3D*]): The boxes to organize.
+
+        """
+        # Load up *bounding_volume_hierarchy* (i.e. *self*):
+        bounding_volume_hierarchy: BoundingVolumeHierarchy = self
+        self.bounding_boxes: List[BoundingBox3D] = bounding_boxes
+        self.node_boxes: List[BoundingBox3D] = []
+        self.node_children: List[Tuple[int, int]] = []
+        self.node_leaves: List[List[int]] = []
+
+        # Build the tree with an explicit stack of (node, box indices) to fill in:
+        if bounding_boxes:
+            stack: List[Tuple[int, List[int]]] = [
+                (bounding_volume_hierarchy.node_new(list(range(len(bounding_boxes)))),
+                 list(range(len(bounding_boxes))))]
+            while stack:
+                node: int
+                indices: List[int]
+                node, indices = stack.pop()
+                if len(indices) > BoundingVolumeHierarchy.LEAF_SIZE:
+                    # Split at the median center along the longest axis of *node*:
+                    node_box: BoundingBox3D = bounding_volume_hierarchy.node_boxes[node]
+                    extent: P3D = node_box.upper - node_box.lower
+                    axis: int = (0 if extent.x >= extent.y and extent.x >= extent.z else
+                                 1 if extent.y >= extent.z else 2)
+                    index: int
+                    indices.sort(key=lambda index: bounding_volume_hierarchy.center_get(
+                        index, axis))
+                    half: int = len(indices) // 2
+                    left_indices: List[int] = indices[:half]
+                    right_indices: List[int] = indices[half:]
+                    left: int = bounding_volume_hierarchy.node_new(left_indices)
+                    right: int = bounding_volume_hierarchy.node_new(right_indices)
+                    bounding_volume_hierarchy.node_children[node] = (left, right)
+                    stack.append((left, left_indices))
+                    stack.append((right, right_indices))
+                else:
+                    bounding_volume_hierarchy.node_leaves[node] = indices
+
+    # BoundingVolumeHierarchy.center_get():
+    def center_get(self, index: int, axis: int) -> float:
+        """Return twice the center of a box along an axis (0=X, 1=Y, 2=Z)."""
+        bounding_volume_hierarchy: BoundingVolumeHierarchy = self
+        bounding_box: BoundingBox3D = bounding_volume_hierarchy.bounding_boxes[index]
+        lower: P3D = bounding_box.lower
+        upper: P3D = bounding_box.upper
+        return (lower.x + upper.x if axis == 0 else
+                lower.y + upper.y if axis == 1 else lower.z + upper.z)
+
+    # BoundingVolumeHierarchy.near_pairs_get():
+    def near_pairs_get(self, distance: float = 0.0,
+                       ignores: Optional[Set[Tuple[str, str]]] = None
+                       ) -> List[Tuple[BoundingBox3D, BoundingBox3D]]:
+        """Return every pair of boxes in different modules that are too close.
+
+        Args:
+            *distance* (*float*):
+                (Optional: Defaults to 0.0.)  Boxes whose gap is less than
+                *distance* are reported.  With the default of 0.0, only
+                boxes that overlap (by more than *EPSILON*) are reported.
+            *ignores* (*Optional*[*Set*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to *None*.)  Pairs of module names
+                (in either order) that are expected to touch.
+
+        Returns:
+            (*List*[*Tuple*[*BoundingBox3D*, *BoundingBox3D*]]) Returns the
+                close pairs sorted by module names and then box names.
+                Boxes in the same module are never paired and overlaps
+                that fall entirely inside a *Difference3D* hole are skipped.
+
+        """
+        bounding_volume_hierarchy: BoundingVolumeHierarchy = self
+        bounding_boxes: List[BoundingBox3D] = bounding_volume_hierarchy.bounding_boxes
+        node_boxes: List[BoundingBox3D] = bounding_volume_hierarchy.node_boxes
+        node_children: List[Tuple[int, int]] = bounding_volume_hierarchy.node_children
+        node_leaves: List[List[int]] = bounding_volume_hierarchy.node_leaves
+        limit: float = distance - BoundingVolumeHierarchy.EPSILON
+        ignores = set() if ignores is None else ignores
+
+        # Collect the *index_pairs* by walking pairs of nodes, starting with the root paired
+        # with itself.  A node paired with itself is split into its children paired with
+        # themselves and with each other:
+        index_pairs: List[Tuple[int, int]] = []
+        stack: List[Tuple[int, int]] = [(0, 0)] if node_boxes else []
+        index1: int
+        index2: int
+        left: int
+        right: int
+        while stack:
+            node1: int
+            node2: int
+            node1, node2 = stack.pop()
+            if node1 == node2:
+                if node_leaves[node1]:
+                    leaf: List[int] = node_leaves[node1]
+                    position: int
+                    for position, index1 in enumerate(leaf):
+                        for index2 in leaf[position + 1:]:
+                            index_pairs.append((index1, index2))
+                else:
+                    left, right = node_children[node1]
+                    stack.extend([(left, left), (right, right), (left, right)])
+            elif node_boxes[node1].gap_get(node_boxes[node2]) < limit:
+                if node_leaves[node1] and node_leaves[node2]:
+                    for index1 in node_leaves[node1]:
+                        for index2 in node_leaves[node2]:
+                            index_pairs.append((index1, index2))
+                elif node_leaves[node1]:
+                    left, right = node_children[node2]
+                    stack.extend([(node1, left), (node1, right)])
+                else:
+                    left, right = node_children[node1]
+                    stack.extend([(left, node2), (right, node2)])
+
+        # Filter the candidate *index_pairs* down to the *near_pairs*:
+        near_pairs: List[Tuple[BoundingBox3D, BoundingBox3D]] = []
+        for index1, index2 in index_pairs:
+            box1: BoundingBox3D = bounding_boxes[index1]
+            box2: BoundingBox3D = bounding_boxes[index2]
+            if box2.module_name < box1.module_name or (box2.module_name == box1.module_name and
+                                                       box2.name < box1.name):
+                box1, box2 = box2, box1
+            module_names: Tuple[str, str] = (box1.module_name, box2.module_name)
+            if (module_names[0] != module_names[1] and module_names not in ignores and
+                    (module_names[1], module_names[0]) not in ignores and
+                    box1.gap_get(box2) < limit and
+                    (distance > 0.0 or not box1.hole_clears(box2))):
+                near_pairs.append((box1, box2))
+        near_pair: Tuple[BoundingBox3D, BoundingBox3D]
+        near_pairs.sort(key=lambda near_pair: (near_pair[0].module_name, near_pair[1].module_name,
+                                               near_pair[0].name, near_pair[1].name))
+        return near_pairs
+
+    # BoundingVolumeHierarchy.nearest_get():
+    def nearest_get(self, other: "BoundingVolumeHierarchy",
+                    ignores: Optional[Set[Tuple[str, str]]] = None
+                    ) -> Optional[Tuple[float, BoundingBox3D, BoundingBox3D]]:
+        """Return the closest pair of boxes between two BoundingVolumeHierarchy's.
+
+        Args:
+            *other* (*BoundingVolumeHierarchy*): The other hierarchy.
+            *ignores* (*Optional*[*Set*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to *None*.)  Pairs of module names
+                (in either order) that are expected to touch.
+
+        Returns:
+            (*Optional*[*Tuple*[*float*, *BoundingBox3D*, *BoundingBox3D*]])
+                Returns the smallest clearance (see
+                *BoundingBox3D*.*clearance_get*()) along with the box from
+                *bounding_volume_hierarchy* (i.e. *self*) and the box from
+                *other*.  Pairs of boxes in the same module or in an ignored
+                pair of modules are skipped.  *None* is returned when there
+                are no pairs to measure.
+
+        """
+        bounding_volume_hierarchy: BoundingVolumeHierarchy = self
+        bounding_boxes1: List[BoundingBox3D] = bounding_volume_hierarchy.bounding_boxes
+        bounding_boxes2: List[BoundingBox3D] = other.bounding_boxes
+        node_boxes1: List[BoundingBox3D] = bounding_volume_hierarchy.node_boxes
+        node_boxes2: List[BoundingBox3D] = other.node_boxes
+        node_children1: List[Tuple[int, int]] = bounding_volume_hierarchy.node_children
+        node_children2: List[Tuple[int, int]] = other.node_children
+        node_leaves1: List[List[int]] = bounding_volume_hierarchy.node_leaves
+        node_leaves2: List[List[int]] = other.node_leaves
+        ignores = set() if ignores is None else ignores
+
+        # Visit node pairs in order of increasing distance.  The node pair distance is a lower
+        # bound for the clearance of any box pair below it, so the search is over as soon as
+        # the next node pair is no closer than the *nearest* box pair found so far:
+        nearest: Optional[Tuple[float, BoundingBox3D, BoundingBox3D]] = None
+        heap: List[Tuple[float, int, int]] = []
+        if node_boxes1 and node_boxes2:
+            heap.append((node_boxes1[0].distance_get(node_boxes2[0]), 0, 0))
+        index1: int
+        index2: int
+        left: int
+        right: int
+        while heap:
+            node_distance: float
+            node1: int
+            node2: int
+            node_distance, node1, node2 = heapq.heappop(heap)
+            if nearest is not None and node_distance >= nearest[0]:
+                break
+            if node_leaves1[node1] and node_leaves2[node2]:
+                for index1 in node_leaves1[node1]:
+                    box1: BoundingBox3D = bounding_boxes1[index1]
+                    for index2 in node_leaves2[node2]:
+                        box2: BoundingBox3D = bounding_boxes2[index2]
+                        module_names: Tuple[str, str] = (box1.module_name, box2.module_name)
+                        if (module_names[0] != module_names[1] and
+                                module_names not in ignores and
+                                (module_names[1], module_names[0]) not in ignores):
+                            clearance: float = box1.clearance_get(box2)
+                            if nearest is None or clearance < nearest[0]:
+                                nearest = (clearance, box1, box2)
+            else:
+                # Split the node that is not a leaf (or the first one if neither is a leaf):
+                child: int
+                if node_leaves1[node1]:
+                    left, right = node_children2[node2]
+                    for child in (left, right):
+                        heapq.heappush(heap, (node_boxes1[node1].distance_get(node_boxes2[child]),
+                                              node1, child))
+                else:
+                    left, right = node_children1[node1]
+                    for child in (left, right):
+                        heapq.heappush(heap, (node_boxes1[child].distance_get(node_boxes2[node2]),
+                                              child, node2))
+        return nearest
+
+    # BoundingVolumeHierarchy.node_new():
+    def node_new(self, indices: List[int]) -> int:
+        """Append a node that encloses some boxes and return its node number."""
+        bounding_volume_hierarchy: BoundingVolumeHierarchy = self
+        bounding_boxes: List[BoundingBox3D] = bounding_volume_hierarchy.bounding_boxes
+        index: int
+        node_box: BoundingBox3D = BoundingBox3D.enclosing_get(
+            [bounding_boxes[index] for index in indices])
+        bounding_volume_hierarchy.node_boxes.append(node_box)
+        bounding_volume_hierarchy.node_children.append((-1, -1))
+        bounding_volume_hierarchy.node_leaves.append([])
+        return len(bounding_volume_hierarchy.node_boxes) - 1
+
+
+# MassProperties:
+class MassProperties:
+    """Represents the mass, center of gravity and inertia of some Scad3D primitives.
+
+    The mass properties are stored as the 10 *moments* of the material,
+    namely the mass, the 3 first moments (i.e. the mass times the X, Y and
+    Z of the center of gravity) and the 6 second moments about the origin
+    (i.e. the integrals of XX, YY, ZZ, XY, XZ and YZ over the mass.)
+    Moments simply add, so the moments of an assembly are the sums of the
+    moments of its primitives.  The center of gravity and the inertia
+    tensor are only computed from the moments when they are asked for.
+    Masses are in grams and distances are in millimeters.
+    """
+
+    # MassProperties.__init__():
+    def __init__(self, name: str, moments: Optional[List[float]] = None) -> None:
+        """Initialize a MassProperties.
+
+        Args:
+            *name* (*str*): The name of the primitives (e.g. a *Module3D* name.)
+            *moments* (*Optional*[*List*[*float*]]):
+                (Optional: Defaults to all zeros.)  The 10 moments
+                (mass, X, Y, Z, XX, YY, ZZ, XY, XZ, YZ.)
+
+        """
+        assert moments is None or len(moments) == 10, "MassProperties needs 10 moments"
+        # Load values into *mass_properties* (i.e. *self*):
+        # mass_properties: MassProperties = self
+        self.moments: List[float] = [0.0] * 10 if moments is None else moments
+        self.name: str = name
+
+    # MassProperties.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of MassProperties."""
+        mass_properties: MassProperties = self
+        name: str = mass_properties.name
+        mass: float = mass_properties.moments[0]
+        center: P3D = mass_properties.center_get()
+        return f"MassProperties('{name}',{mass:.3f}g,{center})"
+
+    # MassProperties.add():
+    def add(self, moments: "Union[array[float], List[float]]", offset: int = 0,
+            scale: float = 1.0) -> None:
+        """Add 10 scaled moments into a MassProperties.
+
+        Args:
+            *moments* (*Union*[*array*[*float*], *List*[*float*]]):
+                The moments to add.
+            *offset* (*int*):
+                (Optional: Defaults to 0.)  The index of the first moment.
+            *scale* (*float*):
+                (Optional: Defaults to 1.0.)  The amount to multiply each
+                moment by (e.g. a density.)
+
+        """
+        mass_properties: MassProperties = self
+        totals: List[float] = mass_properties.moments
+        index: int
+        for index in range(10):
+            totals[index] += moments[offset + index] * scale
+
+    # MassProperties.center_get():
+    def center_get(self) -> P3D:
+        """Return the center of gravity (the origin when there is no mass)."""
+        mass_properties: MassProperties = self
+        moments: List[float] = mass_properties.moments
+        mass: float = moments[0]
+        return (P3D(moments[1] / mass, moments[2] / mass, moments[3] / mass) if mass != 0.0
+                else P3D(0.0, 0.0, 0.0))
+
+    # MassProperties.inertia_get():
+    def inertia_get(self) -> Tuple[float, ...]:
+        """Return the inertia tensor about the center of gravity.
+
+        Returns:
+            (*Tuple*[*float*, ...]) Returns the 9 values of the symmetric
+                3x3 inertia tensor (in gram millimeters squared) in row
+                major order with the axes parallel to the world axes.
+
+        """
+        # Move the second moments from the origin to the center of gravity:
+        mass_properties: MassProperties = self
+        moments: List[float] = mass_properties.moments
+        mass: float = moments[0]
+        center: P3D = mass_properties.center_get()
+        xx: float = moments[4] - mass * center.x * center.x
+        yy: float = moments[5] - mass * center.y * center.y
+        zz: float = moments[6] - mass * center.z * center.z
+        xy: float = moments[7] - mass * center.x * center.y
+        xz: float = moments[8] - mass * center.x * center.z
+        yz: float = moments[9] - mass * center.y * center.z
+
+        # The inertia tensor is trace(C) * I - C, where C is the central second moment matrix:
+        return (yy + zz, -xy, -xz,
+                -xy, xx + zz, -yz,
+                -xz, -yz, xx + yy)
+
+    # MassProperties.mass_get():
+    def mass_get(self) -> float:
+        """Return the total mass in grams."""
+        mass_properties: MassProperties = self
+        return mass_properties.moments[0]
+
+    # MassProperties.moments_clip():
+    @staticmethod
+    def moments_clip(moments: Tuple[float, ...], axis: int, lower: float, upper: float,
+                     clip_lower: float, clip_upper: float) -> Tuple[float, ...]:
+        """Return 10 moments clipped to a slab along one axis.
+
+        The material is assumed to be spread evenly along *axis* between
+        *lower* and *upper* (e.g. a prism or a cylinder along *axis*), so
+        the result is exact for such primitives and an approximation for
+        anything else.
+
+        Args:
+            *moments* (*Tuple*[*float*, ...]): The 10 world moments.
+            *axis* (*int*): The axis to clip along (0, 1 or 2 for X, Y or Z.)
+            *lower* (*float*): The smallest *axis* coordinate of the material.
+            *upper* (*float*): The largest *axis* coordinate of the material.
+            *clip_lower* (*float*): The smallest *axis* coordinate to keep.
+            *clip_upper* (*float*): The largest *axis* coordinate to keep.
+
+        Returns:
+            (*Tuple*[*float*, ...]) Returns the 10 moments of the material
+                between *clip_lower* and *clip_upper*.
+
+        """
+        low: float = max(lower, clip_lower)
+        high: float = min(upper, clip_upper)
+        if high <= low or upper <= lower:
+            return (0.0,) * 10
+
+        # Everything that does not involve *axis* simply scales with the kept *fraction*, and
+        # the *axis* coordinate is independent of the others and uniform over [*low*, *high*]:
+        fraction: float = (high - low) / (upper - lower)
+        clipped: List[float] = [moment * fraction for moment in moments]
+        mass: float = clipped[0]
+        middle: float = (low + high) / 2.0
+        # *crosses* pairs each other axis with the index of its cross moment with *axis*:
+        crosses: Tuple[Tuple[int, int], ...] = (
+            ((1, 7), (2, 8)), ((0, 7), (2, 9)), ((0, 8), (1, 9)))[axis]
+        clipped[1 + axis] = mass * middle
+        clipped[4 + axis] = mass * (low * low + low * high + high * high) / 3.0
+        other: int
+        cross: int
+        for other, cross in crosses:
+            clipped[cross] = clipped[1 + other] * middle
+        return tuple(clipped)
+
+    # MassProperties.moments_transform():
+    @staticmethod
+    def moments_transform(moments: Tuple[float, ...], affine3d: Affine3D) -> Tuple[float, ...]:
+        """Return 10 moments moved from local to world coordinates.
+
+        Args:
+            *moments* (*Tuple*[*float*, ...]): The 10 local moments.
+            *affine3d* (*Affine3D*): The rigid transform from local to world coordinates.
+
+        Returns:
+            (*Tuple*[*float*, ...]) Returns the 10 world moments.
+
+        """
+        # With world point P = R*p + T, the moments become m, R*f + m*T and
+        # R*S*R' + (R*f)*T' + T*(R*f)' + m*T*T':
+        a: Tuple[float, ...] = affine3d.values
+        mass: float = moments[0]
+        rotate: List[List[float]] = [[a[0], a[1], a[2]], [a[4], a[5], a[6]], [a[8], a[9], a[10]]]
+        offset: List[float] = [a[3], a[7], a[11]]
+        first: List[float] = [moments[1], moments[2], moments[3]]
+        second: List[List[float]] = [[moments[4], moments[7], moments[8]],
+                                     [moments[7], moments[5], moments[9]],
+                                     [moments[8], moments[9], moments[6]]]
+        row: int
+        column: int
+        index: int
+        other: int
+        rotated_first: List[float] = [sum([rotate[row][index] * first[index]
+                                           for index in range(3)]) for row in range(3)]
+        rotated_second: List[List[float]] = [[0.0] * 3 for row in range(3)]
+        for row in range(3):
+            for column in range(3):
+                rotated_second[row][column] = (
+                    sum([rotate[row][index] * sum([second[index][other] * rotate[column][other]
+                                                   for other in range(3)])
+                         for index in range(3)]) +
+                    rotated_first[row] * offset[column] + offset[row] * rotated_first[column] +
+                    mass * offset[row] * offset[column])
+        return (mass,
+                rotated_first[0] + mass * offset[0],
+                rotated_first[1] + mass * offset[1],
+                rotated_first[2] + mass * offset[2],
+                rotated_second[0][0], rotated_second[1][1], rotated_second[2][2],
+                rotated_second[0][1], rotated_second[0][2], rotated_second[1][2])
+
+
+# NameRegistry:
+class NameRegistry:
+    """Represents an interned index of the names of Scad objects.
+
+    A *NameRegistry* is a context manager.  While it is active (i.e.
+    inside of a `with NameRegistry() as name_registry:` block), it is
+    *Scad*.*name_registry* and every *Scad* registers with it when it is
+    constructed.  Outside of any such block *Scad*.*name_registry* is
+    *None*, nothing is registered and the frame walk that finds the
+    constructing code is skipped entirely.  Names are interned via
+    `sys.intern`() so the many copies of the same name share one string,
+    and each registration is a couple of table operations, so duplicate
+    names are detected in O(1) time.  The registry also remembers the code
+    that constructed each name so that a name can be traced back to the
+    class (usually an `hr2_models` class) that emitted it.  Objects that
+    are loaded from a pickled *ScadProgram* cache are not registered.
+    """
+
+    # NameRegistry.__init__():
+    def __init__(self) -> None:
+        """Initialize an empty NameRegistry."""
+        # Load values into *name_registry* (i.e. *self*):
+        # name_registry: NameRegistry = self
+        self.counts: Dict[str, int] = {}
+        self.duplicates: Set[str] = set()
+        self.owners_cache: Dict[Any, str] = {}
+        self.previous: Optional[NameRegistry] = None
+        self.scads: Dict[str, "Scad"] = {}
+        self.sites: Dict[str, List[Tuple[str, Any]]] = {}
+
+    # NameRegistry.__enter__():
+    def __enter__(self) -> "NameRegistry":
+        """Make the NameRegistry the active Scad.name_registry."""
+        name_registry: NameRegistry = self
+        name_registry.previous = Scad.name_registry
+        Scad.name_registry = name_registry
+        return name_registry
+
+    # NameRegistry.__exit__():
+    def __exit__(self, *exception_information: Any) -> None:
+        """Restore the previously active Scad.name_registry."""
+        name_registry: NameRegistry = self
+        Scad.name_registry = name_registry.previous
+        name_registry.previous = None
+
+    # NameRegistry.__len__():
+    def __len__(self) -> int:
+        """Return the number of distinct names in the NameRegistry."""
+        name_registry: NameRegistry = self
+        return len(name_registry.counts)
+
+    # NameRegistry.clear():
+    def clear(self) -> None:
+        """Forget all of the names in the NameRegistry."""
+        name_registry: NameRegistry = self
+        name_registry.counts.clear()
+        name_registry.duplicates.clear()
+        name_registry.owners_cache.clear()
+        name_registry.scads.clear()
+        name_registry.sites.clear()
+
+    # NameRegistry.count_get():
+    def count_get(self, name: str) -> int:
+        """Return the number of Scad's registered with a name."""
+        name_registry: NameRegistry = self
+        return name_registry.counts.get(name, 0)
+
+    # NameRegistry.duplicates_get():
+    def duplicates_get(self) -> Dict[str, int]:
+        """Return a table of each duplicated name to its count."""
+        name_registry: NameRegistry = self
+        counts: Dict[str, int] = name_registry.counts
+        name: str
+        return {name: counts[name] for name in sorted(name_registry.duplicates)}
+
+    # NameRegistry.lookup():
+    def lookup(self, name: str) -> "Optional[Scad]":
+        """Return the first Scad registered with a name.
+
+        Args:
+            *name* (*str*): The name to look up.
+
+        Returns:
+            (*Optional*[*Scad*]) Returns the first *Scad* constructed
+                with *name* or *None* if there is no such *Scad*.
+
+        """
+        name_registry: NameRegistry = self
+        return name_registry.scads.get(name)
+
+    # NameRegistry.owner_get():
+    def owner_get(self, module_name: str, code: Any) -> str:
+        """Return the name of the class that owns some code.
+
+        Args:
+            *module_name* (*str*): The name of the module *code* is in.
+            *code* (*Any*): The code object that constructed a *Scad*.
+
+        Returns:
+            (*str*) Returns the name of the class with a method (or a
+                lambda in a method) whose code is *code*.  For code
+                outside of any class, "MODULE.FUNCTION" is returned.
+
+        """
+        name_registry: NameRegistry = self
+        owners_cache: Dict[Any, str] = name_registry.owners_cache
+        if code not in owners_cache:
+            owner: str = f"{module_name}.{code.co_name}"
+            module: Any = sys.modules.get(module_name)
+            value: Any
+            for value in (vars(module).values() if module is not None else ()):
+                if isinstance(value, type) and value.__module__ == module_name:
+                    attribute: Any
+                    for attribute in vars(value).values():
+                        function: Any = getattr(attribute, "__func__", attribute)
+                        function_code: Any = getattr(function, "__code__", None)
+                        if function_code is code or (
+                                function_code is not None and code in function_code.co_consts):
+                            owner = value.__name__
+                            break
+                    else:
+                        continue
+                    break
+            owners_cache[code] = owner
+        return owners_cache[code]
+
+    # NameRegistry.owners_get():
+    def owners_get(self, name: str) -> List[str]:
+        """Return the sorted names of the classes that constructed a name."""
+        name_registry: NameRegistry = self
+        module_name: str
+        code: Any
+        return sorted({name_registry.owner_get(module_name, code)
+                       for module_name, code in name_registry.sites.get(name, [])})
+
+    # NameRegistry.register():
+    def register(self, scad: "Scad") -> bool:
+        """Register a Scad with the NameRegistry.
+
+        Args:
+            *scad* (*Scad*): The *Scad* to register.  Its name is
+                replaced by the interned copy of the name.
+
+        Returns:
+            (*bool*) Returns *True* if the name has already been
+                registered and *False* otherwise.
+
+        """
+        name_registry: NameRegistry = self
+        name: str = sys.intern(scad.name)
+        scad.name = name
+
+        # Skip over the frames in this module (e.g. the `__init__`() chain of *scad*) to find
+        # the code that actually constructed *scad*:
+        scad_globals: Dict[str, Any] = globals()
+        frame: Any = sys._getframe(1)
+        while frame is not None and frame.f_globals is scad_globals:
+            frame = frame.f_back
+        site: Tuple[str, Any] = (("", None) if frame is None
+                                 else (frame.f_globals.get("__name__", ""), frame.f_code))
+
+        counts: Dict[str, int] = name_registry.counts
+        count: int = counts.get(name, 0)
+        counts[name] = count + 1
+        if count:
+            name_registry.duplicates.add(name)
+            name_registry.sites[name].append(site)
+        else:
+            name_registry.scads[name] = scad
+            name_registry.sites[name] = [site]
+        return count > 0
+
+    # NameRegistry.report_get():
+    def report_get(self) -> str:
+        """Return a report of the duplicated names and the classes that emit them."""
+        name_registry: NameRegistry = self
+        duplicates: Dict[str, int] = name_registry.duplicates_get()
+        lines: List[str] = [f"{len(duplicates)} duplicated names out of {len(name_registry)}:"]
+        name: str
+        count: int
+        for name, count in duplicates.items():
+            lines.append(f"{count:5d}  {name!r}  "
+                         f"({', '.join(name_registry.owners_get(name))})")
+        return "\n".join(lines)
+
+
+# SExpression:
+class SExpression:
+    """Represents a parenthesized S-expression that round trips losslessly.
+
+    Each item in *items* is either an atom (a *str* exactly as it appears
+    in the source text, quotes included) or a nested *SExpression*.  The
+    white space in front of each item is kept in the parallel *spaces* list
+    and the white space in front of the closing parenthesis is kept in
+    *tail*, so *SExpression*.*text_get*() reproduces the original text.
+    """
+
+    # The token regular expression: leading white space followed by an open parenthesis,
+    # a close parenthesis, a quoted string, or a bare atom:
+    TOKEN_PATTERN = re.compile(r'(\s*)(?:(\()|(\))|("(?:[^"\\]|\\.)*")|([^\s()"]+))', re.DOTALL)
+
+    # SExpression.__init__():
+    def __init__(self, items: "Optional[List[Union[str, SExpression]]]" = None,
+                 spaces: Optional[List[str]] = None, tail: str = "") -> None:
+        """Initialize an SExpression.
+
+        Args:
+            *items* (*Optional*[*List*[*Union*[*str*, *SExpression*]]]):
+                (Optional: Defaults to an empty list.)
+                The atoms and nested *SExpression*'s.
+            *spaces* (*Optional*[*List*[*str*]]):
+                (Optional: Defaults to a single space in front of every
+                item but the first.)  The white space in front of each
+                item in *items*.
+            *tail* (*str*):
+                (Optional: Defaults to "".)  The white space in front of
+                the closing parenthesis.
+
+        """
+        # Fill in the defaults:
+        if items is None:
+            items = []
+        if spaces is None:
+            spaces = ["" if index == 0 else " " for index in range(len(items))]
+        assert len(items) == len(spaces), f"{len(items)} items != {len(spaces)} spaces"
+
+        # Load values into *s_expression* (i.e. *self*):
+        # s_expression: SExpression = self
+        self.items: List[Union[str, SExpression]] = items
+        self.spaces: List[str] = spaces
+        self.tail: str = tail
+
+    # SExpression.__str__():
+    def __str__(self) -> str:
+        """Return a short string representation of an SExpression."""
+        # Grab some values from *s_expression* (i.e. *self*):
+        s_expression: SExpression = self
+        head: str = s_expression.head_get()
+        items_size: int = len(s_expression.items)
+        return f"SExpression('{head}', {items_size} items)"
+
+    # SExpression.append():
+    def append(self, item: "Union[str, SExpression]", space: str = " ") -> None:
+        """Append an item to an SExpression.
+
+        Args:
+            *item* (*Union*[*str*, *SExpression*]):
+                The atom or nested *SExpression* to append.
+            *space* (*str*):
+                (Optional: Defaults to " ".)  The white space to put
+                in front of *item*.
+
+        """
+        # Append *item* and *space* to *s_expression* (i.e. *self*):
+        s_expression: SExpression = self
+        s_expression.items.append(item)
+        s_expression.spaces.append(space)
+
+    # SExpression.atom_get():
+    def atom_get(self, index: int) -> str:
+        """Return the unquoted atom at an index.
+
+        Args:
+            *index* (*int*): The index into *items* of the atom.
+
+        Returns:
+            (*str*) Returns the unquoted atom at *index* or "" if
+                *index* is out of range or not an atom.
+
+        """
+        # Grab some values from *s_expression* (i.e. *self*):
+        s_expression: SExpression = self
+        items: List[Union[str, SExpression]] = s_expression.items
+        atom: str = ""
+        if 0 <= index < len(items):
+            item: Union[str, SExpression] = items[index]
+            if isinstance(item, str):
+                atom = SExpression.atom_unquote(item)
+        return atom
+
+    # SExpression.atom_unquote():
+    @staticmethod
+    def atom_unquote(atom: str) -> str:
+        """Return an atom with surrounding quotes and escapes removed."""
+        if len(atom) >= 2 and atom.startswith('"') and atom.endswith('"'):
+            atom = re.sub(r'\\(.)', r'\1', atom[1:-1])
+        return atom
+
+    # SExpression.child_find():
+    def child_find(self, head: str) -> "Optional[SExpression]":
+        """Return the first nested SExpression with a given head atom."""
+        # Scan the *items* of *s_expression* (i.e. *self*) for *head*:
+        s_expression: SExpression = self
+        child: Optional[SExpression] = None
+        item: Union[str, SExpression]
+        for item in s_expression.items:
+            if isinstance(item, SExpression) and item.head_get() == head:
+                child = item
+                break
+        return child
+
+    # SExpression.head_get():
+    def head_get(self) -> str:
+        """Return the first atom of an SExpression (or "" if none)."""
+        # Grab some values from *s_expression* (i.e. *self*):
+        s_expression: SExpression = self
+        items: List[Union[str, SExpression]] = s_expression.items
+        head: str = ""
+        if items and isinstance(items[0], str):
+            head = items[0]
+        return head
+
+    # SExpression.parse():
+    @staticmethod
+    def parse(text: str) -> "Tuple[str, SExpression, str]":
+        """Parse a single S-expression from some text.
+
+        The text is scanned exactly once, so parsing is linear in the
+        size of *text*.
+
+        Args:
+            *text* (*str*): The text to parse.
+
+        Returns:
+            (*Tuple*[*str*, *SExpression*, *str*]) Returns the white space
+                before the S-expression, the S-expression, and the white
+                space after the S-expression.
+
+        Raises:
+            *ValueError* if *text* is not exactly one well formed S-expression.
+
+        """
+        # Scan the tokens of *text* keeping nested lists in *stack*:
+        token_pattern = SExpression.TOKEN_PATTERN
+        text_size: int = len(text)
+        prefix: str = ""
+        root: Optional[SExpression] = None
+        stack: List[SExpression] = []
+        position: int = 0
+        while position < text_size:
+            match: Optional[Match[str]] = token_pattern.match(text, position)
+            if match is None:
+                break
+            space: str
+            open_parenthesis: Optional[str]
+            close_parenthesis: Optional[str]
+            quoted_atom: Optional[str]
+            bare_atom: Optional[str]
+            space, open_parenthesis, close_parenthesis, quoted_atom, bare_atom = match.groups()
+            if open_parenthesis is not None:
+                s_expression: SExpression = SExpression()
+                if stack:
+                    stack[-1].append(s_expression, space)
+                elif root is None:
+                    prefix = space
+                    root = s_expression
+                else:
+                    raise ValueError(f"Extra S-expression at offset {match.start(2)}")
+                stack.append(s_expression)
+            elif close_parenthesis is not None:
+                if not stack:
+                    raise ValueError(f"Unbalanced ')' at offset {match.start(3)}")
+                stack.pop().tail = space
+            else:
+                if not stack:
+                    raise ValueError(f"Atom outside of S-expression at offset {match.end(1)}")
+                stack[-1].append(quoted_atom if quoted_atom is not None else bare_atom, space)
+            position = match.end()
+
+        # Make sure that only white space is left over and everything is balanced:
+        suffix: str = text[position:]
+        if suffix.strip() != "":
+            raise ValueError(f"Unexpected text at offset {position}")
+        if stack:
+            raise ValueError(f"{len(stack)} unclosed S-expression(s)")
+        if root is None:
+            raise ValueError("No S-expression found")
+        return prefix, root, suffix
+
+    # SExpression.text_append():
+    def text_append(self, pieces: List[str]) -> None:
+        """Append the text pieces of an SExpression to a list."""
+        # Grab some values from *s_expression* (i.e. *self*):
+        s_expression: SExpression = self
+        items: List[Union[str, SExpression]] = s_expression.items
+        spaces: List[str] = s_expression.spaces
+
+        # Output the *items* with their *spaces*:
+        pieces.append("(")
+        index: int
+        item: Union[str, SExpression]
+        for index, item in enumerate(items):
+            pieces.append(spaces[index])
+            if isinstance(item, str):
+                pieces.append(item)
+            else:
+                item.text_append(pieces)
+        pieces.append(s_expression.tail)
+        pieces.append(")")
+
+    # SExpression.text_get():
+    def text_get(self) -> str:
+        """Return the text of an SExpression."""
+        s_expression: SExpression = self
+        pieces: List[str] = []
+        s_expression.text_append(pieces)
+        return "".join(pieces)
+
+
+# KicadPcb:
 class KicadPcb:
-    """Represents a KiCAD PCB."""
+    """Represents a KiCAD PCB.
+
+    The `.kicad_pcb` file is parsed into an *SExpression* tree, with
+    *footprints_table* indexing the footprints by reference and
+    *layer_graphics_table* indexing the top level graphics by layer.
+    Unmodified parts of the file are written back byte for byte.
+    """
 
+    # Tessellated arcs are recognized when there are at least *ARC_EDGES_MINIMUM* edges with
+    # matching lengths (within *ARC_EPSILON*) that turn by no more than *ARC_TURN_MAXIMUM*:
+    ARC_EDGES_MINIMUM: int = 3
+    ARC_EPSILON: float = 1.0e-6
+    ARC_TURN_MAXIMUM: float = pi / 6.0
+
+    # KicadPcb.__init__():
     def __init__(self, file_name: str, offset: P2D) -> None:
         """Bind to a .kicad_pcb file."""
-        # Read in *file_name* and split into *lines*:
+        # Read in *file_name* and parse it into *root*:
         kicad_pcb_file: IO[Any]
-        lines: List[str]
         with open(file_name, "r") as kicad_pcb_file:
             kicad_pcb_text: str = kicad_pcb_file.read()
-            lines = kicad_pcb_text.split('\n')
-            # print(f"KicadPcb.__init__('{file_name}') read in {len(lines)} lines")
+        prefix: str
+        root: SExpression
+        suffix: str
+        prefix, root, suffix = SExpression.parse(kicad_pcb_text)
 
         # Save values into *kicad_pcb* (i.e. *self*):
         # kicad_pcb: KicadPcb = self
-        self.cut_lines_insert_index: int = -1
         self.file_name: str = file_name
-        self.lines: List[str] = lines
+        self.footprints_table: Dict[str, SExpression] = {}
+        self.graphics_insert_index: int = -1
+        self.graphics_insert_space: str = "\n\n  "
+        self.layer_graphics_table: Dict[str, List[SExpression]] = {}
         self.offset: P2D = offset
+        self.pending_graphics: List[SExpression] = []
+        self.prefix: str = prefix
+        self.root: SExpression = root
+        self.suffix: str = suffix
+
+        # Build the indices and remember what was loaded so that *save*() can tell what changed:
+        self.index_build()
+        self.original_text: str = kicad_pcb_text
+        self.original_snapshot: Tuple[Dict[str, str], Dict[str, Dict[str, int]]] = (
+            self.snapshot_get())
+
+    # KicadPcb.arcs_find():
+    @staticmethod
+    def arcs_find(points: List[P2D]) -> List[Tuple[int, int, float]]:
+        """Find the tessellated arcs in a closed polygon.
 
+        An arc is a run of at least *ARC_EDGES_MINIMUM* edges that all have
+        the same length and all turn by the same small angle, which is
+        exactly what *SimplePolygon*.*arc_append*() generates.
+
+        Args:
+            *points* (*List*[*P2D*]): The closed polygon points.
+
+        Returns:
+            (*List*[*Tuple*[*int*, *int*, *float*]]) Returns a list of
+                arcs, where each arc is a tuple of the start point index,
+                the number of edges, and the signed (counter-clockwise
+                is positive) turn angle per edge.  Point indices wrap
+                around.  A single arc with *len*(*points*) edges means
+                that *points* is a full circle.
+
+        """
+        # Compute the *lengths* of the edges and the *turns* at each point, where edge *i*
+        # goes from point *i* to point *i+1* and turn *i* is from edge *i-1* to edge *i*:
+        points_size: int = len(points)
+        lengths: List[float] = []
+        turns: List[float] = []
+        index: int
+        for index in range(points_size):
+            previous_point: P2D = points[index - 1]
+            point: P2D = points[index]
+            next_point: P2D = points[(index + 1) % points_size]
+            dx1: float = point.x - previous_point.x
+            dy1: float = point.y - previous_point.y
+            dx2: float = next_point.x - point.x
+            dy2: float = next_point.y - point.y
+            lengths.append(sqrt(dx2 * dx2 + dy2 * dy2))
+            turns.append(atan2(dx1 * dy2 - dy1 * dx2, dx1 * dx2 + dy1 * dy2))
+
+        # Edge *i* bends like an arc when its length matches edge *i-1* and the turn at point *i*
+        # is small.  It continues the arc of edge *i-1* when edge *i-1* also bends by the
+        # same turn:
+        epsilon: float = KicadPcb.ARC_EPSILON
+        bends: List[bool] = []
+        for index in range(points_size):
+            bends.append(abs(lengths[index] - lengths[index - 1]) <= epsilon and
+                         epsilon < abs(turns[index]) <= KicadPcb.ARC_TURN_MAXIMUM)
+        continues: List[bool] = []
+        for index in range(points_size):
+            continues.append(bends[index] and
+                             (not bends[index - 1] or
+                              abs(turns[index] - turns[index - 1]) <= epsilon))
+
+        # Find an edge that does not continue an arc to start from.  If there is none,
+        # *points* is a full circle:
+        arcs: List[Tuple[int, int, float]] = []
+        start_index: int = -1
+        for index in range(points_size):
+            if not continues[index]:
+                start_index = index
+                break
+        if start_index < 0:
+            if points_size >= KicadPcb.ARC_EDGES_MINIMUM:
+                arcs.append((0, points_size, turns[0]))
+        else:
+            # Sweep through the edges once collecting the runs of arc edges:
+            offset: int = 0
+            while offset < points_size:
+                edge_index: int = (start_index + offset) % points_size
+                edges_count: int = 1
+                while (offset + edges_count < points_size and
+                       continues[(edge_index + edges_count) % points_size]):
+                    edges_count += 1
+                if edges_count >= KicadPcb.ARC_EDGES_MINIMUM:
+                    arcs.append((edge_index, edges_count, turns[(edge_index + 1) % points_size]))
+                offset += edges_count
+        return arcs
+
+    # KicadPcb.at_items_match():
+    @staticmethod
+    def at_items_match(items1: "List[Union[str, SExpression]]",
+                       items2: "List[Union[str, SExpression]]") -> bool:
+        """Return whether two `(at X Y [ROTATION])` item lists are the same place.
+
+        The coordinates are compared numerically to within half of the
+        last printed digit and a missing rotation is treated as 0.
+        """
+        numbers: List[List[float]] = []
+        items: List[Union[str, SExpression]]
+        for items in (items1, items2):
+            item: Union[str, SExpression]
+            values: List[float] = [float(item) for item in items[1:]
+                                   if isinstance(item, str)]
+            if len(values) < 3:
+                values.append(0.0)
+            values[2] %= 360.0
+            numbers.append(values[:3])
+        index: int
+        return all([abs(numbers[0][index] - numbers[1][index]) <= 0.5e-6
+                    for index in range(3)])
+
+    # KicadPcb.changes_get():
+    def changes_get(self) -> List[str]:
+        """Return a compact summary of what changed since the last load or save.
+
+        Returns:
+            (*List*[*str*]) Returns one line per moved footprint (e.g.
+                `H1: (at 1 2) => (at 3 4)`) and one line per layer whose
+                graphics changed (e.g. `Edge.Cuts: 50 removed, 52 added`).
+
+        """
+        # Grab some values from *kicad_pcb* (i.e. *self*):
+        kicad_pcb: KicadPcb = self
+        original_footprint_ats: Dict[str, str]
+        original_layer_counts: Dict[str, Dict[str, int]]
+        original_footprint_ats, original_layer_counts = kicad_pcb.original_snapshot
+        footprint_ats: Dict[str, str]
+        layer_counts: Dict[str, Dict[str, int]]
+        footprint_ats, layer_counts = kicad_pcb.snapshot_get()
+
+        # Summarize the footprints that moved:
+        changes: List[str] = []
+        reference: str
+        for reference in sorted(set(original_footprint_ats) | set(footprint_ats)):
+            original_at: str = original_footprint_ats.get(reference, "(none)")
+            at: str = footprint_ats.get(reference, "(none)")
+            if original_at != at:
+                changes.append(f"{reference}: {original_at} => {at}")
+
+        # Summarize the graphics that were removed and added on each layer:
+        layer: str
+        for layer in sorted(set(original_layer_counts) | set(layer_counts)):
+            original_counts: Dict[str, int] = original_layer_counts.get(layer, {})
+            counts: Dict[str, int] = layer_counts.get(layer, {})
+            text: str
+            removed: int = sum([max(0, original_counts[text] - counts.get(text, 0))
+                                for text in original_counts])
+            added: int = sum([max(0, counts[text] - original_counts.get(text, 0))
+                              for text in counts])
+            if removed or added:
+                changes.append(f"{layer}: {removed} removed, {added} added")
+        return changes
+
+    # KicadPcb.edge_cut_append():
     def edge_cut_append(self, point1: P2D, point2: P2D) -> None:
         """Append an edge cut."""
-        # Grab some values from self:
+        # Grab some values from *kicad_pcb* (i.e. *self*):
         kicad_pcb: KicadPcb = self
-        cut_lines_insert_index: int = kicad_pcb.cut_lines_insert_index
-        lines: List[str] = kicad_pcb.lines
         offset: P2D = kicad_pcb.offset
 
-        # Make sure we know where to insert cut lines:
-        if cut_lines_insert_index < 0:
-            line: str
-            index: int
-            net_class_default_found: bool = False
-            for index, line in enumerate(lines):
-                # print(f"[{index}]:'{line}'")
-                if line.startswith("  (net_class Default"):
-                    net_class_default_found = True
-                if net_class_default_found and line.startswith("  )"):
-                    cut_lines_insert_index = index + 2
-                    kicad_pcb.cut_lines_insert_index = cut_lines_insert_index
-
-        # Create the *cut_line_text* into *lines*:
-        cut_line_text: str = ("  (gr_line (start {0:.6f} {1:.6f}) (end {2:.6f} {3:.6f}) "
+        # Create the *cut_line_text* and queue it up to be inserted by *pending_flush*():
+        cut_line_text: str = ("(gr_line (start {0:.6f} {1:.6f}) (end {2:.6f} {3:.6f}) "
                               "(layer Edge.Cuts) (width 0.05))").format(offset.x + point1.x,
                                                                         offset.y - point1.y,
                                                                         offset.x + point2.x,
                                                                         offset.y - point2.y)
-        lines.insert(cut_lines_insert_index, cut_line_text)
+        kicad_pcb.pending_graphics.append(SExpression.parse(cut_line_text)[1])
 
+    # KicadPcb.edge_cuts_remove():
     def edge_cuts_remove(self) -> None:
         """Remove the edge cuts."""
+        kicad_pcb: KicadPcb = self
+        kicad_pcb.graphics_remove("Edge.Cuts")
+
+    # KicadPcb.edge_cuts_replace():
+    def edge_cuts_replace(self, polygons: "List[Union[Polygon, SimplePolygon]]",
+                          arcs: bool = False) -> None:
+        """Replace all of the edge cuts with some polygons.
+
+        The old edge cuts are removed and the new ones are inserted in
+        a single pass over the board.  All of the *SimplePolygon*'s in
+        *polygons* are written out, so a *Polygon* contributes both its
+        outline and its cutouts.
+
+        Args:
+            *polygons* (*List*[*Union*[*Polygon*, *SimplePolygon*]]):
+                The polygons to output as edge cuts.
+            *arcs* (*bool*):
+                (Optional: Defaults to *False*.)  When *True*, the
+                tessellated arcs found by *KicadPcb*.*arcs_find*() are
+                written as `gr_arc` (or `gr_circle`) items instead of
+                many short `gr_line` items.
+
+        """
         # Grab some values from *kicad_pcb* (i.e. *self*):
         kicad_pcb: KicadPcb = self
-        lines: List[str] = kicad_pcb.lines
-        new_lines: List[str] = []
-        line: str
-        for line in lines:
-            if line.find("(layer Edge.Cuts)") < 0:
-                # Not an edge cut line, copy it over:
-                new_lines.append(line)
+        kicad_pcb.graphics_remove("Edge.Cuts")
+        pending_graphics: List[SExpression] = kicad_pcb.pending_graphics
+
+        # Flatten *polygons* into *simple_polygons*:
+        simple_polygons: List[SimplePolygon] = []
+        polygon: Union[Polygon, SimplePolygon]
+        for polygon in polygons:
+            if isinstance(polygon, Polygon):
+                simple_polygons.extend(polygon.simple_polygons_get())
+            else:
+                simple_polygons.append(polygon)
+
+        # Sweep through *simple_polygons* generating the edge cuts:
+        suffix: str = "(layer Edge.Cuts) (width 0.05))"
+        simple_polygon: SimplePolygon
+        for simple_polygon in simple_polygons:
+            points: List[P2D] = simple_polygon.points_get()
+            points_size: int = len(points)
+
+            # Build the *arcs_table* that maps a starting point index to its arc:
+            arcs_table: Dict[int, Tuple[int, float]] = {}
+            start_index: int
+            edges_count: int
+            turn: float
+            if arcs:
+                for start_index, edges_count, turn in KicadPcb.arcs_find(points):
+                    arcs_table[start_index] = (edges_count, turn)
+
+            # Start at the beginning of an arc (if any) so no arc wraps past the end:
+            first_index: int = min(arcs_table.keys()) if arcs_table else 0
+            offset: int = 0
+            while offset < points_size:
+                index: int = (first_index + offset) % points_size
+                point1: P2D = points[index]
+                edge_text: str
+                if index in arcs_table:
+                    # Compute the arc *center* from its first edge chord and *turn*:
+                    edges_count, turn = arcs_table[index]
+                    point2: P2D = points[(index + 1) % points_size]
+                    chord_dx: float = point2.x - point1.x
+                    chord_dy: float = point2.y - point1.y
+                    scale: float = 0.5 / tan(turn / 2.0)
+                    center: P2D = P2D((point1.x + point2.x) / 2.0 - chord_dy * scale,
+                                      (point1.y + point2.y) / 2.0 + chord_dx * scale)
+                    if edges_count == points_size:
+                        edge_text = (f"(gr_circle (center {kicad_pcb.point_text_get(center)}) "
+                                     f"(end {kicad_pcb.point_text_get(point1)}) {suffix}")
+                    else:
+                        # The Y axis flip and the KiCad Y-down display cancel out, so the
+                        # sweep looks the same on screen.  KiCad 5 measures positive arc
+                        # angles clockwise on screen, hence the minus sign:
+                        angle: float = -degrees(turn * float(edges_count))
+                        edge_text = (f"(gr_arc (start {kicad_pcb.point_text_get(center)}) "
+                                     f"(end {kicad_pcb.point_text_get(point1)}) "
+                                     f"(angle {angle:.6f}) {suffix}")
+                    offset += edges_count
+                else:
+                    point2 = points[(index + 1) % points_size]
+                    edge_text = (f"(gr_line (start {kicad_pcb.point_text_get(point1)}) "
+                                 f"(end {kicad_pcb.point_text_get(point2)}) {suffix}")
+                    offset += 1
+                pending_graphics.append(SExpression.parse(edge_text)[1])
+
+        # Splice everything in:
+        kicad_pcb.pending_flush()
+
+    # KicadPcb.footprint_reference_get():
+    @staticmethod
+    def footprint_reference_get(footprint: SExpression) -> str:
+        """Return the reference of a footprint or "" if it has none.
+
+        Both the KiCad 5 `(fp_text reference REF ...)` form and the
+        KiCad 6 `(property "Reference" "REF")` form are recognized.
+        """
+        reference: str = ""
+        item: Union[str, SExpression]
+        for item in footprint.items:
+            if isinstance(item, SExpression):
+                head: str = item.head_get()
+                if ((head == "fp_text" and item.atom_get(1) == "reference") or
+                        (head == "property" and item.atom_get(1) == "Reference")):
+                    reference = item.atom_get(2)
+                    break
+        return reference
+
+    # KicadPcb.footprints_place():
+    def footprints_place(self, placements: Dict[str, Tuple[P2D, float, str]],
+                         dry_run: bool = False) -> List[str]:
+        """Move footprints to match a placement table.
+
+        Each placement is looked up in *footprints_table*, so the cost is
+        linear in the number of placements.  Moving a footprint to the
+        other side of the board requires KiCad to mirror all of its pads
+        and graphics, so side changes are reported but not applied.
+
+        Args:
+            *placements* (*Dict*[*str*, *Tuple*[*P2D*, *float*, *str*]]):
+                A table of footprint reference to (location, rotation in
+                degrees, side) where side is "F" (front) or "B" (back).
+            *dry_run* (*bool*):
+                (Optional: Defaults to *False*.)  When *True*, the deltas
+                are reported, but *kicad_pcb* (i.e. *self*) is left alone.
+
+        Returns:
+            (*List*[*str*]) Returns one line per footprint that is missing,
+                needs to move, or is on the wrong side.
+
+        """
+        # Grab some values from *kicad_pcb* (i.e. *self*):
+        kicad_pcb: KicadPcb = self
+        footprints_table: Dict[str, SExpression] = kicad_pcb.footprints_table
+
+        # Sweep through *placements* in reference order:
+        deltas: List[str] = []
+        reference: str
+        for reference in sorted(placements.keys()):
+            location: P2D
+            rotation: float
+            side: str
+            location, rotation, side = placements[reference]
+            footprint: Optional[SExpression] = footprints_table.get(reference)
+            at: Optional[SExpression] = None if footprint is None else footprint.child_find("at")
+            if footprint is None or at is None or len(at.items) < 3:
+                deltas.append(f"{reference}: missing from board")
+                continue
+
+            # Compare the *at* atoms with the new location and rotation text:
+            new_at_items: List[Union[str, SExpression]] = ["at"]
+            new_at_items.extend(kicad_pcb.point_text_get(location).split(" "))
+            normalized_rotation: float = round(rotation % 360.0, 3) % 360.0
+            if normalized_rotation != 0.0:
+                new_at_items.append(f"{normalized_rotation:.3f}".rstrip("0").rstrip("."))
+            old_at_items: List[Union[str, SExpression]] = at.items[:4]
+            if not KicadPcb.at_items_match(old_at_items, new_at_items):
+                new_at_text: str = " ".join([str(item) for item in new_at_items])
+                deltas.append(f"{reference}: {at.text_get()} => ({new_at_text})")
+                if not dry_run:
+                    at.items = new_at_items + at.items[4:]
+                    at.spaces = ([""] + [" "] * (len(new_at_items) - 1)) + at.spaces[4:]
+
+            # Check the side:
+            layer: Optional[SExpression] = footprint.child_find("layer")
+            new_layer: str = f"{side}.Cu"
+            if layer is not None and layer.atom_get(1) != new_layer:
+                deltas.append(f"{reference}: {layer.atom_get(1)} => {new_layer} "
+                              "(flip in KiCad)")
+        return deltas
+
+    # KicadPcb.graphics_remove():
+    def graphics_remove(self, layer: str) -> None:
+        """Remove all of the top level graphics items on a layer.
+
+        The top level items are filtered in a single pass.  The position
+        of the first removed item is remembered so that replacement
+        graphics are inserted at the same place.
 
-        # Save *new_lines* back into *kicad*:
-        kicad_pcb.lines = new_lines
+        Args:
+            *layer* (*str*): The layer name (e.g. "Edge.Cuts".)
 
+        """
+        # Grab some values from *kicad_pcb* (i.e. *self*):
+        kicad_pcb: KicadPcb = self
+        kicad_pcb.pending_flush()
+        root: SExpression = kicad_pcb.root
+        layer_graphics_table: Dict[str, List[SExpression]] = kicad_pcb.layer_graphics_table
+
+        # Copy over everything that is not in *removes* into *new_items* and *new_spaces*:
+        removes: Set[int] = set(id(graphic) for graphic in layer_graphics_table.get(layer, []))
+        if removes:
+            new_items: List[Union[str, SExpression]] = []
+            new_spaces: List[str] = []
+            index: int
+            item: Union[str, SExpression]
+            for index, item in enumerate(root.items):
+                if id(item) in removes:
+                    if kicad_pcb.graphics_insert_index < 0:
+                        kicad_pcb.graphics_insert_index = len(new_items)
+                        kicad_pcb.graphics_insert_space = root.spaces[index]
+                else:
+                    new_items.append(item)
+                    new_spaces.append(root.spaces[index])
+            root.items = new_items
+            root.spaces = new_spaces
+            del layer_graphics_table[layer]
+
+    # KicadPcb.index_build():
+    def index_build(self) -> None:
+        """Rebuild the footprint and layer indices in one pass."""
+        # Grab some values from *kicad_pcb* (i.e. *self*):
+        kicad_pcb: KicadPcb = self
+        root: SExpression = kicad_pcb.root
+        footprints_table: Dict[str, SExpression] = {}
+        layer_graphics_table: Dict[str, List[SExpression]] = {}
+
+        # Sweep through the top level *items* of *root*:
+        item: Union[str, SExpression]
+        for item in root.items:
+            if isinstance(item, SExpression):
+                head: str = item.head_get()
+                if head in ("module", "footprint"):
+                    reference: str = KicadPcb.footprint_reference_get(item)
+                    if reference != "":
+                        footprints_table[reference] = item
+                elif head.startswith("gr_"):
+                    layer_s_expression: Optional[SExpression] = item.child_find("layer")
+                    if layer_s_expression is not None:
+                        layer: str = layer_s_expression.atom_get(1)
+                        if layer not in layer_graphics_table:
+                            layer_graphics_table[layer] = []
+                        layer_graphics_table[layer].append(item)
+
+        # Stuff the indices back into *kicad_pcb*:
+        kicad_pcb.footprints_table = footprints_table
+        kicad_pcb.layer_graphics_table = layer_graphics_table
+
+    # KicadPcb.mounting_holes_update():
     def mounting_holes_update(self, holes_table: Dict[str, Tuple[P2D, float]]) -> None:
         """Update the mounting hole position."""
         # Grab some values from *kicad_pcb*:
         kicad_pcb: KicadPcb = self
-        lines: List[str] = kicad_pcb.lines
+        footprints_table: Dict[str, SExpression] = kicad_pcb.footprints_table
         offset: P2D = kicad_pcb.offset
 
-        line_number: int
-        line: str
-        at_line_number: int
-        label_line_number: int
-        label_prefix: str = "    (fp_text reference "
-        label_prefix_size: int = len(label_prefix)
-
-        in_mounting_hole: bool = False
-        for line_index, line in enumerate(lines):
-            if line.startswith("  (module MountingHole:MountingHole_"):
-                # Beginning of mounting hole:
-                in_mounting_hole = True
-                at_line_index = -1
-                label_line_index = -1
-            elif line.startswith("  )") and in_mounting_hole:
-                # We have reached the end:
-                if at_line_index < 0 or label_line_index < 0:
-                    print(f"Incomplete hole: at:{at_line_index} "
-                          f"label:{label_line_index}")  # pragma: no cover
+        # Visit each mounting hole footprint:
+        reference: str
+        footprint: SExpression
+        for reference, footprint in footprints_table.items():
+            if footprint.atom_get(1).startswith("MountingHole:MountingHole_"):
+                at: Optional[SExpression] = footprint.child_find("at")
+                if at is None or len(at.items) < 3:
+                    print(f"Incomplete hole: '{reference}'")  # pragma: no cover
+                elif reference in holes_table:
+                    # Look up the *hole* from *holes_table* and stuff location back into *at*:
+                    hole: P2D
+                    diameter: float
+                    hole, diameter = holes_table[reference]
+                    at.items[1] = "{0:.6f}".format(offset.x + hole.x)
+                    at.items[2] = "{0:.6f}".format(offset.y - hole.y)
                 else:
-                    # Grab the hole label from label_line:
-                    label_line: str = lines[label_line_index]
-                    at_index: int = label_line.find(" (at ")
-                    label: str = label_line[label_prefix_size:at_index]
-                    # print(f"Hole Label: {label}")
-
-                    # Look up the *hole* from *holes_table* and stuff location back into *lines*
-                    # at *at_index*:
-                    if label in holes_table:
-                        hole: P2D
-                        diameter: float
-                        hole, diameter = holes_table[label]
-                        at_text: str = "    (at {0:.6f} {1:0.6f})".format(offset.x + hole.x,
-                                                                          offset.y - hole.y)
-                        lines[at_line_index] = at_text
-                    else:
-                        print(f"No hole named '{label}'")  # pragma: no cover
-
-                # Reset all of the values:
-                in_mounting_hole = False
-                at_line_index = -1
-                label_line_index = -1
-            elif in_mounting_hole:
-                if line.startswith("    (at "):
-                    at_line_index = line_index
-                elif line.startswith("    (fp_text reference "):
-                    label_line_index = line_index
-
-    def save(self):
-        """Save contents back file."""
+                    print(f"No hole named '{reference}'")  # pragma: no cover
+
+    # KicadPcb.pending_flush():
+    def pending_flush(self) -> None:
+        """Splice all pending graphics into the top level in one pass.
+
+        The pending graphics go where the most recently removed graphics
+        were.  Otherwise, they go after the last top level graphics item,
+        footprint, or net class, in that order of preference.
+        """
+        # Grab some values from *kicad_pcb* (i.e. *self*):
+        kicad_pcb: KicadPcb = self
+        pending_graphics: List[SExpression] = kicad_pcb.pending_graphics
+        if pending_graphics:
+            root: SExpression = kicad_pcb.root
+            items: List[Union[str, SExpression]] = root.items
+            spaces: List[str] = root.spaces
+
+            # Figure out the *insert_index*:
+            insert_index: int = kicad_pcb.graphics_insert_index
+            insert_space: str = kicad_pcb.graphics_insert_space
+            if insert_index < 0:
+                # An explicit *found* flag is needed, since the last item can be a match:
+                insert_index = len(items)
+                insert_space = "\n\n  "
+                found: bool = False
+                heads: Tuple[str, ...]
+                for heads in (("gr_",), ("module", "footprint"), ("net_class",)):
+                    index: int
+                    for index in range(len(items) - 1, -1, -1):
+                        item: Union[str, SExpression] = items[index]
+                        if isinstance(item, SExpression) and item.head_get().startswith(heads):
+                            insert_index = index + 1
+                            found = True
+                            break
+                    if found:
+                        if heads == ("gr_",):
+                            insert_space = "\n  "
+                        break
+
+            # Splice *pending_graphics* in at *insert_index*:
+            new_spaces: List[str] = [insert_space] + ["\n  "] * (len(pending_graphics) - 1)
+            root.items = items[:insert_index] + list(pending_graphics) + items[insert_index:]
+            root.spaces = spaces[:insert_index] + new_spaces + spaces[insert_index:]
+
+            # Subsequent graphics go right after the ones just inserted:
+            kicad_pcb.graphics_insert_index = insert_index + len(pending_graphics)
+            kicad_pcb.graphics_insert_space = "\n  "
+            kicad_pcb.pending_graphics = []
+            kicad_pcb.index_build()
+
+    # KicadPcb.point_text_get():
+    def point_text_get(self, point: P2D) -> str:
+        """Return the KiCad "X Y" text for a point in model coordinates.
+
+        KiCad has the Y axis pointing down, so the Y coordinate is flipped
+        around the *offset* of *kicad_pcb* (i.e. *self*).  Tiny negative
+        values are rounded so that "-0.000000" never shows up.
+        """
+        kicad_pcb: KicadPcb = self
+        offset: P2D = kicad_pcb.offset
+        x: float = round(offset.x + point.x, 6) + 0.0
+        y: float = round(offset.y - point.y, 6) + 0.0
+        return "{0:.6f} {1:.6f}".format(x, y)
+
+    # KicadPcb.save():
+    def save(self) -> List[str]:
+        """Save contents back file if anything changed.
+
+        Nothing is written when the contents are unchanged, so the file
+        modification time stays put.  Otherwise, the contents are written
+        to a temporary file that is atomically renamed over the file.
+
+        Returns:
+            (*List*[*str*]) Returns the summary of changes from
+                *KicadPcb*.*changes_get*() (or an empty list if nothing
+                was written.)
+
+        """
         # Grab some values from *kicad_pcb* (i.e. *self*):
         kicad_pcb: KicadPcb = self
         file_name: str = kicad_pcb.file_name
-        lines: List[str] = kicad_pcb.lines
 
-        # Write *kicad_lines* out to *kicad_file_name*:
-        kicad_pcb_text: str = '\n'.join(lines) + '\n'
-        kicad_pcb_file: IO[Any]
-        with open(file_name, "w") as kicad_pcb_file:
-            kicad_pcb_file.write(kicad_pcb_text)
+        # Only write *kicad_pcb_text* out to *file_name* when it is different:
+        changes: List[str] = []
+        kicad_pcb_text: str = kicad_pcb.text_get()
+        if kicad_pcb_text != kicad_pcb.original_text:
+            changes = kicad_pcb.changes_get()
+            if not changes:
+                changes.append("Formatting changes only")  # pragma: no cover
+
+            # Write to a temporary file with the same permissions and rename it:
+            temporary_file_name: str = f"{file_name}.{os.getpid()}.tmp"
+            kicad_pcb_file: IO[Any]
+            with open(temporary_file_name, "w") as kicad_pcb_file:
+                kicad_pcb_file.write(kicad_pcb_text)
+            os.chmod(temporary_file_name, os.stat(file_name).st_mode & 0o7777)
+            os.replace(temporary_file_name, file_name)
+
+            # The file now matches *kicad_pcb*:
+            kicad_pcb.original_text = kicad_pcb_text
+            kicad_pcb.original_snapshot = kicad_pcb.snapshot_get()
+        return changes
+
+    # KicadPcb.snapshot_get():
+    def snapshot_get(self) -> Tuple[Dict[str, str], Dict[str, Dict[str, int]]]:
+        """Return the footprint positions and graphics counts.
+
+        Returns:
+            (*Tuple*[*Dict*[*str*, *str*], *Dict*[*str*, *Dict*[*str*, *int*]]])
+                Returns a table of footprint reference to `(at ...)` text
+                and a table of layer to graphic text counts.
+
+        """
+        # Grab some values from *kicad_pcb* (i.e. *self*):
+        kicad_pcb: KicadPcb = self
+        kicad_pcb.pending_flush()
+
+        # Fill in *footprint_ats*:
+        footprint_ats: Dict[str, str] = {}
+        reference: str
+        footprint: SExpression
+        for reference, footprint in kicad_pcb.footprints_table.items():
+            at: Optional[SExpression] = footprint.child_find("at")
+            footprint_ats[reference] = "(none)" if at is None else at.text_get()
+
+        # Fill in *layer_counts*:
+        layer_counts: Dict[str, Dict[str, int]] = {}
+        layer: str
+        graphics: List[SExpression]
+        for layer, graphics in kicad_pcb.layer_graphics_table.items():
+            counts: Dict[str, int] = {}
+            graphic: SExpression
+            for graphic in graphics:
+                text: str = graphic.text_get()
+                counts[text] = counts.get(text, 0) + 1
+            layer_counts[layer] = counts
+        return footprint_ats, layer_counts
+
+    # KicadPcb.text_get():
+    def text_get(self) -> str:
+        """Return the full text of the KiCad PCB file."""
+        kicad_pcb: KicadPcb = self
+        kicad_pcb.pending_flush()
+        return kicad_pcb.prefix + kicad_pcb.root.text_get() + kicad_pcb.suffix
+
+
+# KicadBoard:
+class KicadBoard:
+    """Represents the model side of a KiCad PCB.
+
+    A KicadBoard holds the outline polygons, mounting holes, and footprint
+    placements that a model computes for a PCB.  It is pickle-safe, so it
+    is cached along with its *ScadProgram* and can be shipped to worker
+    processes that update the `.kicad_pcb` files concurrently.
+    """
+
+    # KicadBoard.__init__():
+    def __init__(self, name: str, edge_polygons: "List[Union[Polygon, SimplePolygon]]",
+                 mounting_holes: Dict[str, Tuple[P2D, float]],
+                 placements: Dict[str, Tuple[P2D, float, str]],
+                 offset: Optional[P2D] = None) -> None:
+        """Initialize a KicadBoard.
+
+        Args:
+            *name* (*str*): The board name (e.g. "master_board").
+            *edge_polygons* (*List*[*Union*[*Polygon*, *SimplePolygon*]]):
+                The polygons to write out as edge cuts.
+            *mounting_holes* (*Dict*[*str*, *Tuple*[*P2D*, *float*]]):
+                The mounting hole table for *KicadPcb*.*mounting_holes_update*().
+            *placements* (*Dict*[*str*, *Tuple*[*P2D*, *float*, *str*]]):
+                The placement table for *KicadPcb*.*footprints_place*().
+            *offset* (*Optional*[*P2D*]):
+                (Optional: Defaults to *P2D*(100.0, 100.0).)  The KiCad
+                location of the model origin.
+
+        """
+        # Load values into *kicad_board* (i.e. *self*):
+        # kicad_board: KicadBoard = self
+        self.edge_polygons: List[Union[Polygon, SimplePolygon]] = edge_polygons
+        self.mounting_holes: Dict[str, Tuple[P2D, float]] = mounting_holes
+        self.name: str = name
+        self.offset: P2D = P2D(100.0, 100.0) if offset is None else offset
+        self.placements: Dict[str, Tuple[P2D, float, str]] = placements
+
+    # KicadBoard.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of a KicadBoard."""
+        kicad_board: KicadBoard = self
+        return f"KicadBoard('{kicad_board.name}')"
+
+    # KicadBoard.boards_sync():
+    @staticmethod
+    def boards_sync(kicad_boards: "Dict[str, KicadBoard]", kicad_pcb_files: Dict[str, str],
+                    jobs: int = 0, dry_run: bool = False,
+                    kicad_sch_files: Optional[Dict[str, str]] = None,
+                    strict: bool = True) -> Tuple[int, List[str]]:
+        """Synchronize several KiCad PCB files concurrently.
+
+        Each board in *kicad_pcb_files* is loaded, updated and saved in its
+        own worker process.  Boards listed in *kicad_sch_files* are cross
+        checked against their schematic before their PCB is loaded.
+
+        Args:
+            *kicad_boards* (*Dict*[*str*, *KicadBoard*]):
+                The table of board name to *KicadBoard*.
+            *kicad_pcb_files* (*Dict*[*str*, *str*]):
+                The registry of board name to `.kicad_pcb` file name.
+            *jobs* (*int*):
+                (Optional: Defaults to 0.)  The number of worker processes,
+                where 0 means one per CPU and 1 means no worker processes.
+            *dry_run* (*bool*):
+                (Optional: Defaults to *False*.)  When *True*, the changes
+                are reported, but no files are written.
+            *kicad_sch_files* (*Optional*[*Dict*[*str*, *str*]]):
+                (Optional: Defaults to *None*.)  The registry of board name
+                to root `.sch` file name.
+            *strict* (*bool*):
+                (Optional: Defaults to *True*.)  When *True*, any schematic
+                mismatch fails the board and its PCB is not written.  When
+                *False*, the mismatches are only reported.
+
+        Returns:
+            (*Tuple*[*int*, *List*[*str*]]) Returns an exit code (0 for
+                success and 1 if any board failed to sync) and the
+                report lines with per-board timing.
+
+        """
+        # Pair each registered board with its files, failing any board that the model lacks:
+        kicad_sch_files = {} if kicad_sch_files is None else kicad_sch_files
+        results: List[Tuple[str, float, List[str], List[str], str]] = []
+        tasks: List[Tuple[KicadBoard, str, str]] = []
+        name: str
+        for name in sorted(kicad_pcb_files.keys()):
+            if name in kicad_boards:
+                tasks.append((kicad_boards[name], kicad_pcb_files[name],
+                              kicad_sch_files.get(name, "")))
+            else:
+                results.append((name, 0.0, [], [], "No model for this board"))
+
+        # Perform the *tasks*, using a process pool when there is more than one worker:
+        workers: int = min(len(tasks), jobs if jobs > 0 else (os.cpu_count() or 1))
+        kicad_board: KicadBoard
+        kicad_pcb_file_name: str
+        kicad_sch_file_name: str
+        if workers <= 1:
+            for kicad_board, kicad_pcb_file_name, kicad_sch_file_name in tasks:
+                results.append(KicadBoard.sync_timed(kicad_board, kicad_pcb_file_name, dry_run,
+                                                     kicad_sch_file_name, strict))
+        else:
+            executor: ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures: List[Future] = [
+                    executor.submit(KicadBoard.sync_timed, kicad_board, kicad_pcb_file_name,
+                                    dry_run, kicad_sch_file_name, strict)
+                    for kicad_board, kicad_pcb_file_name, kicad_sch_file_name in tasks]
+                future: Future
+                for future in futures:
+                    results.append(future.result())
+
+        # Generate the *report* lines and *exit_code*:
+        exit_code: int = 0
+        report: List[str] = []
+        seconds: float
+        changes: List[str]
+        mismatch_lines: List[str]
+        error: str
+        for name, seconds, changes, mismatch_lines, error in sorted(results):
+            if error:
+                exit_code = 1
+                report.append(f"{name}: FAILED after {seconds:.3f}s: {error}")
+            else:
+                report.append(f"{name}: {len(changes)} changes in {seconds:.3f}s")
+            report.extend([f"    schematic: {mismatch_line}" for mismatch_line in mismatch_lines])
+            report.extend([f"    {change}" for change in changes])
+        return exit_code, report
+
+    # KicadBoard.kicad_pcb_update():
+    def kicad_pcb_update(self, kicad_pcb: KicadPcb) -> List[str]:
+        """Update a KicadPcb from a KicadBoard.
+
+        Args:
+            *kicad_pcb* (*KicadPcb*): The *KicadPcb* to update.
+
+        Returns:
+            (*List*[*str*]) Returns the *KicadPcb*.*footprints_place*() deltas.
+
+        """
+        kicad_board: KicadBoard = self
+        kicad_pcb.edge_cuts_replace(kicad_board.edge_polygons)
+        kicad_pcb.mounting_holes_update(kicad_board.mounting_holes)
+        return kicad_pcb.footprints_place(kicad_board.placements)
+
+    # KicadBoard.references_get():
+    def references_get(self) -> Set[str]:
+        """Return the footprint references that a KicadBoard emits."""
+        kicad_board: KicadBoard = self
+        return set(kicad_board.mounting_holes.keys()) | set(kicad_board.placements.keys())
+
+    # KicadBoard.schematic_check():
+    def schematic_check(self, kicad_sch_file_name: str) -> Dict[str, List[str]]:
+        """Cross check a KicadBoard against a KiCad schematic hierarchy.
+
+        Args:
+            *kicad_sch_file_name* (*str*): The root `.sch` file name.
+
+        Returns:
+            (*Dict*[*str*, *List*[*str*]]) Returns the
+                *KicadSchematic*.*mismatches_get*() table.
+
+        """
+        kicad_board: KicadBoard = self
+        kicad_schematic: KicadSchematic = KicadSchematic(kicad_sch_file_name)
+        return kicad_schematic.mismatches_get(kicad_board.references_get())
+
+    # KicadBoard.sync():
+    def sync(self, kicad_pcb_file_name: str, dry_run: bool = False) -> List[str]:
+        """Load, update and save (unless *dry_run*) a `.kicad_pcb` file.
+
+        Returns:
+            (*List*[*str*]) Returns the *KicadPcb*.*changes_get*() summary
+                followed by the *KicadPcb*.*footprints_place*() deltas that
+                it does not cover (i.e. missing footprints and footprints
+                on the wrong side.)
+
+        """
+        kicad_board: KicadBoard = self
+        kicad_pcb: KicadPcb = KicadPcb(kicad_pcb_file_name, kicad_board.offset)
+        deltas: List[str] = kicad_board.kicad_pcb_update(kicad_pcb)
+        changes: List[str] = kicad_pcb.changes_get() if dry_run else kicad_pcb.save()
+
+        # The footprint moves show up in both *changes* and *deltas*, so only add the rest:
+        delta: str
+        return changes + [delta for delta in deltas if delta not in changes]
+
+    # KicadBoard.sync_timed():
+    @staticmethod
+    def sync_timed(kicad_board: "KicadBoard", kicad_pcb_file_name: str, dry_run: bool,
+                   kicad_sch_file_name: str = "",
+                   strict: bool = False) -> Tuple[str, float, List[str], List[str], str]:
+        """Sync a KicadBoard and time how long it takes.
+
+        This is the worker process entry point.  When *kicad_sch_file_name*
+        is not empty, the schematic is checked first and, if *strict* is
+        *True*, any mismatch stops the sync before the PCB file is touched.
+        Any exception is caught and returned as the error message of the
+        board, so one broken board never takes down the other boards.
+
+        Returns:
+            (*Tuple*[*str*, *float*, *List*[*str*], *List*[*str*], *str*])
+                Returns the board name, the elapsed seconds, the changes,
+                the schematic mismatch lines, and an error message (or ""
+                for success.)
+
+        """
+        start_time: float = time.perf_counter()
+        changes: List[str] = []
+        mismatch_lines: List[str] = []
+        error: str = ""
+        try:
+            if kicad_sch_file_name:
+                mismatch_lines = KicadSchematic.mismatch_lines_get(
+                    kicad_board.schematic_check(kicad_sch_file_name))
+                if strict and mismatch_lines:
+                    raise ValueError(f"'{kicad_sch_file_name}' does not match the model")
+            changes = kicad_board.sync(kicad_pcb_file_name, dry_run)
+        except Exception as sync_error:
+            error = f"{type(sync_error).__name__}: {sync_error}"
+        return (kicad_board.name, time.perf_counter() - start_time, changes, mismatch_lines, error)
+
+
+# KicadSchematic:
+class KicadSchematic:
+    """Represents a hierarchy of legacy KiCad `.sch` files.
+
+    A KicadSchematic reads a root `.sch` file and every sub-sheet file
+    that it references (each file is read only once) and builds a
+    reference designator index.  Only the `$Comp` reference lines (`F 0`
+    and hierarchical `AR ... Ref=...` lines) and the `$Sheet` file name
+    lines (`F1`) are looked at, so each file is scanned in a single pass
+    with no tokenizing.
+    """
+
+    # *MISMATCH_DESCRIPTIONS* orders and describes the categories of *mismatches_get*():
+    MISMATCH_DESCRIPTIONS: Dict[str, str] = {
+        "missing_from_schematic": "model references missing from schematic",
+        "missing_from_model": "schematic references missing from model",
+        "unannotated": "unannotated schematic symbols",
+        "duplicated": "duplicated schematic references",
+    }
+
+    # KicadSchematic.__init__():
+    def __init__(self, file_name: str) -> None:
+        """Read a KiCad schematic hierarchy.
+
+        Args:
+            *file_name* (*str*): The root `.sch` file name.
+
+        Raises:
+            *OSError* if any file can not be read and *ValueError* if a
+            `$Comp` block is not terminated.
+
+        """
+        # Load values into *kicad_schematic* (i.e. *self*):
+        kicad_schematic: KicadSchematic = self
+        self.file_name: str = file_name
+        self.file_names: List[str] = []
+        self.references_table: Dict[str, List[str]] = {}
+
+        # Walk the sheet hierarchy breadth first, reading each file only once:
+        pending_file_names: Deque[str] = collections.deque([file_name])
+        while pending_file_names:
+            sheet_file_name: str = pending_file_names.popleft()
+            if sheet_file_name not in kicad_schematic.file_names:
+                kicad_schematic.file_names.append(sheet_file_name)
+                pending_file_names.extend(kicad_schematic.sheet_read(sheet_file_name))
+
+    # KicadSchematic.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of a KicadSchematic."""
+        kicad_schematic: KicadSchematic = self
+        return f"KicadSchematic('{kicad_schematic.file_name}')"
+
+    # KicadSchematic.mismatch_lines_get():
+    @staticmethod
+    def mismatch_lines_get(mismatches: Dict[str, List[str]]) -> List[str]:
+        """Return one summary line per non-empty mismatch category."""
+        mismatch_lines: List[str] = []
+        category: str
+        description: str
+        for category, description in KicadSchematic.MISMATCH_DESCRIPTIONS.items():
+            items: List[str] = mismatches[category]
+            if items:
+                mismatch_lines.append(f"{len(items)} {description}: {', '.join(items)}")
+        return mismatch_lines
+
+    # KicadSchematic.mismatches_get():
+    def mismatches_get(self, references: Set[str]) -> Dict[str, List[str]]:
+        """Cross check model references against a KicadSchematic.
+
+        Only schematic symbols whose reference prefix (e.g. "H" or "J")
+        is used by *references* are considered, so that resistors and
+        the like do not show up as missing from the model.
+
+        Args:
+            *references* (*Set*[*str*]): The references the model emits.
+
+        Returns:
+            (*Dict*[*str*, *List*[*str*]]) Returns a table keyed by the
+                *MISMATCH_DESCRIPTIONS* categories, where each entry is
+                a naturally sorted list of references (with locations for
+                "unannotated" and "duplicated".)
+
+        """
+        kicad_schematic: KicadSchematic = self
+        references_table: Dict[str, List[str]] = kicad_schematic.references_table
+        reference_key: Callable[[str], Tuple[str, int]] = KicadSchematic.reference_key
+        prefixes: Set[str] = set([reference_key(reference)[0] for reference in references])
+
+        mismatches: Dict[str, List[str]] = {
+            category: [] for category in KicadSchematic.MISMATCH_DESCRIPTIONS.keys()}
+        reference: str
+        for reference in sorted(references, key=reference_key):
+            if reference not in references_table:
+                mismatches["missing_from_schematic"].append(reference)
+        for reference in sorted(references_table.keys(), key=reference_key):
+            if reference_key(reference)[0] in prefixes:
+                locations: List[str] = references_table[reference]
+                if reference.endswith("?"):
+                    mismatches["unannotated"].extend(
+                        [f"{reference} ({location})" for location in locations])
+                else:
+                    if reference not in references:
+                        mismatches["missing_from_model"].append(reference)
+                    if len(locations) > 1:
+                        mismatches["duplicated"].append(f"{reference} ({', '.join(locations)})")
+        return mismatches
+
+    # KicadSchematic.reference_key():
+    @staticmethod
+    def reference_key(reference: str) -> Tuple[str, int]:
+        """Return a natural sort key (e.g. "H2" before "H10") for a reference."""
+        prefix: str = reference.rstrip("0123456789?")
+        digits: str = reference[len(prefix):].rstrip("?")
+        return (prefix, int(digits) if digits else -1)
+
+    # KicadSchematic.sheet_read():
+    def sheet_read(self, sheet_file_name: str) -> List[str]:
+        """Index the references in one `.sch` file.
+
+        Args:
+            *sheet_file_name* (*str*): The `.sch` file to read.
+
+        Returns:
+            (*List*[*str*]) Returns the sub-sheet file names (relative to
+                the current directory) referenced by *sheet_file_name*.
+
+        """
+        kicad_schematic: KicadSchematic = self
+        references_table: Dict[str, List[str]] = kicad_schematic.references_table
+        sheet_file: IO[Any]
+        with open(sheet_file_name) as sheet_file:
+            lines: List[str] = sheet_file.read().split('\n')
+        directory: str = os.path.dirname(sheet_file_name)
+        base_name: str = os.path.basename(sheet_file_name)
+
+        # Scan the *lines* once.  A `$Comp` contributes its `AR` references when it has any
+        # (i.e. it lives in a sheet that is instantiated more than once) and its `F 0`
+        # reference otherwise:
+        sub_sheet_file_names: List[str] = []
+        comp_line_number: int = 0
+        field_reference: str = ""
+        ar_references: List[str] = []
+        index: int
+        line: str
+        for index, line in enumerate(lines):
+            if comp_line_number:
+                if line.startswith("F 0 "):
+                    field_reference = KicadSchematic.quoted_get(line)
+                elif line.startswith("AR "):
+                    ref_index: int = line.find("Ref=")
+                    if ref_index >= 0:
+                        ar_references.append(KicadSchematic.quoted_get(line[ref_index:]))
+                elif line.startswith("$EndComp"):
+                    location: str = f"{base_name}:{comp_line_number}"
+                    reference: str
+                    for reference in (ar_references if ar_references else [field_reference]):
+                        if reference:
+                            references_table.setdefault(reference, []).append(location)
+                    comp_line_number = 0
+                elif line.startswith("$Comp"):
+                    raise ValueError(f"{sheet_file_name}:{comp_line_number}: "
+                                     "$Comp without $EndComp")
+            elif line.startswith("$Comp"):
+                comp_line_number = index + 1
+                field_reference = ""
+                ar_references = []
+            elif line.startswith("F1 "):
+                sub_sheet_file_names.append(
+                    os.path.join(directory, KicadSchematic.quoted_get(line)))
+        if comp_line_number:
+            raise ValueError(f"{sheet_file_name}:{comp_line_number}: $Comp without $EndComp")
+        return sub_sheet_file_names
+
+    # KicadSchematic.quoted_get():
+    @staticmethod
+    def quoted_get(text: str) -> str:
+        """Return the contents of the first double quoted string in some text."""
+        start_index: int = text.find('"') + 1
+        return text[start_index:text.find('"', start_index)] if start_index else ""
+
+
+# MarkedDocument:
+class MarkedDocument:
+    """Represents a text document with generated regions.
+
+    A generated region is the run of lines between a line that ends with
+    `<!-- NAME starts here. -->` and a line that ends with
+    `<!-- NAME ends here. -->`, where NAME names the region (e.g.
+    "NAME list" in `README.md`.)  The markers are located with a single
+    scan and several regions can be refreshed before the document is
+    saved once.
+    """
+
+    # *MARKER_PATTERN* matches a start or end marker at the end of a line:
+    MARKER_PATTERN = re.compile(r"<!-- (.+) (starts|ends) here\. -->$")
+
+    # MarkedDocument.__init__():
+    def __init__(self, text: str, file_name: str = "") -> None:
+        """Initialize a MarkedDocument.
+
+        Args:
+            *text* (*str*): The document text.
+            *file_name* (*str*):
+                (Optional: Defaults to "".)  The file name used by
+                *MarkedDocument*.*save*().
+
+        Raises:
+            *ValueError* if a marker is unmatched or repeated.
+
+        """
+        # Load values into *marked_document* (i.e. *self*):
+        marked_document: MarkedDocument = self
+        self.file_name: str = file_name
+        self.hashes_table: Dict[str, str] = {}
+        self.lines: List[str] = []
+        self.original_text: str = ""
+        self.regions_table: Dict[str, Tuple[int, int]] = {}
+        self.updates_table: Dict[str, List[str]] = {}
+        marked_document.text_load(text)
+
+    # MarkedDocument.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of a MarkedDocument."""
+        marked_document: MarkedDocument = self
+        return f"MarkedDocument('{marked_document.file_name}')"
+
+    # MarkedDocument.file_read():
+    @staticmethod
+    def file_read(file_name: str) -> "MarkedDocument":
+        """Return the MarkedDocument for a file."""
+        marked_file: IO[Any]
+        with open(file_name) as marked_file:
+            return MarkedDocument(marked_file.read(), file_name)
+
+    # MarkedDocument.lines_hash():
+    @staticmethod
+    def lines_hash(lines: List[str]) -> str:
+        """Return a content hash for some region lines."""
+        return hashlib.sha256('\n'.join(lines).encode("utf-8")).hexdigest()
+
+    # MarkedDocument.region_get():
+    def region_get(self, name: str) -> List[str]:
+        """Return the current lines of a region."""
+        marked_document: MarkedDocument = self
+        if name in marked_document.updates_table:
+            return marked_document.updates_table[name]
+        if name not in marked_document.regions_table:
+            raise ValueError(f"Region '{name}' is not present")
+        start_index: int
+        end_index: int
+        start_index, end_index = marked_document.regions_table[name]
+        return marked_document.lines[start_index:end_index]
+
+    # MarkedDocument.regions_update():
+    def regions_update(self, regions: Dict[str, List[str]]) -> List[str]:
+        """Replace the lines of several regions.
+
+        Args:
+            *regions* (*Dict*[*str*, *List*[*str*]]): A table of region
+                name to its new lines.
+
+        Returns:
+            (*List*[*str*]) Returns the names of the regions whose content
+                hash changed (in document order.)
+
+        Raises:
+            *ValueError* if a region is not present in the document.
+
+        """
+        marked_document: MarkedDocument = self
+        regions_table: Dict[str, Tuple[int, int]] = marked_document.regions_table
+        hashes_table: Dict[str, str] = marked_document.hashes_table
+        updates_table: Dict[str, List[str]] = marked_document.updates_table
+        name: str
+        lines: List[str]
+        for name, lines in regions.items():
+            if name not in regions_table:
+                raise ValueError(f"Region '{name}' is not present")
+            if MarkedDocument.lines_hash(lines) == hashes_table[name]:
+                updates_table.pop(name, None)
+            else:
+                updates_table[name] = lines
+        return sorted(updates_table.keys(), key=lambda name: regions_table[name][0])
+
+    # MarkedDocument.save():
+    def save(self) -> List[str]:
+        """Write a MarkedDocument back to its file if any region changed.
+
+        The text is written to a temporary file that is atomically renamed
+        over the original file, so readers never see a partial document.
+        The temporary file is removed if anything fails before the rename.
+
+        Returns:
+            (*List*[*str*]) Returns the names of the changed regions (or an
+                empty list if nothing was written.)
+
+        """
+        marked_document: MarkedDocument = self
+        file_name: str = marked_document.file_name
+        changed_names: List[str] = marked_document.regions_update({})
+        if changed_names:
+            text: str = marked_document.text_get()
+            temporary_file_name: str = f"{file_name}.{os.getpid()}.tmp"
+            marked_file: IO[Any]
+            try:
+                with open(temporary_file_name, "w") as marked_file:
+                    marked_file.write(text)
+                os.chmod(temporary_file_name, os.stat(file_name).st_mode & 0o7777)
+                os.replace(temporary_file_name, file_name)
+            finally:
+                # After a successful rename there is nothing left to remove:
+                if os.path.exists(temporary_file_name):
+                    os.remove(temporary_file_name)
+
+            # The file now matches *marked_document*:
+            marked_document.text_load(text)
+        return changed_names
+
+    # MarkedDocument.text_get():
+    def text_get(self) -> str:
+        """Return the MarkedDocument text with all region updates applied."""
+        marked_document: MarkedDocument = self
+        lines: List[str] = marked_document.lines
+        regions_table: Dict[str, Tuple[int, int]] = marked_document.regions_table
+        updates_table: Dict[str, List[str]] = marked_document.updates_table
+        if not updates_table:
+            return marked_document.original_text
+
+        # Splice the updated regions in with one pass over the regions in document order:
+        new_lines: List[str] = []
+        previous_index: int = 0
+        name: str
+        for name in sorted(updates_table.keys(), key=lambda name: regions_table[name][0]):
+            start_index: int
+            end_index: int
+            start_index, end_index = regions_table[name]
+            new_lines.extend(lines[previous_index:start_index])
+            new_lines.extend(updates_table[name])
+            previous_index = end_index
+        new_lines.extend(lines[previous_index:])
+        return '\n'.join(new_lines)
+
+    # MarkedDocument.text_load():
+    def text_load(self, text: str) -> None:
+        """Load the text of a MarkedDocument and locate its regions.
+
+        Args:
+            *text* (*str*): The document text.
+
+        Raises:
+            *ValueError* if a marker is unmatched or repeated.
+
+        """
+        # Reset *marked_document* (i.e. *self*):
+        marked_document: MarkedDocument = self
+        lines: List[str] = text.split('\n')
+        hashes_table: Dict[str, str] = {}
+        regions_table: Dict[str, Tuple[int, int]] = {}
+        marked_document.hashes_table = hashes_table
+        marked_document.lines = lines
+        marked_document.original_text = text
+        marked_document.regions_table = regions_table
+        marked_document.updates_table = {}
+
+        # Scan *lines* once, pairing each start marker with its end marker:
+        marker_pattern: Any = MarkedDocument.MARKER_PATTERN
+        starts_table: Dict[str, int] = {}
+        index: int
+        line: str
+        for index, line in enumerate(lines):
+            if line.endswith("-->"):
+                marker_match: Optional[Match[str]] = marker_pattern.search(line)
+                if marker_match is not None:
+                    name: str = marker_match.group(1)
+                    if marker_match.group(2) == "starts":
+                        if name in starts_table or name in regions_table:
+                            raise ValueError(f"Line {index + 1}: Region '{name}' is repeated")
+                        starts_table[name] = index + 1
+                    elif name in starts_table:
+                        start_index: int = starts_table.pop(name)
+                        regions_table[name] = (start_index, index)
+                        hashes_table[name] = MarkedDocument.lines_hash(lines[start_index:index])
+                    else:
+                        raise ValueError(f"Line {index + 1}: Region '{name}' was never started")
+        if starts_table:
+            raise ValueError(f"Region(s) {sorted(starts_table.keys())} never ended")
 
 
 # Scad:
@@ -403,6 +2784,179 @@ class Scad:
     provide all of the functiontality.
     """
 
+    # *KEY_COLUMNS* and *KEY_COLUMN_TYPES* describe the tuples returned by the various `key()`
+    # methods (e.g. *Circle*.*key*() and *Square*.*key*().)  Shorter keys omit trailing columns:
+    KEY_COLUMNS: Tuple[str, ...] = (
+        "Type", "Name", "X", "Y", "DX", "DY", "Angle", "Corner Radius", "Corner Count")
+    KEY_COLUMN_TYPES: Tuple[Callable[[str], Any], ...] = (
+        str, str, float, float, float, float, float, float, int)
+
+    # *COLOR_HEXES* maps each OpenSCAD color name (i.e. the SVG color names) to its `#RRGGBB`
+    # value.  It is precompiled below into *COLORS_RGBA*, which maps each lower case color name
+    # to its red, green, blue and alpha values between 0.0 and 1.0, and *COLORS_SET*, which is
+    # the frozen set of allowed lower case color names.  Both are built once at import time:
+    COLOR_HEXES: Dict[str, str] = {
+        # Purples:
+        "Lavender": "#E6E6FA",
+        "Thistle": "#D8BFD8",
+        "Plum": "#DDA0DD",
+        "Violet": "#EE82EE",
+        "Orchid": "#DA70D6",
+        "Fuchsia": "#FF00FF",
+        "Magenta": "#FF00FF",
+        "MediumOrchid": "#BA55D3",
+        "MediumPurple": "#9370DB",
+        "BlueViolet": "#8A2BE2",
+        "DarkViolet": "#9400D3",
+        "DarkOrchid": "#9932CC",
+        "DarkMagenta": "#8B008B",
+        "Purple": "#800080",
+        "Indigo": "#4B0082",
+        "DarkSlateBlue": "#483D8B",
+        "SlateBlue": "#6A5ACD",
+        "MediumSlateBlue": "#7B68EE",
+        # Pinks:
+        "Pink": "#FFC0CB",
+        "LightPink": "#FFB6C1",
+        "HotPink": "#FF69B4",
+        "DeepPink": "#FF1493",
+        "MediumVioletRed": "#C71585",
+        "PaleVioletRed": "#DB7093",
+        # Blues:
+        "Aqua": "#00FFFF",
+        "Cyan": "#00FFFF",
+        "LightCyan": "#E0FFFF",
+        "PaleTurquoise": "#AFEEEE",
+        "Aquamarine": "#7FFFD4",
+        "Turquoise": "#40E0D0",
+        "MediumTurquoise": "#48D1CC",
+        "DarkTurquoise": "#00CED1",
+        "CadetBlue": "#5F9EA0",
+        "SteelBlue": "#4682B4",
+        "LightSteelBlue": "#B0C4DE",
+        "PowderBlue": "#B0E0E6",
+        "LightBlue": "#ADD8E6",
+        "SkyBlue": "#87CEEB",
+        "LightSkyBlue": "#87CEFA",
+        "DeepSkyBlue": "#00BFFF",
+        "DodgerBlue": "#1E90FF",
+        "CornflowerBlue": "#6495ED",
+        "RoyalBlue": "#4169E1",
+        "Blue": "#0000FF",
+        "MediumBlue": "#0000CD",
+        "DarkBlue": "#00008B",
+        "Navy": "#000080",
+        "MidnightBlue": "#191970",
+        # Reds:
+        "IndianRed": "#CD5C5C",
+        "LightCoral": "#F08080",
+        "Salmon": "#FA8072",
+        "DarkSalmon": "#E9967A",
+        "LightSalmon": "#FFA07A",
+        "Red": "#FF0000",
+        "Crimson": "#DC143C",
+        "FireBrick": "#B22222",
+        "DarkRed": "#8B0000",
+        # Greens:
+        "GreenYellow": "#ADFF2F",
+        "Chartreuse": "#7FFF00",
+        "LawnGreen": "#7CFC00",
+        "Lime": "#00FF00",
+        "LimeGreen": "#32CD32",
+        "PaleGreen": "#98FB98",
+        "LightGreen": "#90EE90",
+        "MediumSpringGreen": "#00FA9A",
+        "SpringGreen": "#00FF7F",
+        "MediumSeaGreen": "#3CB371",
+        "SeaGreen": "#2E8B57",
+        "ForestGreen": "#228B22",
+        "Green": "#008000",
+        "DarkGreen": "#006400",
+        "YellowGreen": "#9ACD32",
+        "OliveDrab": "#6B8E23",
+        "Olive": "#808000",
+        "DarkOliveGreen": "#556B2F",
+        "MediumAquamarine": "#66CDAA",
+        "DarkSeaGreen": "#8FBC8F",
+        "LightSeaGreen": "#20B2AA",
+        "DarkCyan": "#008B8B",
+        "Teal": "#008080",
+        # Oranges (LightSalmon is listed with the Reds):
+        "Coral": "#FF7F50",
+        "Tomato": "#FF6347",
+        "OrangeRed": "#FF4500",
+        "DarkOrange": "#FF8C00",
+        "Orange": "#FFA500",
+        # Yellows:
+        "Gold": "#FFD700",
+        "Yellow": "#FFFF00",
+        "LightYellow": "#FFFFE0",
+        "LemonChiffon": "#FFFACD",
+        "LightGoldenrodYellow": "#FAFAD2",
+        "PapayaWhip": "#FFEFD5",
+        "Moccasin": "#FFE4B5",
+        "PeachPuff": "#FFDAB9",
+        "PaleGoldenrod": "#EEE8AA",
+        "Khaki": "#F0E68C",
+        "DarkKhaki": "#BDB76B",
+        # Browns:
+        "Cornsilk": "#FFF8DC",
+        "BlanchedAlmond": "#FFEBCD",
+        "Bisque": "#FFE4C4",
+        "NavajoWhite": "#FFDEAD",
+        "Wheat": "#F5DEB3",
+        "BurlyWood": "#DEB887",
+        "Tan": "#D2B48C",
+        "RosyBrown": "#BC8F8F",
+        "SandyBrown": "#F4A460",
+        "Goldenrod": "#DAA520",
+        "DarkGoldenrod": "#B8860B",
+        "Peru": "#CD853F",
+        "Chocolate": "#D2691E",
+        "SaddleBrown": "#8B4513",
+        "Sienna": "#A0522D",
+        "Brown": "#A52A2A",
+        "Maroon": "#800000",
+        # Whites:
+        "White": "#FFFFFF",
+        "Snow": "#FFFAFA",
+        "Honeydew": "#F0FFF0",
+        "MintCream": "#F5FFFA",
+        "Azure": "#F0FFFF",
+        "AliceBlue": "#F0F8FF",
+        "GhostWhite": "#F8F8FF",
+        "WhiteSmoke": "#F5F5F5",
+        "Seashell": "#FFF5EE",
+        "Beige": "#F5F5DC",
+        "OldLace": "#FDF5E6",
+        "FloralWhite": "#FFFAF0",
+        "Ivory": "#FFFFF0",
+        "AntiqueWhite": "#FAEBD7",
+        "Linen": "#FAF0E6",
+        "LavenderBlush": "#FFF0F5",
+        "MistyRose": "#FFE4E1",
+        # Grays:
+        "Gainsboro": "#DCDCDC",
+        "LightGrey": "#D3D3D3",
+        "Silver": "#C0C0C0",
+        "DarkGray": "#A9A9A9",
+        "Gray": "#808080",
+        "DimGray": "#696969",
+        "LightSlateGray": "#778899",
+        "SlateGray": "#708090",
+        "DarkSlateGray": "#2F4F4F",
+        "Black": "#000000",
+    }
+    COLORS_RGBA: Dict[str, Tuple[float, float, float, float]] = {
+        color_name.lower(): (int(hex_text[1:3], 16) / 255.0, int(hex_text[3:5], 16) / 255.0,
+                             int(hex_text[5:7], 16) / 255.0, 1.0)
+        for color_name, hex_text in COLOR_HEXES.items()}
+    COLORS_SET: FrozenSet[str] = frozenset(COLORS_RGBA.keys())
+
+    # *name_registry* is the active *NameRegistry* (see *NameRegistry*.*__enter__*()) that
+    # indexes the name of every *Scad* as it is constructed, or *None* if there is none:
+    name_registry: Optional[NameRegistry] = None
+
     # Scad.__init__()
     def __init__(self, name: str) -> None:
         """Create the base *Scad* object.
@@ -411,169 +2965,43 @@ class Scad:
             *name* (*str*): The name of the *Scad* object.
 
         """
-        # Stuff *name* into the *scad* object (i.e. *self*):
-        self.name: str = name
+        # Stuff *name* into the *scad* object (i.e. *self*) and register it if there is an
+        # active *name_registry*:
+        self.name: str = name
+        name_registry: Optional[NameRegistry] = Scad.name_registry
+        if name_registry is not None:
+            name_registry.register(self)
+
+    # Scad.color_rgba_get():
+    @staticmethod
+    def color_rgba_get(color_name: str, alpha: float = 1.0) -> Tuple[float, float, float, float]:
+        """Return the RGBA values of a color.
+
+        Args:
+            *color_name* (*str*): The color name (case does not matter.)
+            *alpha* (*float*): (Optional: Defaults to 1.0.)  The alpha
+                (i.e. opacity) value between 0.0 and 1.0.
+
+        Returns:
+            (*Tuple*[*float*, *float*, *float*, *float*]) Returns the
+                red, green, blue and alpha values between 0.0 and 1.0
+                (e.g. for mesh, glTF or SVG exporters.)
+
+        Raises:
+            *ValueError* if *color_name* is not a recognized color.
+
+        """
+        rgba: Optional[Tuple[float, float, float, float]] = Scad.COLORS_RGBA.get(
+            color_name.lower())
+        if rgba is None:
+            raise ValueError(f"Color '{color_name}' is not a recognized color.")
+        return rgba if alpha >= 1.0 else (rgba[0], rgba[1], rgba[2], alpha)
 
     # Scad.colors_set_get():
     @staticmethod
-    def colors_set_get() -> Set[str]:
-        """Return a set of lower case allowed colors."""
-        colors: List[str] = [
-            # Purples:
-            "Lavender"
-            "Thistle",
-            "Plum",
-            "Violet",
-            "Orchid",
-            "Fuchsia",
-            "Magenta",
-            "MediumOrchid",
-            "MediumPurple",
-            "BlueViolet",
-            "DarkViolet",
-            "DarkOrchid",
-            "DarkMagenta",
-            "Purple",
-            "Indigo",
-            "DarkSlateBlue",
-            "SlateBlue",
-            "MediumSlateBlue",
-            # Pinks:
-            "Pink",
-            "LightPink",
-            "HotPink",
-            "DeepPink",
-            "MediumVioletRed",
-            "PaleVioletRed",
-            # Blues:
-            "Aqua",
-            "Cyan",
-            "LightCyan",
-            "PaleTurquoise",
-            "Aquamarine",
-            "Turquoise",
-            "MediumTurquoise",
-            "DarkTurquoise",
-            "CadetBlue",
-            "SteelBlue",
-            "LightSteelBlue",
-            "PowderBlue",
-            "LightBlue",
-            "SkyBlue",
-            "LightSkyBlue",
-            "DeepSkyBlue",
-            "DodgerBlue",
-            "CornflowerBlue",
-            "RoyalBlue",
-            "Blue",
-            "MediumBlue",
-            "DarkBlue",
-            "Navy",
-            "MidnightBlue",
-            # Reds:
-            "IndianRed",
-            "LightCoral",
-            "Salmon",
-            "DarkSalmon",
-            "LightSalmon",
-            "Red",
-            "Crimson",
-            "FireBrick",
-            "DarkRed",
-            # Greens:
-            "GreenYellow",
-            "Chartreuse",
-            "LawnGreen",
-            "Lime",
-            "LimeGreen",
-            "PaleGreen",
-            "LightGreen",
-            "MediumSpringGreen",
-            "SpringGreen",
-            "MediumSeaGreen",
-            "SeaGreen",
-            "ForestGreen",
-            "Green",
-            "DarkGreen",
-            "YellowGreen",
-            "OliveDrab",
-            "Olive",
-            "DarkOliveGreen",
-            "MediumAquamarine",
-            "DarkSeaGreen",
-            "LightSeaGreen",
-            "DarkCyan",
-            "Teal",
-            # Oranges
-            "LightSalmon",
-            "Coral",
-            "Tomato",
-            "OrangeRed",
-            "DarkOrange",
-            "Orange",
-            # Yellows:
-            "Gold",
-            "Yellow",
-            "LightYellow",
-            "LemonChiffon",
-            "LightGoldenrodYellow",
-            "PapayaWhip",
-            "Moccasin",
-            "PeachPuff",
-            "PaleGoldenrod",
-            "Khaki",
-            "DarkKhaki",
-            # Browns:
-            "Cornsilk",
-            "BlanchedAlmond",
-            "Bisque",
-            "NavajoWhite",
-            "Wheat",
-            "BurlyWood",
-            "Tan",
-            "RosyBrown",
-            "SandyBrown",
-            "Goldenrod",
-            "DarkGoldenrod",
-            "Peru",
-            "Chocolate",
-            "SaddleBrown",
-            "Sienna",
-            "Brown",
-            "Maroon",
-            # Whites:
-            "White",
-            "Snow",
-            "Honeydew",
-            "MintCream",
-            "Azure",
-            "AliceBlue",
-            "GhostWhite",
-            "WhiteSmoke",
-            "Seashell",
-            "Beige",
-            "OldLace",
-            "FloralWhite",
-            "Ivory",
-            "AntiqueWhite",
-            "Linen",
-            "LavenderBlush",
-            "MistyRose",
-            # Grays:
-            "Gainsboro",
-            "LightGrey",
-            "Silver",
-            "DarkGray",
-            "Gray",
-            "DimGray",
-            "LightSlateGray",
-            "SlateGray",
-            "DarkSlateGray",
-            "Black",
-        ]
-        color: str
-        colors_set: Set[str] = {color.lower() for color in colors}
-        return colors_set
+    def colors_set_get() -> FrozenSet[str]:
+        """Return the frozen set of lower case allowed colors."""
+        return Scad.COLORS_SET
 
     # Scad.float_format():
     @staticmethod
@@ -583,30 +3011,173 @@ class Scad:
         value_text = "0.000" if value_text == "-0.000" else value_text
         return value_text
 
+    # Scad.keys_csv_file_read():
+    @staticmethod
+    def keys_csv_file_read(csv_file: IO[Any]) -> List[Tuple[Any, ...]]:
+        """Read keys back from an open file.
+
+        This is the inverse of *Scad*.*keys_csv_file_write*(), except that
+        the floating point values only have 3 digits after the decimal point.
+
+        Args:
+            *csv_file* (*IO*[*Any*]): An open file to read from.
+
+        Returns:
+            (*List*[*Tuple*[*Any*, ...]]) Returns the list of keys with each
+                column converted to its *KEY_COLUMN_TYPES* type.
+
+        Raises:
+            *ValueError* if the header or a value is not valid.
+
+        """
+        # Verify the header:
+        key_columns: Tuple[str, ...] = Scad.KEY_COLUMNS
+        csv_reader: Any = csv.reader(csv_file)
+        header: List[str] = next(csv_reader, [])
+        if tuple(header) != key_columns:
+            raise ValueError(f"Unexpected key CSV header: {header}")
+
+        # Convert each row into a *key* using precompiled *key_column_types*:
+        key_column_types: Tuple[Callable[[str], Any], ...] = Scad.KEY_COLUMN_TYPES
+        keys: List[Tuple[Any, ...]] = []
+        row: List[str]
+        for row in csv_reader:
+            if not (2 <= len(row) <= len(key_columns)):
+                raise ValueError(f"Line {csv_reader.line_num}: {len(row)} columns in key")
+            try:
+                keys.append(tuple([column_type(text)
+                                   for column_type, text in zip(key_column_types, row)]))
+            except ValueError as value_error:
+                raise ValueError(f"Line {csv_reader.line_num}: {value_error}")
+        return keys
+
     # Scad.keys_csv_file_write():
     @staticmethod
     def keys_csv_file_write(keys: List[Tuple[Any, ...]], csv_file: IO[Any]) -> None:
         """Write out keys to an open file.
 
+        The rows are formatted into a buffer by a *csv.writer* and written
+        to *csv_file* with a single write.  Floats are formatted with 3
+        digits after the decimal point and strings are always quoted.
+
         Args:
             *keys* (*List*[*Tuple*[*Any*, ...]]: A list of keys to
                 output.
             *csv_file* (*IO*[*Any*]): An open file to write to:
 
         """
-        # Output a header first:
+        # Precompile a formatter for each column.  A *Decimal* is written unquoted (it is
+        # numeric) and exactly as formatted (it is not a *float*):
         float_format: Callable[[float], str] = Scad.float_format
-        csv_file.write("Type,Name,X,Y,DX,DY,Angle,Corner Radius,Corner Count\n")
+        column_type: Callable[[str], Any]
+        formatters: List[Callable[[Any], Any]] = [
+            ((lambda value: Decimal(float_format(value))) if column_type is float else column_type)
+            for column_type in Scad.KEY_COLUMN_TYPES]
+
+        # Output a header followed by all of the *keys* into *buffer*:
+        buffer: io.StringIO = io.StringIO()
+        buffer.write(','.join(Scad.KEY_COLUMNS) + '\n')
+        csv_writer: Any = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+        key: Tuple[Any, ...]
+        csv_writer.writerows([[formatter(key_value)
+                               for formatter, key_value in zip(formatters, key)]
+                              for key in keys])
+        csv_file.write(buffer.getvalue())
+
+    # Scad.keys_diff():
+    @staticmethod
+    def keys_diff(old_keys: List[Tuple[Any, ...]], new_keys: List[Tuple[Any, ...]],
+                  tolerance: float = 0.001) -> List[Tuple[str, str, float, str]]:
+        """Return the differences between two lists of keys.
+
+        The keys are hash joined by name (a repeated name gets a "#2",
+        "#3", ... suffix), so the time is linear in the number of keys.
+
+        Args:
+            *old_keys* (*List*[*Tuple*[*Any*, ...]]): The original keys.
+            *new_keys* (*List*[*Tuple*[*Any*, ...]]): The updated keys.
+            *tolerance* (*float*):
+                (Optional: Defaults to 0.001.)  Numeric changes whose
+                magnitude is no more than *tolerance* are ignored.
+
+        Returns:
+            (*List*[*Tuple*[*str*, *str*, *float*, *str*]]) Returns a list
+                of (kind, name, magnitude, description) tuples, where kind
+                is one of "added", "removed", "changed", or "moved".  The
+                list is sorted by decreasing magnitude (added, removed and
+                changed entries have an infinite magnitude) and then name.
+
+        """
+        # Index both key lists by name:
+        old_table: Dict[str, Tuple[Any, ...]] = Scad.keys_index(old_keys)
+        new_table: Dict[str, Tuple[Any, ...]] = Scad.keys_index(new_keys)
+
+        # Perform the join:
+        inf: float = float("inf")
+        key_columns: Tuple[str, ...] = Scad.KEY_COLUMNS
+        differences: List[Tuple[str, str, float, str]] = []
+        name: str
+        old_key: Tuple[Any, ...]
+        for name, old_key in old_table.items():
+            new_key: Optional[Tuple[Any, ...]] = new_table.get(name)
+            if new_key is None:
+                differences.append(("removed", name, inf, str(old_key)))
+            elif old_key[0] != new_key[0] or len(old_key) != len(new_key):
+                differences.append(("changed", name, inf, f"{old_key} => {new_key}"))
+            else:
+                # Compare the numeric columns; the move distance is measured in X/Y:
+                deltas: List[Tuple[str, float]] = [
+                    (key_columns[index], float(new_key[index] - old_key[index]))
+                    for index in range(2, len(old_key))
+                    if abs(new_key[index] - old_key[index]) > tolerance]
+                if deltas:
+                    column_name: str
+                    delta: float
+                    magnitude: float = max(
+                        [sqrt((new_key[2] - old_key[2]) ** 2 + (new_key[3] - old_key[3]) ** 2)] +
+                        [abs(delta) for column_name, delta in deltas
+                         if column_name not in ("X", "Y")])
+                    description: str = ", ".join([f"{column_name} {delta:+.3f}"
+                                                  for column_name, delta in deltas])
+                    differences.append(("moved", name, magnitude, description))
+        for name, new_key in new_table.items():
+            if name not in old_table:
+                differences.append(("added", name, inf, str(new_key)))
+
+        # Sort by decreasing magnitude, then by name:
+        differences.sort(key=lambda difference: (-difference[2], difference[1], difference[0]))
+        return differences
+
+    # Scad.keys_diff_lines_get():
+    @staticmethod
+    def keys_diff_lines_get(differences: List[Tuple[str, str, float, str]]) -> List[str]:
+        """Return one line per *Scad*.*keys_diff*() difference."""
+        kind: str
+        name: str
+        magnitude: float
+        description: str
+        return [f"{kind} '{name}'" +
+                ("" if magnitude == float("inf") else f" by {magnitude:.3f}") +
+                f": {description}"
+                for kind, name, magnitude, description in differences]
+
+    # Scad.keys_index():
+    @staticmethod
+    def keys_index(keys: List[Tuple[Any, ...]]) -> Dict[str, Tuple[Any, ...]]:
+        """Return a table of keys indexed by name.
+
+        A name that occurs more than once gets a "#N" suffix on each of
+        its later occurrences.
+        """
+        table: Dict[str, Tuple[Any, ...]] = {}
+        counts: Dict[str, int] = {}
         key: Tuple[Any, ...]
         for key in keys:
-            key_value: Any
-            key_texts: List[str] = []
-            for key_value in key:
-                key_text: str = (f'"{key_value}"' if isinstance(key_value, str)
-                                 else (float_format(key_value) if isinstance(key_value, float)
-                                       else str(key_value)))
-                key_texts.append(key_text)
-            csv_file.write(','.join(key_texts) + '\n')
+            name: str = key[1]
+            count: int = counts.get(name, 0) + 1
+            counts[name] = count
+            table[name if count == 1 else f"{name}#{count}"] = key
+        return table
 
     # Scad.html_table_file_write():
     @staticmethod
@@ -621,22 +3192,23 @@ class Scad:
 
         """
         # Output the HTML Head and start the HTML Body with *title* and Table:
-        html_file.write("<HTML>\n")
-        html_file.write(" <Head>\n")
-        html_file.write(f"  <Title>{title}</Title>\n")
-        html_file.write(" </Head>\n")
-        html_file.write(" <Body>\n")
-        html_file.write(f"  <H1>{title}</H1>\n")
-        html_file.write("  <Table>\n")
+        html_lines: List[str] = [
+            "<HTML>",
+            " <Head>",
+            f"  <Title>{title}</Title>",
+            " </Head>",
+            " <Body>",
+            f"  <H1>{title}</H1>",
+            "  <Table>",
+        ]
 
         # Output the *headings*:
-        headings_text: str = "Index,Type,Name,X,Y,DX,DY,Angle,Corner Radius,Corner Count"
-        headings: List[str] = headings_text.split(',')
+        headings: List[str] = ["Index"] + list(Scad.KEY_COLUMNS)
         heading: str
-        heading_row_text: str = (
-            "   <TR>\n" +
-            '\n'.join([f'    <TH align="left">{heading}</TH>' for heading in headings]) +
-            "\n   </TR>\n"
+        heading_row_lines: List[str] = (
+            ["   <TR>"] +
+            [f'    <TH align="left">{heading}</TH>' for heading in headings] +
+            ["   </TR>"]
         )
         # Now output all of the keys:
         float_format: Callable[[float], str] = Scad.float_format
@@ -644,21 +3216,164 @@ class Scad:
         for key_index, key in enumerate(keys):
             # Start a row for *key*:
             if key_index % 20 == 0:
-                html_file.write(heading_row_text)
-            html_file.write("   <TR>\n")
-            html_file.write(f'    <TD align="left">{key_index}</TD>\n')
+                html_lines.extend(heading_row_lines)
+            html_lines.append("   <TR>")
+            html_lines.append(f'    <TD align="left">{key_index}</TD>')
             key_value: Any
-            for key_value in key:
-                # Output *key_value*:
-                key_text: str = (float_format(key_value) if isinstance(key_value, float)
-                                 else str(key_value))
-                html_file.write(f'    <TD align="left">{key_text}</TD>\n')
-            html_file.write("   </TR>\n")
-
-        # Wrap up the the Table, Body and HTML:
-        html_file.write("  </Table>\n")
-        html_file.write(" </Body>\n")
-        html_file.write("</HTML>\n")
+            html_lines.extend([
+                '    <TD align="left">' +
+                (float_format(key_value) if isinstance(key_value, float) else str(key_value)) +
+                '</TD>'
+                for key_value in key])
+            html_lines.append("   </TR>")
+
+        # Wrap up the the Table, Body and HTML and write everything out at once:
+        html_lines.extend(["  </Table>", " </Body>", "</HTML>", ""])
+        html_file.write('\n'.join(html_lines))
+
+    # Scad.keys_html_report_write():
+    @staticmethod
+    def keys_html_report_write(keys_tables: List[Tuple[str, List[Tuple[Any, ...]]]],
+                               html_file: IO[Any], title: str) -> None:
+        """Write out several key tables as one self-contained HTML report.
+
+        Each key table is embedded as a compact JSON array and rendered by
+        a small inline script that supports sorting (click a heading) and
+        filtering (type into the box above the table.)  The report needs
+        no external style sheets or scripts, so it works offline.
+
+        Args:
+            *keys_tables* (*List*[*Tuple*[*str*, *List*[*Tuple*[*Any*, ...]]]]):
+                A list of (caption, keys) tuples (e.g. the Romi base and
+                expansion plate keys.)
+            *html_file* (*IO*[*Any*]): An open file to write HTML to.
+            *title* (*str*): The title to use in the generated HTML.
+
+        """
+        # Round the floats so that the embedded JSON stays compact.  "</" is escaped so that
+        # no name can terminate the <script> element early:
+        caption: str
+        keys: List[Tuple[Any, ...]]
+        key: Tuple[Any, ...]
+        key_value: Any
+        tables: List[Dict[str, Any]] = [
+            {"caption": caption,
+             "keys": [[round(key_value, 3) if isinstance(key_value, float) else key_value
+                       for key_value in key]
+                      for key in keys]}
+            for caption, keys in keys_tables]
+        json_text: str = json.dumps({"columns": list(Scad.KEY_COLUMNS), "tables": tables},
+                                    separators=(",", ":")).replace("</", "<\\/")
+
+        # Assemble the entire document and write it out at once:
+        escaped_title: str = html.escape(title)
+        html_lines: List[str] = [
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{escaped_title}</title>",
+            "<style>",
+            "table{border-collapse:collapse;margin-bottom:2em}",
+            "th,td{border:1px solid #ccc;padding:2px 6px;text-align:left}",
+            "th{cursor:pointer;background:#eee}",
+            "td.n{text-align:right}",
+            "</style>",
+            "</head>",
+            "<body>",
+            f"<h1>{escaped_title}</h1>",
+            '<div id="tables"></div>',
+            f'<script type="application/json" id="keys">{json_text}</script>',
+            "<script>",
+            "(function () {",
+            '  var data = JSON.parse(document.getElementById("keys").textContent);',
+            '  var root = document.getElementById("tables");',
+            "  function add(parent, tag, text) {",
+            "    var element = document.createElement(tag);",
+            "    if (text !== undefined) { element.textContent = text; }",
+            "    parent.appendChild(element);",
+            "    return element;",
+            "  }",
+            "  function cell(value) {",
+            '    return value === null || value === undefined ? "" :',
+            '      (typeof value === "number" && !Number.isInteger(value) ?',
+            "       value.toFixed(3) : String(value));",
+            "  }",
+            "  data.tables.forEach(function (table) {",
+            '    add(root, "h2", table.caption + " (" + table.keys.length + ")");',
+            '    var filter = add(root, "input");',
+            '    filter.placeholder = "Filter";',
+            '    var element = add(root, "table");',
+            '    var head = add(add(element, "thead"), "tr");',
+            '    var body = add(element, "tbody");',
+            "    var rows = table.keys.map(function (key, index) { return [index].concat(key); });",
+            "    var sort_column = -1;",
+            "    var sort_sign = 1;",
+            "    function render() {",
+            "      var text = filter.value.toLowerCase();",
+            '      body.textContent = "";',
+            "      rows.forEach(function (row) {",
+            "        var texts = row.map(cell);",
+            '        if (text && texts.join(" ").toLowerCase().indexOf(text) < 0) { return; }',
+            '        var tr = add(body, "tr");',
+            "        texts.forEach(function (cell_text, index) {",
+            '          var td = add(tr, "td", cell_text);',
+            '          if (typeof row[index] === "number") { td.className = "n"; }',
+            "        });",
+            "      });",
+            "    }",
+            '    ["Index"].concat(data.columns).forEach(function (column, index) {',
+            '      add(head, "th", column).onclick = function () {',
+            "        sort_sign = sort_column === index ? -sort_sign : 1;",
+            "        sort_column = index;",
+            "        rows.sort(function (row1, row2) {",
+            "          var value1 = row1[index];",
+            "          var value2 = row2[index];",
+            "          if (value1 === value2) { return 0; }",
+            "          if (value1 === null || value1 === undefined) { return 1; }",
+            "          if (value2 === null || value2 === undefined) { return -1; }",
+            "          return (value1 < value2 ? -1 : 1) * sort_sign;",
+            "        });",
+            "        render();",
+            "      };",
+            "    });",
+            "    filter.oninput = render;",
+            "    render();",
+            "  });",
+            "})();",
+            "</script>",
+            "</body>",
+            "</html>",
+            "",
+        ]
+        html_file.write('\n'.join(html_lines))
+
+    # Scad.keys_table_get():
+    @staticmethod
+    def keys_table_get(keys: List[Tuple[Any, ...]]) -> Dict[str, List[Any]]:
+        """Return keys as a columnar table.
+
+        Args:
+            *keys* (*List*[*Tuple*[*Any*, ...]]: A list of keys.
+
+        Returns:
+            (*Dict*[*str*, *List*[*Any*]]) Returns a table that maps each
+                *KEY_COLUMNS* name to a list of the values in that column,
+                where *None* fills in for a short key (e.g. a Circle has
+                no corner radius.)
+
+        """
+        key_columns: Tuple[str, ...] = Scad.KEY_COLUMNS
+        column_name: str
+        columns: List[List[Any]] = [[] for column_name in key_columns]
+        key: Tuple[Any, ...]
+        for key in keys:
+            key_size: int = len(key)
+            index: int
+            column: List[Any]
+            for index, column in enumerate(columns):
+                column.append(key[index] if index < key_size else None)
+        return {column_name: column for column_name, column in zip(key_columns, columns)}
 
     # Scad.polygon_scad_lines_append():
     def polygon_scad_lines_append(self, simple_polygons: "List[SimplePolygon]",
@@ -708,6 +3423,9 @@ class Scad:
 class ScadProgram:
     """Represents top level OpenScad program."""
 
+    # Bump *CACHE_VERSION* whenever the layout of the pickled cache file changes:
+    CACHE_VERSION: int = 2
+
     # ScadProgram.__init__():
     def __init__(self, name: str) -> None:
         """Initialize a ScadProgram."""
@@ -715,6 +3433,7 @@ class ScadProgram:
         # scad_program: ScadProgram = self
         self.if2d: If2D = If2D("Name If2D", "false", [])
         self.if3d: If3D = If3D("Name If3D", "false", [])
+        self.kicad_boards: Dict[str, KicadBoard] = {}
         self.name: str = name
         self.scads: List[Scad] = []
         self.modules_table: Dict[str, Scad] = {}
@@ -739,9 +3458,89 @@ class ScadProgram:
         scads: List[Scad] = scad_program.scads
         scads.append(scad)
 
-    # ScadProgram.read_me_update():
-    def read_me_update(self, read_me_text: str) -> str:
-        """Update the README.md file with acceptable selecton names."""
+    # ScadProgram.cache_load():
+    @staticmethod
+    def cache_load(cache_file_name: str, sources_hash: str) -> "Optional[ScadProgram]":
+        """Load a previously built ScadProgram from a cache file.
+
+        Args:
+            *cache_file_name* (*str*):
+                The cache file written by *ScadProgram*.*cache_save*().
+            *sources_hash* (*str*):
+                The hash of the sources that built the *ScadProgram*
+                (see *ScadProgram*.*sources_hash_get*().)
+
+        Returns:
+            (*Optional*[*ScadProgram*]) Returns the cached *ScadProgram*
+                or *None* if the cache file is missing, corrupted, from
+                a different *CACHE_VERSION*, or from different sources.
+
+        """
+        # Read the *cache_file_name*, bailing out on any failure:
+        scad_program: Optional[ScadProgram] = None
+        cache_file: IO[bytes]
+        try:
+            with open(cache_file_name, "rb") as cache_file:
+                cache_bytes: bytes = cache_file.read()
+            cache_version: int
+            cache_sources_hash: str
+            cache_scad_program: Any
+            cache_version, cache_sources_hash, cache_scad_program = pickle.loads(
+                zlib.decompress(cache_bytes))
+            if (cache_version == ScadProgram.CACHE_VERSION and
+                    cache_sources_hash == sources_hash and
+                    isinstance(cache_scad_program, ScadProgram)):
+                scad_program = cache_scad_program
+        except (OSError, EOFError, ValueError, TypeError,
+                AttributeError, ImportError, pickle.UnpicklingError, zlib.error):
+            scad_program = None
+        return scad_program
+
+    # ScadProgram.cache_save():
+    def cache_save(self, cache_file_name: str, sources_hash: str) -> None:
+        """Save a ScadProgram to a cache file.
+
+        The whole node tree (including *modules_table*, *if2d*, and
+        *if3d*) is pickled, compressed and written to a temporary file
+        that is atomically renamed to *cache_file_name*.  The temporary
+        file is removed if anything goes wrong before the rename.
+
+        Args:
+            *cache_file_name* (*str*): The cache file name to write.
+            *sources_hash* (*str*): The hash of the sources that built
+                the *scad_program* (i.e. *self*).
+
+        """
+        # Pickle *scad_program* (i.e. *self*) along with the version and hash:
+        scad_program: ScadProgram = self
+        cache_bytes: bytes = zlib.compress(
+            pickle.dumps((ScadProgram.CACHE_VERSION, sources_hash, scad_program),
+                         pickle.HIGHEST_PROTOCOL), 1)
+
+        # Write to a temporary file and rename, so a reader never sees a partial cache file:
+        temporary_file_name: str = f"{cache_file_name}.{os.getpid()}.tmp"
+        cache_file: IO[bytes]
+        try:
+            with open(temporary_file_name, "wb") as cache_file:
+                cache_file.write(cache_bytes)
+            os.replace(temporary_file_name, cache_file_name)
+        finally:
+            # After a successful rename there is nothing left to remove:
+            if os.path.exists(temporary_file_name):
+                os.remove(temporary_file_name)
+
+    # ScadProgram.kicad_board_append():
+    def kicad_board_append(self, kicad_board: KicadBoard) -> None:
+        """Register a KicadBoard with a ScadProgram."""
+        scad_program: ScadProgram = self
+        kicad_boards: Dict[str, KicadBoard] = scad_program.kicad_boards
+        name: str = kicad_board.name
+        assert name not in kicad_boards, f"KicadBoard '{name}' has already been defined"
+        kicad_boards[name] = kicad_board
+
+    # ScadProgram.name_list_lines_get():
+    def name_list_lines_get(self) -> List[str]:
+        """Return the `README.md` "NAME list" region lines."""
         # Grab some values from *scad_program* (i.e. *self*):
         scad_program: ScadProgram = self
         if2d: If2D = scad_program.if2d
@@ -751,42 +3550,48 @@ class ScadProgram:
         all_named_mark_downs: List[Tuple[str, ...]] = if2d.named_mark_downs + if3d.named_mark_downs
         all_named_mark_downs.sort()
 
-        # Split *read_me_text* into *read_me_lines* and search for the markers that
-        # specify the *start_index* and *end_index* of where to insert the updates:
-        read_me_lines: List[str] = read_me_text.split('\n')
-        end_index: int = -1
-        start_index: int = -1
-        read_me_line_index: int
-        read_me_line: str
-        for read_me_line_index, read_me_line in enumerate(read_me_lines):
-            if read_me_line.endswith('>'):
-                if read_me_line.endswith("<!-- NAME list starts here. -->"):
-                    start_index = read_me_line_index + 1
-                elif read_me_line.endswith("<!-- NAME list ends here. -->"):
-                    end_index = read_me_line_index
-        assert start_index >= 0 and end_index >= 0, "README.md is broken"
-
-        # Extract *before_lines*, *previous_middle_lines*, and *after_lines*:
-        before_lines: List[str] = read_me_lines[:start_index]
-        # previous_middle_lines: List[str] = read_me_lines[start_index:end_index]
-        after_lines: List[str] = read_me_lines[end_index:]
-
-        # Construct *new_middle_lines*:
-        new_middle_lines: List[str] = []
+        # Construct *name_list_lines*:
+        name_list_lines: List[str] = []
         named_mark_down: Tuple[str, ...]
         for named_mark_down in all_named_mark_downs:
             name: str = named_mark_down[0]
-            new_middle_lines.append("")
-            new_middle_lines.append(f"  * `{name}`:")
+            name_list_lines.append("")
+            name_list_lines.append(f"  * `{name}`:")
             mark_down_line: str
             for mark_down_line in named_mark_down[1:]:
-                new_middle_lines.append(f"    {mark_down_line}")
-        new_middle_lines.append("")
+                name_list_lines.append(f"    {mark_down_line}")
+        name_list_lines.append("")
+        return name_list_lines
+
+    # ScadProgram.name_use_get():
+    def name_use_get(self, name: str) -> "Optional[Scad]":
+        """Return the module use that renders a name.
+
+        Args:
+            *name* (*str*): A name registered via `name_match_append()`.
+
+        Returns:
+            (*Optional*[*Scad*]) Returns the *UseModule2D* or *UseModule3D*
+                for *name* or *None* if *name* is not registered.
+
+        """
+        scad_program: ScadProgram = self
+        then_expression: str = f'name == "{name}"'
+        then_clauses: List[Tuple[str, List[Any]]] = (
+            list(scad_program.if2d.then_clauses) + list(scad_program.if3d.then_clauses))
+        then_clause: Tuple[str, List[Any]]
+        for then_clause in then_clauses:
+            if then_clause[0] == then_expression and then_clause[1]:
+                return then_clause[1][0]
+        return None
 
-        # Consturct *new_read_me_text* from *new_lines* and return it:
-        new_lines: List[str] = before_lines + new_middle_lines + after_lines
-        new_read_me_text: str = '\n'.join(new_lines)
-        return new_read_me_text
+    # ScadProgram.read_me_update():
+    def read_me_update(self, read_me_text: str) -> str:
+        """Update the README.md file with acceptable selecton names."""
+        scad_program: ScadProgram = self
+        read_me: MarkedDocument = MarkedDocument(read_me_text)
+        read_me.regions_update({"NAME list": scad_program.name_list_lines_get()})
+        return read_me.text_get()
 
     # ScadProgram.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
@@ -822,6 +3627,334 @@ class ScadProgram:
         # Append the final comment:
         scad_lines.append(f"{indent}// End ScadProgram('{name}')")
 
+    # ScadProgram.sources_hash_get():
+    @staticmethod
+    def sources_hash_get(directory: str = "",
+                         input_file_names: Optional[List[str]] = None) -> str:
+        """Return a hash of all of the `.py` files in a directory.
+
+        Args:
+            *directory* (*str*):
+                (Optional: Defaults to the `scad_models` package
+                directory.)  The directory to scan.
+            *input_file_names* (*Optional*[*List*[*str*]]):
+                (Optional: Defaults to *None*.)  Any other input files
+                to hash along with the `.py` files.  A missing input
+                file is hashed as missing rather than raising an error.
+
+        Returns:
+            (*str*) Returns the SHA-256 hex digest of the file names and
+                contents of all of the `.py` files in *directory* and of
+                the *input_file_names*.
+
+        """
+        # Hash the sorted file names and their contents:
+        if directory == "":
+            directory = os.path.dirname(os.path.abspath(__file__))
+        sha256: Any = hashlib.sha256()
+        sha256.update(f"CACHE_VERSION={ScadProgram.CACHE_VERSION}".encode("utf-8"))
+        file_name: str
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith(".py"):
+                py_file: IO[bytes]
+                with open(os.path.join(directory, file_name), "rb") as py_file:
+                    sha256.update(file_name.encode("utf-8"))
+                    sha256.update(py_file.read())
+
+        # Hash the *input_file_names* in the order given, since the order is fixed by the caller:
+        input_file: IO[bytes]
+        for file_name in ([] if input_file_names is None else input_file_names):
+            sha256.update(f"\0input={file_name}\0".encode("utf-8"))
+            if os.path.isfile(file_name):
+                with open(file_name, "rb") as input_file:
+                    sha256.update(input_file.read())
+            else:
+                sha256.update(b"\0missing\0")
+        return sha256.hexdigest()
+
+    # ScadProgram.svg_files_write():
+    def svg_files_write(self, directory: str) -> List[str]:
+        """Write an `.svg` file for each name registered with the If2D.
+
+        Args:
+            *directory* (*str*):
+                The directory to write the `NAME.svg` files into.
+
+        Returns:
+            (*List*[*str*]) Returns the list of `.svg` file names that
+                were written.
+
+        """
+        # Grab some values from *scad_program* (i.e. *self*):
+        scad_program: ScadProgram = self
+        if2d: If2D = scad_program.if2d
+        then_clauses: List[Tuple[str, List[Scad2D]]] = if2d.then_clauses
+
+        # Sweep through each *then_clause* that was created by *If2D.name_match_append*():
+        float_format: Callable[[float], str] = Scad.float_format
+        svg_file_names: List[str] = []
+        then_clause: Tuple[str, List[Scad2D]]
+        for then_clause in then_clauses:
+            then_expression: str = then_clause[0]
+            then_scad2ds: List[Scad2D] = then_clause[1]
+            name_match: Optional[Match[str]] = re.fullmatch(r'name == "(.*)"', then_expression)
+            if name_match is None:
+                continue
+            name: str = name_match.group(1)
+
+            # Generate the *body_lines* first, since this fills in *svg_defs*:
+            svg_defs: Dict[str, List[str]] = {}
+            body_lines: List[str] = []
+            scad2d: Scad2D
+            for scad2d in then_scad2ds:
+                scad2d.svg_lines_append(body_lines, "  ", svg_defs)
+
+            # Compute the view box with a 1mm margin.  SVG has Y pointing down, so the
+            # drawing is flipped and the view box is in flipped coordinates as well:
+            bounding_box: Optional[Tuple[P2D, P2D]] = Scad2D.bounding_boxes_merge(
+                [scad2d.bounding_box_get() for scad2d in then_scad2ds])
+            lower_left: P2D = P2D(0.0, 0.0) if bounding_box is None else bounding_box[0]
+            upper_right: P2D = P2D(1.0, 1.0) if bounding_box is None else bounding_box[1]
+            margin: float = 1.0
+            width_text: str = float_format(upper_right.x - lower_left.x + 2.0 * margin)
+            height_text: str = float_format(upper_right.y - lower_left.y + 2.0 * margin)
+            view_box_text: str = (f"{float_format(lower_left.x - margin)} "
+                                  f"{float_format(-upper_right.y - margin)} "
+                                  f"{width_text} {height_text}")
+
+            # Assemble all of the *svg_lines* and write them out with a single write:
+            svg_lines: List[str] = [
+                '<?xml version="1.0" encoding="UTF-8"?>',
+                '<svg xmlns="http://www.w3.org/2000/svg" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink"',
+                f' width="{width_text}mm" height="{height_text}mm" viewBox="{view_box_text}">',
+                f" <title>{name}</title>",
+                " <defs>"]
+            svg_def_lines: List[str]
+            for svg_def_lines in svg_defs.values():
+                svg_lines.extend(svg_def_lines)
+            svg_lines.append(" </defs>")
+            svg_lines.append(' <g transform="scale(1,-1)" fill="green" stroke="none">')
+            svg_lines.extend(body_lines)
+            svg_lines.append(" </g>")
+            svg_lines.append("</svg>")
+            svg_lines.append("")
+            svg_file_name: str = os.path.join(directory, f"{name}.svg")
+            svg_file: IO[Any]
+            with open(svg_file_name, "w") as svg_file:
+                svg_file.write('\n'.join(svg_lines))
+            svg_file_names.append(svg_file_name)
+        return svg_file_names
+
+
+# ScadSnapshot:
+class ScadSnapshot:
+    """Represents a normalized and hashed per module snapshot of a ScadProgram.
+
+    A ScadSnapshot is used as a golden output regression check for the
+    `.scad` files that a *ScadProgram* emits.  The emitted lines are split
+    up by top level *Scad* (i.e. mostly *Module2D*'s and *Module3D*'s,)
+    normalized (see *ScadSnapshot*.*line_normalize*()) and hashed.  A
+    saved snapshot stores each module hash next to its compressed text, so
+    comparing a new build against it only compares the hashes and only
+    decompresses and diffs the modules that actually changed.
+
+    Attributes:
+        *compressed* (*Dict*[*str*, *bytes*]):
+            The zlib compressed text of each loaded module.
+        *hashes* (*Dict*[*str*, *str*]):
+            The hash of each module text in emission order.
+        *name* (*str*): The *ScadProgram* name.
+        *texts* (*Dict*[*str*, *str*]):
+            The normalized text of each module that has been appended or
+            decompressed so far.
+
+    """
+
+    # Bump *VERSION* whenever the snapshot file layout or the normalization changes:
+    VERSION: int = 1
+
+    # *NEGATIVE_ZERO_PATTERN* matches a negative zero such as "-0.000":
+    NEGATIVE_ZERO_PATTERN: Pattern[str] = re.compile(r"(?<![\w.])-(0\.0+)(?![\d])")
+
+    # ScadSnapshot.__init__():
+    def __init__(self, name: str) -> None:
+        """Initialize an empty ScadSnapshot."""
+        # Load values into *scad_snapshot* (i.e. *self*):
+        # scad_snapshot: ScadSnapshot = self
+        self.compressed: Dict[str, bytes] = {}
+        self.hashes: Dict[str, str] = {}
+        self.name: str = name
+        self.texts: Dict[str, str] = {}
+
+    # ScadSnapshot.__str__():
+    def __str__(self) -> str:
+        """Return a string representation of a ScadSnapshot."""
+        scad_snapshot: ScadSnapshot = self
+        return f"ScadSnapshot('{scad_snapshot.name}',{len(scad_snapshot.hashes)})"
+
+    # ScadSnapshot.diff_lines_get():
+    def diff_lines_get(self, new_snapshot: "ScadSnapshot", context: int = 0) -> List[str]:
+        """Return a minimal textual diff of the modules that differ.
+
+        Args:
+            *new_snapshot* (*ScadSnapshot*): The snapshot of a new build
+                to compare against *scad_snapshot* (i.e. *self*), which
+                is usually the golden one.
+            *context* (*int*): (Optional: Defaults to 0.)  The number of
+                unchanged context lines to show around each change.
+
+        Returns:
+            (*List*[*str*]) Returns the unified diff lines of each
+                differing module (an empty list when nothing differs.)
+                An added or removed module is diffed against no lines.
+
+        """
+        scad_snapshot: ScadSnapshot = self
+        diff_lines: List[str] = []
+        module_name: str
+        for module_name in scad_snapshot.differences_get(new_snapshot):
+            old_lines: List[str] = (scad_snapshot.text_get(module_name).split("\n")
+                                    if module_name in scad_snapshot.hashes else [])
+            new_lines: List[str] = (new_snapshot.text_get(module_name).split("\n")
+                                    if module_name in new_snapshot.hashes else [])
+            diff_lines.extend(difflib.unified_diff(
+                old_lines, new_lines, f"{scad_snapshot.name}: {module_name}",
+                f"{new_snapshot.name}: {module_name}", n=context, lineterm=""))
+        return diff_lines
+
+    # ScadSnapshot.differences_get():
+    def differences_get(self, new_snapshot: "ScadSnapshot") -> List[str]:
+        """Return the names of the modules that differ from another ScadSnapshot.
+
+        Only the module hashes are compared.  The differing module names
+        are returned in *scad_snapshot* (i.e. *self*) order followed by
+        the modules that only occur in *new_snapshot*.
+        """
+        scad_snapshot: ScadSnapshot = self
+        old_hashes: Dict[str, str] = scad_snapshot.hashes
+        new_hashes: Dict[str, str] = new_snapshot.hashes
+        module_name: str
+        old_hash: str
+        differences: List[str] = [module_name for module_name, old_hash in old_hashes.items()
+                                  if new_hashes.get(module_name) != old_hash]
+        differences.extend([module_name for module_name in new_hashes.keys()
+                            if module_name not in old_hashes])
+        return differences
+
+    # ScadSnapshot.line_normalize():
+    @staticmethod
+    def line_normalize(line: str) -> str:
+        """Return a line with trailing white space removed and "-0.000" replaced by "0.000"."""
+        line = line.rstrip()
+        return ScadSnapshot.NEGATIVE_ZERO_PATTERN.sub(r"\1", line) if "-0." in line else line
+
+    # ScadSnapshot.load():
+    @staticmethod
+    def load(snapshot_file_name: str) -> "ScadSnapshot":
+        """Load a ScadSnapshot from a file written by *ScadSnapshot*.*save*().
+
+        Raises:
+            *ValueError* if the file is not a snapshot of the current *VERSION*.
+
+        """
+        snapshot_file: IO[Any]
+        with open(snapshot_file_name) as snapshot_file:
+            snapshot_json: Any = json.load(snapshot_file)
+        version: int = ScadSnapshot.VERSION
+        if not isinstance(snapshot_json, dict) or snapshot_json.get("version") != version:
+            raise ValueError(f"'{snapshot_file_name}' is not a version {version} "
+                             "ScadSnapshot file")
+        scad_snapshot: ScadSnapshot = ScadSnapshot(snapshot_json["name"])
+        module_name: str
+        module_hash: str
+        compressed_text: str
+        for module_name, module_hash, compressed_text in snapshot_json["modules"]:
+            scad_snapshot.hashes[module_name] = module_hash
+            scad_snapshot.compressed[module_name] = base64.b64decode(compressed_text)
+        return scad_snapshot
+
+    # ScadSnapshot.module_append():
+    def module_append(self, module_name: str, scad_lines: List[str]) -> None:
+        """Append the normalized and hashed lines of one module to a ScadSnapshot.
+
+        A repeated *module_name* is made unique with a " #N" suffix.
+        """
+        scad_snapshot: ScadSnapshot = self
+        hashes: Dict[str, str] = scad_snapshot.hashes
+        unique_name: str = module_name
+        index: int = 2
+        while unique_name in hashes:
+            unique_name = f"{module_name} #{index}"
+            index += 1
+        line_normalize: Callable[[str], str] = ScadSnapshot.line_normalize
+        line: str
+        text: str = "\n".join([line_normalize(line) for line in scad_lines])
+        scad_snapshot.texts[unique_name] = text
+        hashes[unique_name] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    # ScadSnapshot.program_get():
+    @staticmethod
+    def program_get(scad_program: "ScadProgram") -> "ScadSnapshot":
+        """Return the ScadSnapshot of the text that a ScadProgram emits.
+
+        Each top level *Scad* and the *if2d*/*if3d* name dispatch trees
+        become one module in the snapshot, so the snapshot text matches
+        *ScadProgram*.*scad_lines_append*() without the begin/end comments.
+        """
+        scad_snapshot: ScadSnapshot = ScadSnapshot(scad_program.name)
+        if2d: If2D = scad_program.if2d
+        if2d.lock()
+        if3d: If3D = scad_program.if3d
+        if3d.lock()
+        scad: Scad
+        for scad in scad_program.scads + [if2d, if3d]:
+            scad_lines: List[str] = []
+            scad.scad_lines_append(scad_lines, "")
+            scad_snapshot.module_append(scad.name, scad_lines)
+        return scad_snapshot
+
+    # ScadSnapshot.report_get():
+    def report_get(self, new_snapshot: "ScadSnapshot", context: int = 0) -> str:
+        """Return a summary line followed by the diff of each differing module."""
+        scad_snapshot: ScadSnapshot = self
+        differences: List[str] = scad_snapshot.differences_get(new_snapshot)
+        lines: List[str] = [f"{len(differences)} of {len(scad_snapshot.hashes)} modules differ "
+                            f"from ScadSnapshot('{scad_snapshot.name}')"]
+        lines.extend(scad_snapshot.diff_lines_get(new_snapshot, context))
+        return "\n".join(lines) + "\n"
+
+    # ScadSnapshot.save():
+    def save(self, snapshot_file_name: str) -> None:
+        """Save a ScadSnapshot to a file.
+
+        The file can be read back with *ScadSnapshot*.*load*().
+        """
+        scad_snapshot: ScadSnapshot = self
+        modules: List[List[str]] = []
+        module_name: str
+        module_hash: str
+        for module_name, module_hash in scad_snapshot.hashes.items():
+            compressed: bytes = scad_snapshot.compressed.get(module_name, b"")
+            if not compressed:
+                compressed = zlib.compress(scad_snapshot.texts[module_name].encode("utf-8"), 9)
+            modules.append([module_name, module_hash, base64.b64encode(compressed).decode("ascii")])
+        snapshot_file: IO[Any]
+        with open(snapshot_file_name, "w") as snapshot_file:
+            json.dump({"version": ScadSnapshot.VERSION, "name": scad_snapshot.name,
+                       "modules": modules}, snapshot_file, indent=0)
+            snapshot_file.write("\n")
+
+    # ScadSnapshot.text_get():
+    def text_get(self, module_name: str) -> str:
+        """Return the normalized text of one module, decompressing it if needed."""
+        scad_snapshot: ScadSnapshot = self
+        texts: Dict[str, str] = scad_snapshot.texts
+        if module_name not in texts:
+            texts[module_name] = zlib.decompress(
+                scad_snapshot.compressed[module_name]).decode("utf-8")
+        return texts[module_name]
+
 
 # Scad2D:
 class Scad2D(Scad):
@@ -832,6 +3965,190 @@ class Scad2D(Scad):
         """Set the name of the 2-dimensional SCAD object."""
         super().__init__(name)
 
+    # Scad2D.area_moments_combine():
+    @staticmethod
+    def area_moments_combine(area_moments: "List[Optional[Tuple[float, ...]]]",
+                             signs: List[float]) -> "Optional[Tuple[float, ...]]":
+        """Return the signed sum of some area moments or *None* if any are unknown."""
+        moments: List[float] = [0.0] * 6
+        area_moment: Optional[Tuple[float, ...]]
+        sign: float
+        for area_moment, sign in zip(area_moments, signs):
+            if area_moment is None:
+                return None
+            index: int
+            for index in range(6):
+                moments[index] += sign * area_moment[index]
+        return tuple(moments)
+
+    # Scad2D.area_moments_get():
+    def area_moments_get(self) -> "Optional[Tuple[float, ...]]":
+        """Return the area moments of a Scad2D or *None*.
+
+        Returns:
+            (*Optional*[*Tuple*[*float*, ...]]) Returns the 6 area moments
+                (i.e. the integrals of 1, X, Y, XX, XY and YY over the
+                area) or *None* when the area is not known.
+
+        This is the fall back method for sub-classes without a known area.
+        """
+        return None
+
+    # Scad2D.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the (lower left, upper right) bounding box corners or *None*."""
+        return None
+
+    # Scad2D.bounding_boxes_merge():
+    @staticmethod
+    def bounding_boxes_merge(bounding_boxes: "List[Optional[Tuple[P2D, P2D]]]"
+                             ) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the bounding box that encloses a list of bounding boxes."""
+        bounding_box: Optional[Tuple[P2D, P2D]]
+        present_boxes: List[Tuple[P2D, P2D]] = [bounding_box for bounding_box in bounding_boxes
+                                                if bounding_box is not None]
+        if not present_boxes:
+            return None
+        return (P2D(min([bounding_box[0].x for bounding_box in present_boxes]),
+                    min([bounding_box[0].y for bounding_box in present_boxes])),
+                P2D(max([bounding_box[1].x for bounding_box in present_boxes]),
+                    max([bounding_box[1].y for bounding_box in present_boxes])))
+
+    # Scad2D.hole_boxes_get():
+    def hole_boxes_get(self) -> "List[Tuple[P2D, P2D]]":
+        """Return the bounding boxes of the holes in a Scad2D.
+
+        This is the fall back method for sub-classes without any known holes.
+        """
+        return []
+
+    # Scad2D.outline_points_get():
+    def outline_points_get(self) -> "Optional[List[P2D]]":
+        """Return the points of a hole free outline or *None*.
+
+        Sub-classes that reduce to a single *SimplePolygon* without any
+        holes override this method to return its points.  Everything
+        else (holes, differences, etc.) returns *None* and must be
+        rendered by OpenSCAD.
+        """
+        return None
+
+    # Scad2D.points_area_moments_get():
+    @staticmethod
+    def points_area_moments_get(points: List[P2D]) -> Tuple[float, ...]:
+        """Return the area moments of a simple polygon.
+
+        Args:
+            *points* (*List*[*P2D*]): The simple polygon points in either order.
+
+        Returns:
+            (*Tuple*[*float*, ...]) Returns the 6 area moments (i.e. the
+                integrals of 1, X, Y, XX, XY and YY over the area) computed
+                with Green's theorem.
+
+        """
+        area: float = 0.0
+        x_sum: float = 0.0
+        y_sum: float = 0.0
+        xx_sum: float = 0.0
+        xy_sum: float = 0.0
+        yy_sum: float = 0.0
+        size: int = len(points)
+        index: int
+        point1: P2D
+        for index, point1 in enumerate(points):
+            point2: P2D = points[(index + 1) % size]
+            x1: float = point1.x
+            y1: float = point1.y
+            x2: float = point2.x
+            y2: float = point2.y
+            cross: float = x1 * y2 - x2 * y1
+            area += cross
+            x_sum += (x1 + x2) * cross
+            y_sum += (y1 + y2) * cross
+            xx_sum += (x1 * x1 + x1 * x2 + x2 * x2) * cross
+            xy_sum += (x1 * y2 + 2.0 * x1 * y1 + 2.0 * x2 * y2 + x2 * y1) * cross
+            yy_sum += (y1 * y1 + y1 * y2 + y2 * y2) * cross
+
+        # Clockwise points have a negative area, so flip the sign:
+        sign: float = 1.0 if area >= 0.0 else -1.0
+        return (sign * area / 2.0, sign * x_sum / 6.0, sign * y_sum / 6.0,
+                sign * xx_sum / 12.0, sign * xy_sum / 24.0, sign * yy_sum / 12.0)
+
+    # Scad2D.points_triangulate():
+    @staticmethod
+    def points_triangulate(points: List[P2D]) -> List[Tuple[int, int, int]]:
+        """Triangulate a simple polygon using ear clipping.
+
+        Args:
+            *points* (*List*[*P2D*]):
+                The points of a simple polygon (no holes and no self
+                intersections) in either clockwise or counter clockwise
+                order.
+
+        Returns:
+            (*List*[*Tuple*[*int*, *int*, *int*]]) Returns a list of
+                counter clockwise triangles as indices into *points*.
+
+        """
+        # Compute twice the signed area to determine the winding direction.  Always clip the
+        # ears from a counter clockwise *indices* list:
+        points_size: int = len(points)
+        index: int
+        signed_area: float = 0.0
+        for index in range(points_size):
+            point1: P2D = points[index]
+            point2: P2D = points[(index + 1) % points_size]
+            signed_area += point1.x * point2.y - point2.x * point1.y
+        indices: List[int] = list(range(points_size))
+        if signed_area < 0.0:
+            indices.reverse()
+
+        # Clip ears until only a single triangle remains.  An ear is a convex vertex whose
+        # triangle does not contain any of the other remaining points:
+        triangles: List[Tuple[int, int, int]] = []
+        misses: int = 0
+        position: int = 0
+        while len(indices) > 3:
+            indices_size: int = len(indices)
+            position %= indices_size
+            previous_index: int = indices[(position - 1) % indices_size]
+            current_index: int = indices[position]
+            next_index: int = indices[(position + 1) % indices_size]
+            a: P2D = points[previous_index]
+            b: P2D = points[current_index]
+            c: P2D = points[next_index]
+            cross: float = (b.x - a.x) * (c.y - a.y) - (b.y - a.y) * (c.x - a.x)
+            is_ear: bool = cross > 0.0
+            if is_ear:
+                other_index: int
+                for other_index in indices:
+                    if other_index not in (previous_index, current_index, next_index):
+                        p: P2D = points[other_index]
+                        if ((b.x - a.x) * (p.y - a.y) - (b.y - a.y) * (p.x - a.x) >= 0.0 and
+                                (c.x - b.x) * (p.y - b.y) - (c.y - b.y) * (p.x - b.x) >= 0.0 and
+                                (a.x - c.x) * (p.y - c.y) - (a.y - c.y) * (p.x - c.x) >= 0.0):
+                            is_ear = False
+                            break
+
+            # Clip the ear.  Degenerate (collinear) vertices are dropped once no real ear can
+            # be found so that the loop always terminates:
+            if is_ear or misses > indices_size:
+                if cross > 0.0:
+                    triangles.append((previous_index, current_index, next_index))
+                del indices[position]
+                misses = 0
+            else:
+                position += 1
+                misses += 1
+        if len(indices) == 3:
+            a = points[indices[0]]
+            b = points[indices[1]]
+            c = points[indices[2]]
+            if (b.x - a.x) * (c.y - a.y) - (b.y - a.y) * (c.x - a.x) > 0.0:
+                triangles.append((indices[0], indices[1], indices[2]))
+        return triangles
+
     # Scad2D.polygon_scad_lines_append():
     def polygon_scad_lines_append(self, simple_polygons: "List[SimplePolygon]",
                                   scad_lines: List[str], indent: str) -> None:
@@ -984,6 +4301,52 @@ class Scad2D(Scad):
         class_name: str = scad2d.__class__.__name__
         assert False, f"{class_name}.scad_lines_append() has not been implemented yet."
 
+    # Scad2D.svg_id_get():
+    @staticmethod
+    def svg_id_get(name: str, svg_defs: Dict[str, List[str]]) -> str:
+        """Convert a name into an SVG/XML id that is not already in *svg_defs*."""
+        svg_id: str = "_" + re.sub(r"[^A-Za-z0-9_\-]", "_", name)
+        if svg_id in svg_defs:
+            svg_id += f"_{len(svg_defs)}"
+        return svg_id
+
+    # Scad2D.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Place holder for sub-class svg_lines_append methods.
+
+        Args:
+            *svg_lines* (*List*[*str*]): The lines list to append the
+                SVG elements to.
+            *indent* (*str*): The indentatation prefix for each line.
+            *svg_defs* (*Dict*[*str*, *List*[*str*]]): A table of
+                SVG `<defs>` entries (modules and masks) keyed by id.
+                Each entry is generated only once per SVG file.
+
+        Raises:
+            *ValueError*: For a *Scad2D* sub-class (e.g. *Variable2D*)
+                that has no SVG equivalent.
+
+        """
+        # Grab *class_name* from *scad2d* (i.e. *self*) and fail:
+        scad2d: Scad2D = self
+        class_name: str = scad2d.__class__.__name__
+        raise ValueError(f"{class_name} '{scad2d.name}' can not be written to an SVG file")
+
+    # Scad2D.svg_path_get():
+    @staticmethod
+    def svg_path_get(simple_polygons: "List[SimplePolygon]") -> str:
+        """Return the SVG path data for a list of SimplePolygon's."""
+        float_format: Callable[[float], str] = Scad.float_format
+        path_texts: List[str] = []
+        simple_polygon: SimplePolygon
+        for simple_polygon in simple_polygons:
+            point: P2D
+            points_text: str = " L ".join([f"{float_format(point.x)} {float_format(point.y)}"
+                                           for point in simple_polygon.points_get()])
+            path_texts.append(f"M {points_text} Z")
+        return " ".join(path_texts)
+
 
 # Difference2D:
 class Difference2D(Scad2D):
@@ -1048,6 +4411,25 @@ class Difference2D(Scad2D):
         # Just do the append:
         subtracts.append(scad2d)
 
+    # Difference2D.area_moments_get():
+    def area_moments_get(self) -> "Optional[Tuple[float, ...]]":
+        """Return the area moments of the root less those of each subtracted Scad2D.
+
+        The subtracted Scad2D's are assumed to lie inside the root.
+        """
+        difference2d: Difference2D = self
+        subtract: Scad2D
+        return Scad2D.area_moments_combine(
+            [difference2d.root.area_moments_get()] +
+            [subtract.area_moments_get() for subtract in difference2d.subtracts],
+            [1.0] + [-1.0] * len(difference2d.subtracts))
+
+    # Difference2D.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the Difference2D bounding box (i.e. the root bounding box)."""
+        difference2d: Difference2D = self
+        return difference2d.root.bounding_box_get()
+
     # Diffrence2D.extend():
     def extend(self, scad2ds: List[Scad2D]) -> None:
         """Append a list of Scad2D's to a Difference2D."""
@@ -1064,6 +4446,18 @@ class Difference2D(Scad2D):
         # Just do the extends.
         subtracts.extend(scad2ds)
 
+    # Difference2D.hole_boxes_get():
+    def hole_boxes_get(self) -> "List[Tuple[P2D, P2D]]":
+        """Return the bounding boxes of the root holes and of each subtracted Scad2D."""
+        difference2d: Difference2D = self
+        hole_boxes: List[Tuple[P2D, P2D]] = difference2d.root.hole_boxes_get()
+        subtract: Scad2D
+        for subtract in difference2d.subtracts:
+            subtract_box: Optional[Tuple[P2D, P2D]] = subtract.bounding_box_get()
+            if subtract_box is not None:
+                hole_boxes.append(subtract_box)
+        return hole_boxes
+
     # Difference2D.lock():
     def lock(self) -> None:
         """Lock Difference2D from further appends or extends."""
@@ -1102,6 +4496,56 @@ class Difference2D(Scad2D):
             subtract.scad_lines_append(scad_lines, next_indent)
         scad_lines.append(f"{indent}}}  // End: Difference2D: '{name}'")
 
+    # Difference2D.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Append Difference2D to a list of SVG lines using a `<mask>`.
+
+        Args:
+            *svg_lines* (*List*[*str*]): The lines list to append the
+                SVG elements to.
+            *indent* (*str*): The indentatation prefix for each line.
+            *svg_defs* (*Dict*[*str*, *List*[*str*]]): The table of
+                SVG `<defs>` entries to add the mask to.
+
+        """
+        # Grab some values from *difference2d* (i.e. *self*):
+        difference2d: Difference2D = self
+        name: str = difference2d.name
+        root: Scad2D = difference2d.root
+        subtracts: List[Scad2D] = difference2d.subtracts
+
+        # The mask shows *root* in white and hides each of the *subtracts* with black:
+        mask_id: str = Scad2D.svg_id_get(f"{name} Mask", svg_defs)
+        svg_defs[mask_id] = []
+        mask_lines: List[str] = []
+        bounding_box: Optional[Tuple[P2D, P2D]] = root.bounding_box_get()
+        units_text: str = ""
+        if bounding_box is not None:
+            float_format: Callable[[float], str] = Scad.float_format
+            lower_left: P2D = bounding_box[0]
+            upper_right: P2D = bounding_box[1]
+            units_text = (f' maskUnits="userSpaceOnUse"'
+                          f' x="{float_format(lower_left.x)}" y="{float_format(lower_left.y)}"'
+                          f' width="{float_format(upper_right.x - lower_left.x)}"'
+                          f' height="{float_format(upper_right.y - lower_left.y)}"')
+        mask_lines.append(f'  <mask id="{mask_id}"{units_text}>')
+        mask_lines.append('   <g fill="white">')
+        root.svg_lines_append(mask_lines, "    ", svg_defs)
+        mask_lines.append('   </g>')
+        mask_lines.append('   <g fill="black">')
+        subtract: Scad2D
+        for subtract in subtracts:
+            subtract.svg_lines_append(mask_lines, "    ", svg_defs)
+        mask_lines.append('   </g>')
+        mask_lines.append('  </mask>')
+        svg_defs[mask_id] = mask_lines
+
+        # Now draw *root* through the mask:
+        svg_lines.append(f'{indent}<g mask="url(#{mask_id})">')
+        root.svg_lines_append(svg_lines, indent + " ", svg_defs)
+        svg_lines.append(f"{indent}</g>")
+
 
 # Echo2D:
 # class Echo2D(Scad2D):
@@ -1216,6 +4660,23 @@ class Module2D(Scad2D):
         # Perform the *append*:
         scad2ds.append(scad2d)
 
+    # Module2D.area_moments_get():
+    def area_moments_get(self) -> "Optional[Tuple[float, ...]]":
+        """Return the summed area moments of the Module2D contents (assumed not to overlap)."""
+        module2d: Module2D = self
+        scad2d: Scad2D
+        return Scad2D.area_moments_combine([scad2d.area_moments_get()
+                                            for scad2d in module2d.scad2ds],
+                                           [1.0] * len(module2d.scad2ds))
+
+    # Module2D.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the bounding box enclosing all of the Module2D contents."""
+        module2d: Module2D = self
+        scad2d: Scad2D
+        return Scad2D.bounding_boxes_merge([scad2d.bounding_box_get()
+                                            for scad2d in module2d.scad2ds])
+
     # Module2D.extend():
     def extend(self, new_scad2ds: List[Scad2D]) -> None:
         """Append a Scad2D to a Module2D."""
@@ -1238,6 +4699,25 @@ class Module2D(Scad2D):
         module2d: Module2D = self
         module2d.locked = True
 
+    # Module2D.hole_boxes_get():
+    def hole_boxes_get(self) -> "List[Tuple[P2D, P2D]]":
+        """Return the hole bounding boxes of a Module2D with a single Scad2D.
+
+        The holes of one member might be filled in by another member, so a
+        Module2D with several members reports no holes.
+        """
+        module2d: Module2D = self
+        scad2ds: List[Scad2D] = module2d.scad2ds
+        return scad2ds[0].hole_boxes_get() if len(scad2ds) == 1 else []
+
+    # Module2D.outline_points_get():
+    def outline_points_get(self) -> "Optional[List[P2D]]":
+        """Return the hole free outline points of a single item Module2D or *None*."""
+        # Grab some values from *module2d* (i.e. *self*):
+        module2d: Module2D = self
+        scad2ds: List[Scad2D] = module2d.scad2ds
+        return scad2ds[0].outline_points_get() if len(scad2ds) == 1 else None
+
     # Module2D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Circle to lines list.
@@ -1270,6 +4750,33 @@ class Module2D(Scad2D):
         # Output the closing '}':
         scad_lines.append(f"{indent}}}")
 
+    # Module2D.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Append a `<use>` of a Module2D to a list of SVG lines.
+
+        The Module2D contents are placed into *svg_defs* the first time
+        the Module2D is encountered and are simply reused afterwards.
+        """
+        # Grab some values from *module2d* (i.e. *self*):
+        module2d: Module2D = self
+        name: str = module2d.name
+        scad2ds: List[Scad2D] = module2d.scad2ds
+
+        # Define the module in *svg_defs* exactly once:
+        module_id: str = Scad2D.svg_id_get(name, {})
+        if module_id not in svg_defs:
+            svg_defs[module_id] = []
+            module_lines: List[str] = [f'  <g id="{module_id}">']
+            scad2d: Scad2D
+            for scad2d in scad2ds:
+                scad2d.svg_lines_append(module_lines, "   ", svg_defs)
+            module_lines.append("  </g>")
+            svg_defs[module_id] = module_lines
+
+        # Instantiate the module:
+        svg_lines.append(f'{indent}<use xlink:href="#{module_id}"/>')
+
     # Module2d.use_module_get():
     def use_module_get(self) -> "UseModule2D":
         """Return the UseModule associated with Module2D."""
@@ -1396,6 +4903,23 @@ class Polygon(Scad2D):
         simple_polygons: List[SimplePolygon] = polygon.simple_polygons
         simple_polygons.append(simple_polygon)
 
+    # Polygon.area_moments_get():
+    def area_moments_get(self) -> "Optional[Tuple[float, ...]]":
+        """Return the area moments of the outer SimplePolygon less those of the holes."""
+        polygon: Polygon = self
+        simple_polygons: List[SimplePolygon] = polygon.simple_polygons
+        simple_polygon: SimplePolygon
+        return (Scad2D.area_moments_combine(
+            [simple_polygon.area_moments_get() for simple_polygon in simple_polygons],
+            [1.0] + [-1.0] * (len(simple_polygons) - 1)) if simple_polygons else None)
+
+    # Polygon.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the Polygon bounding box (i.e. the outer SimplePolygon bounding box)."""
+        polygon: Polygon = self
+        simple_polygons: List[SimplePolygon] = polygon.simple_polygons
+        return simple_polygons[0].bounding_box_get() if simple_polygons else None
+
     # Polygon.extend():
     def extend(self, additional_simple_polygons: "List[SimplePolygon]") -> None:
         """Append a list of SimplePolygon's to the Polygon.
@@ -1414,11 +4938,29 @@ class Polygon(Scad2D):
         simple_polygons: List[SimplePolygon] = polygon.simple_polygons
         simple_polygons.extend(additional_simple_polygons)
 
+    # Polygon.hole_boxes_get():
+    def hole_boxes_get(self) -> "List[Tuple[P2D, P2D]]":
+        """Return the bounding boxes of the Polygon holes (i.e. all but the first SimplePolygon)."""
+        polygon: Polygon = self
+        simple_polygon: SimplePolygon
+        hole_boxes: List[Optional[Tuple[P2D, P2D]]] = [
+            simple_polygon.bounding_box_get() for simple_polygon in polygon.simple_polygons[1:]]
+        hole_box: Optional[Tuple[P2D, P2D]]
+        return [hole_box for hole_box in hole_boxes if hole_box is not None]
+
     # Polygon.lock():
     def lock(self):
         """Lock Polygon from further expansion."""
         polygon: Polygon = self
-        polygon.locked = True
+        polygon.locked = True
+
+    # Polygon.outline_points_get():
+    def outline_points_get(self) -> "Optional[List[P2D]]":
+        """Return the outline points of a Polygon with no holes or *None*."""
+        # Grab some values from *polygon* (i.e. *self*):
+        polygon: Polygon = self
+        simple_polygons: List[SimplePolygon] = polygon.simple_polygons
+        return simple_polygons[0].points_get() if len(simple_polygons) == 1 else None
 
     # Polygon.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
@@ -1443,20 +4985,29 @@ class Polygon(Scad2D):
         simple_polygons = simple_polygons[:]
         return simple_polygons
 
+    # Polygon.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Append Polygon as an even-odd SVG path to a list of lines."""
+        polygon: Polygon = self
+        path_text: str = Scad2D.svg_path_get(polygon.simple_polygons)
+        svg_lines.append(f'{indent}<path fill-rule="evenodd" d="{path_text}"/>')
+
 
 # SimplePolygon:
 class SimplePolygon(Scad2D):
     """Represents a simple closed polygon of points."""
 
     # SimplePolygon.__init__():
-    def __init__(self, name: str, points: List[P2D] = [],
+    def __init__(self, name: str, points: Optional[List[P2D]] = None,
                  lock: bool = False, convexity: int = -1) -> None:
         """Initialize a SimplePolygon.
 
         Args:
             *name* (*str*): The name for the polygon.
-            *points* (*List*[*P2D*]): The list of points to initialize
-                *close_polygon* (i.e. *self* with.)
+            *points* (*Optional*[*List*[*P2D*]]): The list of points to
+                initialize *close_polygon* (i.e. *self* with.)  Defaults
+                to an empty list.
             *lock* (*bool*): If *True* no additional points can be
                 appended to *simple_polygon* (*i.e. *self*); othewise
                 additional points can be appended.
@@ -1468,9 +5019,9 @@ class SimplePolygon(Scad2D):
         """
         # Stuff values into *simpl_polygon* (i.e. *self*):
         # simple_polygon: SimplePolygon = self
+        super().__init__(name)
         self.locked: bool = lock
-        self.name: str = name
-        self.points: List[P2D] = points[:]  # Copy the contents of *points*
+        self.points: List[P2D] = [] if points is None else points[:]  # Copy *points*
         self.convexity: int = 4 if convexity <= 0 else convexity
 
     # SimplePolygon.__getitem__():
@@ -1552,6 +5103,24 @@ class SimplePolygon(Scad2D):
             # print(f"[{index}]angle={degrees(angle} x={x} y={y}")
             points.append(P2D(x, y))
 
+    # SimplePolygon.area_moments_get():
+    def area_moments_get(self) -> "Optional[Tuple[float, ...]]":
+        """Return the SimplePolygon area moments."""
+        simple_polygon: SimplePolygon = self
+        points: List[P2D] = simple_polygon.points
+        return Scad2D.points_area_moments_get(points) if len(points) >= 3 else None
+
+    # SimplePolygon.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the SimplePolygon bounding box."""
+        simple_polygon: SimplePolygon = self
+        points: List[P2D] = simple_polygon.points
+        if not points:
+            return None
+        point: P2D
+        return (P2D(min([point.x for point in points]), min([point.y for point in points])),
+                P2D(max([point.x for point in points]), max([point.y for point in points])))
+
     # SimplePolygon.is_locked():
     def is_locked(self) -> bool:
         """Return whether SimplePolygon is locked or not."""
@@ -1608,6 +5177,12 @@ class SimplePolygon(Scad2D):
         simple_polygon: SimplePolygon = self
         simple_polygon.locked = True
 
+    # SimplePolygon.outline_points_get():
+    def outline_points_get(self) -> "Optional[List[P2D]]":
+        """Return the SimplePolygon points as the outline points."""
+        simple_polygon: SimplePolygon = self
+        return simple_polygon.points_get()
+
     # SimplePolygon.point_append():
     def point_append(self, point: P2D) -> None:
         """Append a point to a SimplePolygon.
@@ -1736,6 +5311,14 @@ class SimplePolygon(Scad2D):
         # `polygon` command:
         super().polygon_scad_lines_append([simple_polygon], scad_lines, indent)
 
+    # SimplePolygon.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Append SimplePolygon as an SVG path to a list of lines."""
+        simple_polygon: SimplePolygon = self
+        path_text: str = Scad2D.svg_path_get([simple_polygon])
+        svg_lines.append(f'{indent}<path d="{path_text}"/>')
+
     # SimplePolygon.x_mirror():
     def x_mirror(self, name: str, replace: Optional[str] = None) -> "SimplePolygon":
         """Return an X-axis mirrored polygon.
@@ -1856,6 +5439,15 @@ class Circle(SimplePolygon):
         # Return the formatted string reprentation:
         return f"Circle('{name}',{diameter},{points_count},{center},{convexity})"
 
+    # Circle.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the Circle bounding box."""
+        circle: Circle = self
+        center: P2D = circle.center
+        radius: float = circle.diameter / 2.0
+        return (P2D(center.x - radius, center.y - radius),
+                P2D(center.x + radius, center.y + radius))
+
     # Circle.copy():
     def copy(self, new_name: str, diameter: Optional[float] = None,
              points_count: Optional[int] = None, center: Optional[P2D] = None,
@@ -1941,6 +5533,17 @@ class Circle(SimplePolygon):
         scad_lines.append(f"{circle_indent}circle(d={float_format(diameter)}, "
                           f"$fn={points_count});  // Circle '{name}'")
 
+    # Circle.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Append Circle as an SVG circle to a list of lines."""
+        circle: Circle = self
+        center: P2D = circle.center
+        float_format: Callable[[float], str] = Scad.float_format
+        radius: float = circle.diameter / 2.0
+        svg_lines.append(f'{indent}<circle cx="{float_format(center.x)}" '
+                         f'cy="{float_format(center.y)}" r="{float_format(radius)}"/>')
+
     # Circle.x_mirror():
     def x_mirror(self, new_name: str, replace: Optional[str] = None) -> "Circle":
         """Return an X-axis mirrored Circle.
@@ -2459,6 +6062,31 @@ class UseModule2D(Scad2D):
         name: str = use_module2d.name
         return f"UseModule2D('{name}',{module2d})"
 
+    # UseModule2D.area_moments_get():
+    def area_moments_get(self) -> "Optional[Tuple[float, ...]]":
+        """Return the area moments of the used Module2D."""
+        use_module2d: UseModule2D = self
+        return use_module2d.module2d.area_moments_get()
+
+    # UseModule2D.bounding_box_get():
+    def bounding_box_get(self) -> "Optional[Tuple[P2D, P2D]]":
+        """Return the bounding box of the used Module2D."""
+        use_module2d: UseModule2D = self
+        return use_module2d.module2d.bounding_box_get()
+
+    # UseModule2D.hole_boxes_get():
+    def hole_boxes_get(self) -> "List[Tuple[P2D, P2D]]":
+        """Return the hole bounding boxes of the used Module2D."""
+        use_module2d: UseModule2D = self
+        return use_module2d.module2d.hole_boxes_get()
+
+    # UseModule2D.outline_points_get():
+    def outline_points_get(self) -> "Optional[List[P2D]]":
+        """Return the outline points of the used Module2D."""
+        use_module2d: UseModule2D = self
+        module2d: Module2D = use_module2d.module2d
+        return module2d.outline_points_get()
+
     # UseModule2D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append UseModule2D to list of lines.
@@ -2478,6 +6106,13 @@ class UseModule2D(Scad2D):
         end_text: str = "" if is_operator else ';'
         scad_lines.append(f"{indent}{module_name}(){end_text} // UseModule2D('{use_module_name}')")
 
+    # UseModule2D.svg_lines_append():
+    def svg_lines_append(self, svg_lines: List[str], indent: str,
+                         svg_defs: Dict[str, List[str]]) -> None:
+        """Append UseModule2D as an SVG `<use>` to a list of lines."""
+        use_module2d: UseModule2D = self
+        use_module2d.module2d.svg_lines_append(svg_lines, indent, svg_defs)
+
 
 # Variable2D:
 class Variable2D(Scad2D):
@@ -2529,6 +6164,529 @@ class Scad3D(Scad):
         """Set the name of the 3-dimensional SCAD object."""
         super().__init__(name)
 
+    # Scad3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of the Module3D's used in a Scad3D.
+
+        Args:
+            *bill_of_materials* (*BillOfMaterials*): The memoized module part counts.
+            *counts* (*Dict*[*str*, *int*]): The part counts to add to.
+
+        This is the fall back method for sub-classes that do not contain
+        any *Module3D*'s (e.g. *Cube*); it does not add anything.
+        """
+        pass
+
+    # Scad3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the world space bounding boxes of the primitives in a Scad3D.
+
+        Args:
+            *bounding_boxes* (*List*[*BoundingBox3D*]): The list to append to.
+            *affine3d* (*Affine3D*): The transform from local to world coordinates.
+            *module_name* (*str*): The name of the innermost containing *Module3D*.
+
+        This is the fall back method for sub-classes that do not have a
+        known extent (e.g. *If3D*); it does not append anything.
+        """
+        pass
+
+    # Scad3D.bounding_boxes_get():
+    def bounding_boxes_get(self) -> "List[BoundingBox3D]":
+        """Return the world space bounding boxes of the primitives in a Scad3D."""
+        scad3d: Scad3D = self
+        bounding_boxes: List[BoundingBox3D] = []
+        scad3d.bounding_boxes_append(bounding_boxes, Affine3D(), "")
+        return bounding_boxes
+
+    # Scad3D.clearances_get():
+    def clearances_get(self, groups: Dict[str, List[str]],
+                       group_pairs: Optional[List[Tuple[str, str]]] = None,
+                       ignores: Optional[List[Tuple[str, str]]] = None
+                       ) -> "List[Tuple[float, str, str, BoundingBox3D, BoundingBox3D]]":
+        """Return the minimum clearances between groups of modules.
+
+        Args:
+            *groups* (*Dict*[*str*, *List*[*str*]]):
+                A table of group tags to lists of *Module3D* name patterns
+                (e.g. `"*Spacer Module"`, see the *fnmatch* module.)  A box
+                belongs to a group when the name of its innermost *Module3D*
+                matches any of the patterns.
+            *group_pairs* (*Optional*[*List*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to every pair of groups.)  The pairs of
+                group tags to measure.
+            *ignores* (*Optional*[*List*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to *None*.)  Pairs of *Module3D* name
+                patterns (in either order) that are expected to touch, such
+                as a connector and the board it is soldered to.  Boxes from
+                matching modules are never measured against each other.
+
+        Returns:
+            (*List*[*Tuple*[*float*, *str*, *str*, *BoundingBox3D*, *BoundingBox3D*]])
+                Returns a list of (clearance, tag1, tag2, box1, box2) tuples
+                sorted by increasing clearance, where *box1* and *box2* are
+                the closest primitives from the two groups.  Group pairs
+                whose modules are all shared have no entry.
+
+        Raises:
+            *ValueError*: For an unknown group tag or a group that matches
+                no boxes.
+
+        """
+        # Sort the bounding boxes of *scad3d* (i.e. *self*) into *group_boxes*:
+        scad3d: Scad3D = self
+        bounding_boxes: List[BoundingBox3D] = scad3d.bounding_boxes_get()
+        tag: str
+        patterns: List[str]
+        pattern: str
+        bounding_box: BoundingBox3D
+        group_boxes: Dict[str, List[BoundingBox3D]] = {}
+        for tag, patterns in groups.items():
+            group_boxes[tag] = [bounding_box for bounding_box in bounding_boxes
+                                if any([fnmatch.fnmatchcase(bounding_box.module_name, pattern)
+                                        for pattern in patterns])]
+            if not group_boxes[tag]:
+                raise ValueError(f"Clearance group '{tag}' matches no modules in '{scad3d.name}'")
+
+        # Expand the *ignores* patterns into *ignored_names* pairs of actual module names:
+        module_names: List[str] = sorted(set([bounding_box.module_name
+                                              for bounding_box in bounding_boxes]))
+        ignored_names: Set[Tuple[str, str]] = set()
+        pattern1: str
+        pattern2: str
+        module_name1: str
+        module_name2: str
+        for pattern1, pattern2 in ([] if ignores is None else ignores):
+            for module_name1 in module_names:
+                if fnmatch.fnmatchcase(module_name1, pattern1):
+                    for module_name2 in module_names:
+                        if fnmatch.fnmatchcase(module_name2, pattern2):
+                            ignored_names.add((module_name1, module_name2))
+
+        # Build one *BoundingVolumeHierarchy* per group and measure each pair of groups:
+        tags: List[str] = list(groups.keys())
+        tag1: str
+        tag2: str
+        index: int
+        if group_pairs is None:
+            group_pairs = [(tag1, tag2)
+                           for index, tag1 in enumerate(tags) for tag2 in tags[index + 1:]]
+        hierarchies: Dict[str, BoundingVolumeHierarchy] = {}
+        clearances: List[Tuple[float, str, str, BoundingBox3D, BoundingBox3D]] = []
+        for tag1, tag2 in group_pairs:
+            for tag in (tag1, tag2):
+                if tag not in group_boxes:
+                    raise ValueError(f"Unknown clearance group '{tag}'")
+                if tag not in hierarchies:
+                    hierarchies[tag] = BoundingVolumeHierarchy(group_boxes[tag])
+            nearest: Optional[Tuple[float, BoundingBox3D, BoundingBox3D]] = (
+                hierarchies[tag1].nearest_get(hierarchies[tag2], ignored_names))
+            if nearest is not None:
+                clearances.append((nearest[0], tag1, tag2, nearest[1], nearest[2]))
+        clearance: Tuple[float, str, str, BoundingBox3D, BoundingBox3D]
+        clearances.sort(key=lambda clearance: (clearance[0], clearance[1], clearance[2]))
+        return clearances
+
+    # Scad3D.clearances_report():
+    def clearances_report(self, groups: Dict[str, List[str]], warning: float = 1.0,
+                          group_pairs: Optional[List[Tuple[str, str]]] = None,
+                          ignores: Optional[List[Tuple[str, str]]] = None) -> str:
+        """Return a minimum clearance report between groups of modules.
+
+        Args:
+            *groups* (*Dict*[*str*, *List*[*str*]]):
+                A table of group tags to *Module3D* name patterns
+                (see *clearances_get*().)
+            *warning* (*float*):
+                (Optional: Defaults to 1.0.)  Clearances less than
+                *warning* millimeters are flagged with `WARNING`.
+            *group_pairs* (*Optional*[*List*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to every pair of groups.)  The pairs of
+                group tags to measure.
+            *ignores* (*Optional*[*List*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to *None*.)  Pairs of *Module3D* name
+                patterns that are expected to touch (see *clearances_get*().)
+
+        Returns:
+            (*str*) Returns one line per group pair sorted by increasing
+                clearance.
+
+        """
+        scad3d: Scad3D = self
+        clearances: List[Tuple[float, str, str, BoundingBox3D, BoundingBox3D]] = (
+            scad3d.clearances_get(groups, group_pairs, ignores))
+        lines: List[str] = [f"{scad3d.name} clearances (warning below {warning:.3f}mm):"]
+        clearance: float
+        tag1: str
+        tag2: str
+        box1: BoundingBox3D
+        box2: BoundingBox3D
+        for clearance, tag1, tag2, box1, box2 in clearances:
+            status: str = "WARNING" if clearance < warning else "ok"
+            lines.append(f"{clearance:9.3f}mm {status:7s} {tag1} <=> {tag2}: "
+                         f"'{box1.name}' ({box1.module_name}) <=> "
+                         f"'{box2.name}' ({box2.module_name})")
+        return "\n".join(lines) + "\n"
+
+    # Scad3D.extrusion_mesh_append():
+    @staticmethod
+    def extrusion_mesh_append(triangles: "array[float]", affine3d: Affine3D,
+                              points: List[P2D], bottom_z: float, top_z: float) -> None:
+        """Append the triangles of an extruded outline to a mesh.
+
+        Args:
+            *triangles* (*array*[*float*]):
+                The mesh to append to.  Each triangle is 9 floats
+                (3 X/Y/Z vertices in counter clockwise order when viewed
+                from outside.)
+            *affine3d* (*Affine3D*):
+                The transform from local to world coordinates.
+            *points* (*List*[*P2D*]):
+                A simple polygon outline in the local X/Y plane.
+            *bottom_z* (*float*): The local Z of the bottom cap.
+            *top_z* (*float*): The local Z of the top cap.
+
+        """
+        # Drop any consecutive duplicate points (e.g. arcs that share an end point):
+        unique_points: List[P2D] = []
+        point: P2D
+        for point in points:
+            if not unique_points or point.distance(unique_points[-1]) > 1.0e-9:
+                unique_points.append(point)
+        while len(unique_points) > 1 and unique_points[0].distance(unique_points[-1]) <= 1.0e-9:
+            del unique_points[-1]
+        points_size: int = len(unique_points)
+        if points_size < 3:
+            return  # pragma: no cover
+
+        # Triangulate the cap and force *unique_points* into counter clockwise order:
+        cap_triangles: List[Tuple[int, int, int]] = Scad2D.points_triangulate(unique_points)
+        signed_area: float = 0.0
+        index: int
+        for index in range(points_size):
+            point1: P2D = unique_points[index]
+            point2: P2D = unique_points[(index + 1) % points_size]
+            signed_area += point1.x * point2.y - point2.x * point1.y
+        if signed_area < 0.0:
+            unique_points.reverse()
+            cap_triangles = [(points_size - 1 - i1, points_size - 1 - i2, points_size - 1 - i3)
+                             for i1, i2, i3 in cap_triangles]
+
+        # Transform every vertex exactly once.  *bottoms* and *tops* are flattened X/Y/Z lists:
+        m: Tuple[float, ...] = affine3d.values
+        bottoms: List[float] = []
+        tops: List[float] = []
+        for point in unique_points:
+            x: float = point.x
+            y: float = point.y
+            base_x: float = m[0] * x + m[1] * y + m[3]
+            base_y: float = m[4] * x + m[5] * y + m[7]
+            base_z: float = m[8] * x + m[9] * y + m[11]
+            bottoms.extend((base_x + m[2] * bottom_z,
+                            base_y + m[6] * bottom_z,
+                            base_z + m[10] * bottom_z))
+            tops.extend((base_x + m[2] * top_z,
+                         base_y + m[6] * top_z,
+                         base_z + m[10] * top_z))
+
+        # Append the top cap (counter clockwise) and bottom cap (clockwise) triangles:
+        i1: int
+        i2: int
+        i3: int
+        for i1, i2, i3 in cap_triangles:
+            triangles.extend(tops[i1 * 3:i1 * 3 + 3] + tops[i2 * 3:i2 * 3 + 3] +
+                             tops[i3 * 3:i3 * 3 + 3])
+            triangles.extend(bottoms[i1 * 3:i1 * 3 + 3] + bottoms[i3 * 3:i3 * 3 + 3] +
+                             bottoms[i2 * 3:i2 * 3 + 3])
+
+        # Append two triangles for each side wall quadrilateral:
+        for i1 in range(points_size):
+            i2 = (i1 + 1) % points_size
+            bottom1: List[float] = bottoms[i1 * 3:i1 * 3 + 3]
+            bottom2: List[float] = bottoms[i2 * 3:i2 * 3 + 3]
+            top1: List[float] = tops[i1 * 3:i1 * 3 + 3]
+            top2: List[float] = tops[i2 * 3:i2 * 3 + 3]
+            triangles.extend(bottom1 + bottom2 + top2)
+            triangles.extend(bottom1 + top2 + top1)
+
+    # Scad3D.extrusion_moments_get():
+    @staticmethod
+    def extrusion_moments_get(area_moments: Tuple[float, ...], bottom_z: float,
+                              top_z: float) -> Tuple[float, ...]:
+        """Return the unit density moments of a straight extrusion.
+
+        Args:
+            *area_moments* (*Tuple*[*float*, ...]):
+                The 6 area moments of the extruded outline (see
+                *Scad2D*.*area_moments_get*().)
+            *bottom_z* (*float*): The local Z of the bottom cap.
+            *top_z* (*float*): The local Z of the top cap.
+
+        Returns:
+            (*Tuple*[*float*, ...]) Returns the 10 local moments (see
+                *MassProperties*.)
+
+        """
+        area: float
+        x: float
+        y: float
+        xx: float
+        xy: float
+        yy: float
+        area, x, y, xx, xy, yy = area_moments
+        height: float = top_z - bottom_z
+        z: float = (top_z * top_z - bottom_z * bottom_z) / 2.0
+        zz: float = (top_z * top_z * top_z - bottom_z * bottom_z * bottom_z) / 3.0
+        return (area * height, x * height, y * height, area * z,
+                xx * height, yy * height, area * zz, xy * height, x * z, y * z)
+
+    # Scad3D.interferences_get():
+    def interferences_get(self, ignores: Optional[Set[Tuple[str, str]]] = None
+                          ) -> "List[Tuple[BoundingBox3D, BoundingBox3D]]":
+        """Return the pairs of primitives in different modules that overlap.
+
+        Args:
+            *ignores* (*Optional*[*Set*[*Tuple*[*str*, *str*]]]):
+                (Optional: Defaults to *None*.)  Pairs of *Module3D* names
+                (in either order) that are expected to overlap.
+
+        Returns:
+            (*List*[*Tuple*[*BoundingBox3D*, *BoundingBox3D*]]) Returns the
+                overlapping pairs of bounding boxes (see
+                *BoundingVolumeHierarchy*.*near_pairs_get*().)
+
+        """
+        scad3d: Scad3D = self
+        bounding_volume_hierarchy: BoundingVolumeHierarchy = BoundingVolumeHierarchy(
+            scad3d.bounding_boxes_get())
+        return bounding_volume_hierarchy.near_pairs_get(0.0, ignores)
+
+    # Scad3D.mass_properties_get():
+    def mass_properties_get(self, densities: Optional[Dict[str, float]] = None,
+                            default_density: float = 1.0) -> "Dict[str, MassProperties]":
+        """Return the mass properties of a Scad3D and each Module3D inside it.
+
+        Args:
+            *densities* (*Optional*[*Dict*[*str*, *float*]]):
+                (Optional: Defaults to *None*.)  A table of densities in
+                grams per cubic centimeter.  The density of a primitive is
+                looked up by the primitive name, then by the names of the
+                containing *Module3D*'s (innermost first) and then by its
+                *Color* name.
+            *default_density* (*float*):
+                (Optional: Defaults to 1.0.)  The density of primitives
+                that are not in *densities*.
+
+        Returns:
+            (*Dict*[*str*, *MassProperties*]) Returns a table of mass
+                properties keyed by *Module3D* name, where each Module3D
+                includes every instance of it and all of its contents.
+                The entire *scad3d* is keyed by its own name.
+
+        """
+        # Collect the unit density moments of every primitive into one flat *records* array:
+        scad3d: Scad3D = self
+        records: array[float] = array("d")
+        tags: List[Tuple[str, Tuple[str, ...], str]] = []
+        scad3d.mass_records_append(records, tags, Affine3D(), (), "")
+
+        # Accumulate the primitive moments, scaled by density, into *mass_properties_table*:
+        densities = {} if densities is None else densities
+        total: MassProperties = MassProperties(scad3d.name)
+        mass_properties_table: Dict[str, MassProperties] = {scad3d.name: total}
+        index: int
+        name: str
+        module_names: Tuple[str, ...]
+        color_name: str
+        for index, (name, module_names, color_name) in enumerate(tags):
+            key: str
+            keys: List[str] = [name] + list(reversed(module_names)) + [color_name]
+            density: float = default_density
+            for key in keys:
+                if key in densities:
+                    density = densities[key]
+                    break
+            scale: float = density / 1000.0  # Grams per cubic millimeter
+            offset: int = index * 10
+            total.add(records, offset, scale)
+            module_name: str
+            for module_name in set(module_names):
+                if module_name != scad3d.name:
+                    if module_name not in mass_properties_table:
+                        mass_properties_table[module_name] = MassProperties(module_name)
+                    mass_properties_table[module_name].add(records, offset, scale)
+        return mass_properties_table
+
+    # Scad3D.mass_properties_report():
+    def mass_properties_report(self, densities: Optional[Dict[str, float]] = None,
+                               default_density: float = 1.0) -> str:
+        """Return a report of the mass, center of gravity and inertia of each Module3D.
+
+        Args:
+            *densities* (*Optional*[*Dict*[*str*, *float*]]):
+                (Optional: Defaults to *None*.)  A table of densities
+                (see *mass_properties_get*().)
+            *default_density* (*float*):
+                (Optional: Defaults to 1.0.)  The density of primitives
+                that are not in *densities*.
+
+        Returns:
+            (*str*) Returns one line per *Module3D* sorted by decreasing
+                mass with the entire *scad3d* first.  The inertia is
+                about the center of gravity.
+
+        """
+        scad3d: Scad3D = self
+        mass_properties_table: Dict[str, MassProperties] = scad3d.mass_properties_get(
+            densities, default_density)
+        total: MassProperties = mass_properties_table[scad3d.name]
+        mass_properties: MassProperties
+        others: List[MassProperties] = [mass_properties
+                                        for mass_properties in mass_properties_table.values()
+                                        if mass_properties is not total]
+        others.sort(key=lambda mass_properties: (-mass_properties.mass_get(),
+                                                 mass_properties.name))
+        lines: List[str] = [f"{scad3d.name} mass properties (g, mm, g*mm^2):",
+                            f"{'Mass':>9} {'CoG X':>8} {'CoG Y':>8} {'CoG Z':>8} "
+                            f"{'Ixx':>11} {'Iyy':>11} {'Izz':>11}  Name"]
+        for mass_properties in [total] + others:
+            center: P3D = mass_properties.center_get()
+            inertia: Tuple[float, ...] = mass_properties.inertia_get()
+            lines.append(f"{mass_properties.mass_get():9.3f} "
+                         f"{center.x:8.2f} {center.y:8.2f} {center.z:8.2f} "
+                         f"{inertia[0]:11.1f} {inertia[4]:11.1f} {inertia[8]:11.1f}  "
+                         f"{mass_properties.name}")
+        return "\n".join(lines) + "\n"
+
+    # Scad3D.mass_record_append():
+    def mass_record_append(self, records: "array[float]",
+                           tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                           module_names: Tuple[str, ...], color_name: str,
+                           moments: Tuple[float, ...]) -> None:
+        """Append the local moments of a primitive Scad3D moved to world coordinates."""
+        scad3d: Scad3D = self
+        records.extend(MassProperties.moments_transform(moments, affine3d))
+        tags.append((scad3d.name, module_names, color_name))
+
+    # Scad3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the unit density world space moments of the primitives in a Scad3D.
+
+        Args:
+            *records* (*array*[*float*]):
+                The flat array to append 10 moments per primitive to (see
+                *MassProperties*.)
+            *tags* (*List*[*Tuple*[*str*, *Tuple*[*str*, ...], *str*]]):
+                The list to append one (primitive name, containing
+                *Module3D* names, color name) tuple per primitive to.
+            *affine3d* (*Affine3D*): The transform from local to world coordinates.
+            *module_names* (*Tuple*[*str*, ...]):
+                The names of the containing *Module3D*'s, outermost first.
+            *color_name* (*str*): The innermost *Color* name (or "").
+
+        This is the fall back method for sub-classes that do not have a
+        known volume (e.g. *If3D*); it does not append anything.
+        """
+        pass
+
+    # Scad3D.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the triangle mesh for a Scad3D.
+
+        Args:
+            *triangles* (*array*[*float*]):
+                The mesh to append to.  Each triangle is 9 floats
+                (3 X/Y/Z vertices in counter clockwise order when viewed
+                from outside.)
+            *affine3d* (*Affine3D*):
+                The transform from local to world coordinates.
+            *openscad_scad3ds* (*List*[*Scad3D*]):
+                The list of *Scad3D*'s that can not be meshed without
+                OpenSCAD (e.g. *Difference3D*'s).
+
+        This is the fall back method for sub-classes that can not be
+        meshed natively.  It simply records *scad3d* (i.e. *self*) in
+        *openscad_scad3ds*.
+        """
+        scad3d: Scad3D = self
+        openscad_scad3ds.append(scad3d)
+
+    # Scad3D.mesh_get():
+    def mesh_get(self) -> "Tuple[array[float], List[Scad3D]]":
+        """Return the native triangle mesh for a Scad3D.
+
+        Returns:
+            (*array*[*float*], *List*[*Scad3D*]) Returns the triangle
+                mesh as a flat array of 9 floats per triangle and the
+                list of sub-trees that still need OpenSCAD.
+
+        """
+        scad3d: Scad3D = self
+        triangles: array[float] = array("d")
+        openscad_scad3ds: List[Scad3D] = []
+        scad3d.mesh_append(triangles, Affine3D(), openscad_scad3ds)
+        return triangles, openscad_scad3ds
+
+    # Scad3D.stl_file_write():
+    def stl_file_write(self, stl_file: IO[bytes]) -> "List[Scad3D]":
+        """Write out a binary `.stl` file without using OpenSCAD.
+
+        Args:
+            *stl_file* (*IO*[*bytes*]):
+                A binary file object to write the `.stl` file to.
+
+        Returns:
+            (*List*[*Scad3D*]) Returns the sub-trees that were left
+                out of the `.stl` file because they need OpenSCAD
+                (i.e. they contain a *Difference3D*.)  An empty list
+                means the `.stl` file is complete.
+
+        """
+        # Grab some values from *scad3d* (i.e. *self*):
+        scad3d: Scad3D = self
+        name: str = scad3d.name
+        triangles: array[float]
+        openscad_scad3ds: List[Scad3D]
+        triangles, openscad_scad3ds = scad3d.mesh_get()
+
+        # Binary STL is an 80 byte header, a 32-bit triangle count, and 50 bytes per triangle
+        # (a normal, 3 vertices, and an unused 16-bit attribute):
+        triangles_size: int = len(triangles) // 9
+        header: bytes = f"Scad3D '{name}'".encode("utf-8")[:80].ljust(80, b' ')
+        stl_bytes: bytearray = bytearray(84 + 50 * triangles_size)
+        stl_bytes[:80] = header
+        struct.pack_into("<I", stl_bytes, 80, triangles_size)
+        triangle_struct: struct.Struct = struct.Struct("<12fH")
+        pack_into: Callable[..., None] = triangle_struct.pack_into
+        triangle_index: int
+        for triangle_index in range(triangles_size):
+            (x1, y1, z1, x2, y2, z2,
+             x3, y3, z3) = triangles[triangle_index * 9:triangle_index * 9 + 9]
+            # The normal is the normalized cross product of two triangle edges:
+            ux: float = x2 - x1
+            uy: float = y2 - y1
+            uz: float = z2 - z1
+            vx: float = x3 - x1
+            vy: float = y3 - y1
+            vz: float = z3 - z1
+            nx: float = uy * vz - uz * vy
+            ny: float = uz * vx - ux * vz
+            nz: float = ux * vy - uy * vx
+            length: float = sqrt(nx * nx + ny * ny + nz * nz)
+            if length > 0.0:
+                nx /= length
+                ny /= length
+                nz /= length
+            pack_into(stl_bytes, 84 + 50 * triangle_index,
+                      nx, ny, nz, x1, y1, z1, x2, y2, z2, x3, y3, z3, 0)
+        stl_file.write(bytes(stl_bytes))
+        return openscad_scad3ds
+
 
 # Cylinder:
 class Cylinder(Scad3D):
@@ -2564,6 +6722,80 @@ class Cylinder(Scad3D):
         start_point: P3D = cylinder.start_point
         return f"Cylinder('{name}',{diameter},{start_point},{end_point},{sides})"
 
+    # Cylinder.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the Cylinder bounding box."""
+        cylinder: Cylinder = self
+        radius: float = cylinder.diameter / 2.0
+        height: float = (cylinder.end_point - cylinder.start_point).length()
+        bounding_boxes.append(BoundingBox3D.transformed_get(
+            cylinder.name, affine3d.compose(cylinder.frame_get()),
+            P3D(-radius, -radius, 0.0), P3D(radius, radius, height), module_name))
+
+    # Cylinder.frame_get():
+    def frame_get(self) -> Affine3D:
+        """Return the Cylinder frame.
+
+        Returns:
+            (*Affine3D*) Returns the right handed frame that puts the center of
+                the cylinder bottom at the origin with the axis along Z.
+
+        """
+        # Grab some values from *cylinder* (i.e. *self*):
+        cylinder: Cylinder = self
+        end_point: P3D = cylinder.end_point
+        start_point: P3D = cylinder.start_point
+
+        # Build a right handed frame (*u*, *v*, *w*) where *w* points along the cylinder axis:
+        height_vector: P3D = end_point - start_point
+        w: P3D = height_vector / height_vector.length()
+        helper: P3D = P3D(1.0, 0.0, 0.0) if abs(w.x) < 0.9 else P3D(0.0, 1.0, 0.0)
+        u: P3D = helper - w * helper.dot(w)
+        u = u / u.length()
+        v: P3D = w.cross(u)
+        return Affine3D((u.x, v.x, w.x, start_point.x,
+                         u.y, v.y, w.y, start_point.y,
+                         u.z, v.z, w.z, start_point.z))
+
+    # Cylinder.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the Cylinder moments using the same sides as the mesh."""
+        cylinder: Cylinder = self
+        sides: int = cylinder.sides
+        height: float = (cylinder.end_point - cylinder.start_point).length()
+        radius: float = cylinder.diameter / 2.0
+        index: int
+        points: List[P2D] = [P2D(radius * cos(2.0 * pi * float(index) / float(sides)),
+                                 radius * sin(2.0 * pi * float(index) / float(sides)))
+                             for index in range(sides)]
+        cylinder.mass_record_append(
+            records, tags, affine3d.compose(cylinder.frame_get()), module_names, color_name,
+            Scad3D.extrusion_moments_get(Scad2D.points_area_moments_get(points), 0.0, height))
+
+    # Cylinder.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the Cylinder triangles to a mesh."""
+        # Grab some values from *cylinder* (i.e. *self*):
+        cylinder: Cylinder = self
+        diameter: float = cylinder.diameter
+        end_point: P3D = cylinder.end_point
+        sides: int = cylinder.sides
+        start_point: P3D = cylinder.start_point
+
+        # The local frame has the cylinder bottom centered on the origin and extends along Z:
+        height: float = (end_point - start_point).length()
+        frame: Affine3D = cylinder.frame_get()
+        radius: float = diameter / 2.0
+        index: int
+        points: List[P2D] = [P2D(radius * cos(2.0 * pi * float(index) / float(sides)),
+                                 radius * sin(2.0 * pi * float(index) / float(sides)))
+                             for index in range(sides)]
+        Scad3D.extrusion_mesh_append(triangles, affine3d.compose(frame), points, 0.0, height)
+
     # Cylinder.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append OpenScad commands for cylinder to lines list."""
@@ -2656,6 +6888,56 @@ class Cube(Scad3D):
         return (f"Cube('{name}',{float_format(dx)},{float_format(dy)},"
                 f"{float_format(dz)},center={center})")
 
+    # Cube.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the Cube bounding box."""
+        cube: Cube = self
+        center: P3D = cube.center
+        half: P3D = P3D(cube.dx / 2.0, cube.dy / 2.0, cube.dz / 2.0)
+        bounding_boxes.append(BoundingBox3D.transformed_get(
+            cube.name, affine3d, center - half, center + half, module_name))
+
+    # Cube.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the Cube moments."""
+        cube: Cube = self
+        center: P3D = cube.center
+        dx: float = cube.dx
+        dy: float = cube.dy
+        dz: float = cube.dz
+        volume: float = dx * dy * dz
+        cube.mass_record_append(records, tags, affine3d, module_names, color_name, (
+            volume, volume * center.x, volume * center.y, volume * center.z,
+            volume * (dx * dx / 12.0 + center.x * center.x),
+            volume * (dy * dy / 12.0 + center.y * center.y),
+            volume * (dz * dz / 12.0 + center.z * center.z),
+            volume * center.x * center.y, volume * center.x * center.z,
+            volume * center.y * center.z))
+
+    # Cube.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the 12 Cube triangles to a mesh."""
+        # Grab some values from *cube* (i.e. *self*):
+        cube: Cube = self
+        center: P3D = cube.center
+        dx: float = cube.dx
+        dy: float = cube.dy
+        dz: float = cube.dz
+
+        # A cube is just a square extruded along the Z axis:
+        half_dx: float = dx / 2.0
+        half_dy: float = dy / 2.0
+        points: List[P2D] = [P2D(center.x - half_dx, center.y - half_dy),
+                             P2D(center.x + half_dx, center.y - half_dy),
+                             P2D(center.x + half_dx, center.y + half_dy),
+                             P2D(center.x - half_dx, center.y + half_dy)]
+        Scad3D.extrusion_mesh_append(triangles, affine3d, points,
+                                     center.z - dz / 2.0, center.z + dz / 2.0)
+
     # Cube.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Cube to lines list.
@@ -2707,8 +6989,7 @@ class Color(Scad3D):
         super().__init__(name)
         # Now figure out what to stuff into *color* (i.e. *self*):
         # color: Color = self
-        colors_set: Set[str] = Scad.colors_set_get()
-        if color_name.lower() not in colors_set:
+        if color_name.lower() not in Scad.COLORS_SET:
             raise ValueError(f"Color '{color_name} is not a recognized color.")
         if not (0.0 <= alpha <= 1.0):
             raise ValueError(f"Alpha ({alpha}) must be between 0.0 and 1.0 inclusive.")
@@ -2728,6 +7009,41 @@ class Color(Scad3D):
         alpha_text: str = "" if alpha >= 1.0 else ",alpha={0:.2f}".format(alpha)
         return f"Color('{name}',{scad3d},'{color_name}'{alpha_text})"
 
+    # Color.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of the colored Scad3D."""
+        color: Color = self
+        color.scad3d.bom_counts_append(bill_of_materials, counts)
+
+    # Color.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the colored Scad3D bounding boxes."""
+        color: Color = self
+        color.scad3d.bounding_boxes_append(bounding_boxes, affine3d, module_name)
+
+    # Color.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the Scad3D moments under the Color name."""
+        color: Color = self
+        color.scad3d.mass_records_append(records, tags, affine3d, module_names, color.color_name)
+
+    # Color.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the colored Scad3D to a mesh (`.stl` files have no color)."""
+        color: Color = self
+        color.scad3d.mesh_append(triangles, affine3d, openscad_scad3ds)
+
+    # Color.rgba_get():
+    def rgba_get(self) -> Tuple[float, float, float, float]:
+        """Return the Color red, green, blue and alpha values between 0.0 and 1.0."""
+        color: Color = self
+        return Scad.color_rgba_get(color.color_name, color.alpha)
+
     # Color.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Color to a list of lines.
@@ -2851,6 +7167,33 @@ class Difference3D(Scad3D):
         # Just do the append:
         subtracts.append(scad3d)
 
+    # Difference3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of the Difference3D root (subtractions are not parts)."""
+        difference3d: Difference3D = self
+        difference3d.root.bom_counts_append(bill_of_materials, counts)
+
+    # Difference3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the Difference3D root bounding boxes along with their holes.
+
+        The subtracted Scad3D's do not add any material, so their bounding
+        boxes are attached to each root box as holes instead.
+        """
+        difference3d: Difference3D = self
+        root_bounding_boxes: List[BoundingBox3D] = []
+        difference3d.root.bounding_boxes_append(root_bounding_boxes, affine3d, module_name)
+        holes: List[BoundingBox3D] = []
+        subtract: Scad3D
+        for subtract in difference3d.subtracts:
+            subtract.bounding_boxes_append(holes, affine3d, module_name)
+        root_bounding_box: BoundingBox3D
+        for root_bounding_box in root_bounding_boxes:
+            root_bounding_box.holes.extend(holes)
+        bounding_boxes.extend(root_bounding_boxes)
+
     # Diffrence3D.extend():
     def extend(self, scad3ds: List[Scad3D]) -> None:
         """Append a list of Scad3D's to a Difference3D."""
@@ -2874,6 +7217,57 @@ class Difference3D(Scad3D):
         difference3d: Difference3D = self
         difference3d.locked = True
 
+    # Difference3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the root moments followed by the negated subtracted moments.
+
+        Each subtracted Scad3D is first clipped to the bounding box of
+        the root (see *MassProperties*.*moments_clip*()), so that a
+        through-hole only removes the material inside of the root.  The
+        clipped material is still assumed to lie inside the root and the
+        subtracted Scad3D's are assumed not to overlap one another.
+        """
+        difference3d: Difference3D = self
+        difference3d.root.mass_records_append(records, tags, affine3d, module_names, color_name)
+        root_bounding_boxes: List[BoundingBox3D] = []
+        difference3d.root.bounding_boxes_append(root_bounding_boxes, affine3d, "")
+
+        subtract: Scad3D
+        for subtract in difference3d.subtracts:
+            start: int = len(records)
+            subtract.mass_records_append(records, tags, affine3d, module_names, color_name)
+            subtract_bounding_boxes: List[BoundingBox3D] = []
+            subtract.bounding_boxes_append(subtract_bounding_boxes, affine3d, "")
+
+            # Clip the subtracted moments along each axis that sticks out of the root:
+            if root_bounding_boxes and subtract_bounding_boxes:
+                root_box: BoundingBox3D = BoundingBox3D.enclosing_get(root_bounding_boxes)
+                subtract_box: BoundingBox3D = BoundingBox3D.enclosing_get(
+                    subtract_bounding_boxes)
+                root_lower: Tuple[float, ...] = (
+                    root_box.lower.x, root_box.lower.y, root_box.lower.z)
+                root_upper: Tuple[float, ...] = (
+                    root_box.upper.x, root_box.upper.y, root_box.upper.z)
+                lower: Tuple[float, ...] = (
+                    subtract_box.lower.x, subtract_box.lower.y, subtract_box.lower.z)
+                upper: Tuple[float, ...] = (
+                    subtract_box.upper.x, subtract_box.upper.y, subtract_box.upper.z)
+                axis: int
+                for axis in range(3):
+                    if lower[axis] < root_lower[axis] or upper[axis] > root_upper[axis]:
+                        offset: int
+                        for offset in range(start, len(records), 10):
+                            records[offset:offset + 10] = array("d", MassProperties.moments_clip(
+                                tuple(records[offset:offset + 10]), axis, lower[axis],
+                                upper[axis], root_lower[axis], root_upper[axis]))
+
+            # Remove the subtracted material by negating its moments:
+            index: int
+            for index in range(start, len(records)):
+                records[index] = -records[index]
+
     # Difference3D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Difference3D to a list of lines.
@@ -3064,6 +7458,130 @@ class LinearExtrude(Scad3D):
         self.slices: int = slices
         self.twist: float = twist
 
+    # LinearExtrude.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the LinearExtrude bounding box.
+
+        Nothing is appended if the extruded Scad2D has no known bounding box.
+        The holes of a straight extrusion are attached to its bounding box.
+        """
+        # Grab some values from *linear_extrude* (i.e. *self*):
+        linear_extrude: LinearExtrude = self
+        height: float = linear_extrude.height
+        initial_scale: float = linear_extrude.initial_scale
+        final_scale: float = linear_extrude.final_scale
+
+        # The extrusion is scaled about the Z axis and the scale varies linearly with Z, so each
+        # side of the box is furthest out at either the initial or the final scale.  The union
+        # of the two scaled boxes is needed, since an extent that does not contain the origin
+        # moves towards (or away from) it as it is scaled.  Any twist sweeps the outline around
+        # the Z axis, so use the enclosing circle instead:
+        extent: Optional[Tuple[P2D, P2D]] = linear_extrude.scad2d.bounding_box_get()
+        if extent is not None:
+            lower: P2D = P2D(min(extent[0].x * initial_scale, extent[0].x * final_scale),
+                             min(extent[0].y * initial_scale, extent[0].y * final_scale))
+            upper: P2D = P2D(max(extent[1].x * initial_scale, extent[1].x * final_scale),
+                             max(extent[1].y * initial_scale, extent[1].y * final_scale))
+            if linear_extrude.twist != 0.0:
+                radius: float = max(abs(lower.x), abs(upper.x)) * sqrt(2.0)
+                radius = max(radius, max(abs(lower.y), abs(upper.y)) * sqrt(2.0))
+                lower = P2D(-radius, -radius)
+                upper = P2D(radius, radius)
+            bottom_z: float = -height / 2.0 if linear_extrude.center else 0.0
+            bounding_box: BoundingBox3D = BoundingBox3D.transformed_get(
+                linear_extrude.name, affine3d, P3D(lower.x, lower.y, bottom_z),
+                P3D(upper.x, upper.y, bottom_z + height), module_name)
+
+            # The holes in a straight extrusion go all of the way through:
+            if initial_scale == final_scale == 1.0 and linear_extrude.twist == 0.0:
+                hole_box: Tuple[P2D, P2D]
+                for hole_box in linear_extrude.scad2d.hole_boxes_get():
+                    bounding_box.holes.append(BoundingBox3D.transformed_get(
+                        linear_extrude.name, affine3d, P3D(hole_box[0].x, hole_box[0].y, bottom_z),
+                        P3D(hole_box[1].x, hole_box[1].y, bottom_z + height), module_name))
+            bounding_boxes.append(bounding_box)
+
+    # LinearExtrude.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the LinearExtrude moments.
+
+        Nothing is appended if the extruded Scad2D has no known area.  A
+        twisted or scaled extrusion is integrated as a stack of thin
+        straight slices.
+        """
+        # Grab some values from *linear_extrude* (i.e. *self*):
+        linear_extrude: LinearExtrude = self
+        height: float = linear_extrude.height
+        initial_scale: float = linear_extrude.initial_scale
+        final_scale: float = linear_extrude.final_scale
+        twist: float = linear_extrude.twist
+        area_moments: Optional[Tuple[float, ...]] = linear_extrude.scad2d.area_moments_get()
+        if area_moments is not None:
+            area: float
+            x: float
+            y: float
+            xx: float
+            xy: float
+            yy: float
+            area, x, y, xx, xy, yy = area_moments
+            bottom_z: float = -height / 2.0 if linear_extrude.center else 0.0
+            straight: bool = twist == 0.0 and initial_scale == 1.0 and final_scale == 1.0
+            slices: int = 1 if straight else 64
+            moments: List[float] = [0.0] * 10
+            index: int
+            for index in range(slices):
+                # Scale and rotate the area moments to the middle of the slice.  OpenSCAD twists
+                # clockwise when viewed from above:
+                fraction: float = (float(index) + 0.5) / float(slices)
+                scale: float = initial_scale + (final_scale - initial_scale) * fraction
+                angle: float = -twist * fraction
+                c: float = cos(angle)
+                s: float = sin(angle)
+                scale2: float = scale * scale
+                scale3: float = scale2 * scale
+                scale4: float = scale2 * scale2
+                slice_moments: Tuple[float, ...] = Scad3D.extrusion_moments_get(
+                    (scale2 * area, scale3 * (c * x - s * y), scale3 * (s * x + c * y),
+                     scale4 * (c * c * xx - 2.0 * c * s * xy + s * s * yy),
+                     scale4 * (c * s * (xx - yy) + (c * c - s * s) * xy),
+                     scale4 * (s * s * xx + 2.0 * c * s * xy + c * c * yy)),
+                    bottom_z + height * float(index) / float(slices),
+                    bottom_z + height * float(index + 1) / float(slices))
+                moment_index: int
+                for moment_index in range(10):
+                    moments[moment_index] += slice_moments[moment_index]
+            linear_extrude.mass_record_append(records, tags, affine3d, module_names, color_name,
+                                              tuple(moments))
+
+    # LinearExtrude.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the LinearExtrude triangles to a mesh.
+
+        Only straight (no twist or scale) extrusions of hole free
+        outlines are meshed; everything else is appended to
+        *openscad_scad3ds*.
+        """
+        # Grab some values from *linear_extrude* (i.e. *self*):
+        linear_extrude: LinearExtrude = self
+        center: bool = linear_extrude.center
+        final_scale: float = linear_extrude.final_scale
+        height: float = linear_extrude.height
+        initial_scale: float = linear_extrude.initial_scale
+        scad2d: Scad2D = linear_extrude.scad2d
+        twist: float = linear_extrude.twist
+
+        # Append the extrusion if it is simple enough; otherwise leave it for OpenSCAD:
+        points: Optional[List[P2D]] = scad2d.outline_points_get()
+        if points is None or twist != 0.0 or initial_scale != 1.0 or final_scale != 1.0:
+            openscad_scad3ds.append(linear_extrude)
+        else:
+            bottom_z: float = -height / 2.0 if center else 0.0
+            Scad3D.extrusion_mesh_append(triangles, affine3d, points, bottom_z, bottom_z + height)
+
     # LinearExtrude.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append ScadLinearExtrude to list of lines.
@@ -3127,6 +7645,7 @@ class Module3D(Scad3D):
 
         # Load values into *module3d* (i.e. *self*):
         # module3d: Module3D = self
+        self.bom_parts: List[Tuple[str, Dict[str, Any], int]] = []
         self.is_operator: bool = is_operator
         self.locked: bool = lock
         self.scad3ds: List[Scad3D] = scad3ds[:]  # Make a copy
@@ -3185,6 +7704,44 @@ class Module3D(Scad3D):
         assert isinstance(scad3d, Scad3D)
         scad3ds.append(scad3d)
 
+    # Module3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the memoized part counts of the Module3D."""
+        module3d: Module3D = self
+        part: str
+        count: int
+        for part, count in bill_of_materials.counts_get(module3d).items():
+            counts[part] = counts.get(part, 0) + count
+
+    # Module3D.bom_part_append():
+    def bom_part_append(self, part: str, attributes: Optional[Dict[str, Any]] = None,
+                        quantity: int = 1) -> None:
+        """Record that a Module3D contains a bill of materials part.
+
+        Args:
+            *part* (*str*):
+                The part name (e.g. "M2.5 Spacer 11mm".)  Parts with the
+                same name are counted together.
+            *attributes* (*Optional*[*Dict*[*str*, *Any*]]):
+                (Optional: Defaults to *None*.)  Some JSON compatible part
+                attributes (e.g. {"height": 11.0}) for the BOM columns.
+            *quantity* (*int*):
+                (Optional: Defaults to 1.)  The number of parts.
+
+        """
+        module3d: Module3D = self
+        module3d.bom_parts.append((part, {} if attributes is None else attributes, quantity))
+
+    # Module3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the Module3D contents bounding boxes under the Module3D name."""
+        module3d: Module3D = self
+        scad3d: Scad3D
+        for scad3d in module3d.scad3ds:
+            scad3d.bounding_boxes_append(bounding_boxes, affine3d, module3d.name)
+
     # Module3D.extend():
     def extend(self, new_scad3ds: List[Scad3D]) -> None:
         """Append a Scad3D to a Module3D."""
@@ -3211,6 +7768,26 @@ class Module3D(Scad3D):
         module3d: Module3D = self
         module3d.locked = True
 
+    # Module3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the Module3D contents moments with the Module3D name appended."""
+        module3d: Module3D = self
+        scad3d: Scad3D
+        for scad3d in module3d.scad3ds:
+            scad3d.mass_records_append(records, tags, affine3d, module_names + (module3d.name,),
+                                       color_name)
+
+    # Module3D.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the Module3D contents to a mesh."""
+        module3d: Module3D = self
+        scad3d: Scad3D
+        for scad3d in module3d.scad3ds:
+            scad3d.mesh_append(triangles, affine3d, openscad_scad3ds)
+
     # Module3D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Circle to lines list.
@@ -3292,6 +7869,41 @@ class Rotate3D(Scad3D):
         rotate_text: str = float_format(rotate * 180.0 / pi)
         return f"Rotate('{name}',{scad3d},{axis},{rotate_text}deg)"
 
+    # Rotate3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of the rotated Scad3D."""
+        rotate3d: Rotate3D = self
+        rotate3d.scad3d.bom_counts_append(bill_of_materials, counts)
+
+    # Rotate3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the rotated Scad3D bounding boxes."""
+        rotate3d: Rotate3D = self
+        rotate_affine3d: Affine3D = Affine3D.rotate_get(rotate3d.rotate, rotate3d.axis)
+        rotate3d.scad3d.bounding_boxes_append(bounding_boxes, affine3d.compose(rotate_affine3d),
+                                              module_name)
+
+    # Rotate3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the rotated Scad3D moments."""
+        rotate3d: Rotate3D = self
+        rotate_affine3d: Affine3D = Affine3D.rotate_get(rotate3d.rotate, rotate3d.axis)
+        rotate3d.scad3d.mass_records_append(records, tags, affine3d.compose(rotate_affine3d),
+                                            module_names, color_name)
+
+    # Rotate3D.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the rotated Scad3D to a mesh."""
+        rotate3d: Rotate3D = self
+        rotate_affine3d: Affine3D = Affine3D.rotate_get(rotate3d.rotate, rotate3d.axis)
+        rotate3d.scad3d.mesh_append(triangles, affine3d.compose(rotate_affine3d),
+                                    openscad_scad3ds)
+
     # Rotate3D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Rotate3D to lines list.
@@ -3348,6 +7960,41 @@ class Translate3D(Scad3D):
         scad3d: Scad3D = translate3d.scad3d
         return f"Translate3D('{name}',{scad3d},{offset})"
 
+    # Translate3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of the translated Scad3D."""
+        translate3d: Translate3D = self
+        translate3d.scad3d.bom_counts_append(bill_of_materials, counts)
+
+    # Translate3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the translated Scad3D bounding boxes."""
+        translate3d: Translate3D = self
+        translate_affine3d: Affine3D = Affine3D.translate_get(translate3d.offset)
+        translate3d.scad3d.bounding_boxes_append(
+            bounding_boxes, affine3d.compose(translate_affine3d), module_name)
+
+    # Translate3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the translated Scad3D moments."""
+        translate3d: Translate3D = self
+        translate_affine3d: Affine3D = Affine3D.translate_get(translate3d.offset)
+        translate3d.scad3d.mass_records_append(records, tags, affine3d.compose(translate_affine3d),
+                                               module_names, color_name)
+
+    # Translate3D.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the translated Scad3D to a mesh."""
+        translate3d: Translate3D = self
+        translate_affine3d: Affine3D = Affine3D.translate_get(translate3d.offset)
+        translate3d.scad3d.mesh_append(triangles, affine3d.compose(translate_affine3d),
+                                       openscad_scad3ds)
+
     # Translate3D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Translate3D to lines list.
@@ -3428,6 +8075,24 @@ class Union3D(Scad3D):
         # Perform the *append*:
         scad3ds.append(scad3d)
 
+    # Union3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of each Union3D member."""
+        union3d: Union3D = self
+        scad3d: Scad3D
+        for scad3d in union3d.scad3ds:
+            scad3d.bom_counts_append(bill_of_materials, counts)
+
+    # Union3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the bounding boxes of each Union3D member."""
+        union3d: Union3D = self
+        scad3d: Scad3D
+        for scad3d in union3d.scad3ds:
+            scad3d.bounding_boxes_append(bounding_boxes, affine3d, module_name)
+
     # Union3D.extend():
     def extend(self, new_scad3ds: List[Scad3D]) -> None:
         """Append a list of Scad3D's to a Union3D."""
@@ -3450,6 +8115,29 @@ class Union3D(Scad3D):
         union3d: Union3D = self
         union3d.locked = True
 
+    # Union3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the moments of each Union3D member, assuming that they do not overlap."""
+        union3d: Union3D = self
+        scad3d: Scad3D
+        for scad3d in union3d.scad3ds:
+            scad3d.mass_records_append(records, tags, affine3d, module_names, color_name)
+
+    # Union3D.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append each Union3D member to a mesh.
+
+        The member meshes are simply concatenated; overlapping shells are
+        fine for previewing and slicing, so no boolean union is done.
+        """
+        union3d: Union3D = self
+        scad3d: Scad3D
+        for scad3d in union3d.scad3ds:
+            scad3d.mesh_append(triangles, affine3d, openscad_scad3ds)
+
     # Union3D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append Union3D to list of lines.
@@ -3500,6 +8188,36 @@ class UseModule3D(Scad3D):
         name: str = use_module3d.name
         return f"UseModule3D('{name}',{module3d})"
 
+    # UseModule3D.bom_counts_append():
+    def bom_counts_append(self, bill_of_materials: "BillOfMaterials",
+                          counts: Dict[str, int]) -> None:
+        """Add the part counts of the used Module3D."""
+        use_module3d: UseModule3D = self
+        use_module3d.module3d.bom_counts_append(bill_of_materials, counts)
+
+    # UseModule3D.bounding_boxes_append():
+    def bounding_boxes_append(self, bounding_boxes: "List[BoundingBox3D]", affine3d: Affine3D,
+                              module_name: str) -> None:
+        """Append the used Module3D bounding boxes."""
+        use_module3d: UseModule3D = self
+        use_module3d.module3d.bounding_boxes_append(bounding_boxes, affine3d, module_name)
+
+    # UseModule3D.mass_records_append():
+    def mass_records_append(self, records: "array[float]",
+                            tags: "List[Tuple[str, Tuple[str, ...], str]]", affine3d: Affine3D,
+                            module_names: Tuple[str, ...], color_name: str) -> None:
+        """Append the used Module3D moments."""
+        use_module3d: UseModule3D = self
+        use_module3d.module3d.mass_records_append(records, tags, affine3d, module_names,
+                                                  color_name)
+
+    # UseModule3D.mesh_append():
+    def mesh_append(self, triangles: "array[float]", affine3d: Affine3D,
+                    openscad_scad3ds: "List[Scad3D]") -> None:
+        """Append the used Module3D to a mesh."""
+        use_module3d: UseModule3D = self
+        use_module3d.module3d.mesh_append(triangles, affine3d, openscad_scad3ds)
+
     # UseModule3D.scad_lines_append():
     def scad_lines_append(self, scad_lines: List[str], indent: str) -> None:
         """Append UseModule3D to list of lines.
@@ -0,0 +1,1201 @@
+"""SCAD Models: Command line program for generating the HR2 OpenSCAD files.
+
+# Introduction
+
+This module provides the `scad_models` console script (see `setup.py`.)
+It builds the HR2 models and writes them out as OpenSCAD `.scad` files:
+
+* In *monolithic* mode (the default), a single `hr2_models.scad` file is
+  written that contains every selected name.
+* In *split* mode (`--split`), one `NAME.scad` file is written per
+  selected name and only the parts needed for that name are built.  The
+  names are built in parallel with `--jobs`.
+
+Running with `--profile` runs everything in one process under `cProfile`
+and prints the most expensive functions.  A timing summary is always
+printed at the end.  Adding `--clearance MM` also prints the minimum
+clearances between the component groups of the arm assembly (see
+*HR2Robot*.*clearances_report*()) and flags those below `MM`.  Adding
+`--mass` prints the mass, center of gravity and inertia of the Nucleo
+assembly and each module in it (see *HR2Robot*.*mass_properties_report*().)
+Adding `--bom` writes a CSV and JSON bill of materials for each assembly
+into the output directory (see *HR2Robot*.*bom_files_write*().)  Adding
+`--duplicates` prints each name that is used by more than one *Scad*
+object along with the classes that constructed it (see *NameRegistry*.)
+
+Running with `--snapshot-save FILE` saves a golden snapshot of the full
+`hr2_models.scad` program and `--snapshot-check FILE` compares a new
+build against it module by module, printing a minimal diff of only the
+modules that changed and exiting with 1 if any did (see *ScadSnapshot*.)
+Use these around any refactoring of `scad.py` that should not change
+the generated models.
+
+Running with `--watch` keeps the program running and polls the
+`scad_models` sources (plus any `--watch-file` parameter files.)  When
+a file changes, the changed modules are reloaded and only the output
+files whose models use a changed top level class or function are
+rebuilt (see *ScadWatcher*.)
+
+Running with `--serve SOCKET` builds the model once and answers JSON
+queries from other tools over a Unix domain socket (see *ModelServer*
+and *model_request*().)
+
+Finally, *parameters_sweep*() builds many variants of the HR2 stack up
+(see *HR2Robot*.*PARAMETER_DEFAULTS*) in a process pool and evaluates
+user supplied metrics into a columnar table.
+"""
+
+# MIT License
+#
+# Copyright (c) 2019 Wayne C. Gramlich (Wayne@Gramlich.Net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# <----------------------------------------100 Characters----------------------------------------> #
+
+# Import stuff from other libraries:
+import argparse
+import ast
+import bisect
+from concurrent.futures import Future, ProcessPoolExecutor
+import cProfile
+import functools
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import pstats
+from scad_models import hr2_models, scad
+from scad_models.hr2_models import HR2Robot
+from scad_models.scad import KicadBoard, NameRegistry, P2D, Scad, ScadProgram, ScadSnapshot
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, IO, List, Optional, Set, Tuple
+
+# *COMMANDS* maps each *ModelServer* request command to the method that answers it:
+COMMANDS: Dict[str, str] = {
+    "bounding_box": "bounding_box_get",
+    "keys": "keys_get",
+    "lookup": "lookup_get",
+    "metrics": "metrics_get",
+    "names": "names_get",
+    "placement": "placement_get",
+    "scad": "scad_get",
+}
+
+
+# ModelServer:
+class ModelServer:
+    """Serves HR2 model queries to other tools over a Unix domain socket.
+
+    The HR2 model is built once and then shared by every client, so the
+    KiCad sync scripts, the render orchestrator and CI checks do not each
+    pay for importing and building it.  The protocol is one JSON object
+    per line in each direction.  Each request has a "command" field:
+
+    * "names": Returns the list of valid names.
+    * "scad": Returns the OpenSCAD text for an optional "name".
+    * "keys": Returns the key table for a "name" whose part has one.
+    * "lookup": Returns the type, count and constructing classes of the
+      Scad objects named "scad_name" (or *null* if there are none.)
+    * "bounding_box": Returns the 2D bounding box of a "name" (or *null*.)
+    * "placement": Returns the mounting hole and footprint placements for
+      a KiCad "board", optionally restricted to a single "reference".
+    * "metrics": Returns the per command latency metrics.
+
+    Each response is either `{"ok": true, "result": ..., "seconds": ...}`
+    or `{"ok": false, "error": ..., "seconds": ...}`.  Clients are handled
+    concurrently in their own threads, while queries against the model are
+    serialized by *lock*.  Before each query, the model sources (and any
+    extra parameter files) are polled; when any of them has changed, the
+    changed modules are reloaded and every cached result is discarded.
+
+    Attributes:
+        *builds* (*int*): The number of times the model has been built.
+        *hr2_robot* (*Optional*[*HR2Robot*]): The cached model or *None*.
+        *lock* (*threading.Lock*): Serializes access to the model.
+        *metrics* (*Dict*[*str*, *List*[*float*]]):
+            The [count, total seconds, maximum seconds] for each command.
+        *metrics_lock* (*threading.Lock*): Serializes access to *metrics*.
+        *polled* (*bool*): *True* once the watched files have been polled.
+        *scad_texts* (*Dict*[*str*, *str*]):
+            The cached OpenSCAD text for each name ("" for the full model.)
+        *signatures* (*Dict*[*str*, *Tuple*[*int*, *int*]]):
+            The last seen modification signature of each watched file.
+        *socket_path* (*str*): The Unix domain socket path.
+        *unix_server* (*Optional*[*socketserver.ThreadingUnixStreamServer*]):
+            The socket server while *serve*() is running.
+        *watched_file_names* (*List*[*str*]): The files to poll.
+
+    """
+
+    # ModelServer.__init__():
+    def __init__(self, socket_path: str, parameter_file_names: Optional[List[str]] = None) -> None:
+        """Initialize a ModelServer.
+
+        Args:
+            *socket_path* (*str*): The Unix domain socket path to listen on.
+            *parameter_file_names* (*Optional*[*List*[*str*]]):
+                (Optional: Defaults to *None*.)  Additional files to watch.
+
+        """
+        # Load up *model_server* (i.e. *self*):
+        # model_server: ModelServer = self
+        self.builds: int = 0
+        self.hr2_robot: Optional[HR2Robot] = None
+        self.lock: threading.Lock = threading.Lock()
+        self.metrics: Dict[str, List[float]] = {}
+        self.metrics_lock: threading.Lock = threading.Lock()
+        self.polled: bool = False
+        self.scad_texts: Dict[str, str] = {}
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.socket_path: str = socket_path
+        self.unix_server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self.watched_file_names: List[str] = (
+            [scad.__file__, hr2_models.__file__] +
+            (parameter_file_names if parameter_file_names is not None else []))
+
+    # ModelServer.bounding_box_get():
+    def bounding_box_get(self, request: Dict[str, Any]) -> Any:
+        """Return the bounding box for a "bounding_box" request."""
+        model_server: ModelServer = self
+        name: str = ModelServer.name_get(request)
+        hr2_robot: HR2Robot = model_server.hr2_robot_get()
+        use_module: Optional[Scad] = hr2_robot.scad_program.name_use_get(name)
+        bounding_box: Optional[Tuple[P2D, P2D]] = (
+            use_module.bounding_box_get() if isinstance(use_module, scad.Scad2D) else None)
+        return (None if bounding_box is None else
+                {"lower_left": [bounding_box[0].x, bounding_box[0].y],
+                 "upper_right": [bounding_box[1].x, bounding_box[1].y]})
+
+    # ModelServer.hr2_robot_get():
+    def hr2_robot_get(self) -> HR2Robot:
+        """Return the HR2Robot, building it if it is not cached.
+
+        This must only be called while *lock* is held.
+        """
+        model_server: ModelServer = self
+        hr2_robot: Optional[HR2Robot] = model_server.hr2_robot
+        if hr2_robot is None:
+            # Build inside of a *NameRegistry* so that "lookup" requests can be answered.  The
+            # registry is dropped along with the *hr2_robot* that it belongs to:
+            with scad.NameRegistry():
+                hr2_robot = hr2_models.hr2_robot_build()
+            model_server.hr2_robot = hr2_robot
+            model_server.builds += 1
+        return hr2_robot
+
+    # ModelServer.keys_get():
+    def keys_get(self, request: Dict[str, Any]) -> Any:
+        """Return the key table for a "keys" request."""
+        model_server: ModelServer = self
+        name: str = ModelServer.name_get(request)
+        hr2_robot: HR2Robot = model_server.hr2_robot_get()
+        # Only look at parts that are already built, since building a part twice would
+        # define its modules twice:
+        part: Any = hr2_robot.parts_table.get(hr2_models.HR2Robot.NAME_PARTS[name])
+        if not hasattr(part, "keys_get"):
+            raise ValueError(f"'{name}' does not have a key table")
+        key: Tuple[Any, ...]
+        return {"columns": list(Scad.KEY_COLUMNS), "keys": [list(key) for key in part.keys_get()]}
+
+    # ModelServer.lookup_get():
+    def lookup_get(self, request: Dict[str, Any]) -> Any:
+        """Return the Scad objects with a name for a "lookup" request."""
+        model_server: ModelServer = self
+        scad_name: Any = request.get("scad_name")
+        if not isinstance(scad_name, str):
+            raise ValueError(f"'scad_name' must be a string, not {scad_name!r}")
+        name_registry: Optional[NameRegistry] = model_server.hr2_robot_get().name_registry
+        assert name_registry is not None, "ModelServer builds without a NameRegistry"
+        found_scad: Optional[Scad] = name_registry.lookup(scad_name)
+        return (None if found_scad is None else
+                {"type": type(found_scad).__name__,
+                 "count": name_registry.count_get(scad_name),
+                 "owners": name_registry.owners_get(scad_name)})
+
+    # ModelServer.metrics_get():
+    def metrics_get(self, request: Dict[str, Any]) -> Any:
+        """Return the per command latency metrics for a "metrics" request."""
+        model_server: ModelServer = self
+        metrics: Dict[str, Any] = {}
+        command: str
+        command_metrics: List[float]
+        with model_server.metrics_lock:
+            for command, command_metrics in sorted(model_server.metrics.items()):
+                count: int = int(command_metrics[0])
+                metrics[command] = {"count": count, "mean_seconds": command_metrics[1] / count,
+                                    "max_seconds": command_metrics[2]}
+        return {"builds": model_server.builds, "commands": metrics}
+
+    # ModelServer.name_get():
+    @staticmethod
+    def name_get(request: Dict[str, Any]) -> str:
+        """Return the validated "name" field of a request."""
+        name_parts: Dict[str, str] = hr2_models.HR2Robot.NAME_PARTS
+        name: Any = request.get("name")
+        if name not in name_parts:
+            raise ValueError(f"'{name}' is not one of {sorted(name_parts.keys())}")
+        return name
+
+    # ModelServer.names_get():
+    def names_get(self, request: Dict[str, Any]) -> Any:
+        """Return the valid names for a "names" request."""
+        return list(hr2_models.HR2Robot.NAME_PARTS.keys())
+
+    # ModelServer.placement_get():
+    def placement_get(self, request: Dict[str, Any]) -> Any:
+        """Return the KiCad placements for a "placement" request."""
+        model_server: ModelServer = self
+        hr2_robot: HR2Robot = model_server.hr2_robot_get()
+        kicad_boards: Dict[str, KicadBoard] = hr2_robot.scad_program.kicad_boards
+        board_name: Any = request.get("board")
+        if board_name not in kicad_boards:
+            raise ValueError(f"Board '{board_name}' is not one of {sorted(kicad_boards.keys())}")
+        kicad_board: KicadBoard = kicad_boards[board_name]
+
+        # Merge the mounting holes and the footprint placements into *placements*.  A mounting
+        # hole can also have a footprint placement, in which case the entries are combined:
+        placements: Dict[str, Dict[str, Any]] = {}
+        reference: str
+        hole: P2D
+        diameter: float
+        for reference, (hole, diameter) in kicad_board.mounting_holes.items():
+            placements[reference] = {"x": hole.x, "y": hole.y, "diameter": diameter}
+        location: P2D
+        rotation: float
+        side: str
+        for reference, (location, rotation, side) in kicad_board.placements.items():
+            placements.setdefault(reference, {}).update({"x": location.x, "y": location.y,
+                                                         "rotation": rotation, "side": side})
+
+        # Restrict *placements* to a single *reference* if requested:
+        if "reference" in request:
+            reference = request["reference"]
+            if reference not in placements:
+                raise ValueError(f"Board '{board_name}' has no reference '{reference}'")
+            placements = {reference: placements[reference]}
+        return placements
+
+    # ModelServer.request_handle():
+    def request_handle(self, request_line: bytes) -> bytes:
+        """Perform one request and return its response.
+
+        Args:
+            *request_line* (*bytes*): A JSON encoded request.
+
+        Returns:
+            (*bytes*) Returns the newline terminated JSON encoded response.
+
+        """
+        model_server: ModelServer = self
+        start_time: float = time.perf_counter()
+        command: str = "invalid"
+        response: Dict[str, Any]
+        # Any exception can come out of the model code, so report everything to the client:
+        try:
+            request: Any = json.loads(request_line)
+            if not isinstance(request, dict) or request.get("command") not in COMMANDS:
+                raise ValueError(f"Request must be an object with a command in {list(COMMANDS)}")
+            command = request["command"]
+            with model_server.lock:
+                model_server.sources_check()
+                result: Any = getattr(model_server, COMMANDS[command])(request)
+            response = {"ok": True, "result": result}
+        except Exception as error:
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+        # Record the latency *metrics*:
+        seconds: float = time.perf_counter() - start_time
+        response["seconds"] = seconds
+        with model_server.metrics_lock:
+            command_metrics: List[float] = model_server.metrics.setdefault(command, [0, 0.0, 0.0])
+            command_metrics[0] += 1
+            command_metrics[1] += seconds
+            command_metrics[2] = max(command_metrics[2], seconds)
+        return (json.dumps(response, separators=(",", ":")) + "\n").encode()
+
+    # ModelServer.scad_get():
+    def scad_get(self, request: Dict[str, Any]) -> Any:
+        """Return the OpenSCAD text for a "scad" request.
+
+        Without a "name", the full model is returned.  With a "name", only
+        the parts needed for that name are built and *name* defaults to it.
+        """
+        model_server: ModelServer = self
+        name: str = ModelServer.name_get(request) if "name" in request else ""
+        scad_texts: Dict[str, str] = model_server.scad_texts
+        if name not in scad_texts:
+            scad_program: ScadProgram = (
+                model_server.hr2_robot_get().scad_program if name == "" else
+                hr2_models.hr2_scad_program_build([name], default_name=name))
+            scad_texts[name] = scad_text_get(scad_program)
+        return scad_texts[name]
+
+    # ModelServer.serve():
+    def serve(self) -> None:
+        """Serve requests until *shutdown*() is called.
+
+        A stale socket left behind by a previous server is removed, but
+        any other kind of file at *socket_path* is left alone.
+        """
+        model_server: ModelServer = self
+        socket_path: str = model_server.socket_path
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)
+
+        # ModelRequestHandler:
+        class ModelRequestHandler(socketserver.StreamRequestHandler):
+            """Answers each request line from one client connection."""
+
+            # ModelRequestHandler.handle():
+            def handle(self) -> None:
+                """Answer requests until the client disconnects."""
+                request_line: bytes
+                for request_line in self.rfile:
+                    if request_line.strip():
+                        self.wfile.write(model_server.request_handle(request_line))
+                        self.wfile.flush()
+
+        unix_server: socketserver.ThreadingUnixStreamServer = (
+            socketserver.ThreadingUnixStreamServer(socket_path, ModelRequestHandler))
+        unix_server.daemon_threads = True
+        model_server.unix_server = unix_server
+        try:
+            unix_server.serve_forever()
+        finally:
+            unix_server.server_close()
+            os.remove(socket_path)
+
+    # ModelServer.shutdown():
+    def shutdown(self) -> None:
+        """Stop a running *serve*() from another thread."""
+        model_server: ModelServer = self
+        unix_server: Optional[socketserver.ThreadingUnixStreamServer] = model_server.unix_server
+        if unix_server is not None:
+            unix_server.shutdown()
+
+    # ModelServer.sources_check():
+    def sources_check(self) -> None:
+        """Discard the cached model if any watched file has changed.
+
+        This must only be called while *lock* is held.
+        """
+        model_server: ModelServer = self
+        changed_file_names: List[str] = signatures_poll(model_server.watched_file_names,
+                                                        model_server.signatures)
+        # The first poll reports every watched file, but the loaded modules are already current:
+        if changed_file_names and model_server.polled:
+            modules_reload(changed_file_names)
+            model_server.hr2_robot = None
+            model_server.scad_texts = {}
+        model_server.polled = True
+
+
+# ScadWatcher:
+class ScadWatcher:
+    """Regenerates `.scad` output files whenever the model sources change.
+
+    A *ScadWatcher* polls the modification signature (time and size) of
+    the `scad.py` and `hr2_models.py` sources plus any extra parameter
+    files.  Python can only reload whole modules, so a changed source is
+    reloaded with *importlib*.  What is rebuilt is much finer grained:
+
+    * Each output file is built under *sys*.*setprofile*() to record the
+      top level `hr2_models.py` classes and functions that it uses.
+    * Each top level class and function of `hr2_models.py` is hashed by
+      its parsed AST, so comment and line number changes are ignored.
+    * Only the output files that use a changed definition are rebuilt.
+      A change to `scad.py`, to a parameter file, or to module level
+      code rebuilds everything.
+
+    Output files whose contents are unchanged are not rewritten.
+
+    Attributes:
+        *definition_hashes* (*Dict*[*str*, *str*]):
+            The AST hash of each top level `hr2_models.py` definition.
+            Module level statements are lumped together under "".
+        *definition_starts* (*List*[*Tuple*[*int*, *str*]]):
+            The sorted first line of each top level `hr2_models.py`
+            statement and its definition name (see *definitions_start_get*().)
+        *dependencies* (*Dict*[*str*, *Set*[*str*]]):
+            The top level definitions used by each output file.
+        *signatures* (*Dict*[*str*, *Tuple*[*int*, *int*]]):
+            The last seen modification signature of each watched file.
+        *targets* (*Dict*[*str*, *Callable*[[], *Tuple*[*str*, *float*, *bool*]]]):
+            The function that writes each output file.
+        *updates* (*int*): The number of *update*() calls so far.
+        *watched_file_names* (*List*[*str*]): The files to poll.
+
+    """
+
+    # ScadWatcher.__init__():
+    def __init__(self, names: List[str], output_directory: str, split: bool,
+                 parameter_file_names: Optional[List[str]] = None) -> None:
+        """Initialize a ScadWatcher.
+
+        Args:
+            *names* (*List*[*str*]): The names to build (empty means everything.)
+            *output_directory* (*str*): The directory to write `.scad` files into.
+            *split* (*bool*): *True* to write one `NAME.scad` file per name.
+            *parameter_file_names* (*Optional*[*List*[*str*]]):
+                (Optional: Defaults to *None*.)  Additional files to watch.
+
+        """
+        # Create the output file *targets* in *output_directory*:
+        os.makedirs(output_directory, exist_ok=True)
+        targets: Dict[str, Callable[[], Tuple[str, float, bool]]] = {}
+        name: str
+        if split:
+            for name in (names if names else list(HR2Robot.NAME_PARTS.keys())):
+                targets[os.path.join(output_directory, f"{name}.scad")] = functools.partial(
+                    name_scad_write, name, output_directory)
+        else:
+            targets[os.path.join(output_directory, "hr2_models.scad")] = functools.partial(
+                monolithic_scad_write, names, output_directory)
+
+        # Load up *scad_watcher* (i.e. *self*):
+        # scad_watcher: ScadWatcher = self
+        self.definition_hashes: Dict[str, str] = {}
+        self.definition_starts: List[Tuple[int, str]] = []
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.targets: Dict[str, Callable[[], Tuple[str, float, bool]]] = targets
+        self.updates: int = 0
+        self.watched_file_names: List[str] = (
+            [scad.__file__, hr2_models.__file__] +
+            (parameter_file_names if parameter_file_names is not None else []))
+
+    # ScadWatcher.affected_get():
+    def affected_get(self, changed_definitions: Set[str], rebuild_all: bool) -> List[str]:
+        """Return the output files that need to be rebuilt.
+
+        Args:
+            *changed_definitions* (*Set*[*str*]):
+                The top level `hr2_models.py` definitions that have changed.
+            *rebuild_all* (*bool*): *True* to force every output file to be rebuilt.
+
+        Returns:
+            (*List*[*str*]) Returns the output file names to rebuild.  Output
+                files that have never been built (or are missing) are included.
+
+        """
+        scad_watcher: ScadWatcher = self
+        dependencies: Dict[str, Set[str]] = scad_watcher.dependencies
+        rebuild_all = rebuild_all or "" in changed_definitions
+        file_name: str
+        affected_file_names: List[str] = [
+            file_name for file_name in scad_watcher.targets.keys()
+            if rebuild_all or file_name not in dependencies or not os.path.exists(file_name) or
+            not dependencies[file_name].isdisjoint(changed_definitions)]
+        return affected_file_names
+
+    # ScadWatcher.definitions_changed_get():
+    def definitions_changed_get(self) -> Set[str]:
+        """Return the top level `hr2_models.py` definitions that have changed.
+
+        Returns:
+            (*Set*[*str*]) Returns the names of the top level definitions
+                whose hash differs from the previous call.  The stored
+                *definition_hashes* are updated.
+
+        """
+        scad_watcher: ScadWatcher = self
+        previous_hashes: Dict[str, str] = scad_watcher.definition_hashes
+        definition_hashes: Dict[str, str] = ScadWatcher.definitions_hash_get(hr2_models.__file__)
+        name: str
+        changed_definitions: Set[str] = {
+            name for name in set(previous_hashes.keys()) | set(definition_hashes.keys())
+            if previous_hashes.get(name) != definition_hashes.get(name)}
+        scad_watcher.definition_hashes = definition_hashes
+        scad_watcher.definition_starts = ScadWatcher.definitions_start_get(hr2_models.__file__)
+        return changed_definitions
+
+    # ScadWatcher.definitions_hash_get():
+    @staticmethod
+    def definitions_hash_get(file_name: str) -> Dict[str, str]:
+        """Return a hash for each top level definition of a Python file.
+
+        Args:
+            *file_name* (*str*): The Python file to parse.
+
+        Returns:
+            (*Dict*[*str*, *str*]) Returns a table that maps each top level
+                class and function name to a hash of its AST.  All other
+                module level statements are hashed together under "".
+
+        """
+        python_file: IO[Any]
+        with open(file_name) as python_file:
+            module: ast.Module = ast.parse(python_file.read(), file_name)
+        definition_hashes: Dict[str, str] = {}
+        module_dumps: List[str] = []
+        node: ast.stmt
+        for node in module.body:
+            node_dump: str = ast.dump(node)
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+                definition_hashes[node.name] = hashlib.sha1(node_dump.encode()).hexdigest()
+            else:
+                module_dumps.append(node_dump)
+        definition_hashes[""] = hashlib.sha1('\n'.join(module_dumps).encode()).hexdigest()
+        return definition_hashes
+
+    # ScadWatcher.definitions_start_get():
+    @staticmethod
+    def definitions_start_get(file_name: str) -> List[Tuple[int, str]]:
+        """Return the first line of each top level statement of a Python file.
+
+        Args:
+            *file_name* (*str*): The Python file to parse.
+
+        Returns:
+            (*List*[*Tuple*[*int*, *str*]]) Returns the sorted first line
+                number (including decorators) of each top level statement
+                along with its class or function name ("" for all other
+                statements.)  A line belongs to the last statement that
+                starts at or before it, which works on Python 3.6 where
+                neither `co_qualname` nor `end_lineno` are available.
+
+        """
+        python_file: IO[Any]
+        with open(file_name) as python_file:
+            module: ast.Module = ast.parse(python_file.read(), file_name)
+        definition_starts: List[Tuple[int, str]] = []
+        node: ast.stmt
+        for node in module.body:
+            start_line: int = node.lineno
+            name: str = ""
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+                decorator: ast.expr
+                start_line = min([start_line] +
+                                 [decorator.lineno for decorator in node.decorator_list])
+                name = node.name
+            definition_starts.append((start_line, name))
+        definition_starts.sort()
+        return definition_starts
+
+    # ScadWatcher.poll():
+    def poll(self) -> List[str]:
+        """Return the watched files that have changed since the previous poll.
+
+        Returns:
+            (*List*[*str*]) Returns the changed watched file names.  A file
+                that disappears is reported as changed.  On the first call,
+                every watched file is reported.
+
+        """
+        scad_watcher: ScadWatcher = self
+        return signatures_poll(scad_watcher.watched_file_names, scad_watcher.signatures)
+
+    # ScadWatcher.run():
+    def run(self, interval: float, iterations: int = 0) -> None:
+        """Poll and update until interrupted.
+
+        Args:
+            *interval* (*float*): The number of seconds to sleep between polls.
+            *iterations* (*int*):
+                (Optional: Defaults to 0.)  The number of polls to perform
+                before returning, where 0 means poll forever.
+
+        """
+        scad_watcher: ScadWatcher = self
+        iteration: int = 0
+        while iterations <= 0 or iteration < iterations:
+            changed_file_names: List[str] = scad_watcher.poll()
+            if changed_file_names:
+                start_time: float = time.perf_counter()
+                results: List[Tuple[str, float, bool]] = scad_watcher.update(changed_file_names)
+                if results:
+                    timings_show(results, time.perf_counter() - start_time, "rebuild")
+            iteration += 1
+            if iterations <= 0 or iteration < iterations:
+                time.sleep(interval)
+
+    # ScadWatcher.update():
+    def update(self, changed_file_names: List[str]) -> List[Tuple[str, float, bool]]:
+        """Reload changed sources and rebuild the affected output files.
+
+        Args:
+            *changed_file_names* (*List*[*str*]): The changed watched files.
+
+        Returns:
+            (*List*[*Tuple*[*str*, *float*, *bool*]]) Returns the file name,
+                the elapsed seconds, and whether the file was written for
+                each rebuilt output file.  An error while reloading or
+                building is printed and an empty list is returned, so
+                the next save of a half edited file gets another try.
+
+        """
+        scad_watcher: ScadWatcher = self
+        file_name: str
+        rebuild_all: bool = any(file_name != hr2_models.__file__
+                                for file_name in changed_file_names)
+        results: List[Tuple[str, float, bool]] = []
+        # Any exception can come out of freshly edited model code, so catch everything:
+        try:
+            # The first update uses the modules that are already loaded:
+            if scad_watcher.updates > 0:
+                modules_reload(changed_file_names)
+            changed_definitions: Set[str] = scad_watcher.definitions_changed_get()
+            for file_name in scad_watcher.affected_get(changed_definitions, rebuild_all):
+                results.append(scad_watcher.write(file_name))
+        except Exception as error:
+            print(f"{type(error).__name__}: {error}")
+            scad_watcher.definition_hashes = {}
+            results = []
+        scad_watcher.updates += 1
+        return results
+
+    # ScadWatcher.write():
+    def write(self, file_name: str) -> Tuple[str, float, bool]:
+        """Write an output file while recording the definitions it uses.
+
+        Args:
+            *file_name* (*str*): The output file to write.
+
+        Returns:
+            (*Tuple*[*str*, *float*, *bool*]) Returns the file name, the
+                elapsed seconds, and whether the file was written.
+
+        """
+        scad_watcher: ScadWatcher = self
+        hr2_models_file_name: str = hr2_models.__file__
+        if not scad_watcher.definition_starts:
+            scad_watcher.definition_starts = ScadWatcher.definitions_start_get(
+                hr2_models_file_name)
+        definition_starts: List[Tuple[int, str]] = scad_watcher.definition_starts
+        definition_start: Tuple[int, str]
+        start_lines: List[int] = [definition_start[0]
+                                  for definition_start in definition_starts]
+        used_definitions: Set[str] = set()
+
+        # definition_record():
+        def definition_record(frame: FrameType, event: str, argument: Any) -> None:
+            code: Any = frame.f_code
+            if event == "call" and code.co_filename == hr2_models_file_name:
+                # Find the top level statement that encloses the first line of *code*:
+                index: int = bisect.bisect_right(start_lines, code.co_firstlineno) - 1
+                used_definitions.add(definition_starts[index][1] if index >= 0 else "")
+
+        sys.setprofile(definition_record)
+        try:
+            result: Tuple[str, float, bool] = scad_watcher.targets[file_name]()
+        finally:
+            sys.setprofile(None)
+        scad_watcher.dependencies[file_name] = used_definitions
+        return result
+
+
+# arguments_parse():
+def arguments_parse(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the `scad_models` command line arguments.
+
+    Args:
+        *arguments* (*Optional*[*List*[*str*]]):
+            (Optional: Defaults to *sys.argv*[1:].)  The arguments to parse.
+
+    Returns:
+        (*argparse.Namespace*) Returns the parsed arguments.  An unknown
+            `--name` is reported by *argparse* (which exits.)
+
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="scad_models", description="Generate the HR2 OpenSCAD models.")
+    parser.add_argument("-n", "--name", action="append", default=[], dest="names",
+                        metavar="NAME", help="A name to generate (repeatable; default is all)")
+    parser.add_argument("-o", "--output-directory", default=".",
+                        help="The directory to write `.scad` files into (default: .)")
+    parser.add_argument("-s", "--split", action="store_true",
+                        help="Write one NAME.scad file per name instead of hr2_models.scad")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="The number of parallel jobs in split mode (0 means one per CPU)")
+    parser.add_argument("-p", "--profile", action="store_true",
+                        help="Profile the build (forces a single job)")
+    parser.add_argument("-b", "--bom", action="store_true",
+                        help="Write CSV and JSON bills of materials for each assembly")
+    parser.add_argument("-c", "--clearance", type=float, default=None, metavar="MM",
+                        help="Print the arm assembly clearances and flag those below MM")
+    parser.add_argument("-d", "--duplicates", action="store_true",
+                        help="Print the duplicated Scad names and the classes that emit them")
+    parser.add_argument("-m", "--mass", action="store_true",
+                        help="Print the Nucleo assembly mass, center of gravity and inertia")
+    parser.add_argument("-l", "--list", action="store_true",
+                        help="List the available names and exit")
+    parser.add_argument("-w", "--watch", action="store_true",
+                        help="Keep running and regenerate the outputs whenever a source changes")
+    parser.add_argument("--watch-file", action="append", default=[], dest="watch_files",
+                        metavar="FILE",
+                        help="An additional parameter file to watch or serve (repeatable)")
+    parser.add_argument("--interval", type=float, default=0.25,
+                        help="The number of seconds between watch polls (default: 0.25)")
+    parser.add_argument("--snapshot-save", default="", metavar="FILE",
+                        help="Save a golden snapshot of the generated .scad program to FILE")
+    parser.add_argument("--snapshot-check", default="", metavar="FILE",
+                        help="Compare the generated .scad program to the golden snapshot FILE")
+    parser.add_argument("--serve", default="", metavar="SOCKET",
+                        help="Serve model queries over the Unix domain socket SOCKET")
+    parsed_arguments: argparse.Namespace = parser.parse_args(arguments)
+
+    # Reject any unknown names:
+    name: str
+    unknown_names: List[str] = [name for name in parsed_arguments.names
+                                if name not in HR2Robot.NAME_PARTS]
+    if unknown_names:
+        parser.error(f"Unknown name(s) {unknown_names}; use --list to see the valid names")
+    return parsed_arguments
+
+
+# main():
+def main(arguments: Optional[List[str]] = None) -> int:
+    """Run the `scad_models` program.
+
+    Args:
+        *arguments* (*Optional*[*List*[*str*]]):
+            (Optional: Defaults to *sys.argv*[1:].)  The command line arguments.
+
+    Returns:
+        (*int*) Returns 0 for success.  (Bad arguments exit via *argparse*.)
+
+    """
+    start_time: float = time.perf_counter()
+    parsed_arguments: argparse.Namespace = arguments_parse(arguments)
+    name: str
+    if parsed_arguments.list:
+        for name in HR2Robot.NAME_PARTS.keys():
+            print(name)
+        return 0
+
+    # Server mode runs until it is interrupted:
+    if parsed_arguments.serve:
+        model_server: ModelServer = ModelServer(parsed_arguments.serve,
+                                                parsed_arguments.watch_files)
+        try:
+            model_server.serve()
+        except KeyboardInterrupt:  # pragma: no cover
+            pass
+        return 0  # pragma: no cover
+
+    # Make sure that there is an *output_directory* to write into:
+    names: List[str] = parsed_arguments.names
+    output_directory: str = parsed_arguments.output_directory
+    os.makedirs(output_directory, exist_ok=True)
+
+    # Figure out how many *jobs* to use.  Profiling only makes sense within a single process:
+    split: bool = parsed_arguments.split
+    profile: bool = parsed_arguments.profile
+    jobs: int = parsed_arguments.jobs
+    jobs = (os.cpu_count() or 1) if jobs <= 0 else jobs
+    jobs = 1 if profile or not split or parsed_arguments.watch else jobs
+
+    # Watch mode runs until it is interrupted:
+    if parsed_arguments.watch:
+        scad_watcher: ScadWatcher = ScadWatcher(names, output_directory, split,
+                                                parsed_arguments.watch_files)
+        try:
+            scad_watcher.run(parsed_arguments.interval)
+        except KeyboardInterrupt:  # pragma: no cover
+            pass
+        return 0  # pragma: no cover
+
+    # Perform the builds, optionally under the profiler:
+    profiler: Optional[cProfile.Profile] = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    results: List[Tuple[str, float, bool]] = []
+    if not split:
+        results.append(monolithic_scad_write(names, output_directory))
+    else:
+        split_names: List[str] = names if names else list(HR2Robot.NAME_PARTS.keys())
+        if jobs <= 1:
+            for name in split_names:
+                results.append(name_scad_write(name, output_directory))
+        else:
+            executor: ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(jobs, len(split_names))) as executor:
+                futures: List[Future] = [executor.submit(name_scad_write, name, output_directory)
+                                         for name in split_names]
+                future: Future
+                for future in futures:
+                    results.append(future.result())
+    if profiler is not None:
+        profiler.disable()
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
+
+    timings_show(results, time.perf_counter() - start_time, f"{jobs} job(s)")
+
+    # Report the clearances last so that they are easy to spot:
+    if parsed_arguments.clearance is not None:
+        clearance_start_time: float = time.perf_counter()
+        hr2_robot: HR2Robot = hr2_models.hr2_robot_build(["hr2_arm_assembly"])
+        print(hr2_robot.clearances_report(parsed_arguments.clearance), end="")
+        print(f"Clearances: {time.perf_counter() - clearance_start_time:.3f} seconds")
+    if parsed_arguments.bom:
+        bom_start_time: float = time.perf_counter()
+        bom_file_names: List[str] = hr2_models.hr2_robot_build().bom_files_write(output_directory)
+        print(f"Bills of materials: {len(bom_file_names)} files written in "
+              f"{time.perf_counter() - bom_start_time:.3f} seconds")
+    if parsed_arguments.duplicates:
+        duplicates_start_time: float = time.perf_counter()
+        name_registry: NameRegistry
+        with NameRegistry() as name_registry:
+            hr2_models.hr2_robot_build()
+        print(name_registry.report_get())
+        print(f"Duplicates: {time.perf_counter() - duplicates_start_time:.3f} seconds")
+    if parsed_arguments.mass:
+        mass_start_time: float = time.perf_counter()
+        print(hr2_models.hr2_robot_build(["hr2_nucleo_assembly"]).mass_properties_report(),
+              end="")
+        print(f"Mass properties: {time.perf_counter() - mass_start_time:.3f} seconds")
+
+    # Save and/or check the golden snapshot of the full program:
+    status: int = 0
+    if parsed_arguments.snapshot_save or parsed_arguments.snapshot_check:
+        snapshot_start_time: float = time.perf_counter()
+        scad_snapshot: ScadSnapshot = ScadSnapshot.program_get(
+            hr2_models.hr2_scad_program_build())
+        if parsed_arguments.snapshot_save:
+            scad_snapshot.save(parsed_arguments.snapshot_save)
+        if parsed_arguments.snapshot_check:
+            golden_snapshot: ScadSnapshot = ScadSnapshot.load(parsed_arguments.snapshot_check)
+            print(golden_snapshot.report_get(scad_snapshot), end="")
+            status = 1 if golden_snapshot.differences_get(scad_snapshot) else 0
+        print(f"Snapshot: {time.perf_counter() - snapshot_start_time:.3f} seconds")
+    return status
+
+
+# model_request():
+def model_request(socket_path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request to a ModelServer and return its response.
+
+    Args:
+        *socket_path* (*str*): The Unix domain socket the *ModelServer* listens on.
+        *request* (*Dict*[*str*, *Any*]): The request (e.g. `{"command": "names"}`.)
+
+    Returns:
+        (*Dict*[*str*, *Any*]) Returns the decoded response.
+
+    """
+    client_socket: socket.socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(socket_path)
+        client_socket.sendall((json.dumps(request) + "\n").encode())
+        response_file: IO[bytes]
+        with client_socket.makefile("rb") as response_file:
+            response: Dict[str, Any] = json.loads(response_file.readline())
+    return response
+
+
+# modules_reload():
+def modules_reload(changed_file_names: List[str]) -> None:
+    """Reload the `scad_models` modules whose sources have changed.
+
+    `hr2_models.py` imports from `scad.py`, so it is reloaded after `scad.py`.
+
+    Args:
+        *changed_file_names* (*List*[*str*]): The changed file names.
+
+    """
+    scad_changed: bool = scad.__file__ in changed_file_names
+    if scad_changed:
+        importlib.reload(scad)
+    if scad_changed or hr2_models.__file__ in changed_file_names:
+        importlib.reload(hr2_models)
+
+
+# monolithic_scad_write():
+def monolithic_scad_write(names: List[str], output_directory: str) -> Tuple[str, float, bool]:
+    """Write every selected name into a single `hr2_models.scad` file.
+
+    Args:
+        *names* (*List*[*str*]): The names to build (empty means everything.)
+        *output_directory* (*str*): The directory to write into.
+
+    Returns:
+        (*Tuple*[*str*, *float*, *bool*]) Returns the file name, the
+            elapsed seconds, and whether the file was written.
+
+    """
+    start_time: float = time.perf_counter()
+    scad_program: ScadProgram = hr2_models.hr2_scad_program_build(names if names else None)
+    file_name: str = os.path.join(output_directory, "hr2_models.scad")
+    changed: bool = scad_file_update(file_name, scad_program)
+    return (file_name, time.perf_counter() - start_time, changed)
+
+
+# name_scad_write():
+def name_scad_write(name: str, output_directory: str) -> Tuple[str, float, bool]:
+    """Write a single name into its own `NAME.scad` file.
+
+    Only the parts needed for *name* are built and the OpenSCAD *name*
+    variable defaults to *name*, so the file renders without any `-D`.
+
+    Args:
+        *name* (*str*): The name to build.
+        *output_directory* (*str*): The directory to write into.
+
+    Returns:
+        (*Tuple*[*str*, *float*, *bool*]) Returns the file name, the
+            elapsed seconds, and whether the file was written.
+
+    """
+    start_time: float = time.perf_counter()
+    scad_program: ScadProgram = hr2_models.hr2_scad_program_build([name], default_name=name)
+    file_name: str = os.path.join(output_directory, f"{name}.scad")
+    changed: bool = scad_file_update(file_name, scad_program)
+    return (file_name, time.perf_counter() - start_time, changed)
+
+
+# parameters_sweep():
+def parameters_sweep(parameter_ranges: Dict[str, List[float]],
+                     metrics: Dict[str, Callable[[HR2Robot], Any]],
+                     validators: Optional[List[Callable[[Dict[str, float]], str]]] = None,
+                     names: Optional[List[str]] = None, jobs: int = 0) -> Dict[str, List[Any]]:
+    """Build and evaluate every combination of some HR2Robot parameters.
+
+    Each variant (i.e. one combination of values from *parameter_ranges*)
+    is first checked by every validator.  A variant that fails is aborted
+    before it is built.  The remaining variants are built in a process
+    pool and each metric is evaluated against the resulting *HR2Robot*.
+    A metric (or the model itself) can also abort a variant by raising
+    any exception (e.g. *ValueError* or a failed assertion), in which
+    case the remaining metrics are skipped and the exception is recorded
+    as the status of that variant alone.  The *metrics* and *validators*
+    must be top level functions so that they can be sent to the worker
+    processes.
+
+    Args:
+        *parameter_ranges* (*Dict*[*str*, *List*[*float*]]):
+            The values to try for each *HR2Robot*.*PARAMETER_DEFAULTS* name.
+        *metrics* (*Dict*[*str*, *Callable*[[*HR2Robot*], *Any*]]):
+            The functions to evaluate for each variant, keyed by column name.
+        *validators* (*Optional*[*List*[*Callable*[[*Dict*[*str*, *float*]], *str*]]]):
+            (Optional: Defaults to *None*.)  Functions that return "" for
+            acceptable parameters and an error message otherwise.
+        *names* (*Optional*[*List*[*str*]]):
+            (Optional: Defaults to *None*.)  When *None*, the entire robot
+            is built for each variant; otherwise, only the parts for *names*.
+        *jobs* (*int*):
+            (Optional: Defaults to 0.)  The number of worker processes, where
+            0 means one per CPU and 1 means no worker processes at all.
+
+    Returns:
+        (*Dict*[*str*, *List*[*Any*]]) Returns a columnar table with one row
+            per variant.  There is one column per parameter and per metric
+            followed by a "status" column ("ok" or why the variant was
+            aborted) and a "seconds" column.  Aborted metrics are *None*.
+
+    Raises:
+        *ValueError* for an unknown parameter name or a duplicate column name.
+
+    """
+    # Validate the *parameter_ranges* and *metrics* column names:
+    parameter_defaults: Dict[str, float] = hr2_models.HR2Robot.PARAMETER_DEFAULTS
+    parameter_names: List[str] = list(parameter_ranges.keys())
+    parameter_name: str
+    for parameter_name in parameter_names:
+        if parameter_name not in parameter_defaults:
+            raise ValueError(f"'{parameter_name}' is not one of "
+                             f"{sorted(parameter_defaults.keys())}")
+    metric_names: List[str] = list(metrics.keys())
+    column_names: List[str] = parameter_names + metric_names + ["status", "seconds"]
+    if len(set(column_names)) != len(column_names):
+        raise ValueError(f"Duplicate column name in {column_names}")
+
+    # Abort each variant that fails validation before it is built:
+    values: Tuple[float, ...]
+    variants: List[Dict[str, float]] = [
+        dict(zip(parameter_names, values))
+        for values in itertools.product(*[parameter_ranges[parameter_name]
+                                          for parameter_name in parameter_names])]
+    metric_functions: List[Callable[[HR2Robot], Any]] = list(metrics.values())
+    results: List[Optional[Tuple[List[Any], str, float]]] = []
+    pending_indices: List[int] = []
+    index: int
+    variant: Dict[str, float]
+    for index, variant in enumerate(variants):
+        validator: Callable[[Dict[str, float]], str]
+        messages: List[str] = [validator(variant) for validator in
+                               (validators if validators is not None else [])]
+        message: str
+        errors: List[str] = [message for message in messages if message]
+        if errors:
+            results.append(([None] * len(metric_names), errors[0], 0.0))
+        else:
+            results.append(None)
+            pending_indices.append(index)
+
+    # Build and evaluate the remaining variants:
+    jobs = (os.cpu_count() or 1) if jobs <= 0 else jobs
+    if jobs <= 1 or len(pending_indices) <= 1:
+        for index in pending_indices:
+            results[index] = variant_evaluate(variants[index], metric_functions, names)
+    else:
+        executor: ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending_indices))) as executor:
+            futures: Dict[int, Future] = {
+                index: executor.submit(variant_evaluate, variants[index], metric_functions, names)
+                for index in pending_indices}
+            future: Future
+            for index, future in futures.items():
+                results[index] = future.result()
+
+    # Assemble the columnar *table*:
+    table: Dict[str, List[Any]] = {column_name: [] for column_name in column_names}
+    result: Optional[Tuple[List[Any], str, float]]
+    for variant, result in zip(variants, results):
+        assert result is not None
+        metric_values: List[Any]
+        status: str
+        seconds: float
+        metric_values, status, seconds = result
+        for parameter_name in parameter_names:
+            table[parameter_name].append(variant[parameter_name])
+        metric_name: str
+        metric_value: Any
+        for metric_name, metric_value in zip(metric_names, metric_values):
+            table[metric_name].append(metric_value)
+        table["status"].append(status)
+        table["seconds"].append(seconds)
+    return table
+
+
+# scad_file_update():
+def scad_file_update(file_name: str, scad_program: ScadProgram) -> bool:
+    """Write a ScadProgram to a file unless the file is already up to date.
+
+    Args:
+        *file_name* (*str*): The `.scad` file to write.
+        *scad_program* (*ScadProgram*): The *ScadProgram* to write.
+
+    Returns:
+        (*bool*) Returns *True* if the file was written.
+
+    """
+    scad_text: str = scad_text_get(scad_program)
+
+    # Leave an up to date file alone so that its modification time does not change:
+    scad_file: IO[Any]
+    if os.path.exists(file_name):
+        with open(file_name) as scad_file:
+            if scad_file.read() == scad_text:
+                return False
+    with open(file_name, "w") as scad_file:
+        scad_file.write(scad_text)
+    return True
+
+
+# scad_text_get():
+def scad_text_get(scad_program: ScadProgram) -> str:
+    """Return the OpenSCAD text for a ScadProgram."""
+    scad_lines: List[str] = []
+    scad_program.scad_lines_append(scad_lines, "")
+    scad_lines.append("")
+    return '\n'.join(scad_lines)
+
+
+# signatures_poll():
+def signatures_poll(file_names: List[str], signatures: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Return the files whose modification signature has changed.
+
+    Args:
+        *file_names* (*List*[*str*]): The files to check.
+        *signatures* (*Dict*[*str*, *Tuple*[*int*, *int*]]):
+            The previous (modification time, size) of each file, which is updated.
+
+    Returns:
+        (*List*[*str*]) Returns the changed file names.  A file that
+            disappears is reported as changed, as is any file that is
+            not already in *signatures*.
+
+    """
+    changed_file_names: List[str] = []
+    file_name: str
+    for file_name in file_names:
+        signature: Tuple[int, int] = (-1, -1)
+        try:
+            file_stat: os.stat_result = os.stat(file_name)
+            signature = (file_stat.st_mtime_ns, file_stat.st_size)
+        except OSError:
+            pass
+        if signatures.get(file_name) != signature:
+            signatures[file_name] = signature
+            changed_file_names.append(file_name)
+    return changed_file_names
+
+
+# timings_show():
+def timings_show(results: List[Tuple[str, float, bool]], total_seconds: float, label: str) -> None:
+    """Print a timing summary.
+
+    Args:
+        *results* (*List*[*Tuple*[*str*, *float*, *bool*]]):
+            The file name, elapsed seconds and written flag for each output file.
+        *total_seconds* (*float*): The total elapsed seconds.
+        *label* (*str*): A label to show on the total line.
+
+    """
+    print(f"{'File':<32} {'Seconds':>8}  Status")
+    file_name: str
+    seconds: float
+    changed: bool
+    for file_name, seconds, changed in results:
+        print(f"{file_name:<32} {seconds:8.3f}  {'written' if changed else 'unchanged'}")
+    print(f"{'Total (' + label + ')':<32} {total_seconds:8.3f}")
+
+
+# variant_evaluate():
+def variant_evaluate(parameters: Dict[str, float],
+                     metric_functions: List[Callable[[HR2Robot], Any]],
+                     names: Optional[List[str]]) -> Tuple[List[Any], str, float]:
+    """Build one parameter sweep variant and evaluate its metrics.
+
+    Args:
+        *parameters* (*Dict*[*str*, *float*]): The *HR2Robot* parameter overrides.
+        *metric_functions* (*List*[*Callable*[[*HR2Robot*], *Any*]]):
+            The metrics to evaluate in order.
+        *names* (*Optional*[*List*[*str*]]): The names to build (*None* means everything.)
+
+    Returns:
+        (*Tuple*[*List*[*Any*], *str*, *float*]) Returns the metric values
+            (*None* after an abort), the status ("ok" or the abort
+            reason), and the elapsed seconds.
+
+    """
+    start_time: float = time.perf_counter()
+    metric_values: List[Any] = [None] * len(metric_functions)
+    status: str = "ok"
+    try:
+        hr2_robot: HR2Robot = hr2_models.hr2_robot_build(names, parameters=parameters)
+        index: int
+        metric_function: Callable[[HR2Robot], Any]
+        for index, metric_function in enumerate(metric_functions):
+            metric_values[index] = metric_function(hr2_robot)
+    except Exception as error:
+        status = f"{type(error).__name__}: {error}"
+    return (metric_values, status, time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
@@ -23,12 +23,13 @@
 # SOFTWARE.
 
 from math import cos, pi, sin
-from scad_models.hr2_models import (BaseDXF, HR2Robot, OtherPi,
-                                    RaspberryPi3, RectangularConnector,
+from scad_models.hr2_models import (BaseDXF, hr2_robot_build, HR2Robot, KICAD_PCB_FILES,
+                                    MasterBoard, OtherPi, RaspberryPi3, RectangularConnector,
                                     RomiExpansionPlate, RomiMotor, Spacer)
-from scad_models.scad import (Color, CornerCube, Difference3D, LinearExtrude, Module3D,
-                              P2D, P3D, Polygon, Scad3D, ScadProgram, Square)
-from typing import Any, IO, List, Tuple
+from scad_models.scad import (BillOfMaterials, Color, CornerCube, Difference3D, KicadPcb,
+                              LinearExtrude, Module3D, NameRegistry, P2D, P3D, Polygon, Scad,
+                              Scad3D, ScadProgram, Square)
+from typing import Any, Dict, IO, List, Optional, Set, Tuple
 
 
 # test_hr2_robot():
@@ -36,7 +37,123 @@ def test_hr2_robot():
     """Test the HR2 class."""
     scad_program: ScadProgram = ScadProgram("Top Level Program")
     hr2_robot: HR2Robot = HR2Robot(scad_program)
-    hr2_robot = hr2_robot
+
+    # Verify that the placements for all of the master board connectors are present:
+    assert hr2_robot.hr2_master_assembly is not None
+    master_board: MasterBoard = hr2_robot.hr2_master_assembly.master_board
+    connector_placements: Dict[str, Tuple[P2D, float, str]] = master_board.connector_placements
+    assert len(connector_placements) == 23
+    assert connector_placements["Pi"][1:] == (90.0, "B")
+    assert connector_placements["North Morpho Connector"][1:] == (0.0, "F")
+    assert connector_placements["MB JP2 Connector"][1:] == (90.0, "B")
+    assert connector_placements["Sonar 270.00deg"][1:] == (360.0, "B")
+
+    # The KiCad placements use the real references from `master_board.kicad_pcb`, which is
+    # already in sync.  Nudging a mounting hole in the model moves the matching footprint:
+    kicad_placements: Dict[str, Tuple[P2D, float, str]] = master_board.kicad_placements
+    assert sorted(kicad_placements.keys()) == sorted([f"H{index}" for index in range(1, 18)])
+    kicad_pcb: KicadPcb = KicadPcb(KICAD_PCB_FILES["master_board"],
+                                   master_board.kicad_board.offset)
+    assert kicad_pcb.footprints_place(kicad_placements, dry_run=True) == []
+    h1_location: P2D = kicad_placements["H1"][0]
+    nudged_placements: Dict[str, Tuple[P2D, float, str]] = dict(kicad_placements)
+    nudged_placements["H1"] = (h1_location + P2D(1.0, 0.0), 0.0, "F")
+    h1_deltas: List[str] = kicad_pcb.footprints_place(nudged_placements)
+    assert len(h1_deltas) == 1 and h1_deltas[0].startswith("H1: (at ")
+    assert kicad_pcb.footprints_place(nudged_placements, dry_run=True) == []
+
+    # Verify the clearance report covers every clearance pair and flags the close ones:
+    clearances_lines: List[str] = hr2_robot.clearances_report(1000.0).split("\n")
+    assert clearances_lines[0] == "HR2 Arm Assembly clearances (warning below 1000.000mm):"
+    assert len(clearances_lines) == len(HR2Robot.CLEARANCE_PAIRS) + 2
+    clearances_line: str
+    assert all(["WARNING" in clearances_line for clearances_line in clearances_lines[1:-1]])
+    assert any([" connectors <=> boards: " in clearances_line
+                for clearances_line in clearances_lines])
+    assert "WARNING" not in hr2_robot.clearances_report(0.0)
+
+    # The connectors are not measured against their own boards, so a clean build has no
+    # touching connectors and boards (the closest is a Morpho connector near the RasPi):
+    assert "WARNING" not in hr2_robot.clearances_report(0.05)
+    assert not any([clearances_line.startswith("    0.000mm")
+                    for clearances_line in clearances_lines])
+
+    # Verify the mass properties report starts with the entire Nucleo assembly:
+    mass_lines: List[str] = hr2_robot.mass_properties_report().split("\n")
+    assert mass_lines[0] == "HR2 Nucleo Assembly mass properties (g, mm, g*mm^2):"
+    assert mass_lines[2].endswith("  HR2 Nucleo Assembly")
+    assert float(mass_lines[2].split()[0]) > float(mass_lines[3].split()[0]) > 0.0
+
+    # Verify that only a build inside of a name registry indexes its names, so that builds do
+    # not share a registry:
+    assert hr2_robot.name_registry is None and Scad.name_registry is None
+    name_registry: NameRegistry
+    with NameRegistry() as name_registry:
+        assert hr2_robot_build().name_registry is name_registry
+    assert Scad.name_registry is None
+    wheat_color: Optional[Scad] = name_registry.lookup("Wheat Color")
+    assert isinstance(wheat_color, Color)
+    assert name_registry.count_get("Wheat Color") == 2
+    assert name_registry.owners_get("Wheat Color") == ["RomiMotor"]
+    assert name_registry.duplicates_get()["Wheat Color"] == 2
+    assert "Wheat Color" in name_registry.report_get()
+
+    # Verify the bill of materials counts the reused wheel assembly twice:
+    bill_of_materials: BillOfMaterials = BillOfMaterials()
+    wheel_counts: Dict[str, int] = bill_of_materials.counts_get(
+        hr2_robot.hr2_wheel_assembly_get().module)
+    assert wheel_counts["Romi Mini Plastic Gearmotor"] == 2
+    assert wheel_counts["Romi Encoder Board"] == 2
+    assert wheel_counts["Romi Encoder Magnet"] == 2
+    assert "Romi Chassis Base" in wheel_counts
+
+    # Headers that only differ by their pin heights are different parts:
+    bill_of_materials.counts_get(hr2_robot.hr2_arm_assembly_get().module)
+    header_parts: List[str] = [part for part in bill_of_materials.part_attributes
+                               if part.startswith("1x2 2.54x2.54mm Male Header 2.54mm ")]
+    assert sorted(header_parts) == ["1x2 2.54x2.54mm Male Header 2.54mm Pin 5.08mm PCB Pin 2.79mm",
+                                    "1x2 2.54x2.54mm Male Header 2.54mm Pin 5.84mm PCB Pin 2.54mm"]
+
+
+# test_hr2_robot_names():
+def test_hr2_robot_names() -> None:
+    """Test the HR2Robot lazy build of selected names."""
+    # Every registered name can be built on its own:
+    name: str
+    for name in HR2Robot.NAME_PARTS.keys():
+        name_scad_program: ScadProgram = ScadProgram(f"{name} Program")
+        HR2Robot(name_scad_program, [name])
+        registered_names: Set[str] = set(
+            [named_mark_down[0] for named_mark_down
+             in name_scad_program.if2d.named_mark_downs + name_scad_program.if3d.named_mark_downs])
+        assert name in registered_names, f"'{name}' was not built"
+
+    # Building only "romi_base" skips everything else:
+    scad_program: ScadProgram = ScadProgram("Romi Base Program")
+    hr2_robot: HR2Robot = HR2Robot(scad_program, ["romi_base"])
+    assert list(hr2_robot.parts_table.keys()) == ["romi_base_get"]
+    assert hr2_robot.hr2_master_assembly is None
+
+    # Parts are shared, so contained names are not built twice:
+    scad_program = ScadProgram("Shared Program")
+    hr2_robot = HR2Robot(scad_program, ["romi_base", "sonar", "hr2_base_assembly", "master_board"])
+    assert hr2_robot.romi_base_get() is hr2_robot.hr2_base_assembly_get().romi_base
+    assert "hcsr04_get" not in hr2_robot.parts_table
+    try:
+        HR2Robot(ScadProgram("Bad Program"), ["bogus"])
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert str(value_error).startswith("'bogus' is not one of [")
+
+    # The stack up *parameters* can be overridden:
+    hr2_robot = HR2Robot(ScadProgram("Parameters Program"), ["romi_base"], {"arm_dz": 30.0})
+    assert hr2_robot.arm_z == hr2_robot.master_board_z + 30.0
+    assert hr2_robot.parameters["pi_dz"] == HR2Robot.PARAMETER_DEFAULTS["pi_dz"]
+    try:
+        HR2Robot(ScadProgram("Bad Parameters Program"), ["romi_base"], {"bogus_dz": 1.0})
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert str(value_error).startswith("'bogus_dz' is not one of [")
 
 
 # test_raspi3b():
@@ -102,6 +219,15 @@ def test_rectangular_connector():
                                                                  pcb_polygon=pcb_polygon)
                     rectangular_connectors.append(rectangular_connector.module.use_module_get())
 
+                    # Pin 1 of a 1x2 connector is half a pitch away from *center*:
+                    pin1_center: P2D
+                    rotation: float
+                    side: str
+                    pin1_center, rotation, side = rectangular_connector.kicad_placement_get()
+                    assert side == top_name.replace("T", "F")
+                    assert abs(rotation - vertical_rotate * 180.0 / pi) < 1.0e-9
+                    assert abs(P2D(center.x, center.y).distance(pin1_center) - 1.27) < 1.0e-9
+
     # Create the final *green_pcb* from *pcb_polygon* by extruding, trimming and coloring:
     pcb_polygon.lock()
     extruded_pcb: LinearExtrude = LinearExtrude("Extruded PCB", pcb_polygon, 1.0)
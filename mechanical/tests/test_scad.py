@@ -25,14 +25,20 @@
 # <----------------------------------------100 Characters----------------------------------------> #
 
 import io
-from math import pi, sqrt
-from scad_models.scad import (Circle, Color, CornerCube, Cube, Cylinder, Difference2D,
-                              Difference3D, If2D, If3D, LinearExtrude, Module2D, Module3D,
-                              P2D, P3D, Polygon, Rotate3D, Scad2D, Scad3D, ScadProgram,
-                              SimplePolygon, Square, Translate3D, Union3D, UseModule2D,
-                              UseModule3D, Variable2D)
+import json
+from math import pi, sin, sqrt
+import os
+import struct
+from scad_models.scad import (Affine3D, BillOfMaterials, BoundingBox3D, BoundingVolumeHierarchy,
+                              Circle, Color, CornerCube, Cube, Cylinder, Difference2D, Difference3D,
+                              If2D, If3D, KicadBoard, KicadPcb, KicadSchematic, LinearExtrude,
+                              MarkedDocument, MassProperties, Module2D, Module3D, NameRegistry,
+                              P2D, P3D, Polygon, Rotate3D, Scad, Scad2D, Scad3D, ScadProgram,
+                              ScadSnapshot, SExpression, SimplePolygon, Square, Translate3D,
+                              Union3D, UseModule2D, UseModule3D, Variable2D)
 import scad_models.scad as scad
-from typing import Any, IO, List, Tuple
+import tempfile
+from typing import Any, Dict, FrozenSet, IO, List, Optional, Set, Tuple
 
 
 # def scad_writer(scad: Scad, scad_lines: List[str]) -> None:
@@ -47,6 +53,181 @@ from typing import Any, IO, List, Tuple
 # All `test_*` functions are alphabetized, since oder of execution does not really matter:
 
 
+def test_affine3d() -> None:
+    """Test Affine3D class."""
+    # Rotate 90 degrees around the Z axis and then translate:
+    rotate: Affine3D = Affine3D.rotate_get(pi / 2.0, P3D(0.0, 0.0, 2.0))
+    translate: Affine3D = Affine3D.translate_get(P3D(10.0, 20.0, 30.0))
+    affine3d: Affine3D = translate.compose(rotate)
+    point: P3D = affine3d.point_transform(P3D(1.0, 0.0, 0.0))
+    assert f"{point}" == "P3D(10.000,21.000,30.000)"
+    assert f"{Affine3D()}" == ("Affine3D(1.000,0.000,0.000,0.000,0.000,1.000,"
+                               "0.000,0.000,0.000,0.000,1.000,0.000)")
+
+
+def test_bill_of_materials() -> None:
+    """Test BillOfMaterials class."""
+    # Create a *wheel* module with a motor and two screws:
+    wheel: Module3D = Module3D("Wheel", [Cube("Wheel Cube", 1.0, 1.0, 1.0)])
+    wheel.bom_part_append("Motor", {"type": "Motor"})
+    wheel.bom_part_append("M2 Screw", {"type": "Screw", "length": 6.0}, 2)
+    assert wheel.bom_parts == [("Motor", {"type": "Motor"}, 1),
+                               ("M2 Screw", {"type": "Screw", "length": 6.0}, 2)]
+
+    # Reuse *wheel* twice, once through a rotate and once in a difference.  Only the root
+    # of the difference is counted, so the *tool* module in the negative is skipped:
+    tool: Module3D = Module3D("Tool", [Cube("Tool Cube", 1.0, 1.0, 1.0)])
+    tool.bom_part_append("Tool")
+    robot: Module3D = Module3D("Robot", [
+        Rotate3D("Rotated Wheel", wheel.use_module_get(), pi, P3D(0.0, 0.0, 1.0)),
+        Translate3D("Translated Wheel",
+                    Difference3D("Drilled Wheel", wheel.use_module_get(),
+                                 [tool.use_module_get()]),
+                    P3D(10.0, 0.0, 0.0)),
+        Color("Red Tool", tool.use_module_get(), "Red")])
+    robot.bom_part_append("Chassis")
+
+    bill_of_materials: BillOfMaterials = BillOfMaterials()
+    assert bill_of_materials.counts_get(robot) == {
+        "Chassis": 1, "M2 Screw": 4, "Motor": 2, "Tool": 1}
+    assert bill_of_materials.counts_get(wheel) == {"M2 Screw": 2, "Motor": 1}
+    assert sorted(bill_of_materials.module_counts.keys()) == ["Robot", "Tool", "Wheel"]
+
+    # Verify the CSV output has a column for each attribute:
+    csv_lines: List[str] = bill_of_materials.csv_get(robot).split("\n")
+    assert csv_lines == ["part,quantity,length,type",
+                         "Chassis,1,,",
+                         "M2 Screw,4,6.0,Screw",
+                         "Motor,2,,Motor",
+                         "Tool,1,,",
+                         ""]
+
+    # Verify the JSON output:
+    bom_json: Dict[str, Any] = json.loads(bill_of_materials.json_get(wheel))
+    assert bom_json == {"assembly": "Wheel", "parts": [
+        {"part": "M2 Screw", "quantity": 2, "length": 6.0, "type": "Screw"},
+        {"part": "Motor", "quantity": 1, "type": "Motor"}]}
+
+    # The same part name with different attributes is an error rather than a silent overwrite:
+    other_motor: Module3D = Module3D("Other Motor", [Cube("Other Motor Cube", 1.0, 1.0, 1.0)])
+    other_motor.bom_part_append("Motor", {"type": "Gearmotor"})
+    try:
+        bill_of_materials.counts_get(other_motor)
+        assert False  # pragma: no cover
+    except AssertionError as assertion_error:
+        assert f"{assertion_error}" == ("Part 'Motor' attributes {'type': 'Gearmotor'} "
+                                        "do not match {'type': 'Motor'}")
+
+
+def test_bounding_box3d() -> None:
+    """Test BoundingBox3D class."""
+    # A rotated box is enclosed by the box around its transformed corners:
+    rotate: Affine3D = Affine3D.rotate_get(pi / 4.0, P3D(0.0, 0.0, 1.0))
+    rotated_box: BoundingBox3D = BoundingBox3D.transformed_get(
+        "Rotated", rotate, P3D(-1.0, -1.0, 0.0), P3D(1.0, 1.0, 2.0), "Module")
+    assert f"{rotated_box}" == ("BoundingBox3D('Rotated',P3D(-1.414,-1.414,0.000),"
+                                "P3D(1.414,1.414,2.000))")
+    assert rotated_box.module_name == "Module" and rotated_box.holes == []
+
+    # The gap is positive between separate boxes and negative for overlapping ones:
+    box1: BoundingBox3D = BoundingBox3D("Box1", P3D(0.0, 0.0, 0.0), P3D(10.0, 10.0, 1.0))
+    box2: BoundingBox3D = BoundingBox3D("Box2", P3D(4.0, 4.0, 3.0), P3D(6.0, 6.0, 5.0))
+    assert box1.gap_get(box2) == 2.0 and box2.gap_get(box1) == 2.0
+    pin: BoundingBox3D = BoundingBox3D("Pin", P3D(4.5, 4.5, -1.0), P3D(5.5, 5.5, 4.0))
+    assert pin.gap_get(box1) == -2.0
+
+    # Distances are straight line and zero for touching or overlapping boxes:
+    assert box1.distance_get(box2) == 2.0
+    corner: BoundingBox3D = BoundingBox3D("Corner", P3D(13.0, 14.0, 1.0), P3D(14.0, 15.0, 2.0))
+    assert box1.distance_get(corner) == 5.0 and corner.distance_get(box1) == 5.0
+    assert pin.distance_get(box1) == 0.0 and box1.clearance_get(corner) == 5.0
+
+    # A hole clears the overlap only when it contains the whole overlap:
+    assert not pin.hole_clears(box1)
+    box1.holes.append(BoundingBox3D("Hole", P3D(4.0, 4.0, 0.0), P3D(6.0, 6.0, 1.0)))
+    assert pin.hole_clears(box1) and box1.hole_clears(pin)
+    assert not box2.hole_clears(pin)
+
+    # The clearance of a pin in a hole is its margin to the hole walls (ignoring Z, which
+    # the hole passes all the way through):
+    assert pin.clearance_get(box1) == 0.5 and box1.clearance_get(pin) == 0.5
+    assert box2.clearance_get(pin) == 0.0
+
+
+def test_bounding_volume_hierarchy() -> None:
+    """Test BoundingVolumeHierarchy class."""
+    assert BoundingVolumeHierarchy([]).near_pairs_get() == []
+
+    # Create a grid of unit cubes spaced 1.5 apart where every third cube is in its own module
+    # and every seventh cube is stretched to overlap its neighbor along X:
+    bounding_boxes: List[BoundingBox3D] = []
+    index: int
+    for index in range(200):
+        x: float = 1.5 * float(index % 10)
+        y: float = 1.5 * float((index // 10) % 5)
+        z: float = 1.5 * float(index // 50)
+        dx: float = 2.0 if index % 7 == 0 else 1.0
+        bounding_boxes.append(BoundingBox3D(f"Box{index}", P3D(x, y, z),
+                                            P3D(x + dx, y + 1.0, z + 1.0),
+                                            f"Module{index % 3}"))
+    bounding_volume_hierarchy: BoundingVolumeHierarchy = (
+        BoundingVolumeHierarchy(bounding_boxes))
+    assert len(bounding_volume_hierarchy.node_boxes) > 50
+
+    # Compare against the brute force answer for both overlaps and near misses:
+    distance: float
+    for distance in (0.0, 0.6):
+        expected: Set[Tuple[str, str]] = set()
+        index1: int
+        index2: int
+        for index1 in range(len(bounding_boxes)):
+            for index2 in range(index1 + 1, len(bounding_boxes)):
+                box1: BoundingBox3D = bounding_boxes[index1]
+                box2: BoundingBox3D = bounding_boxes[index2]
+                if box1.module_name != box2.module_name and box1.gap_get(box2) < distance - 1e-6:
+                    expected.add(tuple(sorted([box1.name, box2.name])))  # type: ignore
+        near_pairs: List[Tuple[BoundingBox3D, BoundingBox3D]] = (
+            bounding_volume_hierarchy.near_pairs_get(distance))
+        near_pair: Tuple[BoundingBox3D, BoundingBox3D]
+        actual: Set[Tuple[str, str]] = set([
+            tuple(sorted([near_pair[0].name, near_pair[1].name]))  # type: ignore
+            for near_pair in near_pairs])
+        assert actual == expected and len(actual) == len(near_pairs)
+        assert len(expected) > 0
+        assert all([near_pair[0].module_name < near_pair[1].module_name
+                    for near_pair in near_pairs])
+
+    # Only the stretched cubes interfere and ignored module pairs are skipped:
+    assert len(bounding_volume_hierarchy.near_pairs_get(0.0)) == 26
+    assert bounding_volume_hierarchy.near_pairs_get(
+        0.0, {("Module1", "Module0"), ("Module2", "Module1"), ("Module0", "Module2")}) == []
+
+    # Compare the nearest boxes between two hierarchies against the brute force answer:
+    bounding_box: BoundingBox3D
+    others: List[BoundingBox3D] = [
+        BoundingBox3D(f"Other{index}",
+                      bounding_box.lower + P3D(0.3 * float(index % 4), 20.0, 0.7),
+                      bounding_box.upper + P3D(0.3 * float(index % 4), 20.0, 0.7),
+                      f"Module{index % 5}")
+        for index, bounding_box in enumerate(bounding_boxes)]
+    other_hierarchy: BoundingVolumeHierarchy = BoundingVolumeHierarchy(others)
+    other: BoundingBox3D
+    expected_clearance: float = min([bounding_box.distance_get(other)
+                                     for bounding_box in bounding_boxes for other in others])
+    nearest: Optional[Tuple[float, BoundingBox3D, BoundingBox3D]] = (
+        bounding_volume_hierarchy.nearest_get(other_hierarchy))
+    assert nearest is not None and nearest[0] == expected_clearance
+    assert nearest[1] in bounding_boxes and nearest[2] in others
+    assert nearest[1].distance_get(nearest[2]) == expected_clearance
+    assert bounding_volume_hierarchy.nearest_get(BoundingVolumeHierarchy([])) is None
+
+    # Boxes in the same module are never measured against one another:
+    same_module: BoundingVolumeHierarchy = BoundingVolumeHierarchy(
+        [BoundingBox3D("Same", P3D(0.0, 0.0, 0.0), P3D(1.0, 1.0, 1.0), "Module0")])
+    nearest = same_module.nearest_get(bounding_volume_hierarchy)
+    assert nearest is not None and nearest[0] == 0.5 and nearest[2].module_name != "Module0"
+
+
 def test_circle() -> None:
     """Test Circle class."""
     center: P2D = P2D(2.0, 3.0)
@@ -116,6 +297,22 @@ def test_color() -> None:
     except ValueError as value_error:
         assert f"{value_error}" == "Alpha (-1.0) must be between 0.0 and 1.0 inclusive."
 
+    # Verify the precompiled color registry (including "Lavender" and "Thistle", which used to
+    # be run together into one bogus color by a missing comma):
+    colors_set: FrozenSet[str] = Scad.colors_set_get()
+    assert colors_set is Scad.COLORS_SET and len(colors_set) == 140
+    assert {"lavender", "thistle"} <= colors_set and "lavenderthistle" not in colors_set
+    thistle_cube: Color = Color("Thistle Cube", cube1, "Thistle")
+    assert thistle_cube.rgba_get() == (216 / 255, 191 / 255, 216 / 255, 1.0)
+    assert colored_cube1.rgba_get() == (0.0, 0.0, 1.0, 0.5)
+    assert Scad.color_rgba_get("DARKRED") == (139 / 255, 0.0, 0.0, 1.0)
+    assert Scad.color_rgba_get("Aqua") == Scad.color_rgba_get("Cyan")
+    try:
+        Scad.color_rgba_get("ugly")
+        assert False, "This line should not be reached"  # pragma: no cover
+    except ValueError as value_error:
+        assert f"{value_error}" == "Color 'ugly' is not a recognized color."
+
 
 def test_cube() -> None:
     """Test Cube class."""
@@ -554,6 +751,331 @@ def test_if3d() -> None:
     assert scad_lines[3] == "}  // End If3D 'Name Match IF3D'", "[3]!"
 
 
+def test_kicad_board() -> None:
+    """Test KicadBoard class."""
+    kicad_pcb_text: str = '\n'.join([
+        '(kicad_pcb (version 20171130) (host pcbnew "5.1.5")',
+        '  (module MountingHole:MountingHole_2.2mm_M2 (layer F.Cu) (tedit 56D1B4CB)',
+        '    (at 100 100)',
+        '    (fp_text reference H1 (at 0 -3.2) (layer F.SilkS))',
+        '  )',
+        ')',
+        ''])
+    square: Square = Square("Square", 2.0, 2.0)
+    good_board: KicadBoard = KicadBoard("good", [square], {"H1": (P2D(1.0, 2.0), 2.2)}, {})
+    missing_board: KicadBoard = KicadBoard("missing", [square], {}, {})
+    assert str(good_board) == "KicadBoard('good')"
+    scad_program: ScadProgram = ScadProgram("KiCad Boards")
+    scad_program.kicad_board_append(good_board)
+    scad_program.kicad_board_append(missing_board)
+    try:
+        scad_program.kicad_board_append(good_board)
+        assert False  # pragma: no cover
+    except AssertionError as assertion_error:
+        assert str(assertion_error) == "KicadBoard 'good' has already been defined"
+
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        good_file_name: str = os.path.join(temporary_directory, "good.kicad_pcb")
+        kicad_pcb_file: IO[Any]
+        with open(good_file_name, "w") as kicad_pcb_file:
+            kicad_pcb_file.write(kicad_pcb_text)
+        kicad_pcb_files: Dict[str, str] = {
+            "good": good_file_name,
+            "missing": os.path.join(temporary_directory, "missing.kicad_pcb"),
+            "orphan": os.path.join(temporary_directory, "orphan.kicad_pcb")}
+
+        # A dry run reports the changes without writing anything:
+        exit_code: int
+        report: List[str]
+        exit_code, report = KicadBoard.boards_sync(scad_program.kicad_boards,
+                                                   {"good": good_file_name}, dry_run=True)
+        assert exit_code == 0
+        assert report[0].startswith("good: 2 changes in ")
+        assert report[1:] == ["    H1: (at 100 100) => (at 101.000000 98.000000)",
+                              "    Edge.Cuts: 0 removed, 4 added"]
+        with open(good_file_name) as kicad_pcb_file:
+            assert kicad_pcb_file.read() == kicad_pcb_text
+
+        # Sync in a process pool; the *missing* file and the *orphan* board both fail:
+        exit_code, report = KicadBoard.boards_sync(scad_program.kicad_boards, kicad_pcb_files,
+                                                   jobs=2)
+        assert exit_code == 1
+        assert len(report) == 5
+        assert report[0].startswith("good: 2 changes in ")
+        assert report[3].startswith("missing: FAILED after ")
+        assert "FileNotFoundError" in report[3]
+        assert report[4] == "orphan: FAILED after 0.000s: No model for this board"
+
+        # Syncing the now up to date *good* board serially changes nothing:
+        exit_code, report = KicadBoard.boards_sync(scad_program.kicad_boards,
+                                                   {"good": good_file_name}, jobs=1)
+        assert exit_code == 0
+        assert len(report) == 1 and report[0].startswith("good: 0 changes in ")
+
+        # Missing footprints and footprints on the wrong side are reported, even in a dry run:
+        placed_board: KicadBoard = KicadBoard("placed", [square], {}, {
+            "H1": (P2D(1.0, 2.0), 0.0, "B"), "J1": (P2D(0.0, 0.0), 0.0, "F")})
+        exit_code, report = KicadBoard.boards_sync({"placed": placed_board},
+                                                   {"placed": good_file_name}, jobs=1,
+                                                   dry_run=True)
+        assert exit_code == 0 and report[0].startswith("placed: 2 changes in ")
+        assert report[1:] == ["    H1: F.Cu => B.Cu (flip in KiCad)",
+                              "    J1: missing from board"]
+
+        # An unexpected exception in one board is reported for that board alone:
+        broken_board: KicadBoard = KicadBoard("broken", [square], {},
+                                              {"H1": (P2D(1.0, 2.0), None, "F")})  # type: ignore
+        exit_code, report = KicadBoard.boards_sync(
+            {"broken": broken_board, "good": good_board},
+            {"broken": good_file_name, "good": good_file_name}, jobs=1)
+        assert exit_code == 1 and len(report) == 2
+        assert report[0].startswith("broken: FAILED after ")
+        assert "TypeError: " in report[0]
+        assert report[1].startswith("good: 0 changes in ")
+
+        # Cross check against a schematic where *H1* is missing; non-strict mode only reports
+        # the mismatches and (the default) strict mode blocks the sync:
+        with open(os.path.join(temporary_directory, "good.sch"), "w") as kicad_sch_file:
+            kicad_sch_file.write('\n'.join(["$Sheet", 'F0 "Holes" 50', 'F1 "holes.sch" 50',
+                                            "$EndSheet", ""]))
+        with open(os.path.join(temporary_directory, "holes.sch"), "w") as kicad_sch_file:
+            kicad_sch_file.write('\n'.join(["$Comp", "L Mechanical:MountingHole H2",
+                                            'F 0 "H2" H 0 0 50  0000 L CNN', "$EndComp", ""]))
+        kicad_sch_files: Dict[str, str] = {"good": os.path.join(temporary_directory, "good.sch")}
+        mismatch_line: str = "    schematic: 1 model references missing from schematic: H1"
+        exit_code, report = KicadBoard.boards_sync(scad_program.kicad_boards,
+                                                   {"good": good_file_name}, jobs=1,
+                                                   kicad_sch_files=kicad_sch_files, strict=False)
+        assert exit_code == 0
+        assert report[1:] == [mismatch_line,
+                              "    schematic: 1 schematic references missing from model: H2"]
+        good_board.mounting_holes["H2"] = (P2D(1.0, 2.0), 2.2)
+        exit_code, report = KicadBoard.boards_sync(scad_program.kicad_boards,
+                                                   {"good": good_file_name}, jobs=1,
+                                                   kicad_sch_files=kicad_sch_files)
+        assert exit_code == 1
+        assert report[0].startswith("good: FAILED after ")
+        assert report[0].endswith("good.sch' does not match the model")
+        assert report[1:] == [mismatch_line]
+
+
+def test_kicad_pcb() -> None:
+    """Test KicadPcb class."""
+    kicad_pcb_lines: List[str] = [
+        '(kicad_pcb (version 20171130) (host pcbnew "5.1.5")',
+        '',
+        '  (net_class Default "This is the default net class."',
+        '    (clearance 0.2)',
+        '  )',
+        '',
+        '  (module MountingHole:MountingHole_2.2mm_M2 (layer F.Cu) (tedit 56D1B4CB)',
+        '    (at 1.000000 2.000000 90)',
+        '    (fp_text reference H1 (at 0 -3.2) (layer F.SilkS)',
+        '      (effects (font (size 1 1) (thickness 0.15)))',
+        '    )',
+        '  )',
+        '',
+        '  (module Connector:Header (layer F.Cu)',
+        '    (at 10 20)',
+        '    (fp_text reference CN1 (at 0 -3.2) (layer F.SilkS))',
+        '  )',
+        '',
+        '  (gr_line (start 0 0) (end 1 1) (layer Edge.Cuts) (width 0.05))',
+        '  (gr_text "Text (with parens)" (at 5 5) (layer F.SilkS))',
+        '  (gr_line (start 1 1) (end 0 0) (layer Edge.Cuts) (width 0.05))',
+        '',
+        ')',
+        '',
+    ]
+    kicad_pcb_text: str = '\n'.join(kicad_pcb_lines)
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        kicad_pcb_file_name: str = os.path.join(temporary_directory, "test.kicad_pcb")
+        kicad_pcb_file: IO[Any]
+        with open(kicad_pcb_file_name, "w") as kicad_pcb_file:
+            kicad_pcb_file.write(kicad_pcb_text)
+
+        # Verify that an unmodified board is written back byte for byte:
+        kicad_pcb: KicadPcb = KicadPcb(kicad_pcb_file_name, P2D(100.0, 100.0))
+        assert kicad_pcb.text_get() == kicad_pcb_text
+        assert sorted(kicad_pcb.footprints_table.keys()) == ["CN1", "H1"]
+        assert len(kicad_pcb.layer_graphics_table["Edge.Cuts"]) == 2
+        assert len(kicad_pcb.layer_graphics_table["F.SilkS"]) == 1
+
+        # Replace the edge cuts and move *H1*; the rotation of *H1* must be preserved:
+        kicad_pcb.edge_cuts_remove()
+        kicad_pcb.edge_cut_append(P2D(0.0, 0.0), P2D(2.0, 0.0))
+        kicad_pcb.edge_cut_append(P2D(2.0, 0.0), P2D(0.0, 0.0))
+        kicad_pcb.mounting_holes_update({"H1": (P2D(3.0, 4.0), 2.2)})
+        assert kicad_pcb.save() == ["H1: (at 1.000000 2.000000 90) => (at 103.000000 96.000000 90)",
+                                    "Edge.Cuts: 2 removed, 2 added"]
+        assert os.listdir(temporary_directory) == ["test.kicad_pcb"]
+
+        # Saving again (or saving an unmodified board) must not touch the file:
+        modification_time: int = os.stat(kicad_pcb_file_name).st_mtime_ns
+        assert kicad_pcb.save() == []
+        assert KicadPcb(kicad_pcb_file_name, P2D(100.0, 100.0)).save() == []
+        assert os.stat(kicad_pcb_file_name).st_mtime_ns == modification_time
+        with open(kicad_pcb_file_name, "r") as kicad_pcb_file:
+            updated_lines: List[str] = kicad_pcb_file.read().split('\n')
+        assert len(updated_lines) == len(kicad_pcb_lines)
+        assert updated_lines[7] == "    (at 103.000000 96.000000 90)", "[7]!"
+        assert updated_lines[18] == ("  (gr_line (start 100.000000 100.000000) "
+                                     "(end 102.000000 100.000000) (layer Edge.Cuts) (width 0.05))")
+        assert updated_lines[19] == ("  (gr_line (start 102.000000 100.000000) "
+                                     "(end 100.000000 100.000000) (layer Edge.Cuts) (width 0.05))")
+        assert updated_lines[20] == kicad_pcb_lines[19], "[20]!"
+        assert updated_lines[:7] == kicad_pcb_lines[:7]
+        assert updated_lines[8:18] == kicad_pcb_lines[8:18]
+        assert updated_lines[21:] == kicad_pcb_lines[21:]
+        reloaded_kicad_pcb: KicadPcb = KicadPcb(kicad_pcb_file_name, P2D(0.0, 0.0))
+        assert len(reloaded_kicad_pcb.layer_graphics_table["Edge.Cuts"]) == 2
+
+        # Place *CN1*; a dry run only reports the deltas:
+        placements: Dict[str, Tuple[P2D, float, str]] = {
+            "CN1": (P2D(10.0, -20.0), 450.0, "B"),
+            "H1": (P2D(103.0, -96.0), 90.0, "F"),
+            "J99": (P2D(0.0, 0.0), 0.0, "F")}
+        deltas: List[str] = ["CN1: (at 10 20) => (at 10.000000 20.000000 90)",
+                             "CN1: F.Cu => B.Cu (flip in KiCad)",
+                             "J99: missing from board"]
+        assert reloaded_kicad_pcb.footprints_place(placements, dry_run=True) == deltas
+        assert reloaded_kicad_pcb.footprints_place(placements, dry_run=True) == deltas
+        assert reloaded_kicad_pcb.footprints_place(placements) == deltas
+        assert reloaded_kicad_pcb.footprints_place(placements) == deltas[1:]
+        assert reloaded_kicad_pcb.changes_get() == [
+            "CN1: (at 10 20) => (at 10.000000 20.000000 90)"]
+
+        # Replace the edge cuts with a "D" shaped outline that has a round cutout:
+        outline: SimplePolygon = SimplePolygon("D Outline")
+        outline.point_append(P2D(0.0, -5.0))
+        outline.arc_append(P2D(10.0, 0.0), 5.0, -pi / 2.0, pi / 2.0, 9)
+        outline.point_append(P2D(0.0, 5.0))
+        outline.lock()
+        polygon: Polygon = Polygon("D Polygon", [outline, Circle("Cutout", 2.0, 16)])
+        reloaded_kicad_pcb.edge_cuts_replace([polygon])
+        assert len(reloaded_kicad_pcb.layer_graphics_table["Edge.Cuts"]) == 11 + 16
+        reloaded_kicad_pcb.edge_cuts_replace([polygon], arcs=True)
+        edge_cuts: List[SExpression] = reloaded_kicad_pcb.layer_graphics_table["Edge.Cuts"]
+        assert [edge_cut.head_get() for edge_cut in edge_cuts] == [
+            "gr_arc", "gr_line", "gr_line", "gr_line", "gr_circle"]
+        assert edge_cuts[0].text_get() == ("(gr_arc (start 10.000000 0.000000) "
+                                           "(end 10.000000 5.000000) (angle -180.000000) "
+                                           "(layer Edge.Cuts) (width 0.05))")
+        assert edge_cuts[4].text_get() == ("(gr_circle (center 0.000000 0.000000) "
+                                           "(end 1.000000 0.000000) "
+                                           "(layer Edge.Cuts) (width 0.05))")
+        assert KicadPcb.arcs_find(Square("Square", 2.0, 2.0).points_get()) == []
+
+        # Without any removed graphics, new edge cuts go after the last graphics item, even
+        # when that item is the last item of the board:
+        last_graphics_lines: List[str] = [
+            '(kicad_pcb (version 20171130) (host pcbnew "5.1.5")',
+            '  (module Connector:Header (layer F.Cu)',
+            '    (at 10 20)',
+            '  )',
+            '  (gr_line (start 0 0) (end 1 1) (layer Edge.Cuts) (width 0.05))',
+            '  (gr_text "Last" (at 5 5) (layer F.SilkS))',
+            ')',
+            '']
+        with open(kicad_pcb_file_name, "w") as kicad_pcb_file:
+            kicad_pcb_file.write('\n'.join(last_graphics_lines))
+        last_graphics_kicad_pcb: KicadPcb = KicadPcb(kicad_pcb_file_name, P2D(0.0, 0.0))
+        last_graphics_kicad_pcb.edge_cut_append(P2D(0.0, 0.0), P2D(2.0, 0.0))
+        last_graphics_kicad_pcb.pending_flush()
+        assert last_graphics_kicad_pcb.text_get().split('\n') == last_graphics_lines[:6] + [
+            "  (gr_line (start 0.000000 0.000000) (end 2.000000 0.000000) "
+            "(layer Edge.Cuts) (width 0.05))"] + last_graphics_lines[6:]
+
+
+def test_kicad_schematic() -> None:
+    """Test KicadSchematic class."""
+    root_lines: List[str] = [
+        "EESchema Schematic File Version 4",
+        "$Comp",
+        "L Device:R R1",
+        'F 0 "R1" H 0 0 50  0000 L CNN',
+        "$EndComp",
+        "$Sheet",
+        "S 4900 6900 950  150 ",
+        'F0 "Holes A" 50',
+        'F1 "holes.sch" 50',
+        "$EndSheet",
+        "$Sheet",
+        'F0 "Holes B" 50',
+        'F1 "holes.sch" 50',
+        "$EndSheet",
+        "$EndSCHEMATC",
+        ""]
+    holes_lines: List[str] = [
+        "$Comp",
+        "L Mechanical:MountingHole H?",
+        'AR Path="/5E7063BE/5E70AEEA" Ref="H1"  Part="1" ',
+        'AR Path="/5E7063BF/5E70AEEA" Ref="H10"  Part="1" ',
+        'F 0 "H?" H 4200 5896 50  0000 L CNN',
+        "$EndComp",
+        "$Comp",
+        'F 0 "H2" H 4200 5896 50  0000 L CNN',
+        "$EndComp",
+        "$Comp",
+        'F 0 "H2" H 4200 5896 50  0000 L CNN',
+        "$EndComp",
+        "$Comp",
+        'F 0 "J?" H 4200 5896 50  0000 L CNN',
+        "$EndComp",
+        ""]
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        root_file_name: str = os.path.join(temporary_directory, "root.sch")
+        holes_file_name: str = os.path.join(temporary_directory, "holes.sch")
+        kicad_sch_file: IO[Any]
+        with open(root_file_name, "w") as kicad_sch_file:
+            kicad_sch_file.write('\n'.join(root_lines))
+        with open(holes_file_name, "w") as kicad_sch_file:
+            kicad_sch_file.write('\n'.join(holes_lines))
+
+        # The *AR* references override the `F 0` reference and *holes.sch* is read once:
+        kicad_schematic: KicadSchematic = KicadSchematic(root_file_name)
+        assert str(kicad_schematic) == f"KicadSchematic('{root_file_name}')"
+        assert kicad_schematic.file_names == [root_file_name, holes_file_name]
+        assert kicad_schematic.references_table == {
+            "H1": ["holes.sch:1"], "H10": ["holes.sch:1"], "H2": ["holes.sch:7", "holes.sch:10"],
+            "J?": ["holes.sch:13"], "R1": ["root.sch:2"]}
+
+        # Only the "H" and "J" prefixes of the model references are cross checked:
+        mismatches: Dict[str, List[str]] = kicad_schematic.mismatches_get({"H1", "H3", "J1"})
+        assert mismatches == {
+            "missing_from_schematic": ["H3", "J1"],
+            "missing_from_model": ["H2", "H10"],
+            "unannotated": ["J? (holes.sch:13)"],
+            "duplicated": ["H2 (holes.sch:7, holes.sch:10)"]}
+        assert KicadSchematic.mismatch_lines_get(mismatches) == [
+            "2 model references missing from schematic: H3, J1",
+            "2 schematic references missing from model: H2, H10",
+            "1 unannotated schematic symbols: J? (holes.sch:13)",
+            "1 duplicated schematic references: H2 (holes.sch:7, holes.sch:10)"]
+        assert KicadSchematic.mismatch_lines_get(
+            kicad_schematic.mismatches_get({"H1", "H2", "H10"})) == [
+                "1 duplicated schematic references: H2 (holes.sch:7, holes.sch:10)"]
+
+        # Unterminated `$Comp` blocks are errors:
+        with open(holes_file_name, "w") as kicad_sch_file:
+            kicad_sch_file.write('\n'.join(holes_lines[:4]))
+        try:
+            KicadSchematic(root_file_name)
+            assert False  # pragma: no cover
+        except ValueError as value_error:
+            assert str(value_error) == f"{holes_file_name}:1: $Comp without $EndComp"
+        with open(holes_file_name, "w") as kicad_sch_file:
+            kicad_sch_file.write('\n'.join(holes_lines[:4] + holes_lines[:4]))
+        try:
+            KicadSchematic(root_file_name)
+            assert False  # pragma: no cover
+        except ValueError as value_error:
+            assert str(value_error) == f"{holes_file_name}:1: $Comp without $EndComp"
+
+
 def test_linear_extrude() -> None:
     """Test LinearExtrude class."""
     unit_square: Square = Square("Unit Square", 1.0, 1.0)
@@ -571,6 +1093,106 @@ def test_linear_extrude() -> None:
     assert scad_lines[4] == ("// End LinearExtrude 'Linear Extrude'"), "[4]!"
 
 
+def test_marked_document() -> None:
+    """Test MarkedDocument class."""
+    document_lines: List[str] = [
+        "# Title",
+        "Names:  <!-- NAME list starts here. -->",
+        "  * old",
+        "<!-- NAME list ends here. -->",
+        "<!-- Timing starts here. -->",
+        "<!-- Timing ends here. -->",
+        "End",
+        ""]
+    document_text: str = '\n'.join(document_lines)
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        file_name: str = os.path.join(temporary_directory, "README.md")
+        marked_file: IO[Any]
+        with open(file_name, "w") as marked_file:
+            marked_file.write(document_text)
+
+        # Both regions are located and unchanged regions do not cause a write:
+        marked_document: MarkedDocument = MarkedDocument.file_read(file_name)
+        assert str(marked_document) == f"MarkedDocument('{file_name}')"
+        assert marked_document.regions_table == {"NAME list": (2, 3), "Timing": (5, 5)}
+        assert marked_document.region_get("NAME list") == ["  * old"]
+        assert marked_document.regions_update({"NAME list": ["  * old"], "Timing": []}) == []
+        modification_time: int = os.stat(file_name).st_mtime_ns
+        assert marked_document.save() == []
+        assert os.stat(file_name).st_mtime_ns == modification_time
+
+        # Update both regions in one pass:
+        assert marked_document.regions_update({"Timing": ["1.0s"],
+                                               "NAME list": ["  * a", "  * b"]}) == [
+                                                   "NAME list", "Timing"]
+        assert marked_document.region_get("Timing") == ["1.0s"]
+        assert marked_document.save() == ["NAME list", "Timing"]
+        assert os.listdir(temporary_directory) == ["README.md"]
+        with open(file_name) as marked_file:
+            assert marked_file.read().split('\n') == (
+                document_lines[:2] + ["  * a", "  * b"] + document_lines[3:5] + ["1.0s"] +
+                document_lines[5:])
+        assert marked_document.regions_table == {"NAME list": (2, 4), "Timing": (6, 7)}
+        assert marked_document.save() == []
+
+        # A save that fails before the rename does not leave its temporary file behind:
+        os.remove(file_name)
+        marked_document.regions_update({"Timing": ["2.0s"]})
+        try:
+            marked_document.save()
+            assert False  # pragma: no cover
+        except OSError:
+            pass
+        assert os.listdir(temporary_directory) == []
+
+    # Broken markers and unknown regions are errors:
+    bad_lines: List[str]
+    for bad_lines in (["<!-- A starts here. -->"],
+                      ["<!-- A ends here. -->"],
+                      ["<!-- A starts here. -->", "<!-- A starts here. -->"]):
+        try:
+            MarkedDocument('\n'.join(bad_lines))
+            assert False  # pragma: no cover
+        except ValueError:
+            pass
+    try:
+        MarkedDocument(document_text).regions_update({"Missing": []})
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert str(value_error) == "Region 'Missing' is not present"
+
+
+def test_mass_properties() -> None:
+    """Test MassProperties class."""
+    # An empty MassProperties is at the origin:
+    empty: MassProperties = MassProperties("Empty")
+    assert f"{empty}" == "MassProperties('Empty',0.000g,P3D(0.000,0.000,0.000))"
+    assert empty.inertia_get() == (0.0,) * 9
+
+    # Two 1 gram point masses 2mm apart along X have no inertia about X:
+    points: MassProperties = MassProperties("Points")
+    points.add([1.0, 1.0, 3.0, 4.0, 1.0, 9.0, 16.0, 3.0, 4.0, 12.0])
+    points.add([2.0, 6.0, 6.0, 8.0, 18.0, 18.0, 32.0, 18.0, 24.0, 24.0], 0, 0.5)
+    assert points.mass_get() == 2.0
+    assert f"{points}" == "MassProperties('Points',2.000g,P3D(2.000,3.000,4.000))"
+    assert points.inertia_get() == (0.0, -0.0, -0.0, -0.0, 2.0, -0.0, -0.0, -0.0, 2.0)
+
+    # A translated unit cube has the same inertia as the untransformed one:
+    cube_moments: Tuple[float, ...] = (1.0, 0.0, 0.0, 0.0, 1.0 / 12.0, 1.0 / 12.0, 1.0 / 12.0,
+                                       0.0, 0.0, 0.0)
+    moved: Tuple[float, ...] = MassProperties.moments_transform(
+        cube_moments, Affine3D.translate_get(P3D(1.0, 2.0, 3.0)))
+    assert moved[:4] == (1.0, 1.0, 2.0, 3.0)
+    moved_mass_properties: MassProperties = MassProperties("Moved", list(moved))
+    inertia: Tuple[float, ...] = moved_mass_properties.inertia_get()
+    value: float
+    sixth: float = round(1.0 / 6.0, 9)
+    assert [round(value, 9) for value in inertia] == [sixth, 0.0, 0.0,
+                                                      0.0, sixth, 0.0,
+                                                      0.0, 0.0, sixth]
+
+
 def test_module2d() -> None:
     """Test Module2D class."""
     # Create some *Scad2D* objects to play with:
@@ -700,6 +1322,55 @@ def test_module3d() -> None:
     assert f"{module3d2}" == "Module3D('Module3D 2',[...],is_operator=True,lock=True)"
 
 
+def test_name_registry() -> None:
+    """Test NameRegistry class."""
+    # Nothing is registered unless a *name_registry* is active:
+    assert Scad.name_registry is None
+    Cube("Cube 1", 1.0, 1.0, 1.0)
+
+    # Only the names constructed inside of the `with` block are registered:
+    name_registry: NameRegistry
+    with NameRegistry() as name_registry:
+        assert Scad.name_registry is name_registry
+        cube1: Cube = Cube("Cube" + " 1", 1.0, 1.0, 1.0)
+        cube2: Cube = Cube("Cube 1", 2.0, 2.0, 2.0)
+        circle: Circle = Circle("Circle", 1.0, 8)
+        Module3D("Module", [cube1, cube2])
+
+        # Nested registries restore the outer registry when they exit:
+        inner_name_registry: NameRegistry
+        with NameRegistry() as inner_name_registry:
+            Cube("Inner", 1.0, 1.0, 1.0)
+        assert Scad.name_registry is name_registry
+        assert len(inner_name_registry) == 1
+    assert Scad.name_registry is None
+
+    # Names are interned and the first *Scad* with a name is the one that is looked up:
+    assert cube1.name is cube2.name
+    assert name_registry.lookup("Cube 1") is cube1
+    assert name_registry.lookup("Circle") is circle
+    assert name_registry.lookup("Bogus") is None
+    assert len(name_registry) == 4
+    assert name_registry.count_get("Cube 1") == 2
+    assert name_registry.count_get("Bogus") == 0
+
+    # Registering returns *True* for a duplicate name:
+    assert name_registry.duplicates_get() == {"Cube 1": 2}
+    assert name_registry.register(Cube("Circle", 1.0, 1.0, 1.0))
+    assert not name_registry.register(Cube("Unique", 1.0, 1.0, 1.0))
+
+    # The constructing code is found by skipping over the frames in `scad.py`, even for the
+    # *UseModule3D* that was constructed by *Module3D*.*__init__*():
+    owners: List[str] = name_registry.owners_get("Use Module")
+    assert len(owners) == 1 and owners[0].endswith(".test_name_registry")
+    assert name_registry.owners_get("Bogus") == []
+    report_lines: List[str] = name_registry.report_get().split("\n")
+    assert report_lines[0] == "2 duplicated names out of 5:"
+    assert report_lines[1].startswith("    2  'Circle'  (")
+    name_registry.clear()
+    assert len(name_registry) == 0 and name_registry.duplicates_get() == {}
+
+
 def test_p2d() -> None:
     """Test the point class."""
     origin: P2D = P2D(0.0, 0.0)
@@ -914,6 +1585,218 @@ def test_rotate3d() -> None:
         assert f"{value_error}" == "Rotate axis has no direction."
 
 
+def test_s_expression() -> None:
+    """Test SExpression class."""
+    # Verify that parsing is lossless:
+    text: str = ' (a  b\n (c "d \\" )" e)\t( ) )\n\n'
+    prefix: str
+    root: SExpression
+    suffix: str
+    prefix, root, suffix = SExpression.parse(text)
+    assert prefix == " "
+    assert suffix == "\n\n"
+    assert prefix + root.text_get() + suffix == text
+    assert str(root) == "SExpression('a', 4 items)"
+    assert root.head_get() == "a"
+    assert root.atom_get(1) == "b"
+    assert root.atom_get(2) == ""
+    assert root.atom_get(9) == ""
+    c: Optional[SExpression] = root.child_find("c")
+    assert isinstance(c, SExpression)
+    assert c.items[1] == '"d \\" )"'
+    assert c.atom_get(1) == 'd " )'
+    assert root.child_find("z") is None
+
+    # Verify that newly constructed *SExpression*'s get single spaces:
+    new_s_expression: SExpression = SExpression(["at", "1", "2"])
+    new_s_expression.append(SExpression(["layer", "F.Cu"]))
+    assert new_s_expression.text_get() == "(at 1 2 (layer F.Cu))"
+
+    # Verify that malformed text is rejected:
+    bad_text: str
+    for bad_text in ("(a (b)", "(a))", "(a) (b)", "a (b)", '(a "b)', "   "):
+        try:
+            SExpression.parse(bad_text)
+            assert False, "This line should not be reached"  # pragma: no cover
+        except ValueError:
+            pass
+
+
+def test_scad3d_bounding_boxes() -> None:
+    """Test the Scad3D bounding_boxes_get() and interferences_get() methods."""
+    # A board is a square extruded with a hole plus a cube with a cylinder subtracted:
+    outer: SimplePolygon = SimplePolygon("Outer", [P2D(0.0, 0.0), P2D(20.0, 0.0),
+                                                   P2D(20.0, 10.0), P2D(0.0, 10.0)], lock=True)
+    hole: SimplePolygon = SimplePolygon("Hole", [P2D(2.0, 2.0), P2D(4.0, 2.0),
+                                                 P2D(4.0, 4.0), P2D(2.0, 4.0)], lock=True)
+    board_polygon: Polygon = Polygon("Board Polygon", [outer, hole])
+    board: Module3D = Module3D("Board Module", [
+        LinearExtrude("Board Extrude", board_polygon, 1.6),
+        Difference3D("Block", Cube("Block Cube", 4.0, 4.0, 4.0, center=P3D(15.0, 5.0, 3.6)),
+                     [Cylinder("Block Hole", 2.0, P3D(15.0, 5.0, 1.0), P3D(15.0, 5.0, 6.0), 8)])])
+
+    # A pin passes through the board hole, another through the block hole, and a third
+    # (rotated and colored) pin hits the board:
+    pins: Module3D = Module3D("Pins Module", [
+        Color("Pin 1 Color", Translate3D("Pin 1 Translate",
+                                         Cube("Pin 1", 1.0, 1.0, 5.0), P3D(3.0, 3.0, 1.0)),
+              "Red"),
+        Union3D("Pin 2 Union", [CornerCube("Pin 2", P3D(14.8, 4.8, 2.0), P3D(15.2, 5.2, 5.0))]),
+        Rotate3D("Pin 3 Rotate", Cube("Pin 3", 1.0, 1.0, 4.0, center=P3D(6.0, 0.0, 0.0)),
+                 pi / 2.0, P3D(0.0, 0.0, 1.0))])
+    assembly: Module3D = Module3D("Assembly Module", [
+        UseModule3D("Board Use", board), UseModule3D("Pins Use", pins)])
+
+    # Verify the world space bounding boxes:
+    bounding_boxes: List[BoundingBox3D] = assembly.bounding_boxes_get()
+    bounding_box: BoundingBox3D
+    assert [(bounding_box.name, bounding_box.module_name) for bounding_box in bounding_boxes] == [
+        ("Board Extrude", "Board Module"), ("Block Cube", "Board Module"),
+        ("Pin 1", "Pins Module"), ("Pin 2", "Pins Module"), ("Pin 3", "Pins Module")]
+    assert f"{bounding_boxes[0]}" == ("BoundingBox3D('Board Extrude',P3D(0.000,0.000,0.000),"
+                                      "P3D(20.000,10.000,1.600))")
+    assert f"{bounding_boxes[0].holes[0]}" == ("BoundingBox3D('Board Extrude',"
+                                               "P3D(2.000,2.000,0.000),P3D(4.000,4.000,1.600))")
+    assert f"{bounding_boxes[1].holes[0]}" == ("BoundingBox3D('Block Hole',"
+                                               "P3D(14.000,4.000,1.000),P3D(16.000,6.000,6.000))")
+    assert f"{bounding_boxes[4]}" == ("BoundingBox3D('Pin 3',P3D(-0.500,5.500,-2.000),"
+                                      "P3D(0.500,6.500,2.000))")
+
+    # Only the third pin interferes with the board:
+    interferences: List[Tuple[BoundingBox3D, BoundingBox3D]] = assembly.interferences_get()
+    assert [(interference[0].name, interference[1].name)
+            for interference in interferences] == [("Board Extrude", "Pin 3")]
+    assert assembly.interferences_get({("Pins Module", "Board Module")}) == []
+
+    # Measure the clearances between groups of modules:
+    groups: Dict[str, List[str]] = {"board": ["Board*"], "pins": ["Pins Module"]}
+    clearances: List[Tuple[float, str, str, BoundingBox3D, BoundingBox3D]] = (
+        assembly.clearances_get(groups))
+    assert [(clearance[0], clearance[1], clearance[2], clearance[3].name, clearance[4].name)
+            for clearance in clearances] == [(0.0, "board", "pins", "Board Extrude", "Pin 3")]
+    assert assembly.clearances_report(groups, 0.5).split("\n") == [
+        "Assembly Module clearances (warning below 0.500mm):",
+        "    0.000mm WARNING board <=> pins: 'Board Extrude' (Board Module) <=> "
+        "'Pin 3' (Pins Module)",
+        ""]
+
+    # Module pairs that are expected to touch are ignored (in either order):
+    assert assembly.clearances_get(groups, ignores=[("Pins*", "Board Module")]) == []
+    assert assembly.clearances_report(groups, 0.5, ignores=[("Board*", "Pins*")]).split(
+        "\n") == ["Assembly Module clearances (warning below 0.500mm):", ""]
+
+    # Without the third pin, the closest pin is the second one just above the board, which is
+    # closer than the first pin is to the walls of its board hole:
+    pins.scad3ds.pop()
+    clearances = assembly.clearances_get(groups)
+    assert [(f"{clearance[0]:.3f}", clearance[3].name, clearance[4].name)
+            for clearance in clearances] == [("0.400", "Board Extrude", "Pin 2")]
+
+    # Unknown and empty groups are rejected:
+    try:
+        assembly.clearances_get(groups, [("board", "bogus")])
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert f"{value_error}" == "Unknown clearance group 'bogus'"
+    try:
+        assembly.clearances_get({"empty": ["Empty*"]})
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert f"{value_error}" == ("Clearance group 'empty' matches no modules in "
+                                    "'Assembly Module'")
+
+    # If3D's have no known extent and twisted extrusions are enclosed by a circle:
+    assert If3D("If3D", "true", [Cube("Cube", 1.0, 1.0, 1.0)]).bounding_boxes_get() == []
+    twisted: LinearExtrude = LinearExtrude("Twisted", Square("Square", 2.0, 2.0), 1.0,
+                                           center=True, twist=pi, final_scale=2.0)
+    assert f"{twisted.bounding_boxes_get()[0]}" == ("BoundingBox3D('Twisted',"
+                                                    "P3D(-2.828,-2.828,-0.500),"
+                                                    "P3D(2.828,2.828,0.500))")
+
+    # An extrusion away from the origin that shrinks moves towards the origin as it rises, so
+    # its box is the union of the initial and final scaled boxes:
+    off_square: Square = Square("Off Square", 2.0, 2.0, center=P2D(5.0, 0.0))
+    tapered: LinearExtrude = LinearExtrude("Tapered", off_square, 1.0, final_scale=0.5)
+    assert f"{tapered.bounding_boxes_get()[0]}" == ("BoundingBox3D('Tapered',"
+                                                    "P3D(2.000,-1.000,0.000),"
+                                                    "P3D(6.000,1.000,1.000))")
+
+
+def test_scad3d_mass_properties() -> None:
+    """Test the Scad2D area moments and Scad3D mass_properties_get() method."""
+    # A 2x4 rectangle centered at (1, 2) with a 1x1 square hole centered at (1, 2):
+    rectangle: Square = Square("Rectangle", 2.0, 4.0, center=P2D(1.0, 2.0))
+    assert rectangle.area_moments_get() == (8.0, 8.0, 16.0, 8.0 + 8.0 / 3.0, 16.0,
+                                            32.0 + 32.0 / 3.0)
+    hole: Square = Square("Hole", 1.0, 1.0, center=P2D(1.0, 2.0))
+    polygon: Polygon = Polygon("Polygon", [rectangle, hole])
+    polygon_moments: Optional[Tuple[float, ...]] = polygon.area_moments_get()
+    assert polygon_moments is not None and polygon_moments[:3] == (7.0, 7.0, 14.0)
+    difference2d: Difference2D = Difference2D("Difference", rectangle, [hole])
+    assert difference2d.area_moments_get() == polygon_moments
+    module2d: Module2D = Module2D("Module2D", [rectangle])
+    assert UseModule2D("Use", module2d).area_moments_get() == rectangle.area_moments_get()
+    unknown: Difference2D = Difference2D("Unknown", rectangle, [Variable2D("V", "v", "1")])
+    assert unknown.area_moments_get() is None
+    assert Polygon("Empty", []).area_moments_get() is None
+
+    # A 2x4x3 block extruded from the rectangle matches the same Cube:
+    extrude: LinearExtrude = LinearExtrude("Extrude", rectangle, 3.0)
+    cube: Cube = Cube("Cube", 2.0, 4.0, 3.0, center=P3D(1.0, 2.0, 1.5))
+    extrude_mass_properties: MassProperties = extrude.mass_properties_get()["Extrude"]
+    cube_mass_properties: MassProperties = cube.mass_properties_get()["Cube"]
+    value: float
+    assert [round(value, 9) for value in extrude_mass_properties.moments] == [
+        round(value, 9) for value in cube_mass_properties.moments]
+    assert f"{cube_mass_properties}" == "MassProperties('Cube',0.024g,P3D(1.000,2.000,1.500))"
+
+    # A twisted extrusion keeps its mass and its inertia around the Z axis:
+    twisted: LinearExtrude = LinearExtrude("Twisted", Square("Centered", 2.0, 4.0), 3.0,
+                                           twist=pi / 2.0)
+    twisted_mass_properties: MassProperties = twisted.mass_properties_get()["Twisted"]
+    assert round(twisted_mass_properties.mass_get(), 9) == 0.024
+    assert round(twisted_mass_properties.inertia_get()[8], 9) == round(0.024 * 20.0 / 12.0, 9)
+
+    # A scaled extrusion is a frustum:
+    frustum: LinearExtrude = LinearExtrude("Frustum", Square("Centered", 2.0, 2.0), 3.0,
+                                           final_scale=0.5)
+    assert round(frustum.mass_properties_get(default_density=1000.0)["Frustum"].mass_get(),
+                 3) == 7.0
+
+    # Rotating a cylinder along X puts its axis on X, and colors and modules pick the density:
+    cylinder: Cylinder = Cylinder("Cylinder", 2.0, P3D(0.0, 0.0, 0.0), P3D(0.0, 0.0, 10.0), 64)
+    inner: Module3D = Module3D("Inner", [
+        Color("Color", Rotate3D("Rotate", cylinder, pi / 2.0, P3D(0.0, 1.0, 0.0)), "Red"),
+        Difference3D("Block", Cube("Block Cube", 10.0, 10.0, 10.0, center=P3D(0.0, 0.0, 20.0)),
+                     [Cube("Block Hole", 5.0, 5.0, 10.0, center=P3D(0.0, 0.0, 20.0))])])
+    outer: Module3D = Module3D("Outer", [
+        UseModule3D("Use Inner", inner),
+        Union3D("Union", [Translate3D("Translate", UseModule3D("Use Inner", inner),
+                                      P3D(0.0, 100.0, 0.0))])])
+    densities: Dict[str, float] = {"Red": 2000.0, "Block Cube": 1000.0, "Block Hole": 1000.0}
+    mass_properties_table: Dict[str, MassProperties] = outer.mass_properties_get(densities)
+    assert sorted(mass_properties_table.keys()) == ["Inner", "Outer"]
+    inner_mass_properties: MassProperties = mass_properties_table["Inner"]
+    cylinder_mass: float = 2.0 * 10.0 * 32.0 * sin(2.0 * pi / 64.0)
+    assert round(inner_mass_properties.mass_get(), 6) == round(2.0 * (cylinder_mass + 750.0), 6)
+    center: P3D = P3D(5.0 * cylinder_mass, 0.0, 15000.0) / (cylinder_mass + 750.0)
+    assert f"{mass_properties_table['Outer'].center_get()}" == f"{center + P3D(0.0, 50.0, 0.0)}"
+    assert "Inner" in outer.mass_properties_report(densities).split("\n")[3]
+
+    # A through-hole that sticks out of both sides of a plate only removes the material inside
+    # of the plate, so the plate stays centered on Z:
+    plate: Difference3D = Difference3D("Plate", Cube("Plate Cube", 10.0, 10.0, 2.0), [
+        Cylinder("Through Hole", 2.0, P3D(2.0, 0.0, -5.0), P3D(2.0, 0.0, 3.0), 64)])
+    plate_mass_properties: MassProperties = plate.mass_properties_get(
+        default_density=1000.0)["Plate"]
+    hole_mass: float = 2.0 * 32.0 * sin(2.0 * pi / 64.0)
+    assert round(plate_mass_properties.mass_get(), 9) == round(200.0 - hole_mass, 9)
+    plate_center: P3D = plate_mass_properties.center_get()
+    assert round(plate_center.x, 9) == round(-2.0 * hole_mass / (200.0 - hole_mass), 9)
+    assert round(plate_center.z, 9) == 0.0
+    assert If3D("If3D", "true", [cube]).mass_properties_get()["If3D"].mass_get() == 0.0
+
+
 def test_scad_keys_csv_file_write() -> None:
     """Test Scad.keys_csv_file_write()."""
     circle_key: Tuple[Any, ...] = ("Circle", "Circle1", 1.0, 2.0, 1.0, 1.0, 0.0)
@@ -930,6 +1813,60 @@ def test_scad_keys_csv_file_write() -> None:
         assert csv_lines[2] == '"Square","Square1",3.000,4.000,2.000,4.000,45.000,0.500,3', "[2]!"
         assert csv_lines[3] == '', "[3]!"
 
+    # Names that need quoting survive a write/read round trip:
+    odd_key: Tuple[Any, ...] = ("Square", 'Odd, "Name"', -0.0001, 2.0, 1.0, 1.0, 0.0, 0.0, 1)
+    with io.StringIO("") as csv_file:
+        scad.Scad.keys_csv_file_write(keys + [odd_key], csv_file)
+        assert csv_file.getvalue().split('\n')[3] == (
+            '"Square","Odd, ""Name""",0.000,2.000,1.000,1.000,0.000,0.000,1')
+        csv_file.seek(0)
+        read_keys: List[Tuple[Any, ...]] = scad.Scad.keys_csv_file_read(csv_file)
+    assert read_keys == [circle_key, square_key,
+                         ("Square", 'Odd, "Name"', 0.0, 2.0, 1.0, 1.0, 0.0, 0.0, 1)]
+    assert isinstance(read_keys[1][8], int)
+
+    # Bad headers, column counts and values are reported:
+    header: str = csv_lines[0] + '\n'
+    bad_csv_text: str
+    for bad_csv_text in ("X,Y\n", header + '"Circle"\n', header + '"Circle","C",x\n'):
+        try:
+            scad.Scad.keys_csv_file_read(io.StringIO(bad_csv_text))
+            assert False  # pragma: no cover
+        except ValueError:
+            pass
+
+
+def test_scad_keys_diff() -> None:
+    """Test Scad.keys_diff()."""
+    old_keys: List[Tuple[Any, ...]] = [
+        ("Circle", "Hole", 1.0, 2.0, 1.0, 1.0, 0.0),
+        ("Circle", "Hole", 5.0, 5.0, 1.0, 1.0, 0.0),
+        ("Circle", "Gone", 0.0, 0.0, 1.0, 1.0, 0.0),
+        ("Circle", "Shape", 0.0, 0.0, 1.0, 1.0, 0.0),
+        ("Square", "Slot", 3.0, 4.0, 2.0, 4.0, 45.0, 0.5, 3),
+        ("Square", "Wider", 3.0, 4.0, 2.0, 4.0, 45.0, 0.5, 3),
+    ]
+    new_keys: List[Tuple[Any, ...]] = [
+        ("Circle", "Hole", 1.0004, 2.0, 1.0, 1.0, 0.0),
+        ("Circle", "Hole", 8.0, 9.0, 1.0, 1.0, 0.0),
+        ("Square", "Shape", 0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1),
+        ("Square", "Slot", 3.0, 4.5, 2.0, 4.0, 45.0, 0.5, 3),
+        ("Square", "Wider", 3.0, 4.0, 3.0, 4.0, 45.0, 0.5, 3),
+        ("Circle", "New", 0.0, 0.0, 1.0, 1.0, 0.0),
+    ]
+    differences: List[Tuple[str, str, float, str]] = scad.Scad.keys_diff(old_keys, new_keys)
+    assert [(kind, name) for kind, name, magnitude, description in differences] == [
+        ("removed", "Gone"), ("added", "New"), ("changed", "Shape"),
+        ("moved", "Hole#2"), ("moved", "Wider"), ("moved", "Slot")]
+    assert scad.Scad.keys_diff_lines_get(differences[3:]) == [
+        "moved 'Hole#2' by 5.000: X +3.000, Y +4.000",
+        "moved 'Wider' by 1.000: DX +1.000",
+        "moved 'Slot' by 0.500: Y +0.500"]
+    assert scad.Scad.keys_diff_lines_get(differences[:1]) == [
+        "removed 'Gone': ('Circle', 'Gone', 0.0, 0.0, 1.0, 1.0, 0.0)"]
+    assert scad.Scad.keys_diff(old_keys, old_keys) == []
+    assert len(scad.Scad.keys_diff(old_keys, new_keys, tolerance=0.0001)) == 7
+
 
 def test_scad_keys_html_file_write() -> None:
     """Test Scad.keys_csv_file_write()."""
@@ -991,6 +1928,46 @@ def test_scad_keys_html_file_write() -> None:
         assert html_lines[43] == '</HTML>'
 
 
+def test_scad_keys_html_report_write() -> None:
+    """Test Scad.keys_html_report_write()."""
+    circle_key: Tuple[Any, ...] = ("Circle", "Circle1", 1.0, 2.0, 1.0, 1.0, 0.0)
+    square_key: Tuple[Any, ...] = ("Square", "</script>", 3.0, 4.0, 2.0, 4.0, 45.0, 0.5, 3)
+    html_file: IO[Any]
+    with io.StringIO("") as html_file:
+        scad.Scad.keys_html_report_write([("Base", [circle_key, square_key]),
+                                          ("Plate", [(square_key[0], "Square2") + square_key[2:]])],
+                                         html_file, "Keys & Holes")
+        html_text: str = html_file.getvalue()
+
+    # Everything is inline, the title is escaped, and the "</script>" name can not escape:
+    assert "<title>Keys &amp; Holes</title>" in html_text
+    assert "http" not in html_text and " src=" not in html_text and "<link" not in html_text
+    assert html_text.count("</script>") == 2
+    json_prefix: str = '<script type="application/json" id="keys">'
+    json_start: int = html_text.index(json_prefix) + len(json_prefix)
+    json_text: str = html_text[json_start:html_text.index("</script>", json_start)]
+    assert json.loads(json_text) == {
+        "columns": list(scad.Scad.KEY_COLUMNS),
+        "tables": [
+            {"caption": "Base",
+             "keys": [list(circle_key), ["Square", "</script>", 3.0, 4.0, 2.0, 4.0, 45.0, 0.5, 3]]},
+            {"caption": "Plate",
+             "keys": [["Square", "Square2", 3.0, 4.0, 2.0, 4.0, 45.0, 0.5, 3]]}]}
+    assert ", " not in json_text and ": " not in json_text
+
+
+def test_scad_keys_table_get() -> None:
+    """Test Scad.keys_table_get()."""
+    circle_key: Tuple[Any, ...] = ("Circle", "Circle1", 1.0, 2.0, 1.0, 1.0, 0.0)
+    square_key: Tuple[Any, ...] = ("Square", "Square1", 3.0, 4.0, 2.0, 4.0, 45.0, 0.5, 3)
+    keys_table: Dict[str, List[Any]] = scad.Scad.keys_table_get([circle_key, square_key])
+    assert list(keys_table.keys()) == list(scad.Scad.KEY_COLUMNS)
+    assert keys_table["Name"] == ["Circle1", "Square1"]
+    assert keys_table["X"] == [1.0, 3.0]
+    assert keys_table["Corner Count"] == [None, 3]
+    assert scad.Scad.keys_table_get([])["Type"] == []
+
+
 def test_scad_program() -> None:
     """Test ScadProgram class."""
     scad_program: ScadProgram = ScadProgram("ScadProgram 1")
@@ -1015,6 +1992,11 @@ def test_scad_program() -> None:
     assert scad_lines[9] == "}  // End If3D 'Name If3D'", "[9]!"
     assert scad_lines[10] == "// End ScadProgram('ScadProgram 1')", "[10]!"
 
+    # The module use for each registered name can be found:
+    circle1_use: Optional[scad.Scad] = scad_program.name_use_get("circle1")
+    assert isinstance(circle1_use, UseModule2D) and circle1_use.module2d is circle1_module
+    assert scad_program.name_use_get("bogus") is None
+
     # Create an *initial_read_me_text*:
     read_me_lines: List[str] = [
         "# README.md",
@@ -1053,6 +2035,170 @@ def test_scad_program() -> None:
     assert final_read_me_text == updated_read_me_text
 
 
+def test_scad_program_cache() -> None:
+    """Test ScadProgram cache_save() and cache_load() methods."""
+    # Build a small *scad_program* that has both 2D and 3D modules:
+    scad_program: ScadProgram = ScadProgram("Cache Program")
+    square: Square = Square("Square", 2.0, 2.0)
+    square_module: Module2D = Module2D("Square Module", [square])
+    scad_program.append(square_module)
+    scad_program.if2d.name_match_append("square", square_module, ["Square"])
+    cube: Cube = Cube("Cube", 1.0, 2.0, 3.0)
+    cube_module: Module3D = Module3D("Cube Module", [cube])
+    scad_program.append(cube_module)
+    scad_program.if3d.name_match_append("cube", cube_module, ["Cube"])
+    scad_lines: List[str] = []
+    scad_program.scad_lines_append(scad_lines, "")
+
+    # The sources hash is stable and depends upon the directory contents:
+    sources_hash: str = ScadProgram.sources_hash_get()
+    assert sources_hash == ScadProgram.sources_hash_get()
+    assert len(sources_hash) == 64
+
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        # A missing cache file is a cache miss:
+        cache_file_name: str = os.path.join(temporary_directory, "test.cache")
+        assert ScadProgram.cache_load(cache_file_name, sources_hash) is None
+
+        # Round trip *scad_program* through the cache and verify the generated lines match:
+        scad_program.cache_save(cache_file_name, sources_hash)
+        assert os.listdir(temporary_directory) == ["test.cache"]
+        loaded_scad_program: Optional[ScadProgram] = ScadProgram.cache_load(cache_file_name,
+                                                                            sources_hash)
+        assert isinstance(loaded_scad_program, ScadProgram)
+        loaded_scad_lines: List[str] = []
+        loaded_scad_program.scad_lines_append(loaded_scad_lines, "")
+        assert loaded_scad_lines == scad_lines
+        assert set(loaded_scad_program.modules_table) == {"Square Module", "Cube Module"}
+
+        # A different sources hash is a cache miss:
+        assert ScadProgram.cache_load(cache_file_name, "different") is None
+
+        # A corrupted cache file is a cache miss:
+        cache_file: IO[bytes]
+        with open(cache_file_name, "wb") as cache_file:
+            cache_file.write(b"not a cache file")
+        assert ScadProgram.cache_load(cache_file_name, sources_hash) is None
+
+        # A failed save does not leave its temporary file behind:
+        directory_cache_file_name: str = os.path.join(temporary_directory, "directory.cache")
+        os.mkdir(directory_cache_file_name)
+        try:
+            scad_program.cache_save(directory_cache_file_name, sources_hash)
+            assert False  # pragma: no cover
+        except OSError:
+            pass
+        assert sorted(os.listdir(temporary_directory)) == ["directory.cache", "test.cache"]
+
+        # Input files change the sources hash, including when they go missing:
+        input_file_name: str = os.path.join(temporary_directory, "input.txt")
+        input_file: IO[str]
+        with open(input_file_name, "w") as input_file:
+            input_file.write("1")
+        input_hash: str = ScadProgram.sources_hash_get(input_file_names=[input_file_name])
+        assert input_hash == ScadProgram.sources_hash_get(input_file_names=[input_file_name])
+        with open(input_file_name, "w") as input_file:
+            input_file.write("2")
+        changed_hash: str = ScadProgram.sources_hash_get(input_file_names=[input_file_name])
+        os.remove(input_file_name)
+        missing_hash: str = ScadProgram.sources_hash_get(input_file_names=[input_file_name])
+        assert len({sources_hash, input_hash, changed_hash, missing_hash}) == 4
+        assert ScadProgram.sources_hash_get(input_file_names=[]) == sources_hash
+
+
+def test_scad_snapshot() -> None:
+    """Test ScadSnapshot class."""
+    def scad_program_build(cube_dz: float, extra: bool) -> ScadProgram:
+        scad_program: ScadProgram = ScadProgram("Snapshot Program")
+        square_module: Module2D = Module2D("Square Module", [Square("Square", 2.0, 2.0)])
+        scad_program.append(square_module)
+        scad_program.if2d.name_match_append("square", square_module, ["Square"])
+        cube_module: Module3D = Module3D("Cube Module", [Cube("Cube", 1.0, 2.0, cube_dz)])
+        scad_program.append(cube_module)
+        scad_program.if3d.name_match_append("cube", cube_module, ["Cube"])
+        if extra:
+            scad_program.append(Module3D("Extra Module", [Cube("Extra Cube", 1.0, 1.0, 1.0)]))
+        return scad_program
+
+    # The snapshot has one module per top level Scad plus the *if2d* and *if3d* trees, and
+    # matches the program lines without the begin/end comments:
+    scad_program: ScadProgram = scad_program_build(3.0, False)
+    golden_snapshot: ScadSnapshot = ScadSnapshot.program_get(scad_program)
+    assert f"{golden_snapshot}" == "ScadSnapshot('Snapshot Program',4)"
+    assert list(golden_snapshot.hashes.keys()) == [
+        "Square Module", "Cube Module", "Name If2D", "Name If3D"]
+    scad_lines: List[str] = []
+    scad_program.scad_lines_append(scad_lines, "")
+    module_name: str
+    assert "\n".join([golden_snapshot.text_get(module_name)
+                      for module_name in golden_snapshot.hashes]) == "\n".join(scad_lines[1:-1])
+
+    # Lines are normalized and repeated module names are made unique:
+    assert ScadSnapshot.line_normalize("translate([-0.000, -0.0, -0.001, 10.000]) {  ") == (
+        "translate([0.000, 0.0, -0.001, 10.000]) {")
+    assert ScadSnapshot.line_normalize("x1-0.000") == "x1-0.000"
+    scratch_snapshot: ScadSnapshot = ScadSnapshot("Scratch Program")
+    scratch_snapshot.module_append("Cube Module", ["cube(size = [1.000, 1.000, 1.000]);"])
+    scratch_snapshot.module_append("Cube Module", ["cube(size = [1.000, 1.000, -0.000]);"])
+    assert list(scratch_snapshot.hashes.keys()) == ["Cube Module", "Cube Module #2"]
+    assert scratch_snapshot.text_get("Cube Module #2") == "cube(size = [1.000, 1.000, 0.000]);"
+
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        # Round trip *golden_snapshot* through a file; the loaded texts are decompressed lazily:
+        snapshot_file_name: str = os.path.join(temporary_directory, "golden.json")
+        golden_snapshot.save(snapshot_file_name)
+        loaded_snapshot: ScadSnapshot = ScadSnapshot.load(snapshot_file_name)
+        assert loaded_snapshot.hashes == golden_snapshot.hashes
+        assert loaded_snapshot.texts == {}
+        loaded_snapshot.save(snapshot_file_name)
+        loaded_snapshot = ScadSnapshot.load(snapshot_file_name)
+
+        # An identical build has no differences and nothing is decompressed:
+        same_snapshot: ScadSnapshot = ScadSnapshot.program_get(scad_program_build(3.0, False))
+        assert loaded_snapshot.differences_get(same_snapshot) == []
+        assert loaded_snapshot.diff_lines_get(same_snapshot) == []
+        assert loaded_snapshot.texts == {}
+        assert loaded_snapshot.report_get(same_snapshot) == (
+            "0 of 4 modules differ from ScadSnapshot('Snapshot Program')\n")
+
+        # Only the changed and added modules are reported, with a minimal diff:
+        new_snapshot: ScadSnapshot = ScadSnapshot.program_get(scad_program_build(3.5, True))
+        assert loaded_snapshot.differences_get(new_snapshot) == ["Cube Module", "Extra Module"]
+        diff_lines: List[str] = loaded_snapshot.diff_lines_get(new_snapshot)
+        assert diff_lines[:5] == [
+            "--- Snapshot Program: Cube Module",
+            "+++ Snapshot Program: Cube Module",
+            "@@ -2 +2 @@",
+            "- cube(size = [1.000, 2.000, 3.000], center = true);  // Cube: 'Cube'",
+            "+ cube(size = [1.000, 2.000, 3.500], center = true);  // Cube: 'Cube'"]
+        assert diff_lines[5:8] == ["--- Snapshot Program: Extra Module",
+                                   "+++ Snapshot Program: Extra Module",
+                                   "@@ -0,0 +1,3 @@"]
+        assert list(loaded_snapshot.texts.keys()) == ["Cube Module"]
+        report_lines: List[str] = loaded_snapshot.report_get(new_snapshot).split("\n")
+        assert report_lines[0] == "2 of 4 modules differ from ScadSnapshot('Snapshot Program')"
+        assert report_lines[1:-1] == diff_lines
+
+        # A removed module is diffed against no lines:
+        assert new_snapshot.differences_get(loaded_snapshot) == ["Cube Module", "Extra Module"]
+        assert new_snapshot.diff_lines_get(loaded_snapshot)[-5:-2] == [
+            "+++ Snapshot Program: Extra Module",
+            "@@ -1,3 +0,0 @@",
+            "-module Extra_Module() {"]
+
+        # A file that is not a snapshot is rejected:
+        with open(snapshot_file_name, "w") as snapshot_file:
+            snapshot_file.write('{"version": 0}\n')
+        try:
+            ScadSnapshot.load(snapshot_file_name)
+            assert False  # pragma: no cover
+        except ValueError as value_error:
+            assert f"{value_error}" == (f"'{snapshot_file_name}' is not a version 1 "
+                                        "ScadSnapshot file")
+
+
 def test_simple_polygon() -> None:
     """Test the SimplePolygon class and associated methods."""
     # Test *empty_polygon*:
@@ -1372,6 +2518,117 @@ def test_square() -> None:
                                     4.0, 0.0, 0.5, 2), "key failed"
 
 
+def test_stl_file_write() -> None:
+    """Test Scad3D mesh generation and `.stl` file writing."""
+    def volume(triangles: Any) -> float:
+        """Return the volume enclosed by a mesh using the divergence theorem."""
+        total: float = 0.0
+        index: int
+        for index in range(0, len(triangles), 9):
+            x1, y1, z1, x2, y2, z2, x3, y3, z3 = triangles[index:index + 9]
+            total += (x1 * (y2 * z3 - z2 * y3) - y1 * (x2 * z3 - z2 * x3) +
+                      z1 * (x2 * y3 - y2 * x3)) / 6.0
+        return total
+
+    # A *Cube* is 12 outward facing triangles:
+    cube: Cube = Cube("Cube", 1.0, 2.0, 3.0, center=P3D(5.0, 5.0, 5.0))
+    triangles: Any
+    openscad_scad3ds: List[Scad3D]
+    triangles, openscad_scad3ds = cube.mesh_get()
+    assert len(triangles) == 12 * 9 and openscad_scad3ds == []
+    assert abs(volume(triangles) - 6.0) < 0.00001
+
+    # Rotating and translating must not change the volume:
+    moved_cube: Translate3D = Translate3D("Moved Cube",
+                                          Rotate3D("Rotated Cube", cube, pi / 3.0,
+                                                   P3D(1.0, 1.0, 0.0)),
+                                          P3D(-7.0, 0.0, 2.0))
+    triangles, openscad_scad3ds = moved_cube.mesh_get()
+    assert abs(volume(triangles) - 6.0) < 0.00001
+
+    # A *Cylinder* with 8 sides is 6 + 6 cap triangles and 16 side triangles:
+    cylinder: Cylinder = Cylinder("Cylinder", 2.0, P3D(0.0, 0.0, 0.0), P3D(0.0, 0.0, -5.0), 8)
+    triangles, openscad_scad3ds = cylinder.mesh_get()
+    assert len(triangles) == 28 * 9
+    assert abs(volume(triangles) - 5.0 * 2.0 * sqrt(2.0)) < 0.00001
+
+    # Clockwise outlines with a concave corner extrude correctly:
+    l_polygon: SimplePolygon = SimplePolygon("L Polygon", [
+        P2D(0.0, 2.0), P2D(1.0, 2.0), P2D(1.0, 1.0), P2D(2.0, 1.0), P2D(2.0, 0.0), P2D(0.0, 0.0)
+    ], lock=True)
+    l_extrude: LinearExtrude = LinearExtrude("L Extrude", Polygon("L", [l_polygon]), 2.0,
+                                             center=True)
+    triangles, openscad_scad3ds = l_extrude.mesh_get()
+    assert abs(volume(triangles) - 6.0) < 0.00001
+
+    # *Difference3D*'s and holed *Polygon*'s are reported as needing OpenSCAD:
+    difference3d: Difference3D = Difference3D("Difference", cube, [cylinder])
+    holed_polygon: Polygon = Polygon("Holed", [Square("Exterior", 4.0, 4.0),
+                                               Circle("Hole", 1.0, 8)])
+    holed_extrude: LinearExtrude = LinearExtrude("Holed Extrude", holed_polygon, 1.0)
+    module3d: Module3D = Module3D("Mesh Module", [
+        Color("Red Cube", cube, "Red"), difference3d, holed_extrude, l_extrude])
+    union3d: Union3D = Union3D("Mesh Union", [module3d.use_module_get(), cylinder])
+    stl_file: IO[bytes] = io.BytesIO()
+    openscad_scad3ds = union3d.stl_file_write(stl_file)
+    assert [scad3d.name for scad3d in openscad_scad3ds] == ["Difference", "Holed Extrude"]
+    stl_bytes: bytes = stl_file.getvalue()  # type: ignore
+    triangles_size: int = struct.unpack_from("<I", stl_bytes, 80)[0]
+    assert triangles_size == 12 + 20 + 28
+    assert len(stl_bytes) == 84 + 50 * triangles_size
+    assert stl_bytes.startswith(b"Scad3D 'Mesh Union'")
+
+
+def test_svg_files_write() -> None:
+    """Test ScadProgram.svg_files_write() and the Scad2D svg_lines_append() methods."""
+    # Build a *Module2D* containing every kind of *Scad2D*:
+    exterior: Square = Square("Exterior", 10.0, 6.0)
+    hole: Circle = Circle("Hole", 2.0, 8, center=P2D(3.0, 0.0))
+    holed_polygon: Polygon = Polygon("Holed Polygon", [exterior, hole])
+    notch: Square = Square("Notch", 2.0, 2.0, center=P2D(-5.0, 0.0))
+    difference2d: Difference2D = Difference2D("Notched", holed_polygon, [notch])
+    inner_module2d: Module2D = Module2D("Inner Module", [Circle("Dot", 1.0, 8)])
+    module2d: Module2D = Module2D("SVG Module", [
+        difference2d, inner_module2d.use_module_get(), inner_module2d.use_module_get()])
+    bounding_box: Optional[Tuple[P2D, P2D]] = module2d.bounding_box_get()
+    assert bounding_box is not None
+    assert f"{bounding_box[0]}" == "P2D(-5.000,-3.000)"
+    assert f"{bounding_box[1]}" == "P2D(5.000,3.000)"
+
+    # Register *module2d* with *scad_program* and write out the `.svg` file:
+    scad_program: ScadProgram = ScadProgram("SVG Program")
+    scad_program.if2d.name_match_append("svg_test", module2d, ["SVG Test"])
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        svg_file_names: List[str] = scad_program.svg_files_write(temporary_directory)
+        assert svg_file_names == [os.path.join(temporary_directory, "svg_test.svg")]
+        svg_file: IO[Any]
+        with open(svg_file_names[0]) as svg_file:
+            svg_text: str = svg_file.read()
+    assert 'viewBox="-6.000 -4.000 12.000 8.000"' in svg_text
+    assert svg_text.count('<g id="_SVG_Module">') == 1
+    assert svg_text.count('<g id="_Inner_Module">') == 1
+    assert svg_text.count('<use xlink:href="#_Inner_Module"/>') == 2
+    assert '<mask id="_Notched_Mask"' in svg_text
+    assert '<g mask="url(#_Notched_Mask)">' in svg_text
+    assert '<path fill-rule="evenodd" d="M ' in svg_text
+    assert '<circle cx="0.000" cy="0.000" r="0.500"/>' in svg_text
+
+    # A *Scad2D* with no SVG equivalent is rejected by name and no file is written:
+    variable_program: ScadProgram = ScadProgram("Variable Program")
+    variable_module2d: Module2D = Module2D("Variable Module", [
+        Variable2D("Width Variable", "width", "3.0")])
+    variable_program.if2d.name_match_append("variable", variable_module2d, ["Variable"])
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        try:
+            variable_program.svg_files_write(temporary_directory)
+            assert False  # pragma: no cover
+        except ValueError as value_error:
+            assert f"{value_error}" == ("Variable2D 'Width Variable' can not be written to "
+                                        "an SVG file")
+        assert os.listdir(temporary_directory) == []
+
+
 def test_translate3d() -> None:
     """Test Translate3D class."""
     cube1: Cube = Cube("Cube 1", 1.0, 2.0, 3.0)
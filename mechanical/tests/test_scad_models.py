@@ -0,0 +1,395 @@
+"""test_scad_models: Unit tests for the `scad_models` command line program."""
+
+# Copyright (c) 2019 Wayne C. Gramlich (Wayne@Gramlich.Net)
+#
+# MIT License
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# <----------------------------------------100 Characters----------------------------------------> #
+
+import argparse
+import contextlib
+import json
+import os
+from scad_models import hr2_models, scad
+from scad_models.hr2_models import HR2Robot
+from scad_models.scad import ScadSnapshot
+from scad_models.scad_models import (arguments_parse, main, model_request, ModelServer,
+                                     parameters_sweep, ScadWatcher)
+import tempfile
+import threading
+import time
+import types
+from typing import Any, Dict, IO, Iterator, List, Set, Tuple
+
+
+# arm_clearance_get():
+def arm_clearance_get(hr2_robot: HR2Robot) -> float:
+    """Return the arm clearance above the master board (a sweep metric)."""
+    return hr2_robot.arm_z - hr2_robot.master_board_z
+
+
+# arm_gap_get():
+def arm_gap_get(hr2_robot: HR2Robot) -> float:
+    """Return the built clearance between the boards and the arm (a sweep metric)."""
+    return hr2_robot.hr2_arm_assembly_get().module.clearances_get(
+        HR2Robot.CLEARANCE_GROUPS, [("boards", "arm")])[0][0]
+
+
+# bogus_metric_get():
+def bogus_metric_get(hr2_robot: HR2Robot) -> float:
+    """Fail with an unexpected KeyError (a sweep metric)."""
+    return hr2_robot.parameters["bogus"]
+
+
+# modules_preserved():
+@contextlib.contextmanager
+def modules_preserved(modules: List[types.ModuleType]) -> Iterator[None]:
+    """Restore the namespaces of some modules that get reloaded inside a with block.
+
+    `importlib.reload`() re-executes a module in place, so every other test module would be
+    left holding the classes of the old module.  Putting the old namespace back keeps the
+    reload from leaking into the tests that run afterwards.
+    """
+    module: types.ModuleType
+    namespaces: List[Tuple[types.ModuleType, Dict[str, Any]]] = [
+        (module, dict(vars(module))) for module in modules]
+    try:
+        yield
+    finally:
+        namespace: Dict[str, Any]
+        for module, namespace in namespaces:
+            vars(module).clear()
+            vars(module).update(namespace)
+
+
+# nucleo144_clearance_get():
+def nucleo144_clearance_get(hr2_robot: HR2Robot) -> float:
+    """Return the Nucleo144 clearance above the master board (a sweep metric)."""
+    clearance: float = hr2_robot.nucleo144_offset.z - hr2_robot.master_board_z
+    if clearance < 12.0:
+        raise ValueError(f"Nucleo144 clearance {clearance:.1f} is too small")
+    return clearance
+
+
+# stack_validate():
+def stack_validate(parameters: Dict[str, float]) -> str:
+    """Reject sweep variants with the master board below the Raspberry Pi."""
+    return "" if parameters["master_board_dz"] > 0.0 else "Master board is below the Pi"
+
+
+# test_arguments_parse():
+def test_arguments_parse() -> None:
+    """Test arguments_parse()."""
+    parsed_arguments: argparse.Namespace = arguments_parse(
+        ["--name", "romi_base", "-n", "sonar", "--split", "--jobs", "2", "-o", "out"])
+    assert parsed_arguments.names == ["romi_base", "sonar"]
+    assert parsed_arguments.split and parsed_arguments.jobs == 2
+    assert parsed_arguments.output_directory == "out"
+    assert not parsed_arguments.profile
+    try:
+        arguments_parse(["--name", "bogus"])
+        assert False  # pragma: no cover
+    except SystemExit as system_exit:
+        assert system_exit.code == 2
+
+
+# test_main():
+def test_main() -> None:
+    """Test main()."""
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        # Split mode writes one file per name, with *name* defaulting to that name:
+        split_directory: str = os.path.join(temporary_directory, "split")
+        assert main(["-n", "romi_base", "-n", "sonar", "--split", "--jobs", "2",
+                     "-o", split_directory]) == 0
+        assert sorted(os.listdir(split_directory)) == ["romi_base.scad", "sonar.scad"]
+        scad_file: IO[Any]
+        with open(os.path.join(split_directory, "romi_base.scad")) as scad_file:
+            scad_lines: List[str] = scad_file.read().split('\n')
+        assert 'name = "romi_base";' in scad_lines
+        assert scad_lines[-2] == "// End ScadProgram('Scad models')"
+
+        # Regenerating an up to date file leaves it alone:
+        romi_base_file_name: str = os.path.join(split_directory, "romi_base.scad")
+        modification_time: int = os.stat(romi_base_file_name).st_mtime_ns
+        assert main(["-n", "romi_base", "--split", "--profile", "-o", split_directory]) == 0
+        assert os.stat(romi_base_file_name).st_mtime_ns == modification_time
+
+        # Monolithic mode writes a single `hr2_models.scad`:
+        assert main(["-n", "romi_base", "-n", "nucleo144", "-o", temporary_directory]) == 0
+        with open(os.path.join(temporary_directory, "hr2_models.scad")) as scad_file:
+            scad_text: str = scad_file.read()
+        assert 'name == "romi_base"' in scad_text and 'name == "nucleo144"' in scad_text
+        assert 'name == "master_board"' not in scad_text
+        assert main(["--list"]) == 0
+
+        # The clearance and mass properties reports are printed after the build:
+        assert main(["-n", "romi_base", "-o", temporary_directory, "--clearance", "1.0",
+                     "--mass", "--duplicates"]) == 0
+
+        # A golden snapshot of the full model matches a new build:
+        snapshot_file_name: str = os.path.join(temporary_directory, "golden.json")
+        assert main(["-n", "romi_base", "-o", temporary_directory,
+                     "--snapshot-save", snapshot_file_name]) == 0
+        assert main(["-n", "romi_base", "-o", temporary_directory,
+                     "--snapshot-check", snapshot_file_name]) == 0
+
+        # A golden snapshot with a changed module fails the check:
+        golden_snapshot: ScadSnapshot = ScadSnapshot.load(snapshot_file_name)
+        module_name: str = next(iter(golden_snapshot.hashes))
+        golden_snapshot.hashes[module_name] = "changed"
+        golden_snapshot.save(snapshot_file_name)
+        assert main(["-n", "romi_base", "-o", temporary_directory,
+                     "--snapshot-check", snapshot_file_name]) == 1
+
+        # The bills of materials are written next to the `.scad` files:
+        assert main(["-n", "romi_base", "-o", temporary_directory, "--bom"]) == 0
+        with open(os.path.join(temporary_directory, "hr2_arm_assembly_bom.csv")) as bom_file:
+            bom_lines: List[str] = bom_file.read().split("\n")
+        assert bom_lines[0].startswith("part,quantity,")
+        assert any([bom_line.startswith("HC-SR04 Sonar,") for bom_line in bom_lines])
+
+
+# test_model_server():
+def test_model_server() -> None:
+    """Test the ModelServer class."""
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        parameter_file_name: str = os.path.join(temporary_directory, "parameters.txt")
+        parameter_file: IO[Any]
+        with open(parameter_file_name, "w") as parameter_file:
+            parameter_file.write("1\n")
+        socket_path: str = os.path.join(temporary_directory, "model.socket")
+        model_server: ModelServer = ModelServer(socket_path, [parameter_file_name])
+        serve_thread: threading.Thread = threading.Thread(target=model_server.serve)
+        serve_thread.start()
+        try:
+            while model_server.unix_server is None or not os.path.exists(socket_path):
+                time.sleep(0.01)  # pragma: no cover
+
+            # Query the model from several concurrent clients:
+            requests: List[Dict[str, Any]] = [
+                {"command": "names"},
+                {"command": "scad", "name": "sonar"},
+                {"command": "keys", "name": "romi_base"},
+                {"command": "bounding_box", "name": "expansion_flat"},
+                {"command": "placement", "board": "master_board", "reference": "H1"},
+                {"command": "scad"},
+                {"command": "lookup", "scad_name": "Wheat Color"},
+                {"command": "lookup", "scad_name": "bogus"},
+            ]
+            responses: List[Dict[str, Any]] = [{} for request in requests]
+
+            def request_send(index: int) -> None:
+                responses[index] = model_request(socket_path, requests[index])
+
+            index: int
+            threads: List[threading.Thread] = [
+                threading.Thread(target=request_send, args=(index,))
+                for index in range(len(requests))]
+            thread: threading.Thread
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            response: Dict[str, Any]
+            for response in responses:
+                assert response["ok"], response
+                assert response["seconds"] >= 0.0
+            assert "romi_base" in responses[0]["result"]
+            assert 'name = "sonar";' in responses[1]["result"]
+            assert responses[2]["result"]["columns"][:2] == ["Type", "Name"]
+            assert len(responses[2]["result"]["keys"]) > 100
+            bounding_box: Dict[str, List[float]] = responses[3]["result"]
+            assert bounding_box["lower_left"][0] < bounding_box["upper_right"][0]
+            assert set(responses[4]["result"]["H1"].keys()) == {"x", "y", "diameter",
+                                                                     "rotation", "side"}
+            assert responses[5]["result"].startswith("// Begin ScadProgram('Scad models')")
+            assert responses[6]["result"] == {"type": "Color", "count": 2, "owners": ["RomiMotor"]}
+            assert responses[7]["result"] is None
+            assert model_server.builds == 1
+
+            # Errors are reported back to the client:
+            error_requests: List[Dict[str, Any]] = [
+                {"command": "bogus"},
+                {"command": "keys", "name": "sonar"},
+                {"command": "keys", "name": "bogus"},
+                {"command": "placement", "board": "bogus"},
+                {"command": "placement", "board": "master_board", "reference": "bogus"},
+                {"command": "lookup"},
+            ]
+            error_request: Dict[str, Any]
+            for error_request in error_requests:
+                response = model_request(socket_path, error_request)
+                assert not response["ok"] and response["error"].startswith("ValueError: ")
+
+            # Changing a watched file discards the cached model:
+            time.sleep(0.01)
+            with open(parameter_file_name, "w") as parameter_file:
+                parameter_file.write("22\n")
+            response = model_request(socket_path, {"command": "bounding_box", "name": "sonar"})
+            assert response["ok"] and response["result"] is None
+            metrics: Dict[str, Any] = model_request(socket_path, {"command": "metrics"})["result"]
+            assert metrics["builds"] == 2
+            assert metrics["commands"]["keys"]["count"] == 3
+            assert metrics["commands"]["invalid"]["count"] == 1
+
+            # After `scad.py` is reloaded, the bounding boxes still use the reloaded classes:
+            with modules_preserved([scad, hr2_models]):
+                model_server.signatures[scad.__file__] = (0, 0)
+                response = model_request(socket_path, {"command": "bounding_box",
+                                                       "name": "expansion_flat"})
+            assert response["ok"] and response["result"] is not None
+            assert metrics["builds"] == 2 and model_server.builds == 3
+        finally:
+            model_server.shutdown()
+            serve_thread.join()
+        assert not os.path.exists(socket_path)
+
+        # A server that has only answered named "scad" requests (and so never built the full
+        # model) still discards its cached texts when a watched file changes:
+        named_server: ModelServer = ModelServer(socket_path, [parameter_file_name])
+        scad_request: bytes = json.dumps({"command": "scad", "name": "sonar"}).encode()
+        assert json.loads(named_server.request_handle(scad_request))["ok"]
+        assert list(named_server.scad_texts.keys()) == ["sonar"] and named_server.builds == 0
+        time.sleep(0.01)
+        with open(parameter_file_name, "w") as parameter_file:
+            parameter_file.write("333\n")
+        assert json.loads(named_server.request_handle(b'{"command": "names"}'))["ok"]
+        assert named_server.scad_texts == {}
+
+
+# test_parameters_sweep():
+def test_parameters_sweep() -> None:
+    """Test parameters_sweep()."""
+    jobs: int
+    for jobs in (1, 2):
+        table: Dict[str, List[Any]] = parameters_sweep(
+            {"master_board_dz": [-1.0, 8.0], "nucleo144_dz": [10.0, 13.0]},
+            {"arm": arm_clearance_get, "nucleo144": nucleo144_clearance_get},
+            [stack_validate], ["romi_base"], jobs)
+        assert list(table.keys()) == [
+            "master_board_dz", "nucleo144_dz", "arm", "nucleo144", "status", "seconds"]
+        assert table["master_board_dz"] == [-1.0, -1.0, 8.0, 8.0]
+        assert table["nucleo144_dz"] == [10.0, 13.0, 10.0, 13.0]
+        assert table["status"][:2] == ["Master board is below the Pi"] * 2
+        assert table["status"][2] == "ValueError: Nucleo144 clearance 10.0 is too small"
+        assert table["status"][3] == "ok"
+        assert table["arm"] == [None, None, 26.0, 26.0]
+        assert table["nucleo144"] == [None, None, None, 13.0]
+        assert table["seconds"][0] == 0.0 and table["seconds"][3] > 0.0
+
+    # Sweeping a parameter that moves a built part changes the metric measured from the built
+    # geometry, and an unexpected exception only aborts the variant that raised it:
+    table = parameters_sweep({"arm_dz": [20.0, 30.0]}, {"gap": arm_gap_get},
+                             names=["hr2_arm_assembly"], jobs=2)
+    assert table["status"] == ["ok", "ok"]
+    assert 0.0 < table["gap"][0] < table["gap"][1]
+    table = parameters_sweep({"arm_dz": [20.0, 30.0]},
+                             {"gap": arm_gap_get, "bogus": bogus_metric_get},
+                             names=["hr2_arm_assembly"], jobs=1)
+    assert table["status"] == ["KeyError: 'bogus'"] * 2
+    assert table["bogus"] == [None, None] and table["gap"][0] < table["gap"][1]
+
+    # Bad parameter names and duplicate columns are rejected:
+    try:
+        parameters_sweep({"bogus": [1.0]}, {})
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert str(value_error).startswith("'bogus' is not one of [")
+    try:
+        parameters_sweep({"arm_dz": [1.0]}, {"status": arm_clearance_get})
+        assert False  # pragma: no cover
+    except ValueError as value_error:
+        assert str(value_error).startswith("Duplicate column name in ")
+
+
+# test_scad_watcher():
+def test_scad_watcher() -> None:
+    """Test the ScadWatcher class."""
+    temporary_directory: str
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        # Only top level definitions are hashed, ignoring comments and line numbers:
+        python_file_name: str = os.path.join(temporary_directory, "example.py")
+        python_file: IO[Any]
+        with open(python_file_name, "w") as python_file:
+            python_file.write("X = 1\n\n\nclass A:\n    pass\n\n\ndef b():\n    return 2\n")
+        hashes1: Dict[str, str] = ScadWatcher.definitions_hash_get(python_file_name)
+        assert sorted(hashes1.keys()) == ["", "A", "b"]
+        with open(python_file_name, "w") as python_file:
+            python_file.write("X = 1\n# Comment\nclass A:\n    pass\n\n\ndef b():\n    return 3\n")
+        hashes2: Dict[str, str] = ScadWatcher.definitions_hash_get(python_file_name)
+        assert hashes1[""] == hashes2[""] and hashes1["A"] == hashes2["A"]
+        assert hashes1["b"] != hashes2["b"]
+
+        # Each line maps to the top level statement that starts at or before it, including the
+        # decorators of a definition:
+        with open(python_file_name, "w") as python_file:
+            python_file.write("X = 1\n\n\n@decorate\nclass A:\n    pass\n\n\ndef b():\n"
+                              "    return 2\n")
+        assert ScadWatcher.definitions_start_get(python_file_name) == [(1, ""), (4, "A"), (9, "b")]
+
+        # The first poll reports every watched file and the first update builds everything:
+        parameter_file_name: str = os.path.join(temporary_directory, "parameters.txt")
+        with open(parameter_file_name, "w") as python_file:
+            python_file.write("1\n")
+        scad_watcher: ScadWatcher = ScadWatcher(["romi_base", "sonar"], temporary_directory,
+                                                True, [parameter_file_name])
+        romi_base_file_name: str = os.path.join(temporary_directory, "romi_base.scad")
+        sonar_file_name: str = os.path.join(temporary_directory, "sonar.scad")
+        changed_file_names: List[str] = scad_watcher.poll()
+        assert len(changed_file_names) == 3 and changed_file_names[-1] == parameter_file_name
+        results: List[Tuple[str, float, bool]] = scad_watcher.update(changed_file_names)
+        assert [result[0] for result in results] == [romi_base_file_name, sonar_file_name]
+        assert all(result[2] for result in results)
+        assert scad_watcher.poll() == []
+
+        # Each output file only depends upon the definitions that it used:
+        dependencies: Dict[str, Set[str]] = scad_watcher.dependencies
+        assert "RomiBase" in dependencies[romi_base_file_name]
+        assert "RomiBase" not in dependencies[sonar_file_name]
+        assert "HCSR04" in dependencies[sonar_file_name]
+        assert scad_watcher.affected_get({"HCSR04"}, False) == [sonar_file_name]
+        assert scad_watcher.affected_get(set(), False) == []
+        assert len(scad_watcher.affected_get({""}, False)) == 2
+        assert scad_watcher.definitions_changed_get() == set()
+
+        # A changed parameter file rebuilds everything, but unchanged outputs are not rewritten:
+        time.sleep(0.01)
+        with open(parameter_file_name, "w") as python_file:
+            python_file.write("22\n")
+        scad_watcher.run(0.0, iterations=2)
+        assert scad_watcher.updates == 2
+        assert scad_watcher.update([parameter_file_name])[0][2] is False
+
+        # A missing output file is rebuilt:
+        os.remove(sonar_file_name)
+        assert scad_watcher.affected_get(set(), False) == [sonar_file_name]
+
+        # A changed `hr2_models.py` is reloaded with `importlib.reload`, but since none of its
+        # definitions actually changed, only the missing output file is rebuilt:
+        hr2_robot_class: Any = hr2_models.HR2Robot
+        with modules_preserved([hr2_models]):
+            results = scad_watcher.update([hr2_models.__file__])
+            assert hr2_models.HR2Robot is not hr2_robot_class
+        assert hr2_models.HR2Robot is hr2_robot_class
+        assert [result[0] for result in results] == [sonar_file_name]
+        assert "HCSR04" in scad_watcher.dependencies[sonar_file_name]